@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Benchmark wydajności JokeAnalyzer i HumorFeatureExtractor
+
+Na żartach z validation/test-waldus-classics.json mierzy dla każdego celu:
+- cold_start: import + inicjalizacja (modele spaCy) + pierwsza analiza,
+  w osobnym procesie - tak jak start nowego workera
+- memory: RSS/PSS/USS tego procesu po rozgrzaniu (pamięć jednego workera)
+- latency: percentyle czasu analizy pojedynczego żartu (p50/p90/p99)
+- throughput: żarty/s dla paczek różnej wielkości
+
+Dodatkowo spacy_profiles: czas parsowania spaCy na zapytanie - pełny potok
+vs tylko komponenty potrzebne analizerom (nlp.pipelines) - i zysk w ms.
+
+Wynik zapisywany jest do JSON (domyślnie validation/benchmarks/analysis-<commit>.json),
+a --compare pokazuje zmianę względem wcześniejszego wyniku, np. z poprzedniego
+commita. Regresja powyżej --threshold kończy skrypt kodem 1.
+
+Użycie:
+    python scripts/benchmark_analysis.py
+    python scripts/benchmark_analysis.py --targets joke_analyser --iterations 5
+    python scripts/benchmark_analysis.py --compare validation/benchmarks/analysis-1ae364c.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+from datetime import datetime
+from typing import Callable, Dict, List, Any, Optional
+
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SRC_DIR = os.path.join(PROJECT_DIR, 'src')
+DATASET_PATH = os.path.join(PROJECT_DIR, 'validation', 'test-waldus-classics.json')
+RESULTS_DIR = os.path.join(PROJECT_DIR, 'validation', 'benchmarks')
+
+sys.path.insert(0, SRC_DIR)
+
+BATCH_SIZES = (1, 8, 32, 128)
+
+
+def load_jokes(path: str = DATASET_PATH) -> List[str]:
+    """Teksty żartów z datasetu walidacyjnego"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [joke['text'] for joke in json.load(f)['jokes']]
+
+
+def _joke_analyser() -> Callable[[str], Any]:
+    from joke_analyser.analyzer import JokeAnalyzer
+    from joke_analyser.models import AnalyzeRequest
+
+    analyzer = JokeAnalyzer()
+    return lambda text: analyzer.analyze_sync(AnalyzeRequest(joke_text=text))
+
+
+def _humor_features() -> Callable[[str], Any]:
+    from humor_features.extractor import HumorFeatureExtractor
+
+    extractor = HumorFeatureExtractor()
+    return extractor.extract_features
+
+
+def _joke_engine() -> Callable[[str], Any]:
+    from joke_analyser.analyzer import JokeAnalyzer
+    from joke_analyser.engine import JokeEngine
+    from joke_analyser.models import AnalyzeRequest
+    from humor_features.extractor import HumorFeatureExtractor
+
+    engine = JokeEngine(JokeAnalyzer(), HumorFeatureExtractor())
+    return lambda text: engine.analyze_sync(AnalyzeRequest(joke_text=text))
+
+
+# Nazwa -> fabryka zwracająca funkcję analizy jednego żartu
+TARGETS: Dict[str, Callable[[], Callable[[str], Any]]] = {
+    'joke_analyser': _joke_analyser,
+    'humor_features': _humor_features,
+    'joke_analyser.engine': _joke_engine,
+}
+
+
+def percentiles(samples_ms: List[float]) -> Dict[str, float]:
+    """p50/p90/p99, średnia i maksimum (ms)"""
+    ordered = sorted(samples_ms)
+
+    def pick(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 3)
+
+    return {
+        'p50_ms': pick(0.50),
+        'p90_ms': pick(0.90),
+        'p99_ms': pick(0.99),
+        'mean_ms': round(statistics.fmean(ordered), 3),
+        'max_ms': round(ordered[-1], 3),
+        'samples': len(ordered),
+    }
+
+
+def measure_latency(analyze: Callable[[str], Any], jokes: List[str], iterations: int) -> Dict[str, float]:
+    """Czas analizy pojedynczego żartu (każdy żart `iterations` razy)"""
+    samples = []
+    for _ in range(iterations):
+        for text in jokes:
+            started = time.perf_counter()
+            analyze(text)
+            samples.append((time.perf_counter() - started) * 1000)
+    return percentiles(samples)
+
+
+def measure_throughput(
+    analyze: Callable[[str], Any],
+    jokes: List[str],
+    batch_sizes=BATCH_SIZES
+) -> Dict[str, Dict[str, float]]:
+    """Przepustowość (żarty/s) dla paczek różnej wielkości (żarty powtarzane cyklicznie)"""
+    results = {}
+    for size in batch_sizes:
+        batch = [jokes[i % len(jokes)] for i in range(size)]
+        started = time.perf_counter()
+        for text in batch:
+            analyze(text)
+        elapsed = time.perf_counter() - started
+        results[str(size)] = {
+            'jokes_per_s': round(size / elapsed, 2) if elapsed > 0 else None,
+            'batch_ms': round(elapsed * 1000, 3),
+        }
+    return results
+
+
+def measure_cold_start(target: str, sample: str) -> Dict[str, Any]:
+    """
+    Zmierz cold start i pamięć w nowym procesie (--child)
+
+    Returns:
+        {'import_ms', 'init_ms', 'first_call_ms', 'total_ms', 'memory'} albo {'error'}
+    """
+    command = [sys.executable, os.path.abspath(__file__), '--child', target, '--child-sample', sample]
+    completed = subprocess.run(command, capture_output=True, text=True, cwd=PROJECT_DIR)
+    try:
+        return json.loads(completed.stdout.strip().splitlines()[-1])
+    except (IndexError, json.JSONDecodeError):
+        return {'error': (completed.stderr.strip().splitlines() or ['no output'])[-1]}
+
+
+def _child(target: str, sample: str):
+    """Proces potomny: import, inicjalizacja, pierwsza analiza, pomiar pamięci"""
+    result: Dict[str, Any] = {}
+    started = time.perf_counter()
+    try:
+        factory = TARGETS[target]
+        # Import modułów celu wykonuje się w fabryce - mierzymy go razem z inicjalizacją,
+        # a osobno sam import pakietu
+        __import__(target)
+        result['import_ms'] = round((time.perf_counter() - started) * 1000, 3)
+
+        init_started = time.perf_counter()
+        analyze = factory()
+        result['init_ms'] = round((time.perf_counter() - init_started) * 1000, 3)
+
+        call_started = time.perf_counter()
+        analyze(sample)
+        result['first_call_ms'] = round((time.perf_counter() - call_started) * 1000, 3)
+        result['total_ms'] = round((time.perf_counter() - started) * 1000, 3)
+
+        from api.prefork import process_memory
+        result['memory'] = process_memory(os.getpid())
+    except Exception as e:
+        result = {'error': f"{type(e).__name__}: {e}"}
+    print(json.dumps(result))
+
+
+def run_target(target: str, jokes: List[str], iterations: int, batch_sizes=BATCH_SIZES) -> Dict[str, Any]:
+    """Pełny benchmark jednego celu"""
+    cold_start = measure_cold_start(target, jokes[0])
+    if 'error' in cold_start:
+        return {'skipped': cold_start['error']}
+
+    analyze = TARGETS[target]()
+    # Rozgrzewka - leniwe struktury spaCy, cache regexów
+    for text in jokes:
+        analyze(text)
+
+    return {
+        'cold_start': {k: v for k, v in cold_start.items() if k != 'memory'},
+        'memory': cold_start.get('memory'),
+        'latency': measure_latency(analyze, jokes, iterations),
+        'throughput': measure_throughput(analyze, jokes, batch_sizes),
+    }
+
+
+def spacy_profiles() -> Dict[str, Any]:
+    """Profile potoku celów: nazwa -> SPACY_NEEDS (None = pełny potok)"""
+    from joke_analyser.analyzer import JokeAnalyzer
+    from humor_features.extractor import HumorFeatureExtractor
+
+    return {
+        'full': None,
+        # Suma profili analizerów - JokeAnalyzer parsuje żart raz z tym profilem
+        'joke_analyser': JokeAnalyzer().spacy_needs,
+        'humor_features': HumorFeatureExtractor.SPACY_NEEDS,
+    }
+
+
+def measure_spacy_profiles(nlp, jokes: List[str], iterations: int, profiles: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Czas parsowania żartu pełnym potokiem i profilami (ms)
+
+    Returns:
+        {profil: {'components', percentyle, 'saved_p50_ms', 'saved_pct'}}
+    """
+    from nlp import parse, pipeline_components
+
+    results: Dict[str, Any] = {}
+    for name, needs in profiles.items():
+        if needs is None:
+            run, components = nlp, list(nlp.pipe_names)
+        else:
+            run = lambda text, needs=needs: parse(nlp, text, needs)
+            selected = pipeline_components(nlp, needs)
+            components = list(nlp.pipe_names if selected is None else selected)
+        for text in jokes:
+            run(text)
+        results[name] = {'components': components, **measure_latency(run, jokes, iterations)}
+
+    full = results.get('full')
+    if full:
+        for name, result in results.items():
+            saved = full['p50_ms'] - result['p50_ms']
+            result['saved_p50_ms'] = round(saved, 3)
+            result['saved_pct'] = round(100 * saved / full['p50_ms'], 1) if full['p50_ms'] else 0.0
+    return results
+
+
+def run_spacy_profiles(jokes: List[str], iterations: int) -> Dict[str, Any]:
+    """measure_spacy_profiles na zainstalowanym polskim modelu"""
+    from nlp import load_spacy_model
+
+    for model_name in ('pl_core_news_lg', 'pl_core_news_sm'):
+        try:
+            nlp = load_spacy_model(model_name)
+        except (OSError, ImportError):
+            continue
+        return {'model': model_name, 'profiles': measure_spacy_profiles(nlp, jokes, iterations, spacy_profiles())}
+    return {'skipped': 'brak polskiego modelu spaCy'}
+
+
+def git_commit() -> Optional[str]:
+    """Skrócony hash bieżącego commita"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, cwd=PROJECT_DIR, check=True
+        ).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Porównaj z poprzednim wynikiem
+
+    Returns:
+        Lista regresji (wzrost p50/p90 latencji lub cold startu, spadek
+        przepustowości o więcej niż threshold, np. 0.2 = 20%)
+    """
+    regressions = []
+    for target, result in current['targets'].items():
+        base = baseline.get('targets', {}).get(target)
+        if not base or 'skipped' in result or 'skipped' in base:
+            continue
+
+        checks = [
+            ('latency p50', result['latency']['p50_ms'], base['latency']['p50_ms'], False),
+            ('latency p90', result['latency']['p90_ms'], base['latency']['p90_ms'], False),
+            ('cold start', result['cold_start']['total_ms'], base['cold_start']['total_ms'], False),
+        ]
+        for size, stats in result['throughput'].items():
+            base_stats = base['throughput'].get(size)
+            if base_stats and stats['jokes_per_s'] and base_stats['jokes_per_s']:
+                checks.append((f"throughput@{size}", stats['jokes_per_s'], base_stats['jokes_per_s'], True))
+
+        for name, value, base_value, higher_is_better in checks:
+            if not base_value:
+                continue
+            change = (value - base_value) / base_value
+            print(f"  {target:<16}{name:<20}{base_value:>12} -> {value:<12}({change:+.1%})")
+            if (-change if higher_is_better else change) > threshold:
+                regressions.append(f"{target}: {name} {base_value} -> {value} ({change:+.1%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark JokeAnalyzer / HumorFeatureExtractor')
+    parser.add_argument('--targets', nargs='+', choices=sorted(TARGETS), default=sorted(TARGETS))
+    parser.add_argument('--dataset', default=DATASET_PATH, help='Dataset żartów (JSON)')
+    parser.add_argument('--iterations', type=int, default=10, help='Powtórzenia każdego żartu dla percentyli')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=list(BATCH_SIZES))
+    parser.add_argument('--output', help='Plik wyniku (domyślnie validation/benchmarks/analysis-<commit>.json)')
+    parser.add_argument('--compare', help='Poprzedni wynik (JSON) do porównania')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Próg regresji (0.2 = 20%%)')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--child-sample', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child(args.child, args.child_sample)
+        return
+
+    jokes = load_jokes(args.dataset)
+    commit = git_commit()
+    results = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'dataset': os.path.relpath(args.dataset, PROJECT_DIR),
+        'jokes': len(jokes),
+        'iterations': args.iterations,
+        'targets': {},
+    }
+
+    for target in args.targets:
+        print(f"⏱️  {target}...", file=sys.stderr)
+        results['targets'][target] = run_target(target, jokes, args.iterations, args.batch_sizes)
+    print("⏱️  spacy_profiles...", file=sys.stderr)
+    results['spacy_profiles'] = run_spacy_profiles(jokes, args.iterations)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"analysis-{commit or 'local'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+
+    print(f"{'cel':<16}{'cold [ms]':>12}{'p50 [ms]':>12}{'p99 [ms]':>12}{'USS [MB]':>12}{'żarty/s':>12}")
+    for target, result in results['targets'].items():
+        if 'skipped' in result:
+            print(f"{target:<16}  pominięty: {result['skipped']}")
+            continue
+        memory = result['memory'] or {}
+        best = max((s['jokes_per_s'] or 0) for s in result['throughput'].values())
+        print(
+            f"{target:<16}{result['cold_start']['total_ms']:>12}{result['latency']['p50_ms']:>12}"
+            f"{result['latency']['p99_ms']:>12}{memory.get('uss_mb', '-'):>12}{best:>12}"
+        )
+
+    profiles = results['spacy_profiles']
+    if 'skipped' in profiles:
+        print(f"spaCy profile: pominięte: {profiles['skipped']}")
+    else:
+        print(f"{'profil spaCy':<16}{'p50 [ms]':>12}{'zysk [ms]':>12}{'zysk [%]':>12}  komponenty")
+        for name, result in profiles['profiles'].items():
+            print(
+                f"{name:<16}{result['p50_ms']:>12}{result['saved_p50_ms']:>12}{result['saved_pct']:>12}"
+                f"  {', '.join(result['components']) or '(tokenizer)'}"
+            )
+    print(f"📄 {output}")
+
+    regressions = []
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"Porównanie z {args.compare} ({baseline.get('commit')}):")
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"❌ {regression}")
+        if not regressions:
+            print("✅ Brak regresji")
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Benchmark czasu startu CLI wywoływanych z PHP (complete, describe, translate)
+
+Każdy skrypt jest uruchamiany bez argumentów (kończy się komunikatem usage,
+bez ładowania modeli) z `python -X importtime`. Mierzymy:
+- import_ms: łączny czas importów samego skryptu (bez `site`)
+- wall_ms: mediana czasu całego procesu (start interpretera + importy + wyjście)
+- heavy: ciężkie biblioteki zaimportowane przy starcie (powinno być pusto)
+
+Wynik jest porównywany z budżetem w scripts/startup_budget.json - przekroczenie
+kończy skrypt kodem 1, więc można go wpiąć w CI / pre-commit.
+
+Użycie:
+    python scripts/benchmark_startup.py
+    python scripts/benchmark_startup.py --runs 10 --json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+from typing import Dict, List, Any
+
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+BUDGET_PATH = os.path.join(PROJECT_DIR, 'scripts', 'startup_budget.json')
+
+# Nazwa -> skrypt CLI (względem katalogu projektu)
+ENTRY_POINTS: Dict[str, str] = {
+    'complete': 'src/ollama/complete.py',
+    'describe': 'src/image/describe.py',
+    'translate': 'src/translation/translate.py',
+}
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """
+    Sparsuj wyjście `-X importtime`
+
+    Returns:
+        Lista {'module', 'self_us', 'cumulative_us', 'depth'} w kolejności zakończenia importu
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            # Nagłówek "self [us] | cumulative | imported package"
+            continue
+        self_us, cumulative_us, name = parts
+        entries.append({
+            'module': name.strip(),
+            'self_us': int(self_us),
+            'cumulative_us': int(cumulative_us),
+            'depth': (len(name) - len(name.lstrip(' ')) - 1) // 2,
+        })
+    return entries
+
+
+def script_imports(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Importy wykonane przez skrypt (wszystko po zakończeniu importu `site`)"""
+    start = 0
+    for index, entry in enumerate(entries):
+        if entry['module'] == 'site' and entry['depth'] == 0:
+            start = index + 1
+    return entries[start:]
+
+
+def measure(script: str, runs: int, heavy_modules: List[str]) -> Dict[str, Any]:
+    """Zmierz start jednego skryptu"""
+    env = dict(os.environ, AI_WORKER_DISABLE='1')
+    command = [sys.executable, '-X', 'importtime', os.path.join(PROJECT_DIR, script)]
+
+    wall_times = []
+    import_times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        completed = subprocess.run(command, env=env, capture_output=True, text=True, cwd=PROJECT_DIR)
+        wall_times.append((time.perf_counter() - started) * 1000)
+
+        imports = script_imports(parse_importtime(completed.stderr))
+        import_times.append(sum(e['cumulative_us'] for e in imports if e['depth'] == 0) / 1000)
+
+    top_level = [e for e in imports if e['depth'] == 0]
+    slowest = sorted(top_level, key=lambda e: e['cumulative_us'], reverse=True)[:5]
+
+    return {
+        'script': script,
+        'import_ms': round(statistics.median(import_times), 2),
+        'wall_ms': round(statistics.median(wall_times), 2),
+        'heavy': sorted({
+            e['module'].split('.')[0] for e in imports
+            if e['module'].split('.')[0] in heavy_modules
+        }),
+        'slowest_imports': [
+            {'module': e['module'], 'cumulative_ms': round(e['cumulative_us'] / 1000, 2)}
+            for e in slowest
+        ],
+    }
+
+
+def check_budget(name: str, result: Dict[str, Any], budget: Dict[str, Any]) -> List[str]:
+    """Zwróć listę przekroczeń budżetu dla skryptu"""
+    violations = []
+    limit = budget.get('import_ms', {}).get(name)
+    if limit is not None and result['import_ms'] > limit:
+        violations.append(f"{name}: import {result['import_ms']}ms > budget {limit}ms")
+    if result['heavy']:
+        violations.append(f"{name}: heavy modules imported at startup: {', '.join(result['heavy'])}")
+    return violations
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark czasu startu CLI')
+    parser.add_argument('--runs', type=int, default=5, help='Liczba uruchomień na skrypt (mediana)')
+    parser.add_argument('--budget', default=BUDGET_PATH, help='Plik z budżetem (JSON)')
+    parser.add_argument('--json', action='store_true', help='Wypisz wynik jako JSON')
+    args = parser.parse_args()
+
+    with open(args.budget, 'r', encoding='utf-8') as f:
+        budget = json.load(f)
+
+    results = {}
+    violations = []
+    for name, script in ENTRY_POINTS.items():
+        results[name] = measure(script, args.runs, budget.get('heavy_modules', []))
+        violations.extend(check_budget(name, results[name], budget))
+
+    if args.json:
+        print(json.dumps({'results': results, 'violations': violations}, indent=2))
+    else:
+        print(f"{'CLI':<12}{'import [ms]':>14}{'budget [ms]':>14}{'wall [ms]':>12}")
+        for name, result in results.items():
+            limit = budget.get('import_ms', {}).get(name, '-')
+            print(f"{name:<12}{result['import_ms']:>14}{limit:>14}{result['wall_ms']:>12}")
+        for violation in violations:
+            print(f"❌ {violation}")
+        if not violations:
+            print("✅ Startup within budget")
+
+    sys.exit(1 if violations else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Test obciążeniowy /ollama/chat, klienta polling i promptów teorii humoru
+
+Domyślnie uruchamia w tle fake Ollama (src/ollama/fake_server.py), więc
+kolejkę (OLLAMA_MAX_CONCURRENT), retry, circuit breaker i cache można
+mierzyć bez GPU. Scenariusze:
+- chat: równoległe POST /ollama/chat do działającego API (--api-url)
+- theories: 9 zapytań na żart (system = prompt teorii z humor_features.prompts)
+  dla żartów z validation/test-waldus-classics.json
+- polling: N instancji PollingClient przeciwko lokalnemu zamiennikowi
+  serwera OVH (/api/ollama/poll, /api/ollama/response); mierzy czas od
+  wystawienia zapytania do otrzymania odpowiedzi
+
+API musi być uruchomione z OLLAMA_BASE_URL wskazującym na fake Ollama:
+    python src/ollama/fake_server.py --port 11435 --token-rate 30 &
+    OLLAMA_BASE_URL=http://127.0.0.1:11435 ./scripts/start-api-production.sh
+    python scripts/load_test.py chat --api-url http://127.0.0.1:5001 --ollama-url http://127.0.0.1:11435
+
+Scenariusz polling nie potrzebuje API (fake Ollama startuje w procesie):
+    python scripts/load_test.py polling --requests 50 --clients 2 --token-rate 100
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import random
+import logging
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Any, Optional, Tuple
+
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(PROJECT_DIR, 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import requests
+
+from benchmark_analysis import load_jokes, percentiles
+from ollama.fake_server import FakeOllamaServer, FakeOllamaSettings
+
+
+def run_load(
+    send: Callable[[Any], Tuple[int, Optional[str]]],
+    items: List[Any],
+    concurrency: int
+) -> Dict[str, Any]:
+    """
+    Wyślij wszystkie zapytania z `concurrency` wątków
+
+    Args:
+        send: Funkcja wysyłająca jedno zapytanie, zwraca (status HTTP, błąd)
+        items: Dane zapytań
+        concurrency: Liczba równoległych klientów
+
+    Returns:
+        Percentyle latencji (ms), przepustowość i liczniki statusów
+    """
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    errors: Dict[str, int] = {}
+    lock = threading.Lock()
+
+    def worker(item):
+        started = time.perf_counter()
+        try:
+            status, error = send(item)
+        except requests.exceptions.RequestException as e:
+            status, error = 0, type(e).__name__
+        elapsed = (time.perf_counter() - started) * 1000
+        with lock:
+            latencies.append(elapsed)
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+            if error:
+                errors[error] = errors.get(error, 0) + 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(worker, items))
+    duration = time.perf_counter() - started
+
+    return {
+        'requests': len(items),
+        'concurrency': concurrency,
+        'duration_s': round(duration, 3),
+        'throughput_rps': round(len(items) / duration, 2) if duration > 0 else None,
+        'latency': percentiles(latencies) if latencies else None,
+        'statuses': statuses,
+        'errors': errors,
+    }
+
+
+def chat_sender(api_url: str, model: Optional[str], timeout: float) -> Callable:
+    """POST /ollama/chat (format Flask/legacy - pole user)"""
+    session = requests.Session()
+
+    def send(payload: Dict[str, Any]) -> Tuple[int, Optional[str]]:
+        body = dict(payload, model=model) if model else payload
+        response = session.post(f"{api_url.rstrip('/')}/ollama/chat", json=body, timeout=timeout)
+        error = None
+        if response.status_code != 200:
+            try:
+                error = str(response.json().get('error') or response.json().get('detail'))[:80]
+            except ValueError:
+                error = f"HTTP {response.status_code}"
+        return response.status_code, error
+
+    return send
+
+
+def chat_payloads(count: int, temperature: float) -> List[Dict[str, Any]]:
+    """Proste zapytania chat (różne prompty - bez trafień w cache przy temperature=0)"""
+    jokes = load_jokes()
+    return [
+        {'user': f"Oceń żart #{i}: {jokes[i % len(jokes)]}", 'temperature': temperature, 'max_tokens': 256}
+        for i in range(count)
+    ]
+
+
+def theory_payloads(joke_count: int, temperature: float) -> List[Dict[str, Any]]:
+    """9 zapytań (po jednym na teorię) dla każdego żartu"""
+    from humor_features.prompts import THEORY_PROMPTS
+
+    jokes = load_jokes()[:joke_count]
+    return [
+        {'system': prompt, 'user': joke, 'temperature': temperature, 'max_tokens': 512}
+        for joke in jokes
+        for prompt in THEORY_PROMPTS.values()
+    ]
+
+
+class FakePollingServer(ThreadingHTTPServer):
+    """Zamiennik serwera OVH dla PollingClient: kolejka zapytań i zebrane odpowiedzi"""
+
+    daemon_threads = True
+
+    def __init__(self, address=('127.0.0.1', 0)):
+        self.pending: 'queue.Queue[Dict[str, Any]]' = queue.Queue()
+        self.issued_at: Dict[str, float] = {}
+        self.latencies: List[float] = []
+        self.failures = 0
+        self.done = threading.Event()
+        self.expected = 0
+        self._lock = threading.Lock()
+        super().__init__(address, FakePollingHandler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def enqueue(self, requests_data: List[Dict[str, Any]]):
+        self.expected += len(requests_data)
+        for request in requests_data:
+            self.pending.put(request)
+
+    def mark_issued(self, request_id: str):
+        with self._lock:
+            self.issued_at[request_id] = time.perf_counter()
+
+    def record_response(self, response: Dict[str, Any]):
+        with self._lock:
+            issued = self.issued_at.pop(response.get('id'), None)
+            if issued is not None:
+                self.latencies.append((time.perf_counter() - issued) * 1000)
+            if not response.get('success'):
+                self.failures += 1
+            if len(self.latencies) >= self.expected:
+                self.done.set()
+
+
+class FakePollingHandler(BaseHTTPRequestHandler):
+    """/api/ollama/poll i /api/ollama/response jak na serwerze OVH"""
+
+    server: FakePollingServer
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path != '/api/ollama/poll':
+            self._json(404, {'error': 'not found'})
+            return
+        try:
+            request = self.server.pending.get_nowait()
+        except queue.Empty:
+            self.send_response(204)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.server.mark_issued(request['id'])
+        self._json(200, {'has_request': True, 'request': request})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            self.server.record_response(json.loads(self.rfile.read(length) or b'{}'))
+        except json.JSONDecodeError:
+            self._json(400, {'error': 'invalid JSON'})
+            return
+        self._json(200, {'success': True})
+
+    def _json(self, status: int, data: Dict[str, Any]):
+        payload = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def run_polling(ollama_url: str, request_count: int, clients: int, timeout: float) -> Dict[str, Any]:
+    """N klientów PollingClient obsługuje request_count zapytań z kolejki"""
+    # PollingClient tworzy OllamaClient() z adresem z OLLAMA_URL
+    os.environ['OLLAMA_URL'] = ollama_url
+    from polling.client import PollingClient
+
+    server = FakePollingServer()
+    threading.Thread(target=server.serve_forever, name='fake-ovh', daemon=True).start()
+
+    jokes = load_jokes()
+    server.enqueue([
+        {
+            'id': f"load-{i}",
+            'prompt': jokes[i % len(jokes)],
+            'system_prompt': 'Oceń żart',
+            'temperature': 0.7,
+            'max_tokens': 256,
+        }
+        for i in range(request_count)
+    ])
+
+    polling_clients = []
+    started = time.perf_counter()
+    for index in range(clients):
+        client = PollingClient(server.url, poll_interval=0)
+        polling_clients.append(client)
+        threading.Thread(target=client.run, name=f"polling-{index}", daemon=True).start()
+
+    completed = server.done.wait(timeout)
+    duration = time.perf_counter() - started
+    for client in polling_clients:
+        client.running = False
+    server.shutdown()
+
+    return {
+        'requests': request_count,
+        'clients': clients,
+        'completed': len(server.latencies),
+        'timed_out': not completed,
+        'failures': server.failures,
+        'duration_s': round(duration, 3),
+        'throughput_rps': round(len(server.latencies) / duration, 2) if duration > 0 else None,
+        'latency': percentiles(server.latencies) if server.latencies else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Test obciążeniowy z fake Ollama')
+    parser.add_argument('scenario', choices=['chat', 'theories', 'polling'])
+    parser.add_argument('--api-url', default='http://127.0.0.1:5001', help='URL API (chat, theories)')
+    parser.add_argument('--ollama-url', help='Działający (fake) Ollama; domyślnie start w tym procesie')
+    parser.add_argument('--requests', type=int, default=100, help='Liczba zapytań (chat, polling)')
+    parser.add_argument('--jokes', type=int, default=5, help='Liczba żartów (theories)')
+    parser.add_argument('--concurrency', type=int, default=8, help='Równoległe zapytania do API')
+    parser.add_argument('--clients', type=int, default=1, help='Liczba klientów polling')
+    parser.add_argument('--temperature', type=float, default=0.7, help='0 = zapytania cache\'owalne')
+    parser.add_argument('--model', help='Model Ollama (domyślnie z konfiguracji API)')
+    parser.add_argument('--timeout', type=float, default=300.0, help='Timeout zapytania / scenariusza (s)')
+    parser.add_argument('--json', action='store_true', help='Wypisz wynik jako JSON')
+    # Parametry fake Ollama startowanego w procesie
+    parser.add_argument('--ollama-port', type=int, default=11435)
+    parser.add_argument('--token-rate', type=float, default=50.0)
+    parser.add_argument('--prompt-eval-rate', type=float, default=500.0)
+    parser.add_argument('--response-tokens', type=int, default=64)
+    parser.add_argument('--max-concurrent', type=int, default=1)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--error-status', type=int, default=503)
+    args = parser.parse_args()
+
+    # Log każdego zapytania OllamaClient (polling) zagłusza wynik
+    logging.getLogger('ollama').setLevel(logging.WARNING)
+
+    fake = None
+    ollama_url = args.ollama_url
+    if ollama_url is None:
+        fake = FakeOllamaServer(('127.0.0.1', args.ollama_port), FakeOllamaSettings(
+            token_rate=args.token_rate,
+            prompt_eval_rate=args.prompt_eval_rate,
+            response_tokens=args.response_tokens,
+            max_concurrent=args.max_concurrent,
+            error_rate=args.error_rate,
+            error_status=args.error_status,
+        ))
+        fake.start_in_thread()
+        ollama_url = fake.url
+        print(f"🤖 Fake Ollama: {ollama_url}", file=sys.stderr)
+
+    if args.scenario == 'polling':
+        result = run_polling(ollama_url, args.requests, args.clients, args.timeout)
+    else:
+        if args.scenario == 'chat':
+            payloads = chat_payloads(args.requests, args.temperature)
+        else:
+            payloads = theory_payloads(args.jokes, args.temperature)
+        random.shuffle(payloads)
+        result = run_load(chat_sender(args.api_url, args.model, args.timeout), payloads, args.concurrency)
+
+    try:
+        result['ollama'] = requests.get(f"{ollama_url}/fake/stats", timeout=5).json()
+    except (requests.exceptions.RequestException, ValueError):
+        result['ollama'] = None
+
+    if fake is not None:
+        fake.shutdown()
+
+    if args.json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+        return
+
+    latency = result.get('latency') or {}
+    print(f"Scenariusz: {args.scenario}")
+    print(f"  zapytania:     {result['requests']} w {result['duration_s']}s ({result['throughput_rps']} req/s)")
+    print(f"  latencja [ms]: p50={latency.get('p50_ms')} p90={latency.get('p90_ms')} p99={latency.get('p99_ms')}")
+    if 'statuses' in result:
+        print(f"  statusy:       {result['statuses']}")
+        for error, count in result['errors'].items():
+            print(f"  ❌ {count}x {error}")
+    else:
+        print(f"  obsłużone:     {result['completed']} (błędy: {result['failures']}, timeout: {result['timed_out']})")
+    if result['ollama']:
+        stats = result['ollama']
+        print(
+            f"  fake ollama:   {stats['requests']} zapytań, {stats['errors']} błędów, "
+            f"maks. równolegle {stats['max_in_flight']}"
+        )
+
+
+if __name__ == '__main__':
+    main()
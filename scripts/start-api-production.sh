@@ -0,0 +1,112 @@
+#!/bin/bash
+# Produkcyjny serwer API: gunicorn + uvicorn workers (FastAPI, api.main:app)
+#
+# Użycie:
+#   ./scripts/start-api-production.sh [start]   # uruchom w tle
+#   ./scripts/start-api-production.sh reload    # graceful reload workerów (SIGHUP)
+#   ./scripts/start-api-production.sh upgrade   # nowy kod bez przerwy (SIGUSR2 + SIGTERM starego mastera)
+#   ./scripts/start-api-production.sh stop      # graceful stop (SIGTERM)
+#   ./scripts/start-api-production.sh status
+#
+# Zmienne: HOST, PORT, WORKERS, PRELOAD_APP, GRACEFUL_TIMEOUT (patrz src/api/config.py)
+
+set -e
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+PROJECT_DIR="$(cd "$SCRIPT_DIR/.." && pwd)"
+LOG_DIR="$PROJECT_DIR/logs"
+PIDFILE="${PIDFILE:-$PROJECT_DIR/logs/api-server.pid}"
+
+mkdir -p "$LOG_DIR"
+
+cd "$PROJECT_DIR"
+
+# Aktywuj virtual environment jeśli istnieje
+if [ -d "$PROJECT_DIR/venv" ]; then
+    source "$PROJECT_DIR/venv/bin/activate"
+fi
+
+export PYTHONPATH="$PROJECT_DIR/src:$PYTHONPATH"
+export PIDFILE
+
+master_pid() {
+    if [ -f "$PIDFILE" ] && kill -0 "$(cat "$PIDFILE")" 2>/dev/null; then
+        cat "$PIDFILE"
+    fi
+}
+
+case "${1:-start}" in
+    start)
+        PID="$(master_pid)"
+        if [ -n "$PID" ]; then
+            echo "ℹ️  Serwer API już działa (PID: $PID) - użyj reload lub upgrade"
+            exit 0
+        fi
+
+        # Metryki Prometheus zbierane ze wszystkich workerów (/metrics)
+        export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-$LOG_DIR/prometheus-multiproc}"
+        rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+        mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+
+        if python -c "import gunicorn" 2>/dev/null; then
+            echo "🚀 Uruchamiam gunicorn (${WORKERS:-2} workers) na ${HOST:-127.0.0.1}:${PORT:-5001}..."
+            nohup gunicorn -c "$PROJECT_DIR/src/api/gunicorn_conf.py" api.main:app \
+                >> "$LOG_DIR/api-server.log" 2>&1 &
+        else
+            # Fallback bez gunicorn: uvicorn --workers (bez preload i graceful reload)
+            echo "⚠️  Brak gunicorn - uruchamiam uvicorn --workers ${WORKERS:-2}"
+            nohup uvicorn api.main:app --host "${HOST:-127.0.0.1}" --port "${PORT:-5001}" \
+                --workers "${WORKERS:-2}" --timeout-graceful-shutdown "${GRACEFUL_TIMEOUT:-30}" \
+                >> "$LOG_DIR/api-server.log" 2>&1 &
+            echo $! > "$PIDFILE"
+        fi
+
+        echo "✅ Serwer API uruchomiony"
+        echo "📄 Logi: $LOG_DIR/api-server.log"
+        ;;
+    reload)
+        PID="$(master_pid)"
+        [ -z "$PID" ] && { echo "❌ Serwer API nie działa"; exit 1; }
+        kill -HUP "$PID"
+        echo "🔄 Graceful reload workerów (PID mastera: $PID)"
+        ;;
+    upgrade)
+        PID="$(master_pid)"
+        [ -z "$PID" ] && { echo "❌ Serwer API nie działa"; exit 1; }
+        # Nowy master z nowym kodem (i nowo załadowanymi modelami) obok starego
+        kill -USR2 "$PID"
+        # gunicorn przenosi PID starego mastera do $PIDFILE.oldbin i zapisuje nowy w $PIDFILE
+        for _ in $(seq 1 120); do
+            NEW_PID="$(cat "$PIDFILE" 2>/dev/null || true)"
+            if [ -n "$NEW_PID" ] && [ "$NEW_PID" != "$PID" ]; then
+                break
+            fi
+            sleep 1
+        done
+        sleep "${UPGRADE_WARMUP:-5}"
+        # Stary master kończy rozpoczęte zapytania i wychodzi
+        kill -TERM "$PID"
+        echo "⬆️  Upgrade zakończony (stary master: $PID)"
+        ;;
+    stop)
+        PID="$(master_pid)"
+        [ -z "$PID" ] && { echo "ℹ️  Serwer API nie działa"; exit 0; }
+        kill -TERM "$PID"
+        echo "🛑 Zatrzymuję serwer API (PID: $PID)"
+        ;;
+    status)
+        PID="$(master_pid)"
+        if [ -n "$PID" ]; then
+            echo "✅ Serwer API działa (PID mastera: $PID)"
+            # Pamięć mastera i workerów (USS = prywatna, PSS = udział we współdzielonej)
+            python "$PROJECT_DIR/src/api/prefork.py" "$PID" || true
+        else
+            echo "❌ Serwer API nie działa"
+            exit 1
+        fi
+        ;;
+    *)
+        echo "Użycie: $0 {start|reload|upgrade|stop|status}"
+        exit 1
+        ;;
+esac
@@ -1,9 +1,15 @@
 """
 API server module
-Flask API server dla lokalnych usług ML/LLM
+FastAPI server dla lokalnych usług ML/LLM (api.main),
+legacy Flask server w api.server
 """
 
-from .server import app
-
 __all__ = ['app']
 
+
+def __getattr__(name):
+    # Import leniwy - `from api.config import config` nie buduje całej aplikacji
+    if name == 'app':
+        from .main import app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -16,6 +16,18 @@ class ServiceConfig(BaseSettings):
     PORT: int = 5001
     DEBUG: bool = False
     
+    # Produkcja (gunicorn + uvicorn workers, patrz src/api/gunicorn_conf.py)
+    WORKERS: int = 2  # Liczba procesów; limity OLLAMA_MAX_CONCURRENT są per proces
+    PRELOAD_APP: bool = True  # Załaduj aplikację i modele w masterze (współdzielone przez fork)
+    GC_FREEZE: bool = True  # gc.freeze() przed fork - GC nie kopiuje stron modeli (patrz api/prefork.py)
+    GRACEFUL_TIMEOUT: int = 30  # Czas na dokończenie zapytań przy reload/stop (s)
+    WORKER_TIMEOUT: int = 300  # Restart workera, który nie odpowiada (s)
+    
+    # Endpointy /describe, /ollama/chat, /ollama/batch w formacie Flask (server.py) zamiast
+    # natywnych (inne błędy i domyślne wartości) - tylko przy zastępowaniu serwera Flask
+    LEGACY_API_COMPAT: bool = False
+    LEGACY_DESCRIBE_ALLOW_FILES: bool = False  # Ścieżki lokalnych plików w image_url (jak Flask)
+    
     # Włączanie/wyłączanie modułów
     ENABLE_IMAGE_DESCRIPTION: bool = True
     ENABLE_OLLAMA: bool = True
@@ -30,6 +42,15 @@ class ServiceConfig(BaseSettings):
     # Ollama
     OLLAMA_BASE_URL: str = "http://localhost:11434"
     OLLAMA_DEFAULT_MODEL: str = "llama2"
+    OLLAMA_MAX_CONCURRENT: int = 2  # Równoległe generacje (wszystkie modele)
+    OLLAMA_MAX_CONCURRENT_PER_MODEL: int = 1
+    OLLAMA_MAX_QUEUE_SIZE: int = 32  # Powyżej - HTTP 429
+    OLLAMA_QUEUE_DEADLINE: float = 120.0  # Maks. czas oczekiwania w kolejce (s)
+    OLLAMA_CACHE_ENABLED: bool = True  # Cache odpowiedzi dla temperature=0
+    OLLAMA_CACHE_MAX_ENTRIES: int = 1024
+    OLLAMA_CACHE_PATH: Optional[str] = None  # Plik SQLite (None = tylko pamięć)
+    OLLAMA_BATCH_MAX_ITEMS: int = 100  # Maks. liczba zapytań w /ollama/batch
+    OLLAMA_BATCH_PARALLELISM: int = 4  # Domyślna równoległość /ollama/batch (maks. OLLAMA_MAX_CONCURRENT)
     
     # Joker (Bielik 7B)
     JOKER_MODEL_PATH: Optional[str] = None  # Ścieżka do modelu lokalnego
@@ -40,6 +61,23 @@ class ServiceConfig(BaseSettings):
     # Joke Analyser
     JOKE_ANALYSER_MODEL_NAME: str = "allegro/herbert-base-cased"
     JOKE_ANALYSER_USE_GPU: bool = False  # CPU wystarczy
+    JOKE_ANALYSER_PROFILE_SAMPLE_RATE: float = 0.0  # Ułamek zapytań /analyze profilowanych cProfile (0.01 = 1%)
+    JOKE_ANALYSER_PROFILE_DIR: str = "logs/profiles"  # Pliki .prof (python -m pstats <plik>)
+    JOKE_ANALYSER_SIMILAR_INDEX: Optional[str] = None  # SQLite indeksu prawie-duplikatów (None = tylko pamięć)
+    JOKE_ANALYSER_SIMILAR_THRESHOLD: float = 0.8  # Minimalne podobieństwo (Jaccard shingli) w /similar-text
+    JOKE_ANALYSER_EMBEDDING_INDEX_DIR: Optional[str] = None  # Katalog indeksu k-NN dla /similar (None = wyłączony)
+    JOKE_ANALYSER_EMBEDDING_ENCODER: str = "spacy"  # spacy (wektory pl_core_news_lg) albo herbert (JOKE_ANALYSER_MODEL_NAME)
+    JOKE_ANALYSER_EMBEDDING_NPROBE: int = 8  # Przeszukiwane klastry IVF na zapytanie
+    JOKE_ANALYSER_EMBEDDING_TRAIN_SIZE: int = 20000  # Od tylu żartów indeks używa IVF zamiast przeszukiwania płaskiego
+    JOKE_ANALYSER_EMBEDDING_BACKEND: str = "torch"  # HerBERT: torch, int8 (kwantyzacja dynamiczna, CPU), onnx
+    JOKE_ANALYSER_ONNX_PATH: Optional[str] = None  # Model ONNX (python -m nlp.embeddings export-onnx <plik>)
+    JOKE_ANALYSER_EMBEDDING_BATCH_SIZE: int = 32  # Teksty w jednym przebiegu HerBERT
+    JOKE_ANALYSER_EMBEDDING_BATCH_WAIT_MS: float = 5.0  # Zbieranie równoległych zapytań w jedną paczkę (0 = wyłączone)
+    JOKE_ANALYSER_EMBEDDING_CACHE_DIR: Optional[str] = None  # Cache embeddingów (memmap, wspólny dla workerów)
+    
+    # Słowniki analizerów (joke_analyser, humor_features)
+    LEXICON_DIR: Optional[str] = None  # Katalog plików JSON (None = src/lexicon/data)
+    LEXICON_RELOAD_INTERVAL: float = 5.0  # Co ile sekund sprawdzać zmiany plików (0 = bez przeładowania)
     
     class Config:
         env_file = ".env"
@@ -0,0 +1,66 @@
+"""
+Konfiguracja gunicorn dla produkcyjnego serwera FastAPI (api.main:app)
+
+Uruchomienie (patrz scripts/start-api-production.sh):
+    gunicorn -c src/api/gunicorn_conf.py api.main:app
+
+- kilka procesów z uvicorn.workers.UvicornWorker (WORKERS)
+- preload_app: aplikacja i modele (BLIP) ładowane raz w masterze,
+  workery dostają je przez fork (copy-on-write) zamiast ładować każdy osobno
+- gc.freeze() przed fork (GC_FREEZE): GC workerów nie dotyka obiektów
+  mastera, więc strony z modelami pozostają współdzielone (api/prefork.py)
+- graceful reload: SIGHUP do mastera - nowe workery, stare kończą
+  rozpoczęte zapytania w ciągu GRACEFUL_TIMEOUT sekund
+
+Uwaga: przy preload_app=True SIGHUP nie wczytuje nowego kodu (jest już
+w masterze) - po aktualizacji kodu użyj `start-api-production.sh upgrade`
+(SIGUSR2 + zamknięcie starego mastera).
+"""
+
+import os
+import sys
+
+# Dodaj ścieżkę do src do PYTHONPATH
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from api.config import config
+from api.prefork import freeze_before_fork
+from metrics import mark_process_dead
+
+bind = os.getenv('BIND', f"{config.HOST}:{config.PORT}")
+workers = config.WORKERS
+worker_class = 'uvicorn.workers.UvicornWorker'
+preload_app = config.PRELOAD_APP
+
+# Długie generacje Ollama / BLIP - nie zabijaj workera po 30 s (domyślne gunicorn)
+timeout = config.WORKER_TIMEOUT
+graceful_timeout = config.GRACEFUL_TIMEOUT
+keepalive = 5
+
+pidfile = os.getenv('PIDFILE')
+accesslog = '-'
+errorlog = '-'
+loglevel = 'debug' if config.DEBUG else 'info'
+
+
+def when_ready(server):
+    server.log.info(
+        f"{config.SERVICE_NAME} ready: {workers} workers on {bind} "
+        f"(preload_app={preload_app})"
+    )
+
+
+def pre_fork(server, worker):
+    if preload_app and config.GC_FREEZE:
+        freeze_before_fork()
+
+
+def post_fork(server, worker):
+    # Dla /health/memory - raport pamięci wszystkich workerów tego mastera
+    os.environ['API_MASTER_PID'] = str(server.pid)
+    server.log.info(f"Worker {worker.pid} started")
+
+
+def child_exit(server, worker):
+    # Metryki Prometheus w trybie multiprocess (PROMETHEUS_MULTIPROC_DIR)
+    mark_process_dead(worker.pid)
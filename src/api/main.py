@@ -4,10 +4,11 @@ FastAPI server dla ai-local-core
 Modularna architektura z możliwością włączania/wyłączania modułów
 """
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 import logging
+import time
 import sys
 import os
 
@@ -16,6 +17,8 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from api.config import config
 from api.dependencies import get_logger
+from metrics import observe_request, render_metrics
+from lexicon import lexicons
 
 # Setup logging
 logging.basicConfig(
@@ -24,6 +27,9 @@ logging.basicConfig(
 )
 logger = get_logger(__name__)
 
+# Słowniki analizerów - przeładowywane w każdym workerze po zmianie plików
+lexicons.configure(config.LEXICON_DIR, config.LEXICON_RELOAD_INTERVAL)
+
 # Inicjalizacja FastAPI
 app = FastAPI(
     title=config.SERVICE_NAME,
@@ -43,6 +49,44 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def request_metrics(request: Request, call_next):
+    """Latencja zapytań per szablon ścieżki (np. /ollama/chat) do /metrics"""
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        # Dla odpowiedzi streamowanych (/ollama/batch) to czas do pierwszego bajtu
+        observe_request(
+            request.method,
+            _route_template(request.scope),
+            status_code,
+            time.perf_counter() - started
+        )
+
+
+def _route_template(scope: dict) -> str:
+    """Szablon ścieżki z prefiksem routera, np. /ollama/chat ('unmatched' dla 404)"""
+    route = scope.get('route')
+    if route is None:
+        return 'unmatched'
+    # Część wersji FastAPI trzyma w route.path ścieżkę bez prefiksu include_router
+    segments = scope['path'].rstrip('/').split('/')
+    template_segments = route.path.rstrip('/').split('/')
+    prefix = '/'.join(segments[:max(1, len(segments) - len(template_segments) + 1)])
+    return prefix + route.path
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Metryki Prometheus (latencja zapytań i etapów przetwarzania)"""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
 # Health check
 @app.get("/health")
 async def health():
@@ -54,10 +98,35 @@ async def health():
     }
 
 
+@app.get("/health/memory")
+async def health_memory():
+    """
+    Pamięć procesu (RSS/PSS/USS/shared w MB) i - pod gunicorn - wszystkich workerów
+
+    USS to pamięć prywatna workera; przy pre-fork z gc.freeze() modele
+    pozostają we współdzielonej części (patrz api/prefork.py).
+    """
+    import gc
+    from api.prefork import process_memory, memory_report
+    
+    master_pid = os.getenv('API_MASTER_PID')
+    return {
+        "pid": os.getpid(),
+        "memory": process_memory(os.getpid()),
+        "gc_frozen_objects": gc.get_freeze_count(),
+        "server": memory_report(int(master_pid)) if master_pid else None
+    }
+
+
 # Warunkowe włączanie modułów
+# Endpointy w formacie Flask (src/api/server.py) tylko przy LEGACY_API_COMPAT=true - są
+# rejestrowane przed natywnymi, więc dla wspólnych ścieżek (/describe, /ollama/chat,
+# /ollama/batch) zastępują natywne (walidację Pydantic i domyślne wartości)
 if config.ENABLE_IMAGE_DESCRIPTION:
     try:
-        from modules.image.router import router as image_router
+        from modules.image.router import router as image_router, legacy_router as image_legacy_router
+        if config.LEGACY_API_COMPAT:
+            app.include_router(image_legacy_router, tags=["Image"])
         app.include_router(image_router, prefix="/describe", tags=["Image"])
         logger.info("✅ Moduł Image Description włączony")
     except Exception as e:
@@ -65,7 +134,9 @@ if config.ENABLE_IMAGE_DESCRIPTION:
 
 if config.ENABLE_OLLAMA:
     try:
-        from modules.ollama.router import router as ollama_router
+        from modules.ollama.router import router as ollama_router, legacy_router as ollama_legacy_router
+        if config.LEGACY_API_COMPAT:
+            app.include_router(ollama_legacy_router, prefix="/ollama", tags=["Ollama"])
         app.include_router(ollama_router, prefix="/ollama", tags=["Ollama"])
         logger.info("✅ Moduł Ollama włączony")
     except Exception as e:
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Pre-fork: współdzielenie modeli między workerami (copy-on-write)
+
+Z preload_app (gunicorn_conf.py) aplikacja i modele (BLIP, spaCy, analizery)
+są ładowane raz w masterze, a workery dostają je przez fork(). Strony pamięci
+pozostają współdzielone dopóki nikt do nich nie pisze - ale zwykły GC Pythona
+pisze: każde przejście kolektora aktualizuje nagłówki obiektów (gc refs),
+więc po kilku minutach każdy worker ma własną kopię. Dlatego przed fork:
+- rozgrzewamy modele (leniwie alokowane struktury powstają w masterze),
+- gc.freeze() przenosi wszystkie obiekty do generacji permanentnej,
+  której GC w workerach nie przegląda.
+
+memory_report() pokazuje ile pamięci procesu jest unikalne (USS) a ile
+współdzielone (PSS/shared) - z /proc/<pid>/smaps_rollup (Linux).
+
+Użycie (raport dla działającego serwera):
+    python src/api/prefork.py <PID mastera gunicorn>
+"""
+
+import gc
+import os
+import sys
+import logging
+from typing import Dict, List, Optional, Any
+
+logger = logging.getLogger(__name__)
+
+_frozen = False
+
+
+def warm_up_models():
+    """Rozgrzej załadowane modele spaCy (w masterze, przed fork)"""
+    try:
+        from nlp import warm_up
+        warm_up()
+    except Exception as e:
+        logger.warning(f"Model warm-up failed: {e}")
+
+
+def freeze_before_fork():
+    """
+    Przygotuj mastera do fork()
+
+    Przy pierwszym wywołaniu rozgrzewa modele i sprząta śmieci z ładowania
+    (gc.collect), żeby nie zamrozić ich na stałe. Kolejne wywołania (restart
+    workera) tylko zamrażają obiekty utworzone od tego czasu.
+    """
+    global _frozen
+    if not _frozen:
+        warm_up_models()
+        gc.collect()
+        _frozen = True
+    gc.freeze()
+
+
+def process_memory(pid: int) -> Optional[Dict[str, float]]:
+    """
+    Pamięć procesu w MB: rss, pss, uss (prywatna), shared
+
+    Returns:
+        None gdy /proc/<pid>/smaps_rollup nie jest dostępny (np. macOS)
+    """
+    try:
+        with open(f'/proc/{pid}/smaps_rollup', 'r') as f:
+            return parse_smaps_rollup(f.read())
+    except OSError:
+        return None
+
+
+def parse_smaps_rollup(content: str) -> Dict[str, float]:
+    """Sparsuj /proc/<pid>/smaps_rollup (wartości w kB) do MB"""
+    values: Dict[str, int] = {}
+    for line in content.splitlines():
+        parts = line.split()
+        if len(parts) >= 2 and parts[0].endswith(':') and parts[1].isdigit():
+            values[parts[0][:-1]] = int(parts[1])
+
+    def mb(*keys: str) -> float:
+        return round(sum(values.get(key, 0) for key in keys) / 1024, 1)
+
+    return {
+        'rss_mb': mb('Rss'),
+        'pss_mb': mb('Pss'),
+        'uss_mb': mb('Private_Clean', 'Private_Dirty'),
+        'shared_mb': mb('Shared_Clean', 'Shared_Dirty'),
+    }
+
+
+def child_pids(pid: int) -> List[int]:
+    """PID-y procesów potomnych (workerów)"""
+    try:
+        with open(f'/proc/{pid}/task/{pid}/children', 'r') as f:
+            return [int(child) for child in f.read().split()]
+    except OSError:
+        pass
+
+    # Jądro bez CONFIG_PROC_CHILDREN - przejrzyj /proc
+    children = []
+    for entry in os.listdir('/proc') if os.path.isdir('/proc') else []:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'r') as f:
+                stat = f.read()
+            # Pole 4 (ppid) po nazwie procesu w nawiasach
+            if int(stat.rsplit(')', 1)[1].split()[1]) == pid:
+                children.append(int(entry))
+        except (OSError, IndexError, ValueError):
+            continue
+    return sorted(children)
+
+
+def memory_report(master_pid: int) -> Dict[str, Any]:
+    """
+    Raport pamięci mastera i workerów
+
+    Suma PSS to realne zużycie RAM przez cały serwer; USS workera to ile
+    pamięci zwolni się po jego zamknięciu (im mniej, tym lepiej działa CoW).
+    """
+    workers = {pid: process_memory(pid) for pid in child_pids(master_pid)}
+    workers = {pid: memory for pid, memory in workers.items() if memory is not None}
+    master = process_memory(master_pid)
+
+    processes = list(workers.values()) + ([master] if master else [])
+    return {
+        'master_pid': master_pid,
+        'master': master,
+        'workers': {str(pid): memory for pid, memory in workers.items()},
+        'total_pss_mb': round(sum(p['pss_mb'] for p in processes), 1),
+        'total_rss_mb': round(sum(p['rss_mb'] for p in processes), 1),
+        'worker_uss_avg_mb': round(
+            sum(w['uss_mb'] for w in workers.values()) / len(workers), 1
+        ) if workers else None,
+    }
+
+
+def main():
+    if len(sys.argv) < 2 or not sys.argv[1].isdigit():
+        print("Użycie: python src/api/prefork.py <PID mastera>", file=sys.stderr)
+        sys.exit(1)
+
+    report = memory_report(int(sys.argv[1]))
+    if report['master'] is None:
+        print("❌ Brak danych /proc/<pid>/smaps_rollup (wymagany Linux)", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"{'proces':<16}{'RSS [MB]':>12}{'PSS [MB]':>12}{'USS [MB]':>12}{'shared [MB]':>14}")
+    rows = [('master', report['master'])] + [
+        (f"worker {pid}", memory) for pid, memory in report['workers'].items()
+    ]
+    for name, memory in rows:
+        print(
+            f"{name:<16}{memory['rss_mb']:>12}{memory['pss_mb']:>12}"
+            f"{memory['uss_mb']:>12}{memory['shared_mb']:>14}"
+        )
+    print(f"Suma PSS: {report['total_pss_mb']} MB (suma RSS: {report['total_rss_mb']} MB)")
+
+
+if __name__ == '__main__':
+    main()
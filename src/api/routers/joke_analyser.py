@@ -2,18 +2,73 @@
 FastAPI router dla AIJokeAnalyzer
 """
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from api.config import config
 from joke_analyser.analyzer import JokeAnalyzer
-from joke_analyser.models import AnalyzeRequest, AnalyzeResponse
+from joke_analyser.engine import JokeEngine, AnalyzeWithFeaturesResponse
+from joke_analyser.models import (
+    AnalyzeRequest, AnalyzeResponse, SimilarTextRequest, SimilarTextMatch, SimilarTextResponse,
+    SimilarRequest, SimilarMatch, SimilarResponse
+)
+from joke_analyser.near_duplicates import NearDuplicateIndex
+from joke_analyser.result_store import joke_hash
+from joke_analyser.similar import SimilarJokes, encoder_from_config
+from humor_features.extractor import HumorFeatureExtractor
+from metrics import SampledProfiler
+from lexicon import lexicons
 import logging
+import sqlite3
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 # Initialize analyzer (singleton)
 joke_analyzer = JokeAnalyzer()
+# Tryb lite (bez spaCy) - nie ładuje modeli, więc koszt drugiej instancji jest pomijalny
+lite_analyzer = JokeAnalyzer(lite=True)
 
+# Oceny + features z jednego parsowania (model spaCy współdzielony - nlp.load_spacy_model)
+try:
+    engine = JokeEngine(joke_analyzer, HumorFeatureExtractor())
+except RuntimeError as e:
+    engine = None
+    logger.warning(f"JokeEngine nie został zainicjalizowany: {e}")
 
-@router.post("/analyze", response_model=AnalyzeResponse, tags=["joke-analyser"])
+# Indeks prawie-duplikatów (MinHash/LSH) dla /similar-text
+try:
+    similar_index = NearDuplicateIndex(
+        config.JOKE_ANALYSER_SIMILAR_INDEX, threshold=config.JOKE_ANALYSER_SIMILAR_THRESHOLD
+    )
+except (ValueError, OSError, sqlite3.Error) as e:
+    similar_index = None
+    logger.warning(f"Indeks prawie-duplikatów nie został zainicjalizowany: {e}")
+
+# Indeks k-NN embeddingów żartów dla /similar (wyłączony bez JOKE_ANALYSER_EMBEDDING_INDEX_DIR)
+similar_jokes = None
+if config.JOKE_ANALYSER_EMBEDDING_INDEX_DIR:
+    try:
+        similar_jokes = SimilarJokes(
+            encoder_from_config(config, nlp=joke_analyzer.nlp),
+            config.JOKE_ANALYSER_EMBEDDING_INDEX_DIR,
+            nprobe=config.JOKE_ANALYSER_EMBEDDING_NPROBE,
+            train_size=config.JOKE_ANALYSER_EMBEDDING_TRAIN_SIZE
+        )
+    except (RuntimeError, ValueError, OSError) as e:
+        logger.warning(f"Indeks podobnych żartów nie został zainicjalizowany: {e}")
+
+# Profilowanie próbki ruchu produkcyjnego (JOKE_ANALYSER_PROFILE_SAMPLE_RATE)
+profiler = SampledProfiler(
+    sample_rate=config.JOKE_ANALYSER_PROFILE_SAMPLE_RATE,
+    output_dir=config.JOKE_ANALYSER_PROFILE_DIR
+)
+
+
+@router.post(
+    "/analyze",
+    response_model=AnalyzeResponse,
+    response_model_exclude_none=True,
+    tags=["joke-analyser"]
+)
 async def analyze_joke(request: AnalyzeRequest):
     """
     Analizuj żart według 9 teorii humoru
@@ -37,6 +92,11 @@ async def analyze_joke(request: AnalyzeRequest):
     - monetization_score: Potencjał monetyzacji (0-100)
     - recommended_improvements: Sugerowane poprawki
     - target_segments: Segmenty docelowe
+    - timings: Czasy analizerów, parsowania spaCy i scoringu w ms
+      (tylko gdy `debug_timings: true`)
+    
+    `lite: true` - analiza bez spaCy (zdania i tokeny z reguł); wielokrotnie
+    szybsza, wyniki przybliżone - do pre-screeningu.
     
     **Example:**
     ```json
@@ -50,7 +110,9 @@ async def analyze_joke(request: AnalyzeRequest):
     try:
         logger.info(f"Analyzing joke: {request.joke_text[:50]}...")
         
-        result = await joke_analyzer.analyze(request)
+        with profiler.profile('joke_analyser.analyze'):
+            analyzer = lite_analyzer if request.lite else joke_analyzer
+            result = await analyzer.analyze(request)
         
         logger.info(f"Analysis complete. Dominant theory: {result.dominant_theory}")
         
@@ -61,6 +123,116 @@ async def analyze_joke(request: AnalyzeRequest):
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
 
+@router.post(
+    "/analyze-with-features",
+    response_model=AnalyzeWithFeaturesResponse,
+    response_model_exclude_none=True,
+    tags=["joke-analyser"]
+)
+async def analyze_with_features(request: AnalyzeRequest):
+    """
+    Oceny 9 teorii i raw HumorFeatures w jednym przejściu
+    
+    Wynik jak `/joke-analyser/analyze` (`analysis`) i `/humor-features/extract`
+    (`features`), ale żart jest parsowany przez spaCy raz. Wymaga modelu
+    pl_core_news_lg; `lite: true` nie jest obsługiwane.
+    """
+    if request.lite:
+        raise HTTPException(status_code=400, detail="Tryb lite nie jest obsługiwany (features wymagają spaCy)")
+    if engine is None:
+        raise HTTPException(
+            status_code=500,
+            detail="JokeEngine nie jest dostępny. Sprawdź instalację spaCy i modelu pl_core_news_lg."
+        )
+    
+    try:
+        with profiler.profile('joke_analyser.analyze_with_features'):
+            return await engine.analyze(request)
+    except Exception as e:
+        logger.error(f"Error analyzing joke with features: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+
+
+def _similar_text(request: SimilarTextRequest) -> SimilarTextResponse:
+    # Żarty dodane przez inne workery
+    similar_index.refresh()
+    signature = similar_index.signature(request.joke_text)
+    matches = similar_index.query(request.joke_text, request.threshold, request.limit, signature=signature)
+    if request.add:
+        similar_index.add(joke_hash(request.joke_text), request.joke_text, signature)
+    
+    return SimilarTextResponse(
+        matches=[
+            SimilarTextMatch(key=key, joke_text=similar_index.text(key), similarity=similarity)
+            for key, similarity in matches
+        ],
+        index_size=len(similar_index)
+    )
+
+
+@router.post("/similar-text", response_model=SimilarTextResponse, tags=["joke-analyser"])
+async def similar_text(request: SimilarTextRequest):
+    """
+    Prawie-duplikaty żartu (MinHash + LSH po znormalizowanym tekście)
+    
+    Podobieństwo to szacowany Jaccard 5-znakowych shingli (bez wielkości liter
+    i interpunkcji). Indeks: `JOKE_ANALYSER_SIMILAR_INDEX` (SQLite, wspólny
+    dla workerów i `joke_analyser.bulk --dedupe-index`).
+    
+    `add: true` - po wyszukaniu dodaj żart do indeksu.
+    """
+    if similar_index is None:
+        raise HTTPException(status_code=500, detail="Indeks prawie-duplikatów nie jest dostępny")
+    
+    try:
+        return await run_in_threadpool(_similar_text, request)
+    except Exception as e:
+        logger.error(f"Error searching near-duplicates: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
+
+
+def _similar(request: SimilarRequest) -> SimilarResponse:
+    index = similar_jokes.index
+    # Żarty dodane przez inne workery i joke_analyser.similar add
+    index.refresh()
+    key = joke_hash(request.joke_text)
+    matches = similar_jokes.search(request.joke_text, request.k, request.nprobe, exclude=key)
+    if request.add:
+        similar_jokes.add([key], [request.joke_text])
+    return SimilarResponse(
+        matches=[SimilarMatch(key=k, joke_text=index.text(k), score=score) for k, score in matches],
+        index_size=len(index),
+        encoder=similar_jokes.encoder.name
+    )
+
+
+@router.post("/similar", response_model=SimilarResponse, tags=["joke-analyser"])
+async def similar(request: SimilarRequest):
+    """
+    Semantycznie podobne żarty (k-NN na embeddingach)
+    
+    Embedding żartu (`JOKE_ANALYSER_EMBEDDING_ENCODER`: wektory słów spaCy albo
+    HerBERT) jest porównywany z indeksem `JOKE_ANALYSER_EMBEDDING_INDEX_DIR`
+    (IVF - przeszukiwane jest `nprobe` najbliższych klastrów, nie cały korpus).
+    Sam żart z zapytania jest pomijany w wynikach.
+    
+    `add: true` - po wyszukaniu dodaj żart do indeksu. Korpus dodaje
+    `python -m joke_analyser.similar add <katalog> <plik>`.
+    """
+    if similar_jokes is None:
+        raise HTTPException(
+            status_code=500,
+            detail="Indeks podobnych żartów nie jest dostępny. Ustaw JOKE_ANALYSER_EMBEDDING_INDEX_DIR "
+                   "i sprawdź enkoder (pl_core_news_lg z wektorami albo torch + transformers)."
+        )
+    
+    try:
+        return await run_in_threadpool(_similar, request)
+    except Exception as e:
+        logger.error(f"Error searching similar jokes: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
+
+
 @router.get("/theories", tags=["joke-analyser"])
 async def get_theories():
     """
@@ -126,6 +298,10 @@ async def health_check():
     return {
         "status": "healthy",
         "service": "joke-analyser",
-        "analyzers_loaded": len(joke_analyzer.analyzers)
+        "analyzers_loaded": len(joke_analyzer.analyzers),
+        "engine_loaded": engine is not None,
+        "similar_index_size": len(similar_index) if similar_index is not None else None,
+        "embedding_index_size": len(similar_jokes.index) if similar_jokes is not None else None,
+        "lexicons": lexicons.versions()
     }
 
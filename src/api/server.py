@@ -4,16 +4,20 @@ Flask API server for image description
 Provides REST API endpoint for describing images
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 import sys
 import os
+import json
 
 # Dodaj ścieżkę do src do PYTHONPATH
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from image.describe import describe_image, load_model
 from ollama.client import OllamaClient
+from ollama.admission import AdmissionController, parse_deadline
+from ollama.cache import CompletionCache
+from ollama.exceptions import OllamaQueueFullError, OllamaQueueTimeoutError, OllamaCircuitOpenError
 import logging
 
 # Setup logging
@@ -27,7 +31,21 @@ app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
 # Initialize Ollama client
-ollama_client = OllamaClient()
+# Kolejka zapytań do Ollama (limit równoległych generacji per model)
+admission = AdmissionController(
+    max_concurrent=int(os.getenv('OLLAMA_MAX_CONCURRENT', 2)),
+    max_concurrent_per_model=int(os.getenv('OLLAMA_MAX_CONCURRENT_PER_MODEL', 1)),
+    max_queue_size=int(os.getenv('OLLAMA_MAX_QUEUE_SIZE', 32)),
+    default_deadline=float(os.getenv('OLLAMA_QUEUE_DEADLINE', 120))
+)
+
+# Cache odpowiedzi dla deterministycznych zapytań (temperature=0)
+completion_cache = CompletionCache(
+    max_entries=int(os.getenv('OLLAMA_CACHE_MAX_ENTRIES', 1024)),
+    db_path=os.getenv('OLLAMA_CACHE_PATH') or None
+) if os.getenv('OLLAMA_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes') else None
+
+ollama_client = OllamaClient(cache=completion_cache, admission=admission)
 
 # Load model at startup
 logger.info("Initializing image description service...")
@@ -107,8 +125,13 @@ def ollama_chat():
         "task": "opcjonalne dodatkowe instrukcje",
         "model": "opcjonalna nazwa modelu",
         "temperature": 0.7,
-        "max_tokens": 1000
+        "max_tokens": 1000,
+        "deadline": 30,  # opcjonalnie - maks. czas oczekiwania w kolejce (s)
+        "cache": null  # opcjonalnie - wymuś cache (domyślnie tylko temperature=0)
     }
+    
+    Gdy kolejka jest pełna zwraca 429 z nagłówkiem Retry-After.
+    Nagłówek X-Cache (HIT / MISS / BYPASS) informuje czy odpowiedź pochodzi z cache.
     """
     try:
         data = request.get_json() or {}
@@ -128,6 +151,8 @@ def ollama_chat():
         model = data.get('model')
         temperature = data.get('temperature')
         max_tokens = data.get('max_tokens')
+        deadline = parse_deadline(data.get('deadline'))
+        use_cache = data.get('cache')
         
         logger.info("Wysyłam zapytanie do Ollama (model=%s)", model or ollama_client.default_model)
         result = ollama_client.chat(
@@ -135,16 +160,28 @@ def ollama_chat():
             system=system_prompt,
             model=model,
             temperature=temperature,
-            max_tokens=max_tokens
+            max_tokens=max_tokens,
+            use_cache=use_cache,
+            deadline=deadline
         )
         
-        return jsonify({
+        response = jsonify({
             'success': True,
             'response': result['text'],
             'usage': result['usage'],
             'model': result['raw'].get('model', model or ollama_client.default_model)
         })
+        response.headers['X-Cache'] = result.get('cache', 'BYPASS')
+        return response
         
+    except (OllamaQueueFullError, OllamaQueueTimeoutError, OllamaCircuitOpenError) as e:
+        status_code = 429 if isinstance(e, OllamaQueueFullError) else 503
+        response = jsonify({
+            'success': False,
+            'error': str(e)
+        })
+        response.headers['Retry-After'] = str(max(1, int(e.retry_after)))
+        return response, status_code
     except ValueError as e:
         logger.error("Błąd walidacji zapytania do Ollama: %s", e)
         return jsonify({
@@ -159,10 +196,108 @@ def ollama_chat():
         }), 500
 
 
+@app.route('/ollama/batch', methods=['POST'])
+def ollama_batch():
+    """
+    Wykonaj wiele zapytań do Ollama równolegle.
+    
+    Request body:
+    {
+        "requests": [{"user": "...", "system": "...", "temperature": 0.9}, ...],
+        "parallelism": 4  # opcjonalnie
+    }
+    
+    Wyniki są streamowane jako NDJSON w kolejności ukończenia
+    (pole "index" wskazuje pozycję zapytania w "requests").
+    """
+    data = request.get_json() or {}
+    items = data.get('requests')
+    max_items = int(os.getenv('OLLAMA_BATCH_MAX_ITEMS', 100))
+    
+    if not items or not isinstance(items, list):
+        return jsonify({
+            'success': False,
+            'error': 'Pole "requests" jest wymagane (niepusta lista)'
+        }), 400
+    if len(items) > max_items:
+        return jsonify({
+            'success': False,
+            'error': f'Za dużo zapytań w batchu (max {max_items})'
+        }), 400
+    
+    if not all(isinstance(item, dict) for item in items):
+        return jsonify({
+            'success': False,
+            'error': 'Elementy "requests" muszą być obiektami'
+        }), 400
+    try:
+        parallelism = int(data.get('parallelism') or os.getenv('OLLAMA_BATCH_PARALLELISM', 4))
+    except (TypeError, ValueError, OverflowError):
+        return jsonify({
+            'success': False,
+            'error': 'Pole "parallelism" musi być liczbą całkowitą'
+        }), 400
+    
+    chat_items = []
+    for item in items:
+        try:
+            deadline = parse_deadline(item.get('deadline'))
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        user_message = item.get('user') or ''
+        if item.get('task'):
+            user_message = f"{user_message}\n\nZADANIE:\n{item['task']}"
+        chat_items.append({
+            'user': user_message,
+            'system': item.get('system'),
+            'model': item.get('model') or ollama_client.default_model,
+            'temperature': item.get('temperature'),
+            'max_tokens': item.get('max_tokens'),
+            'use_cache': item.get('cache'),
+            'deadline': deadline,
+        })
+    
+    parallelism = max(1, min(parallelism, admission.max_concurrent, len(chat_items)))
+    logger.info("Batch do Ollama: %d zapytań, parallelism=%d", len(chat_items), parallelism)
+    
+    def generate_lines():
+        for index, result, error in ollama_client.chat_batch(chat_items, parallelism=parallelism):
+            if error is None:
+                line = {
+                    'index': index,
+                    'success': True,
+                    'response': result['text'],
+                    'usage': result['usage'],
+                    'model': result['raw'].get('model', chat_items[index]['model']),
+                    'cache': result.get('cache', 'BYPASS'),
+                }
+            else:
+                line = {
+                    'index': index,
+                    'success': False,
+                    'error': str(error),
+                }
+            yield json.dumps(line, ensure_ascii=False) + "\n"
+    
+    return Response(stream_with_context(generate_lines()), mimetype='application/x-ndjson')
+
+
+@app.route('/ollama/queue', methods=['GET'])
+def ollama_queue():
+    """Metryki kolejki zapytań do Ollama (głębokość, czasy oczekiwania, circuit breaker, cache)"""
+    stats = admission.stats()
+    stats['circuit_breaker'] = ollama_client.circuit_breaker.stats()
+    stats['cache'] = completion_cache.stats() if completion_cache is not None else None
+    return jsonify(stats)
+
+
 if __name__ == '__main__':
     port = int(os.getenv('PORT', 5001))
     host = os.getenv('HOST', '127.0.0.1')
     
     logger.info(f"Starting image description API server on {host}:{port}")
-    app.run(host=host, port=port, debug=False)
+    app.run(host=host, port=port, debug=False, threaded=True)
 
@@ -2,7 +2,11 @@
 HumorFeatureExtractor - ekstrahuje features z żartów bez scoring logic
 """
 import time
-import spacy
+from nlp import load_spacy_model, cached_doc, covers, parse
+from metrics import stage
+from lexicon import lexicons
+from .tokens import TokenPass, category_index
+from .wordplay import WordplayIndex
 from typing import Dict, List, Optional
 from .feature_models import (
     ExtractRequest,
@@ -23,69 +27,74 @@ class HumorFeatureExtractor:
     """
     Ekstraktor features z żartów używający NLP (spaCy)
     Zwraca tylko raw features, scoring jest w PHP (Laravel)
+    
+    Features razem z ocenami 9 teorii z jednego parsowania:
+    joke_analyser.engine.JokeEngine
     """
     
-    def __init__(self, model_name: str = "pl_core_news_lg"):
+    # Atrybuty spaCy używane przez każdą grupę features (nlp.pipelines);
+    # uruchamiane są tylko komponenty dla ich sumy (bez lemmatyzera)
+    FEATURE_NEEDS = {
+        'structural': frozenset({'sents'}),
+        'keywords': frozenset(),
+        'linguistic': frozenset({'pos', 'ents'}),
+        'atomic': frozenset(),
+        'semantic': frozenset({'pos', 'dep'}),
+        'timing': frozenset({'sents'}),
+        'narrative': frozenset({'pos', 'ents'}),
+        'absurdity': frozenset(),
+    }
+    SPACY_NEEDS = frozenset().union(*FEATURE_NEEDS.values())
+    
+    def __init__(self, model_name: str = "pl_core_news_lg", nlp=None):
         """
         Initialize extractor z polskim modelem spaCy
         
         Args:
             model_name: Nazwa modelu spaCy (default: pl_core_news_lg)
+            nlp: Gotowy potok spaCy (zamiast ładowania model_name)
         """
-        try:
-            self.nlp = spacy.load(model_name)
-        except OSError:
-            raise RuntimeError(
-                f"Model spaCy '{model_name}' nie jest zainstalowany. "
-                f"Zainstaluj: python -m spacy download {model_name}"
-            )
+        if nlp is not None:
+            self.nlp = nlp
+        else:
+            try:
+                self.nlp = load_spacy_model(model_name)
+            except OSError:
+                raise RuntimeError(
+                    f"Model spaCy '{model_name}' nie jest zainstalowany. "
+                    f"Zainstaluj: python -m spacy download {model_name}"
+                )
         
         # Słowniki dla keyword detection
+        self.keywords_lexicon = None
         self._load_dictionaries()
     
     def _load_dictionaries(self):
-        """Załaduj słowniki dla keyword detection"""
-        self.tech_words = {
-            'api', 'bug', 'git', 'commit', 'merge', 'deploy', 'server',
-            'frontend', 'backend', 'fullstack', 'database', 'sql', 'orm',
-            'framework', 'library', 'package', 'npm', 'composer', 'pip',
-            'docker', 'kubernetes', 'ci/cd', 'devops', 'agile', 'scrum',
-        }
-        
-        self.emotion_words = {
-            'radość', 'smutek', 'złość', 'strach', 'zaskoczenie', 'wstyd',
-            'szczęście', 'frustracja', 'ekscytacja', 'nuda', 'ciekawość',
-        }
-        
-        self.regional_markers = {
-            'janusz', 'grażyna', 'seba', 'karyna', 'brajanek', 'dżesika',
-            'polska', 'polski', 'polak', 'warsaw', 'warsaw', 'kraków',
-        }
-        
-        self.archetypes = {
-            'bohater', 'antybohater', 'mentor', 'błazen', 'męczennik',
-            'buntownik', 'nieudacznik', 'geniusz', 'outsider', 'celebryta',
-        }
-        
-        self.taboo_markers = {
-            'śmierć', 'seks', 'polityka', 'religia', 'drugs', 'alkohol',
-            'choroba', 'przemoc', 'dyskryminacja',
-        }
-        
-        self.surprise_words = {
-            'nagle', 'niespodziewanie', 'okazuje się', 'ale', 'jednak',
-            'przecież', 'wcale', 'wcale nie', 'w sumie', 'właściwie',
-        }
-        
-        self.exaggeration_words = {
-            'nigdy', 'zawsze', 'wszyscy', 'nikt', 'wszystko', 'nic',
-            'kompletnie', 'totalnie', 'absolutnie', 'mega', 'ultra',
-        }
-        
-        self.impossibility_markers = {
-            'niemożliwe', 'absurdalne', 'nierealne', 'fantastyczne',
-            'magiczne', 'cudowne', 'niewiarygodne',
-        }
+        """
+        Załaduj słowniki dla keyword detection (src/lexicon/data/keywords.json)
+        
+        Wołane też przed każdą ekstrakcją - po zmianie pliku słowniki są
+        podmieniane bez restartu.
+        """
+        keywords = lexicons.get('keywords')
+        if keywords is self.keywords_lexicon:
+            return
+        
+        self.tech_words = keywords['tech_words'].marker_set
+        self.emotion_words = keywords['emotion_words'].marker_set
+        self.regional_markers = keywords['regional_markers'].marker_set
+        self.archetypes = keywords['archetypes'].marker_set
+        self.taboo_markers = keywords['taboo_markers'].marker_set
+        self.surprise_words = keywords['surprise_words'].marker_set
+        self.exaggeration_words = keywords['exaggeration_words'].marker_set
+        self.impossibility_markers = keywords['impossibility_markers'].marker_set
+        # Słowo -> kategorie (jeden lookup na token w TokenPass)
+        self.categories = category_index({
+            name: keywords[name].marker_set
+            for name in ('tech_words', 'emotion_words', 'regional_markers', 'archetypes', 'taboo_markers',
+                         'surprise_words', 'exaggeration_words', 'impossibility_markers')
+        })
+        self.keywords_lexicon = keywords
     
     async def extract(self, request: ExtractRequest) -> ExtractResponse:
         """
@@ -98,22 +107,55 @@ class HumorFeatureExtractor:
             ExtractResponse z wyekstraktowanymi features
         """
         start_time = time.time()
+        features = self.extract_features(request.joke_text)
+        
+        end_time = time.time()
+        extraction_time_ms = (end_time - start_time) * 1000
+        
+        return ExtractResponse(
+            features=features,
+            extraction_time_ms=round(extraction_time_ms, 2),
+            lexicon_version=self.keywords_lexicon.version
+        )
+    
+    def extract_features(self, joke_text: str) -> HumorFeatures:
+        """
+        Ekstrahuj features (synchronicznie, bez I/O)
+        
+        Dokument sparsowany wcześniej (nlp.parsed_docs - np. przez JokeEngine)
+        jest używany, jeśli ma potrzebne adnotacje.
+        """
+        self._load_dictionaries()
         
-        joke_text = request.joke_text
-        doc = self.nlp(joke_text)
+        doc = cached_doc(joke_text)
+        if doc is None or not covers(doc, self.SPACY_NEEDS):
+            with stage('spacy', 'parse'):
+                doc = parse(self.nlp, joke_text, self.SPACY_NEEDS)
+        
+        # Jedno przejście po tokenach dla wszystkich kategorii
+        with stage('humor_features', 'tokens'):
+            tokens = TokenPass(doc, self.categories)
         
         # Ekstraktuj features z każdej kategorii
-        structural = self._extract_structural(doc, joke_text)
-        keywords = self._extract_keywords(doc, joke_text)
-        linguistic = self._extract_linguistic(doc)
-        atomic = self._extract_atomic(joke_text)
-        semantic = self._extract_semantic(doc)
-        timing = self._extract_timing(doc, joke_text)
-        narrative = self._extract_narrative(doc)
-        absurdity = self._extract_absurdity(doc, joke_text)
+        with stage('humor_features', 'structural'):
+            structural = self._extract_structural(tokens, joke_text)
+        with stage('humor_features', 'keywords'):
+            keywords = self._extract_keywords(tokens)
+        with stage('humor_features', 'linguistic'):
+            linguistic = self._extract_linguistic(doc, tokens)
+        with stage('humor_features', 'atomic'):
+            atomic = self._extract_atomic(joke_text)
+        with stage('humor_features', 'semantic'):
+            semantic = self._extract_semantic(tokens)
+        with stage('humor_features', 'timing'):
+            timing = self._extract_timing(tokens, joke_text)
+        with stage('humor_features', 'narrative'):
+            narrative = self._extract_narrative(doc, tokens)
+        with stage('humor_features', 'absurdity'):
+            absurdity = self._extract_absurdity(tokens, joke_text)
         
         # Złóż wszystko w HumorFeatures
-        features = HumorFeatures(
+        return HumorFeatures(
             joke_text=joke_text,
             structural=structural,
             keywords=keywords,
@@ -125,22 +167,13 @@ class HumorFeatureExtractor:
             absurdity=absurdity,
             language="pl",
             char_count=len(joke_text),
-            word_count=len([t for t in doc if not t.is_space]),
-        )
-        
-        end_time = time.time()
-        extraction_time_ms = (end_time - start_time) * 1000
-        
-        return ExtractResponse(
-            features=features,
-            extraction_time_ms=round(extraction_time_ms, 2)
+            word_count=tokens.non_space_count,
         )
     
-    def _extract_structural(self, doc, text: str) -> StructuralFeatures:
+    def _extract_structural(self, tokens: TokenPass, text: str) -> StructuralFeatures:
         """Ekstraktuj cechy strukturalne (setup-punchline)"""
-        sentences = list(doc.sents)
-        sentence_count = len(sentences)
-        sentence_lengths = [len(sent) for sent in sentences]
+        sentence_lengths = tokens.sentence_lengths
+        sentence_count = len(sentence_lengths)
         avg_length = sum(sentence_lengths) / len(sentence_lengths) if sentence_lengths else 0
         
         # Variance for rhythm detection
@@ -167,59 +200,32 @@ class HumorFeatureExtractor:
             punchline_length=punchline_length,
         )
     
-    def _extract_keywords(self, doc, text: str) -> KeywordFeatures:
+    def _extract_keywords(self, tokens: TokenPass) -> KeywordFeatures:
         """Ekstraktuj słowa kluczowe i markery"""
-        text_lower = text.lower()
-        words_lower = [t.text.lower() for t in doc if not t.is_space and not t.is_punct]
-        
-        tech = [w for w in words_lower if w in self.tech_words]
-        emotion = [w for w in words_lower if w in self.emotion_words]
-        regional = [w for w in words_lower if w in self.regional_markers]
-        archetypes_found = [w for w in words_lower if w in self.archetypes]
-        taboo = [w for w in words_lower if w in self.taboo_markers]
-        surprise = [w for w in words_lower if w in self.surprise_words]
-        
         return KeywordFeatures(
-            tech_words=tech,
-            emotion_words=emotion,
-            regional_markers=regional,
-            archetypes=archetypes_found,
-            taboo_markers=taboo,
-            surprise_words=surprise,
+            tech_words=tokens.matches['tech_words'],
+            emotion_words=tokens.matches['emotion_words'],
+            regional_markers=tokens.matches['regional_markers'],
+            archetypes=tokens.matches['archetypes'],
+            taboo_markers=tokens.matches['taboo_markers'],
+            surprise_words=tokens.matches['surprise_words'],
         )
     
-    def _extract_linguistic(self, doc) -> LinguisticFeatures:
+    def _extract_linguistic(self, doc, tokens: TokenPass) -> LinguisticFeatures:
         """Ekstraktuj cechy lingwistyczne (POS tags, entities)"""
-        # POS tags count
-        pos_tags = {}
-        for token in doc:
-            if not token.is_space and not token.is_punct:
-                pos = token.pos_
-                pos_tags[pos] = pos_tags.get(pos, 0) + 1
-        
         # Named entities
         entities = [
             {'text': ent.text, 'label': ent.label_}
             for ent in doc.ents
         ]
         
-        # Comparisons (szukaj 'niż', 'jak', 'bardziej')
-        comparisons = sum(1 for t in doc if t.text.lower() in ['niż', 'jak', 'bardziej', 'mniej'])
-        
-        # Negations
-        negations = sum(1 for t in doc if t.text.lower() in ['nie', 'nigdy', 'wcale', 'żaden'])
-        
-        # Questions and exclamations
-        questions = sum(1 for t in doc if t.text == '?')
-        exclamations = sum(1 for t in doc if t.text == '!')
-        
         return LinguisticFeatures(
-            pos_tags=pos_tags,
+            pos_tags=tokens.pos_tags,
             entities=entities,
-            comparisons_count=comparisons,
-            negations_count=negations,
-            questions_count=questions,
-            exclamations_count=exclamations,
+            comparisons_count=tokens.counts['comparison'],  # 'niż', 'jak', 'bardziej', 'mniej'
+            negations_count=tokens.counts['negation'],
+            questions_count=tokens.questions,
+            exclamations_count=tokens.exclamations,
         )
     
     def _extract_atomic(self, text: str) -> AtomicFeatures:
@@ -251,46 +257,36 @@ class HumorFeatureExtractor:
             hyperboles=hyperboles,
         )
     
-    def _extract_semantic(self, doc) -> SemanticFeatures:
+    def _extract_semantic(self, tokens: TokenPass) -> SemanticFeatures:
         """Ekstraktuj cechy semantyczne"""
         # Polysemy: słowa z wieloma znaczeniami (simplified - check word length and frequency)
-        polysemy_candidates = [
-            t.text.lower() for t in doc 
-            if not t.is_stop and not t.is_punct and len(t.text) <= 5
-        ]
+        polysemy_candidates = tokens.polysemy_candidates
         
-        # Metaphors: szukaj porównań i przenośni (simple heuristic)
-        metaphors = [
-            t.text for t in doc 
-            if t.dep_ in ['nmod', 'amod'] and t.text.lower() not in ['ten', 'ta', 'to']
-        ]
+        # Metaphors: szukaj porównań i przenośni (nmod/amod, simple heuristic)
+        metaphors = tokens.metaphors
         
-        # Wordplay candidates: słowa podobnie brzmiące
-        wordplay = []
-        words = [t.text.lower() for t in doc if not t.is_space and not t.is_punct]
-        for i, w1 in enumerate(words):
-            for w2 in words[i+1:]:
-                if len(w1) > 3 and len(w2) > 3 and w1[:3] == w2[:3] and w1 != w2:
-                    wordplay.append(f"{w1}/{w2}")
+        # Wordplay candidates: słowa podobnie brzmiące (indeksy kubełkowe - liniowo)
+        wordplay = WordplayIndex(tokens.words)
         
         # Semantic fields (based on dominant POS and keywords)
         semantic_fields = []
-        if any(t.pos_ == 'VERB' and 'comp' in t.text.lower() for t in doc):
+        if tokens.has_comp_verb:
             semantic_fields.append('technologia')
-        if any(t.pos_ == 'ADJ' and t.text.lower() in self.emotion_words for t in doc):
+        if tokens.has_emotion_adjective:
             semantic_fields.append('emocje')
         
         return SemanticFeatures(
             polysemy_words=list(set(polysemy_candidates))[:10],
             metaphors=list(set(metaphors))[:5],
-            wordplay_candidates=wordplay[:5],
+            wordplay_candidates=wordplay.prefix_pairs(limit=5),
+            rhymes=wordplay.rhymes(limit=5),
+            near_homophones=wordplay.near_homophones(limit=5),
             semantic_fields=semantic_fields,
         )
     
-    def _extract_timing(self, doc, text: str) -> TimingFeatures:
+    def _extract_timing(self, tokens: TokenPass, text: str) -> TimingFeatures:
         """Ekstraktuj cechy temporalne"""
-        words = [t for t in doc if not t.is_space and not t.is_punct]
-        word_count = len(words)
+        word_count = len(tokens.words)
         
         # Syllable count (approximate for Polish: avg 2.5 syllables per word)
         syllable_count = int(word_count * 2.5)
@@ -299,9 +295,8 @@ class HumorFeatureExtractor:
         reading_time_sec = (word_count / 200) * 60
         
         # Rhythm score based on sentence length variance
-        sentences = list(doc.sents)
-        if len(sentences) > 1:
-            lengths = [len(list(s)) for s in sentences]
+        lengths = tokens.sentence_lengths
+        if len(lengths) > 1:
             avg = sum(lengths) / len(lengths)
             variance = sum((l - avg) ** 2 for l in lengths) / len(lengths)
             rhythm_score = min(1.0, variance / 100)  # Normalize
@@ -319,11 +314,11 @@ class HumorFeatureExtractor:
             pause_indicators=pause_indicators,
         )
     
-    def _extract_narrative(self, doc) -> NarrativeFeatures:
+    def _extract_narrative(self, doc, tokens: TokenPass) -> NarrativeFeatures:
         """Ekstraktuj cechy narracyjne"""
         # Perspective (1st/3rd person based on pronouns)
-        first_person = sum(1 for t in doc if t.text.lower() in ['ja', 'mnie', 'mój', 'moja'])
-        third_person = sum(1 for t in doc if t.text.lower() in ['on', 'ona', 'jego', 'jej'])
+        first_person = tokens.counts['first_person']
+        third_person = tokens.counts['third_person']
         
         if first_person > third_person:
             perspective = '1st person'
@@ -333,8 +328,8 @@ class HumorFeatureExtractor:
             perspective = 'neutral'
         
         # Emotional arc (based on sentiment - simplified)
-        positive_words = sum(1 for t in doc if t.text.lower() in ['dobrze', 'super', 'świetnie', 'wspaniale'])
-        negative_words = sum(1 for t in doc if t.text.lower() in ['źle', 'słabo', 'kiepsko', 'fatalnie'])
+        positive_words = tokens.counts['positive']
+        negative_words = tokens.counts['negative']
         
         if positive_words > negative_words:
             emotional_arc = 'positive'
@@ -344,14 +339,14 @@ class HumorFeatureExtractor:
             emotional_arc = 'neutral'
         
         # Conflict (szukaj 'ale', 'jednak', 'niestety')
-        conflict_present = any(t.text.lower() in ['ale', 'jednak', 'niestety', 'problem'] for t in doc)
+        conflict_present = tokens.counts['conflict'] > 0
         
         # Resolution (szukaj 'więc', 'dlatego', 'w końcu')
-        resolution_present = any(t.text.lower() in ['więc', 'dlatego', 'w końcu', 'okazało się'] for t in doc)
+        resolution_present = tokens.counts['resolution'] > 0
         
         # Character count (based on proper nouns and pronouns)
         characters = len([ent for ent in doc.ents if ent.label_ == 'PER'])
-        characters += len(set([t.text.lower() for t in doc if t.pos_ == 'PRON']))
+        characters += len(tokens.pronouns)
         
         return NarrativeFeatures(
             narrative_perspective=perspective,
@@ -361,28 +356,21 @@ class HumorFeatureExtractor:
             character_count=min(characters, 10),  # Cap at 10
         )
     
-    def _extract_absurdity(self, doc, text: str) -> AbsurdityFeatures:
+    def _extract_absurdity(self, tokens: TokenPass, text: str) -> AbsurdityFeatures:
         """Ekstraktuj cechy absurdu"""
-        text_lower = text.lower()
-        words_lower = [t.text.lower() for t in doc if not t.is_space and not t.is_punct]
-        
         # Contradictions (szukaj 'ale', 'jednak' + negations)
-        contradictions = sum(
-            1 for t in doc 
-            if t.text.lower() in ['ale', 'jednak'] and 
-            any(t2.text.lower() in ['nie', 'nigdy'] for t2 in doc[t.i:t.i+5])
-        )
+        contradictions = tokens.contradictions()
         
         # Impossibility markers
-        impossibilities = [w for w in words_lower if w in self.impossibility_markers]
+        impossibilities = tokens.matches['impossibility_markers']
         
         # Exaggeration words
-        exaggerations = [w for w in words_lower if w in self.exaggeration_words]
+        exaggerations = tokens.matches['exaggeration_words']
         
         # Logical breaks (heuristic: questions + negations + contradictions)
         logical_breaks = sum([
             text.count('?'),
-            sum(1 for w in words_lower if w in ['nie', 'nigdy']),
+            tokens.counts['strong_negation'],  # 'nie', 'nigdy'
             contradictions,
         ])
         
@@ -58,7 +58,9 @@ class SemanticFeatures(BaseModel):
     """Cechy semantyczne (znaczeniowe)"""
     polysemy_words: List[str]  # słowa wieloznaczne
     metaphors: List[str]
-    wordplay_candidates: List[str]
+    wordplay_candidates: List[str]  # wspólny prefiks (3 litery)
+    rhymes: List[str] = []  # pary rymujące się (humor_features.wordplay)
+    near_homophones: List[str] = []  # pary brzmiące tak samo lub prawie tak samo
     semantic_fields: List[str]  # pola semantyczne (np. 'technologia', 'emocje')
 
 
@@ -112,4 +114,5 @@ class ExtractResponse(BaseModel):
     """Response z wyekstraktowanymi features"""
     features: HumorFeatures
     extraction_time_ms: float
+    lexicon_version: Optional[str] = None  # Wersja słowników keywords (klucz cache po stronie klienta)
 
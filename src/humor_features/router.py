@@ -5,6 +5,7 @@ Endpoint: /humor-features/extract
 from fastapi import APIRouter, HTTPException
 from .feature_models import ExtractRequest, ExtractResponse
 from .extractor import HumorFeatureExtractor
+from lexicon import lexicons
 
 router = APIRouter()
 
@@ -59,6 +60,7 @@ async def health_check():
     return {
         "status": "healthy" if extractor is not None else "unhealthy",
         "service": "humor_features_extractor",
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "lexicons": lexicons.versions()
     }
 
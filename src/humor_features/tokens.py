@@ -0,0 +1,119 @@
+"""
+Jedno przejście po tokenach Doc dla wszystkich grup features
+
+Każda metoda _extract_* przechodziła po dokumencie osobno (narracja kilka razy,
+z osobnym .lower() przy każdym porównaniu). TokenPass odwiedza każdy token raz:
+liczy małe litery, POS, zależność i przynależność do list słów (jeden lookup
+w indeksie kategorii), a ekstraktory czytają gotowe wyniki.
+
+Lemmy nie są zbierane - żadna grupa features ich nie używa, a potok
+ekstraktora nie uruchamia lematyzera (HumorFeatureExtractor.FEATURE_NEEDS).
+"""
+from collections import Counter, defaultdict
+from typing import Dict, FrozenSet, Iterable, List
+
+# Stałe listy słów używane przez ekstraktory (słowniki z lexicon dochodzą w category_index)
+FIXED_CATEGORIES: Dict[str, Iterable[str]] = {
+    'comparison': ('niż', 'jak', 'bardziej', 'mniej'),
+    'negation': ('nie', 'nigdy', 'wcale', 'żaden'),
+    'strong_negation': ('nie', 'nigdy'),
+    'contrast': ('ale', 'jednak'),
+    'determiner': ('ten', 'ta', 'to'),
+    'first_person': ('ja', 'mnie', 'mój', 'moja'),
+    'third_person': ('on', 'ona', 'jego', 'jej'),
+    'positive': ('dobrze', 'super', 'świetnie', 'wspaniale'),
+    'negative': ('źle', 'słabo', 'kiepsko', 'fatalnie'),
+    'conflict': ('ale', 'jednak', 'niestety', 'problem'),
+    # Frazy wielowyrazowe nie pasują do pojedynczego tokenu (jak dotychczas)
+    'resolution': ('więc', 'dlatego', 'w końcu', 'okazało się'),
+}
+
+# Ile tokenów od 'ale'/'jednak' szukać przeczenia (sprzeczność)
+CONTRADICTION_WINDOW = 5
+_STRONG_NEGATIONS = frozenset(FIXED_CATEGORIES['strong_negation'])
+
+
+def category_index(word_sets: Dict[str, Iterable[str]]) -> Dict[str, FrozenSet[str]]:
+    """
+    Słowo (małymi literami) -> kategorie, do których należy
+
+    Args:
+        word_sets: Listy słów ze słowników (nazwa kategorii -> słowa); łączone z FIXED_CATEGORIES
+    """
+    index = defaultdict(set)
+    for category, words in {**word_sets, **FIXED_CATEGORIES}.items():
+        for word in words:
+            index[word].add(category)
+    return {word: frozenset(categories) for word, categories in index.items()}
+
+
+class TokenPass:
+    """Wyniki jednego przejścia po tokenach (i zdaniach) dokumentu"""
+
+    def __init__(self, doc, categories: Dict[str, FrozenSet[str]]):
+        """
+        Args:
+            doc: Doc spaCy (zdania, POS, zależności)
+            categories: Wynik category_index()
+        """
+        empty = frozenset()
+        # Małe litery wszystkich tokenów (indeksy jak w doc) i słowa bez spacji/interpunkcji
+        self.lowers: List[str] = []
+        self.words: List[str] = []
+        # Kategoria -> słowa z tej kategorii w kolejności tekstu
+        self.matches: Dict[str, List[str]] = defaultdict(list)
+        self.counts: Counter = Counter()
+        self.contrast_positions: List[int] = []
+        self.pos_tags: Dict[str, int] = {}
+        self.pronouns = set()
+        self.polysemy_candidates: List[str] = []
+        self.metaphors: List[str] = []
+        self.non_space_count = 0
+        self.questions = 0
+        self.exclamations = 0
+        self.has_comp_verb = False
+        self.has_emotion_adjective = False
+
+        for token in doc:
+            text = token.text
+            lower = text.lower()
+            self.lowers.append(lower)
+            token_categories = categories.get(lower, empty)
+            pos = token.pos_
+            is_punct = token.is_punct
+
+            if not token.is_space:
+                self.non_space_count += 1
+                if not is_punct:
+                    self.words.append(lower)
+                    self.pos_tags[pos] = self.pos_tags.get(pos, 0) + 1
+                    for category in token_categories:
+                        self.matches[category].append(lower)
+                        self.counts[category] += 1
+            if text == '?':
+                self.questions += 1
+            elif text == '!':
+                self.exclamations += 1
+
+            if 'contrast' in token_categories:
+                self.contrast_positions.append(token.i)
+            if pos == 'PRON':
+                self.pronouns.add(lower)
+            elif pos == 'VERB' and 'comp' in lower:
+                self.has_comp_verb = True
+            elif pos == 'ADJ' and 'emotion_words' in token_categories:
+                self.has_emotion_adjective = True
+
+            if not is_punct and not token.is_stop and len(text) <= 5:
+                self.polysemy_candidates.append(lower)
+            if token.dep_ in ('nmod', 'amod') and 'determiner' not in token_categories:
+                self.metaphors.append(text)
+
+        self.sentence_lengths = [len(sent) for sent in doc.sents]
+
+    def contradictions(self) -> int:
+        """'ale'/'jednak' z 'nie'/'nigdy' w oknie CONTRADICTION_WINDOW tokenów"""
+        return sum(
+            1 for i in self.contrast_positions
+            if any(lower in _STRONG_NEGATIONS for lower in self.lowers[i:i + CONTRADICTION_WINDOW])
+        )
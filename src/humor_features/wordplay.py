@@ -0,0 +1,179 @@
+"""
+Kandydaci na grę słów - indeksy kubełkowe zamiast porównywania każdej pary słów
+
+Słowa są grupowane po kluczach, więc wyszukiwanie jest liniowe względem liczby
+tokenów (plus liczba zwróconych par, ograniczona przez `limit`):
+
+    prefix         - wspólne 3 pierwsze litery (dotychczasowe wordplay_candidates)
+    phonetic_key   - polska wymowa: rz/ż, ch/h, ó/u, ubezdźwięcznienie na końcu
+                     (może/morze, bóg/buk)
+    rhyme_key      - klucz fonetyczny od przedostatniej samogłoski (akcent
+                     paroksytoniczny - rymy żeńskie: głowa/słowa)
+    substitution   - klucze fonetyczne różniące się jedną literą, poza dwiema
+                     ostatnimi - te zwykle są końcówką fleksyjną (kasa/kosa,
+                     ale nie kota/koty)
+
+Przykład:
+    index = WordplayIndex(['może', 'morze', 'głowa', 'słowa'])
+    index.near_homophones()  # ['może/morze']
+    index.rhymes()           # ['głowa/słowa']
+"""
+import re
+from bisect import bisect_right
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional
+
+PREFIX_LENGTH = 3
+MIN_SUBSTITUTION_LENGTH = 4
+
+# Kolejność ma znaczenie: dwuznaki przed pojedynczymi literami
+_SPELLING = (
+    ('ch', 'h'), ('rz', 'ż'), ('ó', 'u'), ('ą', 'on'), ('ę', 'en'),
+    ('sz', 'ş'), ('cz', 'ç'), ('dż', 'ĵ'), ('dź', 'đ'), ('dz', 'ʒ'),
+)
+# Ubezdźwięcznienie spółgłoski na końcu wyrazu
+_FINAL_DEVOICING = {
+    'b': 'p', 'd': 't', 'g': 'k', 'w': 'f', 'z': 's', 'ż': 'ş', 'ź': 'ś', 'ĵ': 'ç', 'đ': 'ć', 'ʒ': 'c',
+}
+_VOWELS = frozenset('aeiouy')
+_NON_LETTERS = re.compile(r'[^\w]|[\d_]')
+_DOUBLED = re.compile(r'(.)\1+')
+
+
+def phonetic_key(word: str) -> str:
+    """Przybliżona wymowa polskiego słowa (słowa brzmiące tak samo mają ten sam klucz)"""
+    key = _NON_LETTERS.sub('', word.lower())
+    for spelling, sound in _SPELLING:
+        key = key.replace(spelling, sound)
+    key = _DOUBLED.sub(r'\1', key)
+    if key and key[-1] in _FINAL_DEVOICING:
+        key = key[:-1] + _FINAL_DEVOICING[key[-1]]
+    return key
+
+
+def rhyme_key(word: str) -> Optional[str]:
+    """Końcówka od przedostatniej samogłoski (ostatniej w słowach jednosylabowych)"""
+    key = phonetic_key(word)
+    # 'i' przed samogłoską to zmiękczenie (nie, siano), nie osobna sylaba
+    vowels = [
+        i for i, c in enumerate(key)
+        if c in _VOWELS and not (c == 'i' and i + 1 < len(key) and key[i + 1] in _VOWELS)
+    ]
+    if not vowels:
+        return None
+    ending = key[vowels[-2] if len(vowels) > 1 else vowels[-1]:]
+    return ending if len(ending) >= 2 else None
+
+
+class WordplayIndex:
+    """Indeksy słów jednego tekstu (budowane raz, w czasie liniowym)"""
+
+    def __init__(self, words: Iterable[str]):
+        """
+        Args:
+            words: Słowa tekstu małymi literami, w kolejności (bez interpunkcji)
+        """
+        self.words = list(words)
+        # Słowa bez powtórzeń w kolejności pierwszego wystąpienia
+        self.distinct = list(dict.fromkeys(self.words))
+        self._keys = {word: phonetic_key(word) for word in self.distinct}
+
+    def prefix_pairs(self, limit: int = 5) -> List[str]:
+        """
+        Pary słów (> 3 litery) o wspólnym prefiksie, jak dawne porównanie każdej pary
+
+        Kolejność i powtórzenia jak w pętli `for i, w1 ...: for w2 in words[i+1:]`.
+        """
+        buckets: Dict[str, List[int]] = defaultdict(list)
+        for position, word in enumerate(self.words):
+            if len(word) > PREFIX_LENGTH:
+                buckets[word[:PREFIX_LENGTH]].append(position)
+
+        # next_other[bucket][k] - pierwszy indeks > k w kubełku z innym słowem niż na k
+        # (przeskakuje powtórzenia tego samego słowa - bez tego koszt byłby kwadratowy)
+        next_other = {}
+        for prefix, positions in buckets.items():
+            skips = [len(positions)] * len(positions)
+            for k in range(len(positions) - 2, -1, -1):
+                same = self.words[positions[k + 1]] == self.words[positions[k]]
+                skips[k] = skips[k + 1] if same else k + 1
+            next_other[prefix] = skips
+
+        pairs: List[str] = []
+        for i, w1 in enumerate(self.words):
+            if len(w1) <= PREFIX_LENGTH:
+                continue
+            positions = buckets[w1[:PREFIX_LENGTH]]
+            skips = next_other[w1[:PREFIX_LENGTH]]
+            k = bisect_right(positions, i)
+            while k < len(positions):
+                w2 = self.words[positions[k]]
+                if w2 == w1:
+                    k = skips[k]
+                    continue
+                pairs.append(f"{w1}/{w2}")
+                if len(pairs) >= limit:
+                    return pairs
+                k += 1
+        return pairs
+
+    def near_homophones(self, limit: int = 5) -> List[str]:
+        """Różne słowa o tej samej wymowie albo różniące się jednym dźwiękiem"""
+        same_sound = self._pairs(self._keys.get, limit)
+        if len(same_sound) >= limit:
+            return same_sound
+
+        # Indeks podstawień: klucz z jedną literą zamienioną na '*' (poza końcówką)
+        buckets: Dict[str, List[str]] = defaultdict(list)
+        for word in self.distinct:
+            key = self._keys[word]
+            if len(key) >= MIN_SUBSTITUTION_LENGTH:
+                for p in range(len(key) - 2):
+                    buckets[f"{key[:p]}*{key[p + 1:]}"].append(word)
+
+        pairs = list(same_sound)
+        seen = set(same_sound)
+        for bucket in buckets.values():
+            for pair in self._bucket_pairs(bucket):
+                if pair not in seen:
+                    seen.add(pair)
+                    pairs.append(pair)
+                    if len(pairs) >= limit:
+                        return pairs
+        return pairs
+
+    def rhymes(self, limit: int = 5) -> List[str]:
+        """Różnie brzmiące słowa o wspólnej końcówce rymowej"""
+        keys = {word: rhyme_key(word) for word in self.distinct}
+        return self._pairs(keys.get, limit, exclude_same_sound=True)
+
+    def _pairs(self, key_of, limit: int, exclude_same_sound: bool = False) -> List[str]:
+        """Pary słów z tym samym kluczem, w kolejności pierwszego wystąpienia"""
+        buckets: Dict[str, List[str]] = defaultdict(list)
+        # Pozycja słowa w jego kubełku - pary tylko z późniejszymi słowami
+        slots = {}
+        for word in self.distinct:
+            key = key_of(word)
+            if key:
+                slots[word] = (buckets[key], len(buckets[key]))
+                buckets[key].append(word)
+
+        pairs: List[str] = []
+        for word in self.distinct:
+            if word not in slots:
+                continue
+            bucket, slot = slots[word]
+            for j in range(slot + 1, len(bucket)):
+                other = bucket[j]
+                if exclude_same_sound and self._keys[word] == self._keys[other]:
+                    continue
+                pairs.append(f"{word}/{other}")
+                if len(pairs) >= limit:
+                    return pairs
+        return pairs
+
+    @staticmethod
+    def _bucket_pairs(bucket: List[str]) -> Iterator[str]:
+        for i, w1 in enumerate(bucket):
+            for w2 in bucket[i + 1:]:
+                yield f"{w1}/{w2}"
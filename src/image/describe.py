@@ -6,12 +6,16 @@ Describes images using Salesforce BLIP model
 
 import sys
 import json
-import requests
 from io import BytesIO
-from PIL import Image
-from transformers import BlipProcessor, BlipForConditionalGeneration
 import os
 import logging
+from typing import List, Tuple, TYPE_CHECKING
+
+# PIL, requests i transformers (torch) są importowane leniwie w funkcjach -
+# samo `import transformers` trwa sekundy, a CLI przekazujące wywołanie
+# do workera (src/worker) ich nie potrzebuje
+if TYPE_CHECKING:
+    from PIL import Image
 
 # Setup logging
 logging.basicConfig(
@@ -37,6 +41,8 @@ def load_model():
     if processor is None or model is None:
         logger.info(f"Loading BLIP model: {MODEL_NAME}")
         try:
+            from transformers import BlipProcessor, BlipForConditionalGeneration
+            
             processor = BlipProcessor.from_pretrained(MODEL_NAME)
             model = BlipForConditionalGeneration.from_pretrained(MODEL_NAME)
             
@@ -66,8 +72,10 @@ def load_model():
         logger.debug("Model already loaded")
 
 
-def load_image_from_path(file_path: str) -> Image.Image:
+def load_image_from_path(file_path: str) -> 'Image.Image':
     """Load image from file path"""
+    from PIL import Image
+    
     try:
         logger.info(f"Loading image from file: {file_path}")
         image = Image.open(file_path)
@@ -80,8 +88,11 @@ def load_image_from_path(file_path: str) -> Image.Image:
         raise
 
 
-def download_image(url: str) -> Image.Image:
+def download_image(url: str) -> 'Image.Image':
     """Download image from URL (legacy - kept for compatibility)"""
+    import requests
+    from PIL import Image
+    
     try:
         response = requests.get(url, timeout=10, stream=True)
         response.raise_for_status()
@@ -108,6 +119,8 @@ def describe_image(image_path_or_url: str, max_length: int = 50) -> str:
     Returns:
         String description of the image
     """
+    from metrics import stage
+    
     try:
         # Load model if not already loaded
         load_model()
@@ -116,27 +129,31 @@ def describe_image(image_path_or_url: str, max_length: int = 50) -> str:
         # Usuń cudzysłowy jeśli są (z escapeshellarg w PHP)
         clean_path = image_path_or_url.strip().strip("'").strip('"')
         
-        if os.path.exists(clean_path):
-            logger.info(f"Loading image from file: {clean_path}")
-            image = load_image_from_path(clean_path)
-        else:
-            logger.info(f"Downloading image from URL: {clean_path}")
-            image = download_image(clean_path)
+        with stage('blip', 'load_image'):
+            if os.path.exists(clean_path):
+                logger.info(f"Loading image from file: {clean_path}")
+                image = load_image_from_path(clean_path)
+            else:
+                logger.info(f"Downloading image from URL: {clean_path}")
+                image = download_image(clean_path)
         
         # Process image
         logger.debug("Processing image with BLIP")
-        inputs = processor(image, return_tensors="pt")
-        
-        # Move inputs to same device as model
-        if device and device != 'cpu':
-            inputs = {k: v.to(device) for k, v in inputs.items()}
+        with stage('blip', 'preprocess'):
+            inputs = processor(image, return_tensors="pt")
+            
+            # Move inputs to same device as model
+            if device and device != 'cpu':
+                inputs = {k: v.to(device) for k, v in inputs.items()}
         
         # Generate caption
         logger.debug("Generating caption")
-        out = model.generate(**inputs, max_length=max_length)
+        with stage('blip', 'generate'):
+            out = model.generate(**inputs, max_length=max_length)
         
         # Decode caption
-        caption = processor.decode(out[0], skip_special_tokens=True)
+        with stage('blip', 'decode'):
+            caption = processor.decode(out[0], skip_special_tokens=True)
         
         logger.info(f"Generated caption: {caption}")
         return caption
@@ -146,17 +163,23 @@ def describe_image(image_path_or_url: str, max_length: int = 50) -> str:
         raise
 
 
-def main():
-    """Main function - CLI interface"""
-    if len(sys.argv) < 2:
-        print(json.dumps({
+def run_cli(argv: List[str]) -> Tuple[int, str, str]:
+    """
+    Wykonaj CLI dla podanych argumentów (bez nazwy skryptu)
+    
+    Używane przez main() oraz przez długo działający worker (src/worker).
+    
+    Returns:
+        (exit_code, stdout, stderr) - stdout/stderr to JSON jak w CLI
+    """
+    if len(argv) < 1:
+        return 1, '', json.dumps({
             'error': 'Image path or URL required',
             'usage': 'python describe_image.py <image_path_or_url> [max_length]'
-        }), file=sys.stderr)
-        sys.exit(1)
+        })
     
-    image_path_or_url = sys.argv[1]
-    max_length = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    image_path_or_url = argv[0]
+    max_length = int(argv[1]) if len(argv) > 1 else 50
     
     # Usuń cudzysłowy jeśli są (z escapeshellarg w PHP)
     clean_path = image_path_or_url.strip().strip("'").strip('"')
@@ -168,7 +191,7 @@ def main():
             'description': description,
             'image_path_or_url': clean_path
         }
-        print(json.dumps(result))
+        return 0, json.dumps(result), ''
         
     except Exception as e:
         error_result = {
@@ -176,10 +199,20 @@ def main():
             'error': str(e),
             'image_path_or_url': image_path_or_url
         }
-        print(json.dumps(error_result), file=sys.stderr)
-        sys.exit(1)
+        return 1, '', json.dumps(error_result)
+
+
+def main():
+    """Main function - CLI interface (przez worker, jeśli działa)"""
+    # Dodaj ścieżkę do src do PYTHONPATH
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    from worker.client import call_worker, emit_result
+    
+    result = call_worker('describe', sys.argv[1:])
+    if result is None:
+        result = run_cli(sys.argv[1:])
+    emit_result(result)
 
 
 if __name__ == '__main__':
     main()
-
@@ -1,8 +1,12 @@
 """
 JokeAnalyzer - główny analyzer używający 9 teorii humoru
 """
-from typing import Dict, List
-from .models import AnalyzeRequest, AnalyzeResponse, TheoryScore, TheoryType
+import time
+from contextlib import nullcontext
+from typing import Any, Dict, Iterable, List, Optional
+from metrics import stage, collect_timings
+from nlp import cached_doc, parsed_docs, parse
+from .models import AnalyzeRequest, AnalyzeResponse, AnalysisTimings, TheoryScore, TheoryType
 from .analyzers import (
     SetupPunchlineAnalyzer,
     IncongruityAnalyzer,
@@ -30,22 +34,38 @@ class JokeAnalyzer:
     7. Archetypowość (archetypy humoru)
     8. Atomy humorystyczne (mikro-komponenty)
     9. Reverse engineering (mechanizm bez treści)
+    
+    Tryb lite (lite=True) nie ładuje spaCy - zdania i tokeny są wyznaczane
+    regułami, słowniki są te same. Do szybkiego pre-screeningu dużych ilości
+    żartów; porównanie wyników z pełnym trybem:
+    validation/validation_suite.py --compare-lite
     """
     
-    def __init__(self):
-        """Initialize all 9 analyzers"""
+    def __init__(self, lite: bool = False):
+        """
+        Initialize all 9 analyzers
+        
+        Args:
+            lite: Tryb bez spaCy
+        """
+        self.lite = lite
+        use_spacy = not lite
         self.analyzers = {
-            TheoryType.SETUP_PUNCHLINE: SetupPunchlineAnalyzer(),
-            TheoryType.INCONGRUITY: IncongruityAnalyzer(),
-            TheoryType.SEMANTIC_SHIFT: SemanticShiftAnalyzer(),
-            TheoryType.TIMING: TimingAnalyzer(),
-            TheoryType.ABSURD_ESCALATION: AbsurdEscalationAnalyzer(),
-            TheoryType.PSYCHOANALYSIS: PsychoanalysisAnalyzer(),
-            TheoryType.ARCHETYPE: ArchetypeAnalyzer(),
-            TheoryType.HUMOR_ATOMS: HumorAtomsAnalyzer(),
-            TheoryType.REVERSE_ENGINEERING: ReverseEngineeringAnalyzer(),
+            TheoryType.SETUP_PUNCHLINE: SetupPunchlineAnalyzer(use_spacy),
+            TheoryType.INCONGRUITY: IncongruityAnalyzer(use_spacy),
+            TheoryType.SEMANTIC_SHIFT: SemanticShiftAnalyzer(use_spacy),
+            TheoryType.TIMING: TimingAnalyzer(use_spacy),
+            TheoryType.ABSURD_ESCALATION: AbsurdEscalationAnalyzer(use_spacy),
+            TheoryType.PSYCHOANALYSIS: PsychoanalysisAnalyzer(use_spacy),
+            TheoryType.ARCHETYPE: ArchetypeAnalyzer(use_spacy),
+            TheoryType.HUMOR_ATOMS: HumorAtomsAnalyzer(use_spacy),
+            TheoryType.REVERSE_ENGINEERING: ReverseEngineeringAnalyzer(use_spacy),
         }
         
+        # Wspólny model spaCy i suma profili potoku analizerów (nlp.pipelines)
+        self.nlp = next((a.nlp for a in self.analyzers.values() if a.nlp is not None), None)
+        self.spacy_needs = frozenset().union(*(a.SPACY_NEEDS for a in self.analyzers.values()))
+        
         # Weights for different goals
         self.weights = {
             'reach': {
@@ -76,26 +96,108 @@ class JokeAnalyzer:
             request: AnalyzeRequest z tekstem żartu
             
         Returns:
-            AnalyzeResponse z wynikami analizy
+            AnalyzeResponse z wynikami analizy (z timings gdy request.debug_timings)
+        """
+        return self.analyze_sync(request)
+    
+    def analyze_batch(self, requests: List[AnalyzeRequest]) -> List[AnalyzeResponse]:
         """
-        joke_text = request.joke_text
-        context = request.context
+        Analizuj wiele żartów (w kolejności) bez event loop
         
-        # Run all analyzers
-        theory_scores = {}
-        raw_scores = {}
+        Równoległa analiza w wielu procesach: joke_analyser.batch.analyze_parallel
+        """
+        return [self.analyze_sync(request) for request in requests]
+    
+    def analyze_sync(self, request: AnalyzeRequest) -> AnalyzeResponse:
+        """Synchroniczna wersja analyze() (analizery nie wykonują I/O)"""
+        started = time.perf_counter()
+        with collect_timings() if request.debug_timings else nullcontext() as timings:
+            response = self._analyze(request.joke_text, request.context)
+        
+        if timings is not None:
+            response.timings = self._timings(timings, started)
+        
+        return response
+    
+    def _timings(self, timings, started: float) -> AnalysisTimings:
+        """Czasy etapów z metrics.collect_timings (started - time.perf_counter() na początku)"""
+        return AnalysisTimings(
+            analyzers_ms={
+                theory_type.value: timings.total_ms('joke_analyser', theory_type.value)
+                for theory_type in self.analyzers
+            },
+            spacy_parse_ms=timings.total_ms('spacy', 'parse'),
+            spacy_parse_calls=timings.calls('spacy', 'parse'),
+            scoring_ms=timings.total_ms('joke_analyser', 'scoring'),
+            total_ms=round((time.perf_counter() - started) * 1000, 3),
+        )
+    
+    def prepare_docs(self, docs: Dict[str, Any], theories: Optional[Iterable[str]] = None):
+        """
+        Przygotuj paczkę dokumentów sparsowanych przez nlp.pipe (batch)
         
+        Analizery liczą wspólne dane całej paczki naraz (np. zderzenia
+        wektorowe IncongruityAnalyzer - jedno mnożenie macierzy).
+        """
+        selected = set(theories) if theories is not None else None
         for theory_type, analyzer in self.analyzers.items():
-            result = analyzer.analyze(joke_text, context)
-            
-            theory_scores[theory_type.value] = TheoryScore(
+            if selected is None or theory_type.value in selected:
+                analyzer.prepare_docs(docs)
+    
+    def analyze_theories(
+        self,
+        joke_text: str,
+        context: Optional[Dict] = None,
+        theories: Optional[Iterable[str]] = None
+    ) -> Dict[str, Dict]:
+        """
+        Wyniki wybranych teorii (jedno parsowanie dla wszystkich)
+        
+        Args:
+            theories: Nazwy teorii (TheoryType.value); None = wszystkie
+        
+        Returns:
+            {teoria: wynik analizera ('score', 'explanation', 'key_elements')}
+            w kolejności self.analyzers
+        """
+        selected = set(theories) if theories is not None else None
+        # Jedno parsowanie (tylko potrzebne komponenty) zamiast osobnego w każdym analizerze
+        preparse = self.nlp is not None and self.spacy_needs and cached_doc(joke_text) is None
+        if preparse:
+            with stage('spacy', 'parse'):
+                docs = {joke_text: parse(self.nlp, joke_text, self.spacy_needs)}
+        
+        results = {}
+        with parsed_docs(docs) if preparse else nullcontext():
+            for theory_type, analyzer in self.analyzers.items():
+                if selected is not None and theory_type.value not in selected:
+                    continue
+                with stage('joke_analyser', theory_type.value):
+                    results[theory_type.value] = analyzer.analyze(joke_text, context)
+        return results
+    
+    def _analyze(self, joke_text: str, context: Optional[Dict]) -> AnalyzeResponse:
+        """Uruchom analizery i policz wyniki (etapy mierzone przez metrics.stage)"""
+        theory_scores = {}
+        raw_scores = {}
+        for theory, result in self.analyze_theories(joke_text, context).items():
+            theory_scores[theory] = TheoryScore(
                 score=result['score'],
                 explanation=result['explanation'],
                 key_elements=result.get('key_elements', [])
             )
-            
-            raw_scores[theory_type] = result['score']
+            raw_scores[TheoryType(theory)] = result['score']
         
+        with stage('joke_analyser', 'scoring'):
+            return self._score(joke_text, theory_scores, raw_scores)
+    
+    def _score(
+        self,
+        joke_text: str,
+        theory_scores: Dict[str, TheoryScore],
+        raw_scores: Dict[TheoryType, float]
+    ) -> AnalyzeResponse:
+        """Oblicz wyniki zbiorcze, rekomendacje i segmenty"""
         # Calculate overall score (weighted average)
         overall_score = sum(raw_scores.values()) / len(raw_scores)
         
@@ -12,26 +12,18 @@ Waldusiowy styl to eskalacja:
 "internet padł" → "Walduś umiera" → "Walduś będzie miał grób 404" → "Twoje koty mnie dobijają"
 """
 from typing import Dict, Optional, List
+from lexicon import Lexicon
 from .base import BaseAnalyzer
 
 
 class AbsurdEscalationAnalyzer(BaseAnalyzer):
     """Analiza eskalacji absurdu"""
     
-    # Levels of absurdity (markers)
-    ABSURDITY_LEVELS = {
-        1: ['normalnie', 'zwykle', 'codziennie', 'standardowo'],  # Baseline
-        3: ['dziwnie', 'niezwykle', 'nietypowo', 'niespodziewanie'],  # Mild
-        5: ['absurdalnie', 'szalenie', 'kompletnie', 'totalnie'],  # Medium
-        7: ['kosmicznie', 'transcendentalnie', 'nieskończenie'],  # High
-        10: ['kwantowo', 'metafizycznie', 'ontologicznie'],  # Peak chaos
-    }
+    # Tylko podział na zdania (senter zamiast pełnego potoku)
+    SPACY_NEEDS = frozenset({'sents'})
     
-    # Escalation markers
-    ESCALATION_MARKERS = [
-        'jeszcze', 'nawet', 'aż', 'dopiero', 'w końcu',
-        'coraz', 'bardziej', 'i to', 'mało tego'
-    ]
+    # Poziomy absurdu i markery eskalacji: src/lexicon/data/absurd_escalation.json
+    LEXICON = 'absurd_escalation'
     
     def analyze(self, joke_text: str, context: Optional[Dict] = None) -> Dict:
         """
@@ -44,19 +36,20 @@ class AbsurdEscalationAnalyzer(BaseAnalyzer):
         """
         text_lower = joke_text.lower()
         sentences = self._get_sentences(joke_text)
+        lexicon = self.lexicon
         
         score = 0.0
         key_elements = []
         
         # 1. Detect absurdity level
-        detected_level = self._detect_absurdity_level(text_lower)
+        detected_level = self._detect_absurdity_level(text_lower, lexicon)
         if detected_level > 0:
             score += detected_level * 0.8
             key_elements.append(f"Poziom absurdu: {detected_level}/10")
         
         # 2. Detect escalation markers
         escalation_count = sum(
-            1 for marker in self.ESCALATION_MARKERS 
+            1 for marker in lexicon['escalation_markers'].markers
             if f' {marker} ' in f' {text_lower} '
         )
         if escalation_count > 0:
@@ -94,13 +87,15 @@ class AbsurdEscalationAnalyzer(BaseAnalyzer):
             'key_elements': key_elements
         }
     
-    def _detect_absurdity_level(self, text: str) -> int:
+    def _detect_absurdity_level(self, text: str, lexicon: Lexicon) -> int:
         """Wykryj poziom absurdu (0-10)"""
         max_level = 0
         
-        for level, markers in self.ABSURDITY_LEVELS.items():
-            if any(marker in text for marker in markers):
-                max_level = max(max_level, level)
+        levels = lexicon['absurdity_levels']
+        found = levels.scan(text)
+        for level, markers in levels.items():
+            if markers.matches(found):
+                max_level = max(max_level, int(level))
         
         return max_level
     
@@ -21,52 +21,8 @@ from .base import BaseAnalyzer
 class ArchetypeAnalyzer(BaseAnalyzer):
     """Analiza archetypów humoru"""
     
-    # Archetypes and their markers
-    ARCHETYPES = {
-        'trickster': {
-            'markers': ['oszukać', 'nabrać', 'podpuścić', 'wykiwać', 'sprytnie'],
-            'score_base': 7.0,
-            'description': 'Podstępny żartowniś'
-        },
-        'cynic': {
-            'markers': ['oczywiście', 'naturalnie', 'jak zwykle', 'tradycyjnie', 'pewnie'],
-            'score_base': 8.0,
-            'description': 'Sarkastyczny cynik'
-        },
-        'jester': {
-            'markers': ['hehehe', 'haha', 'hehe', 'ups', 'ojej', 'ale numer'],
-            'score_base': 6.0,
-            'description': 'Wesołek/błazen'
-        },
-        'philosopher': {
-            'markers': ['właściwie', 'w istocie', 'de facto', 'ontologicznie', 'metafizycznie'],
-            'score_base': 7.5,
-            'description': 'Filozofujący mędrzec'
-        },
-        'victim': {
-            'markers': ['znowu', 'zawsze ja', 'dlaczego ja', 'moje życie', 'pech'],
-            'score_base': 7.0,
-            'description': 'Ofiara losu'
-        },
-        'nihilist': {
-            'markers': ['bez sensu', 'nicość', 'pustka', 'wszystko jedno', 'co za różnica'],
-            'score_base': 9.0,
-            'description': 'Nihilista (Walduś style)'
-        },
-        'rebel': {
-            'markers': ['nie będę', 'odmawiam', 'nie chce mi się', 'mam to gdzieś'],
-            'score_base': 7.5,
-            'description': 'Buntownik'
-        },
-    }
-    
-    # Polish archetypes (cultural)
-    POLISH_ARCHETYPES = {
-        'wujek ze Śląska': ['wujek', 'śląsk', 'ślązak', 'hasiok', 'piwo'],
-        'teściowa': ['teściowa', 'teść', 'żona matka'],
-        'janusz': ['janusz', 'grażyna', 'działka', 'majsterkować'],
-        'student': ['sesja', 'egzamin', 'zaliczenie', 'wykład', 'indeks'],
-    }
+    # Znaczniki archetypów: src/lexicon/data/archetype.json
+    LEXICON = 'archetype'
     
     def analyze(self, joke_text: str, context: Optional[Dict] = None) -> Dict:
         """
@@ -77,22 +33,26 @@ class ArchetypeAnalyzer(BaseAnalyzer):
         - Czy jest spójny z twistem?
         """
         text_lower = joke_text.lower()
+        lexicon = self.lexicon
         
         score = 0.0
         key_elements = []
         detected_archetypes = []
         
         # 1. Detect universal archetypes
-        for archetype_name, archetype_data in self.ARCHETYPES.items():
-            markers = archetype_data['markers']
-            if any(marker in text_lower for marker in markers):
-                score += archetype_data['score_base'] * 0.5
+        archetypes = lexicon['archetypes']
+        found = archetypes.scan(text_lower)
+        for archetype_name, archetype in archetypes.items():
+            if archetype.matches(found):
+                score += archetype['score_base'] * 0.5
                 detected_archetypes.append(archetype_name)
-                key_elements.append(f"Archetyp: {archetype_data['description']}")
+                key_elements.append(f"Archetyp: {archetype['description']}")
         
         # 2. Detect Polish archetypes (bonus for cultural relatability)
-        for polish_archetype, markers in self.POLISH_ARCHETYPES.items():
-            if any(marker in text_lower for marker in markers):
+        polish_archetypes = lexicon['polish_archetypes']
+        found = polish_archetypes.scan(text_lower)
+        for polish_archetype, markers in polish_archetypes.items():
+            if markers.matches(found):
                 score += 2.5
                 key_elements.append(f"Polski archetyp: {polish_archetype}")
         
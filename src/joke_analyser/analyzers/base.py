@@ -1,31 +1,57 @@
 """
 BaseAnalyzer - klasa bazowa dla wszystkich analizerów
 """
+import re
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
-import spacy
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+from nlp import load_spacy_model, cached_doc, covers, parse
+from metrics import stage
+from lexicon import Lexicon, lexicons
+
+# Podział na zdania bez spaCy (tryb lite albo brak modelu)
+SENTENCE_END = re.compile(r'[.!?]+')
 
 
 class BaseAnalyzer(ABC):
     """Klasa bazowa dla analizerów teorii humoru"""
     
-    def __init__(self):
-        """Initialize analyzer"""
+    # Słownik analizera w src/lexicon/data (None = znaczniki tylko w kodzie)
+    LEXICON: Optional[str] = None
+    
+    # Atrybuty spaCy używane przez analizer (nlp.pipelines) - tylko te komponenty są uruchamiane
+    SPACY_NEEDS: FrozenSet[str] = frozenset()
+    
+    # Moduły spoza pliku analizera, od których zależy wynik (wersja teorii w ResultStore)
+    SHARED_MODULES: Tuple[str, ...] = ()
+    
+    def __init__(self, use_spacy: bool = True):
+        """
+        Initialize analyzer
+        
+        Args:
+            use_spacy: False = tryb lite (bez ładowania spaCy; zdania i tokeny z reguł)
+        """
         self.nlp = None
-        self._load_models()
+        if use_spacy:
+            self._load_models()
     
     def _load_models(self):
-        """Load NLP models (lazy loading)"""
+        """Load NLP models (jedna instancja współdzielona przez wszystkie analizery)"""
         try:
-            self.nlp = spacy.load("pl_core_news_lg")
+            self.nlp = load_spacy_model("pl_core_news_lg")
         except OSError:
             # Fallback to smaller model
             try:
-                self.nlp = spacy.load("pl_core_news_sm")
+                self.nlp = load_spacy_model("pl_core_news_sm")
             except OSError:
                 print("Warning: spaCy Polish model not found. Install with: python -m spacy download pl_core_news_lg")
                 self.nlp = None
     
+    @property
+    def lexicon(self) -> Lexicon:
+        """Aktualna wersja słownika (pobierać raz na analizę - może zostać podmieniony w locie)"""
+        return lexicons.get(self.LEXICON)
+    
     @abstractmethod
     def analyze(self, joke_text: str, context: Optional[Dict] = None) -> Dict:
         """
@@ -40,26 +66,38 @@ class BaseAnalyzer(ABC):
         """
         pass
     
+    def prepare_docs(self, docs: Dict[str, Any]):
+        """Obliczenia wspólne dla paczki sparsowanych dokumentów (tekst -> Doc) przed analizą"""
+        pass
+    
+    def _parse(self, text: str, needs: Iterable[str] = ()):
+        """Przetwórz tekst komponentami spaCy potrzebnymi dla `needs` (etap spacy/parse)"""
+        doc = cached_doc(text)
+        if doc is not None and covers(doc, needs):
+            # Sparsowany wcześniej (JokeAnalyzer, nlp.pipe w analizie paczek)
+            return doc
+        with stage('spacy', 'parse'):
+            return parse(self.nlp, text, needs)
+    
     def _tokenize(self, text: str) -> List[str]:
         """Tokenizuj tekst"""
         if self.nlp:
-            doc = self.nlp(text)
+            doc = self._parse(text)
             return [token.text for token in doc]
         return text.split()
     
     def _get_sentences(self, text: str) -> List[str]:
         """Podziel na zdania"""
         if self.nlp:
-            doc = self.nlp(text)
+            doc = self._parse(text, ('sents',))
             return [sent.text.strip() for sent in doc.sents]
         # Fallback: split on . ! ?
-        import re
-        return [s.strip() for s in re.split(r'[.!?]+', text) if s.strip()]
+        return [s.strip() for s in SENTENCE_END.split(text) if s.strip()]
     
     def _get_pos_tags(self, text: str) -> List[tuple]:
         """Get POS tags"""
         if self.nlp:
-            doc = self.nlp(text)
+            doc = self._parse(text, ('pos',))
             return [(token.text, token.pos_) for token in doc]
         return []
     
@@ -20,37 +20,8 @@ from .base import BaseAnalyzer
 class HumorAtomsAnalyzer(BaseAnalyzer):
     """Analiza atomów humorystycznych (mikro-komponenty)"""
     
-    # Humor atoms and their markers
-    HUMOR_ATOMS = {
-        'hyperbole': {
-            'markers': ['nigdy', 'zawsze', 'wszystko', 'nic', 'wieczność', 'milion', 'nieskończenie'],
-            'weight': 1.0
-        },
-        'contrast': {
-            'markers': ['ale', 'jednak', 'z drugiej strony', 'natomiast', 'przeciwnie'],
-            'weight': 1.5
-        },
-        'anticlimax': {
-            'markers': ['okazuje się', 'w rzeczywistości', 'niestety', 'niespodziewanie'],
-            'weight': 1.5
-        },
-        'self_deprecation': {
-            'markers': ['głupi', 'idiota', 'debil', 'nieudacznik', 'fail', 'porażka'],
-            'weight': 1.2
-        },
-        'sarcasm': {
-            'markers': ['oczywiście', 'naturalnie', 'jak zwykle', 'pewnie', 'tradycyjnie'],
-            'weight': 1.8
-        },
-        'absurd_syntax': {
-            'markers': ['???', '!?', '...?!', '!!!'],
-            'weight': 1.0
-        },
-        'register_shift': {
-            'markers': ['kurczę', 'cholera', 'ziomek', 'stary', 'koles'],
-            'weight': 1.5
-        },
-    }
+    # Znaczniki atomów i ich wagi: src/lexicon/data/humor_atoms.json
+    LEXICON = 'humor_atoms'
     
     def analyze(self, joke_text: str, context: Optional[Dict] = None) -> Dict:
         """
@@ -68,17 +39,13 @@ class HumorAtomsAnalyzer(BaseAnalyzer):
         detected_atoms = []
         
         # Detect each humor atom
-        for atom_name, atom_data in self.HUMOR_ATOMS.items():
-            markers = atom_data['markers']
-            weight = atom_data['weight']
-            
-            count = sum(
-                1 for marker in markers 
-                if marker in text_lower
-            )
+        atoms = self.lexicon['humor_atoms']
+        found = atoms.scan(text_lower)
+        for atom_name, atom in atoms.items():
+            count = atom.count(found)
             
             if count > 0:
-                score += count * weight
+                score += count * atom['weight']
                 detected_atoms.append(atom_name)
                 key_elements.append(f"{atom_name}: {count}x")
         
@@ -13,14 +13,34 @@ Przykłady niespójności:
 - ludzkie ↔ nieludzkie (np. Walduś: „byt cyfrowy z dramatem człowieka")
 - logiczne ↔ chaotyczne
 - powaga ↔ absurd
+
+Z modelem z wektorami (pl_core_news_lg) pary domen są wykrywane także
+wektorowo (nlp.vectors.DomainClashDetector) - słowa spoza list, ale bliskie
+obu domenom pary. Bez wektorów (lite, brak modelu) zostają same listy.
+Dopóki zderzenia wektorowe nie są punktowane (VECTOR_CLASH_SCORE = 0),
+detektor nie jest uruchamiany. W analizie paczek (batch) zderzenia całego
+kawałka są liczone jednym mnożeniem macierzy (prepare_docs).
 """
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 from .base import BaseAnalyzer
 
 
 class IncongruityAnalyzer(BaseAnalyzer):
     """Analiza teorii niespójności (incongruity)"""
     
+    # Minimalne podobieństwo kosinusowe słowa do centroidu domeny (DomainClashDetector)
+    CLASH_SIMILARITY = 0.45
+    
+    SHARED_MODULES = ('nlp.vectors',)
+    
+    # Punkty za zderzenie wykryte wektorowo. CLASH_SIMILARITY dobrano na syntetycznych
+    # wektorach - do czasu walidacji na pl_core_news_lg (validation_suite + raport
+    # różnic) wynosi 0 - detektor jest wtedy pomijany
+    VECTOR_CLASH_SCORE = 0.0
+    
+    # Zderzenia policzone dla paczki (prepare_docs) - w Doc.user_data
+    CLASHES_KEY = 'incongruity_vector_clashes'
+    
     # Domain pairs (niespójności)
     INCONGRUITY_PAIRS = [
         # Wysokie ↔ Niskie
@@ -81,6 +101,16 @@ class IncongruityAnalyzer(BaseAnalyzer):
                 detected_pairs.append(f"{high_domain[0]}↔{low_domain[0]}")
                 key_elements.append(f"Clash: {high_domain[0]} + {low_domain[0]}")
         
+        # 1b. Domain clashes from word vectors (pairs not found by the lists)
+        vector_clashes = [
+            clash for clash in self._vector_clashes(joke_text)
+            if clash['pair'] not in detected_pairs
+        ]
+        for clash in vector_clashes:
+            score += self.VECTOR_CLASH_SCORE
+            detected_pairs.append(clash['pair'])
+            key_elements.append(f"Clash: {clash['words'][0]} + {clash['words'][1]} (wektory)")
+        
         # 2. Detect contrast markers
         contrast_count = sum(
             1 for marker in self.CONTRAST_MARKERS 
@@ -100,7 +130,7 @@ class IncongruityAnalyzer(BaseAnalyzer):
             key_elements.append("Antropomorfizacja")
         
         # 4. Semantic distance (words that don't belong together)
-        semantic_clash = self._detect_semantic_clash(text_lower)
+        semantic_clash = self._detect_semantic_clash(text_lower) or bool(vector_clashes)
         if semantic_clash:
             score += 1.5
             key_elements.append("Zderzenie semantyczne")
@@ -123,6 +153,33 @@ class IncongruityAnalyzer(BaseAnalyzer):
             'key_elements': key_elements
         }
     
+    def prepare_docs(self, docs: Dict[str, Any]):
+        """Zderzenia wektorowe wszystkich dokumentów paczki - jedno mnożenie macierzy"""
+        detector = self._clash_detector()
+        if detector is None or not docs:
+            return
+        for doc, clashes in zip(docs.values(), detector.clashes_batch(list(docs.values()))):
+            doc.user_data[self.CLASHES_KEY] = clashes
+    
+    def _vector_clashes(self, joke_text: str) -> List[Dict]:
+        """Zderzenia par domen na wektorach słów (pusta lista bez wektorów i punktów)"""
+        detector = self._clash_detector()
+        if detector is None:
+            return []
+        doc = self._parse(joke_text)
+        clashes = doc.user_data.get(self.CLASHES_KEY)
+        return clashes if clashes is not None else detector.clashes(doc)
+    
+    def _clash_detector(self):
+        """DomainClashDetector dla modelu (budowany raz; None bez wektorów albo przy VECTOR_CLASH_SCORE = 0)"""
+        if self.nlp is None or self.VECTOR_CLASH_SCORE <= 0:
+            return None
+        if getattr(self, '_detector_nlp', None) is not self.nlp:
+            from nlp.vectors import DomainClashDetector
+            self._detector = DomainClashDetector.for_nlp(self.nlp, self.INCONGRUITY_PAIRS, self.CLASH_SIMILARITY)
+            self._detector_nlp = self.nlp
+        return self._detector
+    
     def _detect_semantic_clash(self, text: str) -> bool:
         """
         Wykryj słowa, które nie powinny być razem
@@ -22,21 +22,8 @@ from .base import BaseAnalyzer
 class PsychoanalysisAnalyzer(BaseAnalyzer):
     """Analiza psychoanalityczna humoru"""
     
-    # Psychological states
-    PSYCHOLOGICAL_STATES = {
-        'despair': ['rozpacz', 'beznadziejność', 'pustek', 'nicość', 'koniec'],
-        'anger': ['wkurza', 'denerwuje', 'wścieka', 'frustruje', 'irytuje'],
-        'sadness': ['smutek', 'żal', 'tęsknota', 'samotność', 'melancholia'],
-        'fear': ['strach', 'lęk', 'obawa', 'panika', 'przerażenie'],
-        'self-deprecation': ['głupi', 'idiota', 'debil', 'nieudacznik', 'fail'],
-        'projection': ['to nie ja', 'to ty', 'to oni', 'wina nie moja'],
-    }
-    
-    # Defense mechanisms
-    DEFENSE_MECHANISMS = [
-        'przecież', 'właściwie', 'w sumie', 'no dobra',
-        'może', 'chyba', 'jakby', 'niby'
-    ]
+    # Stany psychiczne i mechanizmy obronne: src/lexicon/data/psychoanalysis.json
+    LEXICON = 'psychoanalysis'
     
     def analyze(self, joke_text: str, context: Optional[Dict] = None) -> Dict:
         """
@@ -48,21 +35,24 @@ class PsychoanalysisAnalyzer(BaseAnalyzer):
         - Projekcję, racjonalizację
         """
         text_lower = joke_text.lower()
+        lexicon = self.lexicon
         
         score = 0.0
         key_elements = []
         detected_states = []
         
         # 1. Detect psychological states
-        for state_name, markers in self.PSYCHOLOGICAL_STATES.items():
-            if any(marker in text_lower for marker in markers):
+        states = lexicon['psychological_states']
+        found = states.scan(text_lower)
+        for state_name, markers in states.items():
+            if markers.matches(found):
                 score += 2.0
                 detected_states.append(state_name)
                 key_elements.append(f"Stan: {state_name}")
         
         # 2. Detect defense mechanisms
         defense_count = sum(
-            1 for marker in self.DEFENSE_MECHANISMS 
+            1 for marker in lexicon['defense_mechanisms'].markers
             if f' {marker} ' in f' {text_lower} '
         )
         if defense_count > 0:
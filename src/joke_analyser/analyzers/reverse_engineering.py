@@ -22,33 +22,8 @@ from .base import BaseAnalyzer
 class ReverseEngineeringAnalyzer(BaseAnalyzer):
     """Analiza reverse engineering (ekstrakcja mechanizmu)"""
     
-    # Mechanisms (patterns)
-    MECHANISMS = {
-        'anthropomorphization': {
-            'markers': ['czuję', 'myślę', 'chcę', 'boję się', 'kocham', 'nienawidzę'],
-            'description': 'Antropomorfizacja (tech → human)'
-        },
-        'everyday_frustration': {
-            'markers': ['znowu', 'jak zwykle', 'zawsze tak', 'nigdy nie', 'dlaczego'],
-            'description': 'Frustracja codzienna'
-        },
-        'absurd_transfer': {
-            'markers': ['jak', 'jakby', 'przypomina', 'niczym', 'jest jak'],
-            'description': 'Absurdalne przeniesienie'
-        },
-        'aggressive_tone': {
-            'markers': ['!', 'kurczę', 'cholera', 'no nie', 'serio'],
-            'description': 'Agresywny ton'
-        },
-        'rhetorical_question': {
-            'markers': ['?', 'czy', 'co ja', 'co ty', 'jak to'],
-            'description': 'Pytanie retoryczne'
-        },
-        'meta_commentary': {
-            'markers': ['czyli', 'innymi słowy', 'to znaczy', 'wiem że'],
-            'description': 'Meta-komentarz'
-        },
-    }
+    # Mechanizmy i ich znaczniki: src/lexicon/data/reverse_engineering.json
+    LEXICON = 'reverse_engineering'
     
     def analyze(self, joke_text: str, context: Optional[Dict] = None) -> Dict:
         """
@@ -66,19 +41,15 @@ class ReverseEngineeringAnalyzer(BaseAnalyzer):
         detected_mechanisms = []
         
         # Detect mechanisms
-        for mechanism_name, mechanism_data in self.MECHANISMS.items():
-            markers = mechanism_data['markers']
-            description = mechanism_data['description']
-            
-            count = sum(
-                1 for marker in markers 
-                if marker in text_lower
-            )
+        mechanisms = self.lexicon['mechanisms']
+        found = mechanisms.scan(text_lower)
+        for mechanism_name, mechanism in mechanisms.items():
+            count = mechanism.count(found)
             
             if count > 0:
                 score += count * 1.5
                 detected_mechanisms.append(mechanism_name)
-                key_elements.append(description)
+                key_elements.append(mechanism['description'])
         
         # Bonus: multiple mechanisms (complex pattern)
         if len(detected_mechanisms) >= 3:
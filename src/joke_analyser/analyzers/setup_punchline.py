@@ -14,6 +14,9 @@ import re
 class SetupPunchlineAnalyzer(BaseAnalyzer):
     """Analiza struktury setup-punchline"""
     
+    # Tylko podział na zdania (senter zamiast pełnego potoku)
+    SPACY_NEEDS = frozenset({'sents'})
+    
     # Markers dla setupu (normalna sytuacja)
     SETUP_MARKERS = [
         'kiedy', 'gdy', 'jeśli', 'zawsze', 'często', 'zazwyczaj',
@@ -18,6 +18,9 @@ from .base import BaseAnalyzer
 class TimingAnalyzer(BaseAnalyzer):
     """Analiza mechaniki timingowej"""
     
+    # Tylko podział na zdania (senter zamiast pełnego potoku)
+    SPACY_NEEDS = frozenset({'sents'})
+    
     def analyze(self, joke_text: str, context: Optional[Dict] = None) -> Dict:
         """
         Analiza timing i rytmu
@@ -0,0 +1,250 @@
+"""
+Równoległa analiza wielu żartów w procesach roboczych
+
+Analizery są czysto CPU (spaCy + reguły), więc wątki nie pomagają (GIL) -
+paczka jest dzielona na kawałki i rozdzielana między procesy. Na Linuksie
+procesy powstają przez fork() po zbudowaniu JokeAnalyzer w procesie
+głównym, więc modele spaCy nie są ładowane ponownie (copy-on-write, jak
+w api/prefork.py). Przy spawn (macOS, Windows) każdy proces buduje własny
+analyzer w initializerze.
+
+Każdy kawałek jest parsowany raz (nlp.pipe, tylko komponenty potrzebne
+analizerom), a analizery korzystają z gotowych dokumentów (nlp.parsed_docs)
+zamiast parsować tekst osobno. Dane wspólne dla kawałka (np. zderzenia
+wektorowe) analizery liczą raz (JokeAnalyzer.prepare_docs).
+
+analyze_stream przetwarza dowolnie długi strumień (np. plik JSONL) ze stałą
+pamięcią - w locie jest najwyżej kilka kawałków na proces.
+
+analyze_theories_parallel liczy tylko wybrane teorie (np. te, których
+brakuje w ResultStore) - z tym samym parsowaniem raz na kawałek.
+
+analyze_parallel(dedupe=NearDuplicateIndex(...)) analizuje tylko jednego
+przedstawiciela każdej grupy prawie-duplikatów (także z wcześniejszych paczek
+zapisanych w indeksie) - pozostałe dostają kopię jego wyniku.
+
+Przykład:
+    results = analyze_parallel(texts, processes=4)
+    for text, result in zip(texts, results):
+        if isinstance(result, Exception): ...
+"""
+import os
+import itertools
+from functools import partial
+import multiprocessing
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+from metrics import stage
+from nlp import parsed_docs, pipe
+from .analyzer import JokeAnalyzer
+from .models import AnalyzeRequest, AnalyzeResponse
+from .near_duplicates import NearDuplicateIndex, normalize
+from .result_store import joke_hash
+
+# Analyzer procesu roboczego (odziedziczony przez fork albo z _init_worker)
+_worker_analyzer: Optional[JokeAnalyzer] = None
+
+BatchResult = Union[AnalyzeResponse, Exception]
+TheoriesResult = Union[Dict[str, Dict], Exception]
+
+
+def _init_worker(lite: bool = False):
+    global _worker_analyzer
+    if _worker_analyzer is None or _worker_analyzer.lite != lite:
+        _worker_analyzer = JokeAnalyzer(lite=lite)
+
+
+def _use_analyzer(analyzer: Optional[JokeAnalyzer], lite: bool) -> bool:
+    """Ustaw analyzer procesu głównego; zwraca tryb (lite) dla procesów roboczych"""
+    global _worker_analyzer
+    if analyzer is not None:
+        _worker_analyzer = analyzer
+        return analyzer.lite
+    _init_worker(lite)
+    return lite
+
+
+def _analyze_chunk(texts: List[str], theories: Optional[Sequence[str]] = None) -> List[BatchResult]:
+    """
+    Analizuj kawałek paczki; błędy (np. walidacji) są zwracane, nie rzucane
+
+    Z `theories` wynikiem są słowniki JokeAnalyzer.analyze_theories zamiast AnalyzeResponse.
+    """
+    nlp = _worker_analyzer.nlp
+    docs = {}
+    if nlp is not None and _worker_analyzer.spacy_needs:
+        unique = list(dict.fromkeys(texts))
+        with stage('spacy', 'pipe'):
+            docs = dict(zip(unique, pipe(nlp, unique, _worker_analyzer.spacy_needs, batch_size=len(unique))))
+    _worker_analyzer.prepare_docs(docs, theories)
+
+    results: List[BatchResult] = []
+    with parsed_docs(docs):
+        for text in texts:
+            try:
+                request = AnalyzeRequest(joke_text=text)
+                if theories is None:
+                    results.append(_worker_analyzer.analyze_sync(request))
+                else:
+                    results.append(_worker_analyzer.analyze_theories(request.joke_text, request.context, theories))
+            except Exception as e:
+                # ValueError zamiast oryginału - nie każdy wyjątek (pydantic) da się przesłać między procesami
+                results.append(ValueError(f"{type(e).__name__}: {e}"))
+    return results
+
+
+def _executor(processes: int, lite: bool) -> Executor:
+    """Pula procesów; przy fork analyzer (zbudowany przez _use_analyzer) jest dziedziczony"""
+    if 'fork' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('fork')
+    else:
+        context = multiprocessing.get_context('spawn')
+    return ProcessPoolExecutor(
+        max_workers=processes, mp_context=context, initializer=_init_worker, initargs=(lite,)
+    )
+
+
+def representatives(texts: List[str], index: NearDuplicateIndex) -> List[str]:
+    """
+    Tekst przedstawiciela grupy prawie-duplikatów dla każdego tekstu
+
+    Tekst bez prawie-duplikatu w indeksie jest do niego dodawany (klucz
+    joke_hash) i sam jest przedstawicielem.
+    """
+    result = []
+    for text in texts:
+        # Pusty po normalizacji (np. sama interpunkcja) - brak shingli, nie grupujemy
+        if not normalize(text):
+            result.append(text)
+            continue
+        signature = index.signature(text)
+        match = index.find_duplicate(text, signature=signature)
+        if match is None:
+            index.add(joke_hash(text), text, signature)
+            result.append(text)
+        else:
+            result.append(index.text(match[0]))
+    return result
+
+
+def analyze_parallel(
+    texts: List[str],
+    processes: Optional[int] = None,
+    chunk_size: int = 8,
+    analyzer: Optional[JokeAnalyzer] = None,
+    lite: bool = False,
+    dedupe: Optional[NearDuplicateIndex] = None
+) -> List[BatchResult]:
+    """
+    Analizuj żarty w wielu procesach
+
+    Args:
+        texts: Teksty żartów (bez dedupe duplikaty są analizowane osobno)
+        processes: Liczba procesów (domyślnie liczba CPU); 1 = w bieżącym procesie
+        chunk_size: Liczba żartów na zadanie procesu roboczego
+        analyzer: Gotowy analyzer (współdzielony z procesami przez fork)
+        lite: Tryb bez spaCy (gdy nie podano analyzera)
+        dedupe: Indeks prawie-duplikatów - analizowany jest tylko przedstawiciel
+            grupy, pozostałe żarty dostają jego wynik (z własnym joke_text)
+
+    Returns:
+        Wyniki w kolejności `texts`: AnalyzeResponse albo wyjątek dla żartów,
+        których nie udało się przeanalizować
+    """
+    if dedupe is not None:
+        reps = representatives(texts, dedupe)
+        unique = list(dict.fromkeys(reps))
+        analyzed = dict(zip(unique, analyze_parallel(unique, processes, chunk_size, analyzer, lite)))
+        return [
+            analyzed[rep] if rep == text or isinstance(analyzed[rep], Exception)
+            else analyzed[rep].model_copy(update={'joke_text': text})
+            for text, rep in zip(texts, reps)
+        ]
+
+    return _run_chunks(texts, processes, chunk_size, analyzer, lite)
+
+
+def analyze_theories_parallel(
+    texts: List[str],
+    theories: Sequence[str],
+    processes: Optional[int] = None,
+    chunk_size: int = 8,
+    analyzer: Optional[JokeAnalyzer] = None,
+    lite: bool = False
+) -> List[TheoriesResult]:
+    """
+    Wyniki wybranych teorii dla wielu żartów (jak analyze_parallel)
+
+    Returns:
+        W kolejności `texts`: {teoria: wynik analizera} albo wyjątek
+    """
+    return _run_chunks(texts, processes, chunk_size, analyzer, lite, tuple(theories))
+
+
+def _run_chunks(
+    texts: List[str],
+    processes: Optional[int],
+    chunk_size: int,
+    analyzer: Optional[JokeAnalyzer],
+    lite: bool,
+    theories: Optional[Sequence[str]] = None
+) -> list:
+    lite = _use_analyzer(analyzer, lite)
+    analyze_chunk = partial(_analyze_chunk, theories=theories)
+
+    processes = processes or os.cpu_count() or 1
+    chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+    processes = min(processes, len(chunks))
+
+    if processes <= 1:
+        return [result for chunk in chunks for result in analyze_chunk(chunk)]
+
+    with _executor(processes, lite) as executor:
+        return [result for chunk_results in executor.map(analyze_chunk, chunks) for result in chunk_results]
+
+
+def analyze_stream(
+    texts: Iterable[str],
+    processes: Optional[int] = None,
+    chunk_size: int = 64,
+    analyzer: Optional[JokeAnalyzer] = None,
+    lite: bool = False
+) -> Iterator[List[BatchResult]]:
+    """
+    Analizuj strumień żartów kawałkami, w kolejności wejścia
+
+    W przeciwieństwie do executor.map (który od razu pobiera całe wejście)
+    w locie są najwyżej 2 kawałki na proces, więc pamięć nie rośnie
+    z rozmiarem wejścia.
+
+    Args:
+        texts: Dowolny iterowalny strumień tekstów
+        processes: Liczba procesów (domyślnie liczba CPU); 1 = w bieżącym procesie
+        chunk_size: Liczba żartów w kawałku (jedno wywołanie nlp.pipe)
+        analyzer: Gotowy analyzer (współdzielony z procesami przez fork)
+        lite: Tryb bez spaCy (gdy nie podano analyzera)
+
+    Yields:
+        Wyniki kolejnych kawałków (listy długości chunk_size, ostatnia krótsza)
+    """
+    lite = _use_analyzer(analyzer, lite)
+
+    iterator = iter(texts)
+    chunks = iter(lambda: list(itertools.islice(iterator, chunk_size)), [])
+    processes = processes or os.cpu_count() or 1
+
+    if processes <= 1:
+        for chunk in chunks:
+            yield _analyze_chunk(chunk)
+        return
+
+    with _executor(processes, lite) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_analyze_chunk, chunk))
+            if len(pending) >= processes * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
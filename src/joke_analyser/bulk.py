@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+Analiza dużych korpusów żartów z pliku (JSONL/CSV) do JSONL albo Parquet
+
+    PYTHONPATH=src python -m joke_analyser.bulk in.jsonl out.jsonl
+    PYTHONPATH=src python -m joke_analyser.bulk in.csv out.parquet --processes 4
+
+Wejście jest czytane strumieniowo, analizowane kawałkami w procesach
+roboczych (batch.analyze_stream - jeden nlp.pipe na kawałek) i zapisywane
+przyrostowo, więc pamięć nie zależy od rozmiaru korpusu. Po każdym kawałku
+zapisywany jest checkpoint (<wyjście>.checkpoint.json) - po przerwaniu
+ponowne uruchomienie z tymi samymi argumentami kontynuuje od ostatniego
+zapisanego kawałka.
+
+Parquet jest zapisywany jako katalog plików part-NNNNN.parquet (jeden na
+kilka kawałków) - plik Parquet nie da się dopisywać, a katalog czytają
+pandas.read_parquet i pyarrow.dataset. Wymaga pyarrow.
+
+--dedupe-index PATH odrzuca prawie-duplikaty (near_duplicates, MinHash) przed
+analizą: rekord podobny do wcześniejszego (z tego korpusu albo z poprzednich
+uruchomień z tym samym indeksem) dostaje tylko kolumnę duplicate_of z id
+tamtego rekordu. Indeks jest zapisywany razem z checkpointem.
+"""
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+import itertools
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .batch import analyze_stream, BatchResult
+from .models import TheoryType
+from .near_duplicates import DEFAULT_THRESHOLD, NearDuplicateIndex, normalize
+
+# Pola z tekstem żartu sprawdzane po kolei, gdy nie podano --text-field
+TEXT_FIELDS = ('text', 'joke_text', 'joke')
+
+# Kolumny wyniku (stały schemat - potrzebny dla Parquet)
+COLUMNS = (
+    ['id', 'joke_text', 'overall_score', 'dominant_theory', 'reach_estimate', 'monetization_score']
+    + [f'score_{theory.value}' for theory in TheoryType]
+    + ['error', 'duplicate_of']
+)
+
+
+def detect_format(path: str, formats: Tuple[str, ...]) -> str:
+    """Format pliku z rozszerzenia (.jsonl/.json/.csv/.parquet)"""
+    ext = os.path.splitext(path.rstrip('/'))[1].lower().lstrip('.')
+    ext = {'json': 'jsonl', 'ndjson': 'jsonl'}.get(ext, ext)
+    if ext not in formats:
+        raise ValueError(f"Nieznany format pliku {path} (obsługiwane: {', '.join(formats)})")
+    return ext
+
+
+class InputReader:
+    """Strumieniowe czytanie rekordów (id, tekst) z JSONL albo CSV"""
+
+    def __init__(self, path: str, fmt: Optional[str] = None, text_field: Optional[str] = None,
+                 id_field: str = 'id'):
+        self.path = path
+        self.format = fmt or detect_format(path, ('jsonl', 'csv'))
+        self.text_fields = (text_field,) if text_field else TEXT_FIELDS
+        self.id_field = id_field
+        self.size = os.path.getsize(path)
+        self._file = None
+
+    def position(self) -> int:
+        """Przeczytane bajty (przybliżone dla CSV - bufor odczytu)"""
+        if self._file is None:
+            return 0
+        if self._file.closed:
+            return self.size
+        return self._file.tell() if self.format == 'jsonl' else self._file.buffer.tell()
+
+    def _text(self, record: Dict[str, Any]) -> str:
+        for field in self.text_fields:
+            if record.get(field):
+                return str(record[field])
+        return ''
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        if self.format == 'jsonl':
+            with open(self.path, 'rb') as self._file:
+                line_number = 0
+                for line in self._file:
+                    line_number += 1
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        record = {}
+                    if not isinstance(record, dict):
+                        record = {}
+                    yield str(record.get(self.id_field, line_number)), self._text(record)
+        else:
+            with open(self.path, newline='', encoding='utf-8') as self._file:
+                for row_number, record in enumerate(csv.DictReader(self._file), start=1):
+                    yield str(record.get(self.id_field) or row_number), self._text(record)
+
+
+def to_record(record_id: str, text: str, result: Optional[BatchResult],
+              duplicate_of: Optional[str] = None) -> Dict[str, Any]:
+    """Płaski rekord wyniku (kolumny COLUMNS); prawie-duplikat - bez ocen"""
+    record = dict.fromkeys(COLUMNS)
+    record.update(id=record_id, joke_text=text)
+    if duplicate_of is not None:
+        record['duplicate_of'] = duplicate_of
+        return record
+    if isinstance(result, Exception):
+        record['error'] = str(result)
+        return record
+
+    record.update(
+        overall_score=result.overall_score,
+        dominant_theory=result.dominant_theory,
+        reach_estimate=result.reach_estimate,
+        monetization_score=result.monetization_score,
+    )
+    for theory, score in result.theory_scores.items():
+        record[f'score_{theory}'] = score.score
+    return record
+
+
+class JsonlWriter:
+    """Dopisywanie wyników do JSONL; pozycja = rozmiar pliku w bajtach"""
+
+    def __init__(self, path: str, position: int = 0):
+        if position and not os.path.exists(path):
+            raise ValueError(f"Brak pliku {path} wskazanego w checkpoincie - użyj --restart")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, 'r+b' if position else 'wb')
+        # Ucięcie częściowo zapisanego kawałka sprzed awarii
+        self._file.truncate(position)
+        self._file.seek(position)
+
+    def write(self, records: List[Dict[str, Any]]):
+        self._file.writelines(
+            json.dumps(record, ensure_ascii=False).encode('utf-8') + b'\n' for record in records
+        )
+
+    def flush(self) -> int:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return self._file.tell()
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetWriter:
+    """Wyniki jako katalog plików Parquet; pozycja = liczba zapisanych części"""
+
+    def __init__(self, path: str, position: int = 0, rows_per_part: int = 10000):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise RuntimeError("Zapis Parquet wymaga pyarrow: pip install pyarrow (albo użyj wyjścia .jsonl)")
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self.path = path
+        self.rows_per_part = rows_per_part
+        self.parts = position
+        self._rows: List[Dict[str, Any]] = []
+
+        os.makedirs(path, exist_ok=True)
+        # Części zapisane po ostatnim checkpoincie
+        for name in os.listdir(path):
+            if name.startswith('part-') and name.endswith('.parquet') and int(name[5:10]) >= position:
+                os.remove(os.path.join(path, name))
+
+    def write(self, records: List[Dict[str, Any]]):
+        self._rows.extend(records)
+
+    def flush(self, force: bool = False) -> Optional[int]:
+        """Zapisz część, gdy zebrało się rows_per_part wierszy; zwraca pozycję albo None"""
+        if not self._rows or (len(self._rows) < self.rows_per_part and not force):
+            return None if self._rows else self.parts
+        table = self._pa.Table.from_pylist(self._rows, schema=self._schema())
+        self._pq.write_table(table, os.path.join(self.path, f'part-{self.parts:05d}.parquet'))
+        self.parts += 1
+        self._rows = []
+        return self.parts
+
+    def close(self):
+        self.flush(force=True)
+
+    def _schema(self):
+        pa = self._pa
+        types = {'id': pa.string(), 'joke_text': pa.string(), 'dominant_theory': pa.string(),
+                 'reach_estimate': pa.int32(), 'monetization_score': pa.int32(), 'error': pa.string(),
+                 'duplicate_of': pa.string()}
+        return pa.schema([(column, types.get(column, pa.float64())) for column in COLUMNS])
+
+
+class Checkpoint:
+    """Postęp zapisany obok wyniku (atomowo: plik tymczasowy + os.replace)"""
+
+    def __init__(self, output: str):
+        self.path = output.rstrip('/') + '.checkpoint.json'
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def save(self, **state):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class Progress:
+    """Postęp na stderr co `interval` sekund"""
+
+    def __init__(self, reader: InputReader, interval: float = 5.0, stream=sys.stderr):
+        self.reader = reader
+        self.interval = interval
+        self.stream = stream
+        self.started = time.monotonic()
+        self._last = self.started
+
+    def update(self, done: int, processed: int, force: bool = False):
+        now = time.monotonic()
+        if not force and now - self._last < self.interval:
+            return
+        self._last = now
+        rate = processed / max(now - self.started, 1e-9)
+        percent = 100.0 * self.reader.position() / self.reader.size if self.reader.size else 100.0
+        print(f"{done} żartów ({percent:.1f}%), {rate:.1f}/s", file=self.stream, flush=True)
+
+
+def run_bulk(
+    input_path: str,
+    output_path: str,
+    input_format: Optional[str] = None,
+    output_format: Optional[str] = None,
+    text_field: Optional[str] = None,
+    id_field: str = 'id',
+    processes: Optional[int] = None,
+    chunk_size: int = 64,
+    restart: bool = False,
+    progress_interval: float = 5.0,
+    analyzer=None,
+    rows_per_part: int = 10000,
+    lite: bool = False,
+    dedupe_index: Optional[str] = None,
+    dedupe_threshold: float = DEFAULT_THRESHOLD,
+) -> Dict[str, Any]:
+    """
+    Przeanalizuj plik z żartami, kontynuując od checkpointu
+
+    lite=True - analiza bez spaCy (pre-screening dużych korpusów)
+    dedupe_index - plik SQLite indeksu prawie-duplikatów (klucze = id rekordów);
+    prawie-duplikaty nie są analizowane
+
+    Returns:
+        Statystyki: records (wszystkie zapisane), processed (w tym
+        uruchomieniu), errors, duplicates, resumed_from, elapsed_s
+    """
+    output_format = output_format or detect_format(output_path, ('jsonl', 'parquet'))
+    if analyzer is not None:
+        lite = analyzer.lite
+    reader = InputReader(input_path, input_format, text_field, id_field)
+    checkpoint = Checkpoint(output_path)
+
+    state = None if restart else checkpoint.load()
+    if state and (state.get('input') != os.path.abspath(input_path) or state.get('format') != output_format):
+        raise ValueError(f"Checkpoint {checkpoint.path} dotyczy innego pliku/formatu - użyj --restart")
+    if state and state.get('lite', False) != lite:
+        raise ValueError(f"Checkpoint {checkpoint.path} dotyczy innego trybu analizy (lite) - użyj --restart")
+    dedupe_path = os.path.abspath(dedupe_index) if dedupe_index else None
+    if state and state.get('dedupe_index') != dedupe_path:
+        raise ValueError(f"Checkpoint {checkpoint.path} dotyczy innego indeksu duplikatów - użyj --restart")
+    done = state['records'] if state else 0
+    position = state['position'] if state else 0
+
+    if output_format == 'parquet':
+        writer = ParquetWriter(output_path, position, rows_per_part)
+    else:
+        writer = JsonlWriter(output_path, position)
+
+    index = NearDuplicateIndex(dedupe_path, dedupe_threshold) if dedupe_path else None
+
+    def duplicate_of(record_id: str, text: str, keys: List[str]) -> Optional[str]:
+        """Id wcześniejszego podobnego rekordu; nowy rekord trafia do indeksu (i do `keys`)"""
+        if index is None or not normalize(text):
+            return None
+        signature = index.signature(text)
+        # Własne id - rekord dodany do indeksu przed awarią, przetwarzany ponownie
+        match = index.find_duplicate(text, exclude=record_id, signature=signature)
+        if match is not None:
+            return match[0]
+        index.add(record_id, text, signature, persist=False)
+        keys.append(record_id)
+        return None
+
+    records = itertools.islice(iter(reader), done, None)
+    # Kopia (id, tekst, duplicate_of) kawałka potrzebna do złożenia wyników - analyze_stream
+    # dostaje same teksty do analizy (bez prawie-duplikatów); do tego id dodane do indeksu
+    chunk_records: List[Tuple[List[Tuple[str, str, Optional[str]]], List[str]]] = []
+
+    def texts():
+        while True:
+            chunk, keys = [], []
+            analyzed = 0
+            # Kawałek kończy się na chunk_size analizowanych tekstach - jak kawałki analyze_stream
+            for record_id, text in records:
+                original = duplicate_of(record_id, text, keys)
+                chunk.append((record_id, text, original))
+                if original is None:
+                    analyzed += 1
+                    if analyzed == chunk_size:
+                        break
+            if not chunk:
+                return
+            chunk_records.append((chunk, keys))
+            yield from (text for _, text, original in chunk if original is None)
+            if analyzed < chunk_size:
+                return
+
+    # Id zapisanych rekordów czekające na utrwalenie indeksu (po checkpoincie -
+    # awaria pomiędzy najwyżej pomija deduplikację względem kilku rekordów)
+    unpersisted: List[str] = []
+
+    def write(chunk, keys, results):
+        nonlocal processed, errors, duplicates
+        results = iter(results)
+        rows = [
+            to_record(record_id, text, None if original is not None else next(results), original)
+            for record_id, text, original in chunk
+        ]
+        errors += sum(1 for row in rows if row['error'] is not None)
+        duplicates += sum(1 for row in rows if row['duplicate_of'] is not None)
+        writer.write(rows)
+        processed += len(rows)
+        unpersisted.extend(keys)
+
+        position = writer.flush()
+        if position is not None:
+            # Checkpoint tylko po trwałym zapisie - wiersze z bufora Parquet są liczone od nowa
+            checkpoint.save(input=os.path.abspath(input_path), format=output_format,
+                            records=resumed_from + processed, position=position, lite=lite,
+                            dedupe_index=dedupe_path)
+            persist_index()
+        progress.update(resumed_from + processed, processed)
+
+    def persist_index():
+        if index is not None and unpersisted:
+            index.persist(unpersisted)
+            unpersisted.clear()
+
+    progress = Progress(reader, progress_interval)
+    processed = errors = duplicates = 0
+    resumed_from = done
+    try:
+        for results in analyze_stream(texts(), processes, chunk_size, analyzer, lite):
+            write(*chunk_records.pop(0), results)
+        # Ostatni kawałek z samymi prawie-duplikatami nie trafia do analyze_stream
+        while chunk_records:
+            write(*chunk_records.pop(0), [])
+    finally:
+        writer.close()
+
+    persist_index()
+    if index is not None:
+        index.close()
+    checkpoint.remove()
+    progress.update(resumed_from + processed, processed, force=True)
+    return {
+        'records': resumed_from + processed,
+        'processed': processed,
+        'errors': errors,
+        'duplicates': duplicates,
+        'resumed_from': resumed_from,
+        'elapsed_s': round(time.monotonic() - progress.started, 3),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Analiza korpusu żartów (JSONL/CSV -> JSONL/Parquet)')
+    parser.add_argument('input', help='Plik wejściowy (.jsonl albo .csv)')
+    parser.add_argument('output', help='Plik wynikowy .jsonl albo katalog .parquet')
+    parser.add_argument('--input-format', choices=['jsonl', 'csv'], help='Domyślnie z rozszerzenia')
+    parser.add_argument('--output-format', choices=['jsonl', 'parquet'], help='Domyślnie z rozszerzenia')
+    parser.add_argument('--text-field', help=f"Pole z tekstem żartu (domyślnie: {', '.join(TEXT_FIELDS)})")
+    parser.add_argument('--id-field', default='id', help='Pole z identyfikatorem (domyślnie numer wiersza)')
+    parser.add_argument('--processes', type=int, help='Liczba procesów (domyślnie liczba CPU)')
+    parser.add_argument('--chunk-size', type=int, default=64, help='Żarty na kawałek (jeden nlp.pipe)')
+    parser.add_argument('--restart', action='store_true', help='Ignoruj checkpoint i zacznij od początku')
+    parser.add_argument('--lite', action='store_true', help='Tryb bez spaCy (szybki pre-screening)')
+    parser.add_argument('--dedupe-index', help='Plik SQLite indeksu prawie-duplikatów (pomija je w analizie)')
+    parser.add_argument('--dedupe-threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Minimalne podobieństwo prawie-duplikatu (Jaccard, 0-1)')
+    parser.add_argument('--progress-interval', type=float, default=5.0, help='Co ile sekund raportować postęp')
+    args = parser.parse_args(argv)
+
+    try:
+        stats = run_bulk(
+            args.input, args.output,
+            input_format=args.input_format,
+            output_format=args.output_format,
+            text_field=args.text_field,
+            id_field=args.id_field,
+            processes=args.processes,
+            chunk_size=args.chunk_size,
+            restart=args.restart,
+            progress_interval=args.progress_interval,
+            lite=args.lite,
+            dedupe_index=args.dedupe_index,
+            dedupe_threshold=args.dedupe_threshold,
+        )
+    except (ValueError, RuntimeError, OSError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+    print(json.dumps(stats, ensure_ascii=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""
+JokeEngine - HumorFeatures i oceny 9 teorii z jednego przejścia
+
+/joke-analyser/analyze i /humor-features/extract parsują żart osobno. Engine
+parsuje go raz (suma profili potoku analizerów i ekstraktora - nlp.pipelines),
+a JokeAnalyzer i HumorFeatureExtractor korzystają z gotowego dokumentu
+(nlp.parsed_docs).
+
+Przykład:
+    engine = JokeEngine(JokeAnalyzer(), HumorFeatureExtractor())
+    result = engine.analyze_sync(AnalyzeRequest(joke_text=text))
+    result.analysis.theory_scores, result.features.keywords
+"""
+import time
+from contextlib import nullcontext
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from metrics import stage, collect_timings
+from nlp import parsed_docs, parse
+from humor_features.extractor import HumorFeatureExtractor
+from humor_features.feature_models import HumorFeatures
+from .analyzer import JokeAnalyzer
+from .models import AnalyzeRequest, AnalyzeResponse
+
+
+class AnalyzeWithFeaturesResponse(BaseModel):
+    """Oceny 9 teorii i raw features z jednego przejścia"""
+    analysis: AnalyzeResponse = Field(..., description="Wynik jak z /joke-analyser/analyze")
+    features: HumorFeatures = Field(..., description="Features jak z /humor-features/extract")
+    lexicon_version: Optional[str] = Field(default=None, description="Wersja słowników keywords")
+    processing_time_ms: float = Field(..., description="Całkowity czas (ms)")
+
+
+class JokeEngine:
+    """Jedno parsowanie spaCy dla JokeAnalyzer i HumorFeatureExtractor"""
+
+    def __init__(self, analyzer: JokeAnalyzer, extractor: HumorFeatureExtractor):
+        """
+        Args:
+            analyzer: Analyzer 9 teorii (pełny tryb - features wymagają spaCy)
+            extractor: Ekstraktor features
+        """
+        if analyzer.lite:
+            raise ValueError("JokeEngine wymaga pełnego trybu analizera (features wymagają spaCy)")
+        self.analyzer = analyzer
+        self.extractor = extractor
+        self.nlp = extractor.nlp
+        self.spacy_needs = analyzer.spacy_needs | extractor.SPACY_NEEDS
+
+    async def analyze(self, request: AnalyzeRequest) -> AnalyzeWithFeaturesResponse:
+        """Analizuj żart i wyekstrahuj features (timings w analysis gdy request.debug_timings)"""
+        return self.analyze_sync(request)
+
+    def analyze_sync(self, request: AnalyzeRequest) -> AnalyzeWithFeaturesResponse:
+        """Synchroniczna wersja analyze()"""
+        started = time.perf_counter()
+        joke_text = request.joke_text
+
+        with collect_timings() if request.debug_timings else nullcontext() as timings:
+            with stage('spacy', 'parse'):
+                doc = parse(self.nlp, joke_text, self.spacy_needs)
+            with parsed_docs({joke_text: doc}):
+                features = self.extractor.extract_features(joke_text)
+                analysis = self.analyzer._analyze(joke_text, request.context)
+
+        if timings is not None:
+            analysis.timings = self.analyzer._timings(timings, started)
+
+        return AnalyzeWithFeaturesResponse(
+            analysis=analysis,
+            features=features,
+            lexicon_version=self.extractor.keywords_lexicon.version,
+            processing_time_ms=round((time.perf_counter() - started) * 1000, 2),
+        )
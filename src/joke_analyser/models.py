@@ -24,6 +24,8 @@ class AnalyzeRequest(BaseModel):
     joke_text: str = Field(..., min_length=5, max_length=1000, description="Tekst żartu")
     context: Optional[Dict] = Field(default=None, description="Kontekst (strona, sytuacja)")
     persona: Optional[str] = Field(default="waldus", description="Persona bota")
+    debug_timings: bool = Field(default=False, description="Dołącz czasy poszczególnych etapów analizy")
+    lite: bool = Field(default=False, description="Tryb lite: bez spaCy (szybki pre-screening, przybliżone wyniki)")
 
 
 class TheoryScore(BaseModel):
@@ -33,6 +35,15 @@ class TheoryScore(BaseModel):
     key_elements: List[str] = Field(default_factory=list, description="Kluczowe elementy")
 
 
+class AnalysisTimings(BaseModel):
+    """Czasy etapów analizy (tylko gdy debug_timings=true)"""
+    analyzers_ms: Dict[str, float] = Field(..., description="Czas każdego analizera (ms)")
+    spacy_parse_ms: float = Field(..., description="Łączny czas parsowania spaCy (ms)")
+    spacy_parse_calls: int = Field(..., description="Liczba wywołań spaCy")
+    scoring_ms: float = Field(..., description="Czas agregacji wyników i rekomendacji (ms)")
+    total_ms: float = Field(..., description="Całkowity czas analizy (ms)")
+
+
 class AnalyzeResponse(BaseModel):
     """Odpowiedź z analizy żartu"""
     joke_text: str
@@ -48,6 +59,9 @@ class AnalyzeResponse(BaseModel):
     # Segmentacja
     target_segments: List[str] = Field(default_factory=list, description="Segmenty docelowe")
     
+    # Diagnostyka (debug_timings)
+    timings: Optional[AnalysisTimings] = Field(default=None, description="Czasy etapów analizy")
+    
     class Config:
         json_schema_extra = {
             "example": {
@@ -68,3 +82,45 @@ class AnalyzeResponse(BaseModel):
             }
         }
 
+
+class SimilarTextRequest(BaseModel):
+    """Request wyszukiwania prawie-duplikatów żartu"""
+    joke_text: str = Field(..., min_length=5, max_length=1000, description="Tekst żartu")
+    threshold: Optional[float] = Field(default=None, ge=0, le=1, description="Minimalne podobieństwo (domyślnie z konfiguracji)")
+    limit: int = Field(default=10, ge=1, le=100, description="Maksymalna liczba wyników")
+    add: bool = Field(default=False, description="Dodaj żart do indeksu (klucz: sha256 tekstu)")
+
+
+class SimilarTextMatch(BaseModel):
+    """Prawie-duplikat z indeksu"""
+    key: str = Field(..., description="Klucz w indeksie")
+    joke_text: str = Field(..., description="Tekst żartu z indeksu")
+    similarity: float = Field(..., ge=0, le=1, description="Szacowane podobieństwo Jaccarda shingli")
+
+
+class SimilarTextResponse(BaseModel):
+    """Prawie-duplikaty żartu"""
+    matches: List[SimilarTextMatch] = Field(default_factory=list, description="Od najbardziej podobnego")
+    index_size: int = Field(..., description="Liczba żartów w indeksie")
+
+
+class SimilarRequest(BaseModel):
+    """Request wyszukiwania semantycznie podobnych żartów (k-NN)"""
+    joke_text: str = Field(..., min_length=5, max_length=1000, description="Tekst żartu")
+    k: int = Field(default=10, ge=1, le=100, description="Liczba wyników")
+    nprobe: Optional[int] = Field(default=None, ge=1, description="Przeszukiwane klastry IVF (więcej = dokładniej)")
+    add: bool = Field(default=False, description="Dodaj żart do indeksu (klucz: sha256 tekstu)")
+
+
+class SimilarMatch(BaseModel):
+    """Podobny żart z indeksu"""
+    key: str = Field(..., description="Klucz w indeksie")
+    joke_text: str = Field(..., description="Tekst żartu z indeksu")
+    score: float = Field(..., description="Podobieństwo kosinusowe embeddingów")
+
+
+class SimilarResponse(BaseModel):
+    """Semantycznie podobne żarty"""
+    matches: List[SimilarMatch] = Field(default_factory=list, description="Od najbardziej podobnego")
+    index_size: int = Field(..., description="Liczba żartów w indeksie")
+    encoder: str = Field(..., description="Enkoder embeddingów")
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Indeks prawie-duplikatów żartów (MinHash + LSH)
+
+Pipeline generowania daje wiele prawie identycznych żartów (inna
+interpunkcja, jedno słowo różnicy). Tekst jest normalizowany (małe litery,
+bez interpunkcji), dzielony na 5-znakowe shingle i skracany do sygnatury
+MinHash (128 permutacji - prawdopodobieństwo zgodności pozycji = podobieństwo
+Jaccarda shingli). LSH dzieli sygnaturę na 16 pasm po 8 wartości; kandydaci
+to żarty z identycznym co najmniej jednym pasmem, a podobieństwo jest
+potwierdzane na całej sygnaturze - zapytanie nie porównuje się z całym
+indeksem.
+
+Indeks w SQLite (opcjonalnie) - wstawianie przyrostowe, wczytywany przy
+starcie; refresh() dociąga wiersze dopisane przez inne procesy.
+
+Przykład:
+    index = NearDuplicateIndex('data/near-duplicates.sqlite')
+    match = index.find_duplicate(text)   # (klucz, podobieństwo) albo None
+    if match is None:
+        index.add(joke_hash(text), text)
+"""
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+import zlib
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+NUM_PERM = 128
+BANDS = 16
+SHINGLE_SIZE = 5
+DEFAULT_THRESHOLD = 0.8
+SEED = 1
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_NON_WORD = re.compile(r'[\W_]+')
+
+Match = Tuple[str, float]
+
+
+def normalize(text: str) -> str:
+    """Małe litery, bez interpunkcji i wielokrotnych spacji"""
+    text = unicodedata.normalize('NFKC', text).lower()
+    return _NON_WORD.sub(' ', text).strip()
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> List[str]:
+    """Znakowe n-gramy znormalizowanego tekstu (krótki tekst - jeden shingle)"""
+    text = normalize(text)
+    if len(text) <= size:
+        return [text] if text else []
+    return list({text[i:i + size] for i in range(len(text) - size + 1)})
+
+
+class MinHasher:
+    """Sygnatury MinHash (permutacje (a*x + b) mod p na crc32 shingli)"""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = SEED):
+        rng = np.random.RandomState(seed)
+        # a, b < 2^31 i x < 2^32 - iloczyn mieści się w uint64
+        self.a = rng.randint(1, 1 << 31, num_perm).astype(np.uint64)
+        self.b = rng.randint(0, 1 << 31, num_perm).astype(np.uint64)
+        self.num_perm = num_perm
+
+    def signature(self, text: str) -> np.ndarray:
+        grams = shingles(text)
+        if not grams:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint32)
+        hashes = np.fromiter((zlib.crc32(g.encode('utf-8')) for g in grams), dtype=np.uint64, count=len(grams))
+        permuted = ((hashes[:, None] * self.a + self.b) % _MERSENNE_PRIME) & _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+
+class NearDuplicateIndex:
+    """Indeks LSH sygnatur MinHash z opcjonalnym zapisem w SQLite"""
+
+    def __init__(self, db_path: Optional[str] = None, threshold: float = DEFAULT_THRESHOLD,
+                 num_perm: int = NUM_PERM, bands: int = BANDS):
+        """
+        Args:
+            db_path: Plik SQLite (None = tylko w pamięci)
+            threshold: Domyślne minimalne podobieństwo (Jaccard shingli) prawie-duplikatu
+            num_perm: Długość sygnatury
+            bands: Liczba pasm LSH (num_perm musi się dzielić przez bands)
+        """
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) musi być wielokrotnością bands ({bands})")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._hasher = MinHasher(num_perm)
+        self._lock = threading.Lock()
+
+        self._keys: List[str] = []
+        self._texts: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._signatures = np.empty((0, num_perm), dtype=np.uint32)
+        self._count = 0
+        self._buckets: List[Dict[bytes, List[int]]] = [defaultdict(list) for _ in range(bands)]
+
+        self.db_path = db_path
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_pid: Optional[int] = None
+        self._last_rowid = 0
+        if db_path:
+            self._open(db_path, num_perm)
+
+    def _open(self, db_path: str, num_perm: int):
+        if db_path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        db = self._connection()
+        params = {'num_perm': str(num_perm), 'bands': str(self.bands), 'seed': str(SEED),
+                  'shingle_size': str(SHINGLE_SIZE)}
+        stored = dict(db.execute('SELECT name, value FROM near_duplicates_meta').fetchall())
+        if stored and stored != params:
+            raise ValueError(f"Indeks {db_path} ma inne parametry MinHash ({stored}) - usuń plik albo użyj innego")
+        db.executemany('INSERT OR IGNORE INTO near_duplicates_meta VALUES (?, ?)', params.items())
+        db.commit()
+        self.refresh()
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Połączenie SQLite dla bieżącego procesu
+
+        Indeks API powstaje przy imporcie, czyli w masterze gunicorna (preload_app),
+        a połączenia nie wolno używać po fork() - każdy proces otwiera własne.
+        """
+        if self._db is None or self._db_pid != os.getpid():
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS near_duplicates ('
+                'key TEXT PRIMARY KEY, text TEXT NOT NULL, signature BLOB NOT NULL)'
+            )
+            self._db.execute('CREATE TABLE IF NOT EXISTS near_duplicates_meta (name TEXT PRIMARY KEY, value TEXT)')
+            self._db.commit()
+            self._db_pid = os.getpid()
+        return self._db
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._positions
+
+    def signature(self, text: str) -> np.ndarray:
+        return self._hasher.signature(text)
+
+    def text(self, key: str) -> Optional[str]:
+        position = self._positions.get(key)
+        return self._texts[position] if position is not None else None
+
+    def _band_keys(self, signature: np.ndarray) -> Iterable[Tuple[int, bytes]]:
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def _insert(self, key: str, text: str, signature: np.ndarray):
+        """Dodaj do struktur w pamięci (pod self._lock)"""
+        position = self._positions.get(key)
+        if position is None:
+            position = self._count
+            if position == len(self._signatures):
+                grown = np.empty((max(64, 2 * position), self._signatures.shape[1]), dtype=np.uint32)
+                grown[:position] = self._signatures[:position]
+                self._signatures = grown
+            self._keys.append(key)
+            self._texts.append(text)
+            self._positions[key] = position
+            self._count += 1
+        else:
+            # Nadpisanie - stare wpisy w kubełkach są odfiltrowywane przy porównaniu sygnatur
+            self._texts[position] = text
+        self._signatures[position] = signature
+        for band, band_key in self._band_keys(signature):
+            self._buckets[band][band_key].append(position)
+
+    def add(self, key: str, text: str, signature: Optional[np.ndarray] = None, persist: bool = True):
+        """
+        Dodaj (albo nadpisz) żart
+
+        Args:
+            key: Identyfikator (np. joke_hash(text) albo id rekordu)
+            signature: Gotowa sygnatura (z query/find_duplicate - bez ponownego liczenia)
+            persist: Zapisz od razu w SQLite; False - zapis później przez persist(keys)
+        """
+        if signature is None:
+            signature = self.signature(text)
+        with self._lock:
+            self._insert(key, text, signature)
+        if persist:
+            self.persist([key])
+
+    def persist(self, keys: Iterable[str]):
+        """Zapisz w SQLite żarty dodane z persist=False"""
+        if not self.db_path:
+            return
+        with self._lock:
+            db = self._connection()
+            rows = [
+                (key, self._texts[self._positions[key]], self._signatures[self._positions[key]].tobytes())
+                for key in keys
+            ]
+            # Blokada zapisu: wiersze innych procesów sprzed naszych są wczytywane,
+            # a między wczytaniem i zapisem nikt nie dopisze nowych - _last_rowid
+            # może przeskoczyć własne wiersze bez gubienia cudzych
+            db.execute('BEGIN IMMEDIATE')
+            try:
+                self._load_new_rows(db)
+                db.executemany('INSERT OR REPLACE INTO near_duplicates (key, text, signature) VALUES (?, ?, ?)', rows)
+                self._last_rowid = max(self._last_rowid, self._max_rowid(db))
+                db.commit()
+            except BaseException:
+                db.rollback()
+                raise
+
+    @staticmethod
+    def _max_rowid(db: sqlite3.Connection) -> int:
+        return db.execute('SELECT COALESCE(MAX(rowid), 0) FROM near_duplicates').fetchone()[0]
+
+    def _load_new_rows(self, db: sqlite3.Connection) -> int:
+        """Wczytaj wiersze po _last_rowid (pod self._lock)"""
+        rows = db.execute(
+            'SELECT rowid, key, text, signature FROM near_duplicates WHERE rowid > ? ORDER BY rowid',
+            (self._last_rowid,)
+        ).fetchall()
+        for rowid, key, text, blob in rows:
+            self._insert(key, text, np.frombuffer(blob, dtype=np.uint32))
+            self._last_rowid = rowid
+        return len(rows)
+
+    def refresh(self) -> int:
+        """Wczytaj wiersze dopisane do SQLite (też przez inne procesy); zwraca ich liczbę"""
+        if not self.db_path:
+            return 0
+        with self._lock:
+            return self._load_new_rows(self._connection())
+
+    def query(self, text: str, threshold: Optional[float] = None, limit: int = 10,
+              signature: Optional[np.ndarray] = None) -> List[Match]:
+        """
+        Prawie-duplikaty tekstu
+
+        Returns:
+            [(klucz, szacowane podobieństwo)] malejąco, podobieństwo >= threshold
+        """
+        threshold = self.threshold if threshold is None else threshold
+        if signature is None:
+            signature = self.signature(text)
+        with self._lock:
+            candidates = set()
+            for band, band_key in self._band_keys(signature):
+                candidates.update(self._buckets[band].get(band_key, ()))
+            if not candidates:
+                return []
+            positions = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+            similarities = (self._signatures[positions] == signature).mean(axis=1)
+            keep = similarities >= threshold
+            matches = sorted(
+                ((self._keys[p], round(float(s), 3)) for p, s in zip(positions[keep], similarities[keep])),
+                key=lambda match: (-match[1], self._positions[match[0]])
+            )
+        return matches[:limit]
+
+    def find_duplicate(self, text: str, threshold: Optional[float] = None, exclude: Optional[str] = None,
+                       signature: Optional[np.ndarray] = None) -> Optional[Match]:
+        """Najbardziej podobny żart z indeksu (poza kluczem `exclude`) albo None"""
+        for key, similarity in self.query(text, threshold, limit=2, signature=signature):
+            if key != exclude:
+                return key, similarity
+        return None
+
+    def close(self):
+        if self._db is not None and self._db_pid == os.getpid():
+            self._db.close()
+        self._db = None
@@ -0,0 +1,293 @@
+"""
+ResultStore - trwały zapis wyników analizy per żart i per teoria
+
+Każdy wynik teorii jest zapisany pod kluczem (hash żartu, teoria, wersja
+analizera). Wersja teorii to hash kodu jej analizera (i jego SHARED_MODULES),
+słownika (src/lexicon/data), wspólnego kodu (COMMON_MODULES, klasa bazowa)
+i modelu spaCy - zmiana słownika archetype.json unieważnia tylko wyniki archetype.
+Ponowna walidacja przelicza więc tylko żarty i teorie, które się zmieniły,
+a diff() pokazuje które wyniki przesunęły się między dwoma uruchomieniami.
+
+Przykład:
+    store = ResultStore('validation/results.sqlite')
+    runner = IncrementalRunner(JokeAnalyzer(), store, processes=4)
+    results = runner.run(jokes)      # tylko brakujące (żart, teoria, wersja), równolegle
+    changes = store.diff(store.previous_run_versions(), runner.versions, jokes)
+"""
+import os
+import json
+import time
+import inspect
+import sqlite3
+import importlib
+import hashlib
+import logging
+from typing import Dict, List, Optional, Any, Tuple
+
+from nlp import pipeline_components
+from . import __version__
+from .analyzer import JokeAnalyzer
+from .analyzers.base import BaseAnalyzer
+from .models import AnalyzeRequest, AnalyzeResponse, TheoryScore, TheoryType
+
+logger = logging.getLogger(__name__)
+
+
+def joke_hash(text: str) -> str:
+    """Hash tekstu żartu (klucz w store)"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+# Wspólny kod, od którego zależą wyniki wszystkich teorii: parsowanie spaCy
+# (profile potoku, gotowe dokumenty) i składanie AnalyzeResponse (JokeAnalyzer._score)
+COMMON_MODULES = ('nlp.pipelines', 'nlp.docs', 'joke_analyser.analyzer')
+
+
+def _source_digest(obj) -> str:
+    path = inspect.getsourcefile(obj)
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _module_digest(name: str) -> str:
+    return _source_digest(importlib.import_module(name))
+
+
+def theory_versions(analyzer: JokeAnalyzer) -> Dict[str, str]:
+    """
+    Wersja każdej teorii: hash kodu analizera i jego SHARED_MODULES + słownika
+    + wspólnego kodu (klasa bazowa, COMMON_MODULES) + modelu i komponentów spaCy
+
+    Returns:
+        {theory: wersja (16 znaków hex)}
+    """
+    nlp = analyzer.nlp
+    if analyzer.lite:
+        model = 'lite'
+    elif nlp is not None:
+        model = f"{nlp.meta.get('name')}-{nlp.meta.get('version')}"
+    else:
+        model = 'no-spacy'
+    shared = '|'.join(_module_digest(name) for name in COMMON_MODULES)
+    common = f"{__version__}|{_source_digest(BaseAnalyzer)}|{shared}|{model}"
+
+    versions = {}
+    for theory_type, theory_analyzer in analyzer.analyzers.items():
+        lexicon = theory_analyzer.lexicon.version if theory_analyzer.LEXICON else ''
+        # Inne komponenty (np. senter zamiast parsera) mogą inaczej dzielić zdania
+        components = pipeline_components(nlp, theory_analyzer.SPACY_NEEDS) if nlp is not None else None
+        code = '|'.join([_source_digest(type(theory_analyzer))] + [
+            _module_digest(name) for name in theory_analyzer.SHARED_MODULES
+        ])
+        versions[theory_type.value] = hashlib.sha256(
+            f"{common}|{code}|{lexicon}|{components}".encode('utf-8')
+        ).hexdigest()[:16]
+    return versions
+
+
+class ResultStore:
+    """Wyniki teorii w SQLite (wszystkie wersje - potrzebne do diffów)"""
+
+    def __init__(self, db_path: str):
+        """
+        Args:
+            db_path: Ścieżka do pliku SQLite (':memory:' w testach)
+        """
+        self.db_path = db_path
+        if db_path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._db = sqlite3.connect(db_path)
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS theory_results ('
+            'joke_hash TEXT NOT NULL, theory TEXT NOT NULL, version TEXT NOT NULL, '
+            'score REAL NOT NULL, explanation TEXT NOT NULL, key_elements TEXT NOT NULL, '
+            'joke_text TEXT NOT NULL, created_at REAL NOT NULL, '
+            'PRIMARY KEY (joke_hash, theory, version))'
+        )
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS runs ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, created_at REAL NOT NULL, '
+            'versions TEXT NOT NULL, label TEXT)'
+        )
+        self._db.commit()
+
+    def get(self, text: str, versions: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Zapisane wyniki żartu dla podanych wersji teorii
+
+        Returns:
+            {theory: {'score', 'explanation', 'key_elements'}} - tylko znalezione
+        """
+        rows = self._db.execute(
+            'SELECT theory, version, score, explanation, key_elements '
+            'FROM theory_results WHERE joke_hash = ?',
+            (joke_hash(text),)
+        ).fetchall()
+        return {
+            theory: {'score': score, 'explanation': explanation, 'key_elements': json.loads(key_elements)}
+            for theory, version, score, explanation, key_elements in rows
+            if versions.get(theory) == version
+        }
+
+    def put(self, text: str, theory: str, version: str, result: Dict[str, Any]):
+        """Zapisz wynik teorii (bez commit - patrz commit())"""
+        self._db.execute(
+            'INSERT OR REPLACE INTO theory_results '
+            '(joke_hash, theory, version, score, explanation, key_elements, joke_text, created_at) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (
+                joke_hash(text), theory, version, float(result['score']), result['explanation'],
+                json.dumps(result.get('key_elements', []), ensure_ascii=False), text, time.time(),
+            )
+        )
+
+    def commit(self):
+        self._db.commit()
+
+    def record_run(self, versions: Dict[str, str], label: Optional[str] = None):
+        """Zapamiętaj wersje teorii użyte w uruchomieniu (baza dla kolejnego diffa)"""
+        self._db.execute(
+            'INSERT INTO runs (created_at, versions, label) VALUES (?, ?, ?)',
+            (time.time(), json.dumps(versions, sort_keys=True), label)
+        )
+        self._db.commit()
+
+    def previous_run_versions(self, current: Optional[Dict[str, str]] = None) -> Optional[Dict[str, str]]:
+        """
+        Wersje z ostatniego uruchomienia różnego od `current`
+
+        Kolejne uruchomienia bez zmian w kodzie mają te same wersje - diff
+        porównuje z ostatnim stanem przed zmianą.
+        """
+        rows = self._db.execute('SELECT versions FROM runs ORDER BY id DESC').fetchall()
+        for (versions,) in rows:
+            versions = json.loads(versions)
+            if versions != current:
+                return versions
+        return None
+
+    def diff(
+        self,
+        before: Dict[str, str],
+        after: Dict[str, str],
+        texts: List[str],
+        min_delta: float = 0.0
+    ) -> List[Dict[str, Any]]:
+        """
+        Zmiany wyników teorii między dwoma zestawami wersji
+
+        Args:
+            before: Wersje teorii poprzedniego uruchomienia
+            after: Wersje teorii bieżącego uruchomienia
+            texts: Żarty do porównania
+            min_delta: Pomiń zmiany o wartości bezwzględnej <= min_delta
+
+        Returns:
+            Lista {'joke_text', 'theory', 'before', 'after', 'delta'}
+            posortowana malejąco po |delta|
+        """
+        changed = [theory for theory, version in after.items() if before.get(theory) != version]
+        changes = []
+        for text in texts:
+            old = self.get(text, {t: before.get(t) for t in changed})
+            new = self.get(text, {t: after[t] for t in changed})
+            for theory in changed:
+                if theory not in old or theory not in new:
+                    continue
+                delta = round(new[theory]['score'] - old[theory]['score'], 3)
+                if abs(delta) > min_delta:
+                    changes.append({
+                        'joke_text': text,
+                        'theory': theory,
+                        'before': old[theory]['score'],
+                        'after': new[theory]['score'],
+                        'delta': delta,
+                    })
+        return sorted(changes, key=lambda change: abs(change['delta']), reverse=True)
+
+
+class IncrementalRunner:
+    """
+    Analiza żartów z przeliczaniem tylko brakujących (żart, teoria, wersja)
+
+    Brakujące teorie są liczone przez batch.analyze_theories_parallel (procesy
+    robocze, jedno parsowanie żartu) - store służy tylko do pomijania pracy.
+    """
+
+    def __init__(self, analyzer: JokeAnalyzer, store: ResultStore, processes: Optional[int] = None):
+        """
+        Args:
+            processes: Liczba procesów dla brakujących wyników (domyślnie liczba CPU)
+        """
+        self.analyzer = analyzer
+        self.store = store
+        self.processes = processes
+        self.versions = theory_versions(analyzer)
+        self.computed = 0
+        self.reused = 0
+
+    def run(self, texts: List[str]) -> Dict[str, AnalyzeResponse]:
+        """
+        Wyniki dla wszystkich żartów (z store albo przeliczone)
+
+        Returns:
+            {tekst: AnalyzeResponse}; żarty odrzucone przez walidację
+            AnalyzeRequest są pomijane
+        """
+        from .batch import analyze_theories_parallel
+
+        theories = [theory_type.value for theory_type in self.analyzer.analyzers]
+        stored: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # Żarty z tym samym zestawem brakujących teorii liczone jedną paczką
+        missing: Dict[Tuple[str, ...], List[str]] = {}
+        for text in dict.fromkeys(texts):
+            try:
+                AnalyzeRequest(joke_text=text)
+            except ValueError:
+                continue
+            stored[text] = self.store.get(text, self.versions)
+            absent = tuple(theory for theory in theories if theory not in stored[text])
+            self.reused += len(theories) - len(absent)
+            if absent:
+                missing.setdefault(absent, []).append(text)
+
+        for absent, group in missing.items():
+            results = analyze_theories_parallel(group, absent, self.processes, analyzer=self.analyzer)
+            for text, result in zip(group, results):
+                if isinstance(result, Exception):
+                    logger.warning(f"Analysis failed for joke {joke_hash(text)[:12]}: {result}")
+                    del stored[text]
+                    continue
+                for theory, theory_result in result.items():
+                    self.store.put(text, theory, self.versions[theory], theory_result)
+                    stored[text][theory] = theory_result
+                    self.computed += 1
+
+        self.store.commit()
+        logger.info(f"Incremental run: {self.computed} theory results computed, {self.reused} reused")
+        return {text: self._compose(text, results) for text, results in stored.items()}
+
+    def _compose(self, text: str, stored: Dict[str, Dict[str, Any]]) -> AnalyzeResponse:
+        """Złóż AnalyzeResponse z wyników teorii (jak JokeAnalyzer.analyze)"""
+        theory_scores: Dict[str, TheoryScore] = {}
+        raw_scores: Dict[TheoryType, float] = {}
+        for theory_type in self.analyzer.analyzers:
+            result = stored[theory_type.value]
+            theory_scores[theory_type.value] = TheoryScore(
+                score=result['score'],
+                explanation=result['explanation'],
+                key_elements=result.get('key_elements', [])
+            )
+            raw_scores[theory_type] = result['score']
+        return self.analyzer._score(text, theory_scores, raw_scores)
+
+
+def summarize_diff(changes: List[Dict[str, Any]]) -> Dict[str, Tuple[int, float]]:
+    """Per teoria: (liczba zmienionych żartów, średnia zmiana)"""
+    summary: Dict[str, List[float]] = {}
+    for change in changes:
+        summary.setdefault(change['theory'], []).append(change['delta'])
+    return {
+        theory: (len(deltas), round(sum(deltas) / len(deltas), 3))
+        for theory, deltas in summary.items()
+    }
@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+Wyszukiwanie semantycznie podobnych żartów (k-NN na embeddingach, IVF w NumPy)
+
+Do ~TRAIN_SIZE żartów indeks jest płaski (iloczyn skalarny z każdym wektorem).
+Potem uczony jest IVF: sferyczny k-means dzieli wektory na nlist ≈ √N
+klastrów, a zapytanie porównuje się z centroidami i przeszukuje tylko nprobe
+najbliższych klastrów - dla miliona żartów kilka tysięcy wektorów zamiast
+miliona. Nowe żarty są przypisywane do najbliższego centroidu (bez
+ponownego uczenia); po dużym wzroście indeksu warto wywołać train().
+
+Pliki w katalogu indeksu (dopisywane, wektory czytane przez np.memmap -
+w pamięci procesu są tylko klucze, przesunięcia tekstów i listy klastrów):
+
+    meta.json      enkoder, wymiar, nlist
+    vectors.f32    wektory float32 (N x dim)
+    items.jsonl    [klucz, tekst] w kolejności wektorów
+    clusters.i32   klaster każdego wektora (po uczeniu)
+    centroids.npy  centroidy (po uczeniu)
+
+Zapis jest chroniony blokadą pliku (fcntl), więc do jednego indeksu mogą
+dopisywać workery API i joke_analyser.similar add; refresh() dociąga
+wiersze dopisane przez inne procesy.
+
+    PYTHONPATH=src python -m joke_analyser.similar add data/similar-jokes jokes.jsonl
+    PYTHONPATH=src python -m joke_analyser.similar train data/similar-jokes
+"""
+import os
+import sys
+import json
+import time
+import fcntl
+import argparse
+import itertools
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from nlp.embeddings import normalize_rows, shared_encoder
+
+# Od tylu wektorów indeks przechodzi z przeszukiwania płaskiego na IVF
+TRAIN_SIZE = 20000
+DEFAULT_NPROBE = 8
+# Próbka do k-means (na klaster) i liczba iteracji
+SAMPLE_PER_CLUSTER = 64
+KMEANS_ITERATIONS = 10
+# Blok wektorów przy przypisywaniu do klastrów (pamięć)
+ASSIGN_BLOCK = 65536
+
+Match = Tuple[str, float]
+
+
+def default_nlist(count: int) -> int:
+    return int(min(4096, max(1, np.sqrt(count))))
+
+
+def spherical_kmeans(vectors: np.ndarray, nlist: int, iterations: int = KMEANS_ITERATIONS,
+                     seed: int = 0) -> np.ndarray:
+    """Centroidy (znormalizowane) - przypisanie według największego iloczynu skalarnego"""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), nlist, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = (vectors @ centroids.T).argmax(axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, vectors)
+        empty = np.bincount(assignment, minlength=nlist) == 0
+        # Pusty klaster - losowy wektor jako nowy centroid
+        sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()))]
+        centroids = normalize_rows(sums)
+    return centroids
+
+
+class EmbeddingIndex:
+    """Indeks k-NN (IVF) wektorów żartów w katalogu z plikami mapowanymi w pamięć"""
+
+    def __init__(self, directory: str, dim: int, encoder: str, train_size: int = TRAIN_SIZE):
+        """
+        Args:
+            directory: Katalog indeksu (tworzony, gdy nie istnieje)
+            dim: Wymiar wektorów
+            encoder: Nazwa enkodera - indeks innego enkodera jest odrzucany
+            train_size: Liczba wektorów, od której add() uczy IVF
+        """
+        self.directory = directory
+        self.dim = dim
+        self.encoder = encoder
+        self.train_size = train_size
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+        meta = self._read_meta()
+        if meta and (meta['dim'] != dim or meta['encoder'] != encoder):
+            raise ValueError(
+                f"Indeks {directory} zbudowano enkoderem {meta['encoder']} ({meta['dim']} wym.) - "
+                f"użyj innego katalogu dla {encoder}"
+            )
+        if not meta:
+            self._write_meta(nlist=0)
+
+        self._keys: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._offsets: List[int] = []
+        self._items_size = 0
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._nlist = 0
+        self._centroids: Optional[np.ndarray] = None
+        self._centroids_mtime: Optional[float] = None
+        self._clusters = np.zeros(0, dtype=np.int32)
+        # Listy klastrów: wektory posortowane po klastrze + granice; nowsze wektory w _recent
+        self._order = np.zeros(0, dtype=np.int64)
+        self._bounds = np.zeros(1, dtype=np.int64)
+        self._recent: Dict[int, List[int]] = {}
+        self.refresh()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _read_meta(self) -> Optional[Dict]:
+        if not os.path.exists(self._path('meta.json')):
+            return None
+        with open(self._path('meta.json'), encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write_meta(self, nlist: int):
+        tmp_path = self._path('meta.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'encoder': self.encoder, 'dim': self.dim, 'nlist': nlist}, f)
+        os.replace(tmp_path, self._path('meta.json'))
+
+    @contextmanager
+    def _file_lock(self):
+        with open(self._path('lock'), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._positions
+
+    @property
+    def trained(self) -> bool:
+        return self._centroids is not None
+
+    @property
+    def nlist(self) -> int:
+        """Liczba klastrów IVF (0 - indeks płaski)"""
+        return self._nlist
+
+    def _size(self, name: str, itemsize: int) -> int:
+        path = self._path(name)
+        return os.path.getsize(path) // itemsize if os.path.exists(path) else 0
+
+    def _map(self, name: str, dtype, count: int, width: int = 0) -> np.ndarray:
+        shape = (count, width) if width else (count,)
+        if not count:
+            return np.zeros(shape, dtype=dtype)
+        return np.memmap(self._path(name), dtype=dtype, mode='r', shape=shape)
+
+    def refresh(self) -> int:
+        """Wczytaj wektory dopisane przez inne procesy (i nowe centroidy); zwraca liczbę nowych"""
+        with self._lock:
+            return self._refresh()
+
+    def _refresh(self) -> int:
+        meta = self._read_meta() or {'nlist': 0}
+        centroids_mtime = os.path.getmtime(self._path('centroids.npy')) if meta['nlist'] else None
+        retrained = meta['nlist'] != self._nlist or centroids_mtime != self._centroids_mtime
+
+        # Nowe wiersze items.jsonl (tylko pełne linie - inny proces może właśnie pisać)
+        before = len(self._keys)
+        with open(self._path('items.jsonl'), 'ab+') as f:
+            f.seek(self._items_size)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                key, _ = json.loads(line)
+                self._positions[key] = len(self._keys)
+                self._keys.append(key)
+                self._offsets.append(self._items_size)
+                self._items_size += len(line)
+
+        # Wiersz jest kompletny, gdy są już jego wektor (i klaster) - reszta przy następnym refresh()
+        count = min(len(self._keys), self._size('vectors.f32', 4 * self.dim))
+        if meta['nlist']:
+            count = min(count, self._size('clusters.i32', 4))
+        if count < len(self._keys):
+            self._items_size = self._offsets[count]
+            for key in self._keys[count:]:
+                del self._positions[key]
+            del self._keys[count:], self._offsets[count:]
+        self._vectors = self._map('vectors.f32', np.float32, count, self.dim)
+
+        if retrained:
+            self._nlist = meta['nlist']
+            self._centroids = np.load(self._path('centroids.npy')) if self._nlist else None
+            self._centroids_mtime = centroids_mtime
+            self._rebuild_lists(count)
+        elif self._nlist and count > len(self._clusters):
+            assigned = len(self._clusters)
+            self._clusters = self._map('clusters.i32', np.int32, count)
+            for position in range(assigned, count):
+                self._recent.setdefault(int(self._clusters[position]), []).append(position)
+            if sum(len(ids) for ids in self._recent.values()) > count // 10:
+                self._rebuild_lists(count)
+        return count - before
+
+    def _rebuild_lists(self, count: int):
+        self._clusters = self._map('clusters.i32', np.int32, count) if self._nlist else np.zeros(0, dtype=np.int32)
+        self._order = np.argsort(self._clusters, kind='stable')
+        self._bounds = np.searchsorted(self._clusters[self._order], np.arange(self._nlist + 1))
+        self._recent = {}
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        return np.concatenate([
+            (vectors[start:start + ASSIGN_BLOCK] @ self._centroids.T).argmax(axis=1)
+            for start in range(0, len(vectors), ASSIGN_BLOCK)
+        ] or [np.zeros(0, dtype=np.int64)]).astype(np.int32)
+
+    def add(self, keys: Sequence[str], texts: Sequence[str], vectors: np.ndarray) -> int:
+        """
+        Dopisz żarty (klucze już obecne w indeksie są pomijane)
+
+        Args:
+            vectors: Znormalizowane wektory (len(keys) x dim)
+
+        Returns:
+            Liczba dodanych żartów
+        """
+        with self._lock, self._file_lock():
+            self._refresh()
+            seen = set()
+            new = [
+                i for i, key in enumerate(keys)
+                if key not in self._positions and not (key in seen or seen.add(key))
+            ]
+            if not new:
+                return 0
+            vectors = np.ascontiguousarray(vectors[new], dtype=np.float32)
+            # Kolejność: items, wektory, klastry - refresh() bierze minimum liczby wierszy
+            with open(self._path('items.jsonl'), 'ab') as f:
+                f.write(b''.join(
+                    json.dumps([keys[i], texts[i]], ensure_ascii=False).encode('utf-8') + b'\n' for i in new
+                ))
+            with open(self._path('vectors.f32'), 'ab') as f:
+                f.write(vectors.tobytes())
+            if self.trained:
+                with open(self._path('clusters.i32'), 'ab') as f:
+                    f.write(self._assign(vectors).tobytes())
+            self._refresh()
+
+            if not self.trained and len(self) >= self.train_size:
+                self._train()
+        return len(new)
+
+    def train(self, nlist: Optional[int] = None):
+        """(Ponowne) uczenie IVF na wszystkich wektorach"""
+        with self._lock, self._file_lock():
+            self._refresh()
+            self._train(nlist)
+
+    def _train(self, nlist: Optional[int] = None):
+        count = len(self._vectors)
+        if not count:
+            return
+        nlist = min(nlist or default_nlist(count), count)
+        rng = np.random.default_rng(0)
+        sample_size = min(count, nlist * SAMPLE_PER_CLUSTER)
+        sample = np.asarray(self._vectors[np.sort(rng.choice(count, sample_size, replace=False))])
+        self._centroids = spherical_kmeans(sample, nlist)
+
+        # Nowe pliki obok starych i os.replace - czytelnicy widzą starą albo nową wersję
+        clusters = self._assign(self._vectors)
+        with open(self._path('clusters.i32.tmp'), 'wb') as f:
+            f.write(clusters.tobytes())
+        np.save(self._path('centroids.tmp.npy'), self._centroids)
+        os.replace(self._path('clusters.i32.tmp'), self._path('clusters.i32'))
+        os.replace(self._path('centroids.tmp.npy'), self._path('centroids.npy'))
+        self._write_meta(nlist)
+        self._nlist = nlist
+        self._centroids_mtime = os.path.getmtime(self._path('centroids.npy'))
+        self._rebuild_lists(count)
+
+    def text(self, key: str) -> Optional[str]:
+        position = self._positions.get(key)
+        if position is None:
+            return None
+        with open(self._path('items.jsonl'), 'rb') as f:
+            f.seek(self._offsets[position])
+            return json.loads(f.readline())[1]
+
+    def _candidates(self, query: np.ndarray, nprobe: int) -> Optional[np.ndarray]:
+        """Pozycje wektorów z nprobe najbliższych klastrów (None - przeszukiwanie płaskie)"""
+        if not self.trained or nprobe >= self._nlist:
+            return None
+        scores = self._centroids @ query
+        probes = np.argpartition(-scores, nprobe - 1)[:nprobe]
+        parts = [self._order[self._bounds[c]:self._bounds[c + 1]] for c in probes]
+        parts += [np.asarray(self._recent[c], dtype=np.int64) for c in probes if c in self._recent]
+        return np.sort(np.concatenate(parts))
+
+    def search(self, query: np.ndarray, k: int = 10, nprobe: int = DEFAULT_NPROBE,
+               exclude: Optional[str] = None) -> List[Match]:
+        """
+        k najbliższych żartów
+
+        Args:
+            query: Znormalizowany wektor zapytania
+            nprobe: Liczba przeszukiwanych klastrów (więcej = dokładniej, wolniej)
+            exclude: Klucz pomijany w wynikach (np. sam żart z zapytania)
+
+        Returns:
+            [(klucz, podobieństwo kosinusowe)] malejąco
+        """
+        query = np.asarray(query, dtype=np.float32)
+        with self._lock:
+            candidates = self._candidates(query, nprobe)
+            vectors = self._vectors if candidates is None else self._vectors[candidates]
+            if not len(vectors):
+                return []
+            scores = vectors @ query
+            wanted = min(k + (exclude is not None), len(scores))
+            top = np.argpartition(-scores, wanted - 1)[:wanted]
+            top = top[np.argsort(-scores[top], kind='stable')]
+            positions = top if candidates is None else candidates[top]
+            matches = [(self._keys[p], round(float(scores[t]), 4)) for p, t in zip(positions, top)]
+        return [match for match in matches if match[0] != exclude][:k]
+
+
+def encoder_from_config(config, nlp=None):
+    """Enkoder procesu według ServiceConfig (JOKE_ANALYSER_EMBEDDING_*)"""
+    return shared_encoder(
+        config.JOKE_ANALYSER_EMBEDDING_ENCODER,
+        nlp,
+        model_name=config.JOKE_ANALYSER_MODEL_NAME,
+        device='cuda' if config.JOKE_ANALYSER_USE_GPU else 'cpu',
+        backend=config.JOKE_ANALYSER_EMBEDDING_BACKEND,
+        onnx_path=config.JOKE_ANALYSER_ONNX_PATH,
+        batch_size=config.JOKE_ANALYSER_EMBEDDING_BATCH_SIZE,
+        batch_wait_ms=config.JOKE_ANALYSER_EMBEDDING_BATCH_WAIT_MS,
+        cache_dir=config.JOKE_ANALYSER_EMBEDDING_CACHE_DIR,
+    )
+
+
+class SimilarJokes:
+    """Enkoder + indeks: dodawanie i wyszukiwanie żartów po tekście"""
+
+    def __init__(self, encoder, directory: str, nprobe: int = DEFAULT_NPROBE, train_size: int = TRAIN_SIZE):
+        self.encoder = encoder
+        self.nprobe = nprobe
+        self.index = EmbeddingIndex(directory, encoder.dim, encoder.name, train_size)
+
+    def add(self, keys: Sequence[str], texts: Sequence[str]) -> int:
+        missing = [i for i, key in enumerate(keys) if key not in self.index]
+        if not missing:
+            return 0
+        vectors = self.encoder.encode([texts[i] for i in missing])
+        return self.index.add([keys[i] for i in missing], [texts[i] for i in missing], vectors)
+
+    def search(self, text: str, k: int = 10, nprobe: Optional[int] = None,
+               exclude: Optional[str] = None) -> List[Match]:
+        query = self.encoder.encode([text])[0]
+        return self.index.search(query, k, nprobe or self.nprobe, exclude)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from api.config import config
+    from .bulk import InputReader
+    from .result_store import joke_hash
+
+    parser = argparse.ArgumentParser(description='Indeks podobnych żartów (embeddingi + IVF)')
+    parser.add_argument('command', choices=['add', 'train'])
+    parser.add_argument('directory', help='Katalog indeksu')
+    parser.add_argument('input', nargs='?', help='Plik z żartami dla add (.jsonl albo .csv)')
+    parser.add_argument('--encoder', default=config.JOKE_ANALYSER_EMBEDDING_ENCODER, choices=['spacy', 'herbert'])
+    parser.add_argument('--text-field', help='Pole z tekstem żartu')
+    parser.add_argument('--batch-size', type=int, default=1024, help='Żarty na jedno kodowanie i zapis')
+    parser.add_argument('--nlist', type=int, help='Liczba klastrów dla train (domyślnie √N)')
+    args = parser.parse_args(argv)
+
+    try:
+        encoder = encoder_from_config(config.model_copy(update={'JOKE_ANALYSER_EMBEDDING_ENCODER': args.encoder}))
+        similar = SimilarJokes(encoder, args.directory, train_size=config.JOKE_ANALYSER_EMBEDDING_TRAIN_SIZE)
+        started = time.monotonic()
+        if args.command == 'train':
+            similar.index.train(args.nlist)
+        else:
+            if not args.input:
+                parser.error('add wymaga pliku wejściowego')
+            texts = (text for _, text in InputReader(args.input, text_field=args.text_field) if text)
+            added = 0
+            while True:
+                batch = list(dict.fromkeys(itertools.islice(texts, args.batch_size)))
+                if not batch:
+                    break
+                added += similar.add([joke_hash(text) for text in batch], batch)
+                print(f"{len(similar.index)} żartów w indeksie (+{added})", file=sys.stderr, flush=True)
+    except (ValueError, RuntimeError, OSError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+    print(json.dumps({
+        'size': len(similar.index),
+        'nlist': similar.index.nlist,
+        'elapsed_s': round(time.monotonic() - started, 3),
+    }))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
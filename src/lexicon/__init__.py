@@ -0,0 +1,19 @@
+"""
+Słowniki analizerów w plikach JSON (kompilowane, wersjonowane, przeładowywane w locie)
+"""
+
+from .store import (
+    Lexicon,
+    LexiconError,
+    LexiconStore,
+    MarkerGroup,
+    MarkerTable,
+    compile_lexicon,
+    load_lexicon,
+    lexicons,
+)
+
+__all__ = [
+    'Lexicon', 'LexiconError', 'LexiconStore', 'MarkerGroup', 'MarkerTable',
+    'compile_lexicon', 'load_lexicon', 'lexicons',
+]
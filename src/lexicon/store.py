@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Słowniki analizerów (znaczniki archetypów, atomów humoru, mechanizmów...)
+
+Słowniki są w plikach JSON (domyślnie src/lexicon/data, LEXICON_DIR), a nie
+w kodzie analizerów - zmiana słownictwa nie wymaga restartu serwisu ani
+ponownego ładowania modeli spaCy.
+
+Plik <nazwa>.json to zestaw tabel. Tabela to lista znaczników albo grupy
+{nazwa grupy: lista znaczników | {"markers": [...], inne atrybuty}}.
+Przy wczytaniu tabele są kompilowane do niezmiennych struktur (krotki,
+frozenset, znaczniki małymi literami), a każdy słownik dostaje wersję -
+hash treści, używany jako klucz cache (patrz joke_analyser.result_store).
+
+Przeładowanie w locie: LexiconStore co `reload_interval` sekund sprawdza
+mtime plików i przy zmianie buduje nowy zestaw słowników, podmieniany
+jedną referencją. Analizer pobiera słownik raz na analizę, więc nigdy nie
+widzi mieszanki starej i nowej wersji. Błędny plik (np. zapisany w połowie)
+nie podmienia słowników - zostaje poprzednia wersja.
+
+Przykład:
+    atoms = lexicons.get('humor_atoms')['humor_atoms']
+    found = atoms.scan(text.lower())
+    for name, atom in atoms.items():
+        count = atom.count(found)
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, Iterator, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIR = os.path.join(os.path.dirname(__file__), 'data')
+
+
+class LexiconError(ValueError):
+    """Niepoprawny albo brakujący słownik"""
+
+
+class MarkerGroup:
+    """Grupa znaczników z atrybutami (np. score_base, weight, description)"""
+
+    __slots__ = ('name', 'markers', 'marker_set', 'attrs')
+
+    def __init__(self, name: str, markers: Tuple[str, ...], attrs: Mapping[str, Any]):
+        self.name = name
+        self.markers = markers
+        self.marker_set = frozenset(markers)
+        self.attrs = MappingProxyType(dict(attrs))
+
+    def __getitem__(self, key: str) -> Any:
+        return self.attrs[key]
+
+    def matches(self, found: FrozenSet[str]) -> bool:
+        """Czy któryś znacznik grupy jest w wyniku MarkerTable.scan"""
+        return not self.marker_set.isdisjoint(found)
+
+    def count(self, found: FrozenSet[str]) -> int:
+        """Liczba znaczników grupy w wyniku MarkerTable.scan"""
+        return sum(1 for marker in self.markers if marker in found)
+
+
+class MarkerTable:
+    """Tabela słownika: grupy znaczników w kolejności z pliku"""
+
+    __slots__ = ('name', 'groups', 'markers', 'marker_set')
+
+    def __init__(self, name: str, groups: Dict[str, MarkerGroup]):
+        self.name = name
+        self.groups = MappingProxyType(groups)
+        # Znaczniki bez powtórzeń między grupami - scan sprawdza każdy raz
+        self.markers = tuple(dict.fromkeys(m for group in groups.values() for m in group.markers))
+        self.marker_set = frozenset(self.markers)
+
+    def __getitem__(self, group: str) -> MarkerGroup:
+        return self.groups[group]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.groups)
+
+    def __len__(self) -> int:
+        return len(self.groups)
+
+    def items(self):
+        return self.groups.items()
+
+    def scan(self, text: str) -> FrozenSet[str]:
+        """Znaczniki tabeli występujące w tekście (jako podciąg; tekst małymi literami)"""
+        return frozenset(marker for marker in self.markers if marker in text)
+
+
+class Lexicon:
+    """Skompilowany słownik (jeden plik JSON)"""
+
+    __slots__ = ('name', 'version', 'tables')
+
+    def __init__(self, name: str, version: str, tables: Dict[str, MarkerTable]):
+        self.name = name
+        self.version = version
+        self.tables = MappingProxyType(tables)
+
+    def __getitem__(self, table: str) -> MarkerTable:
+        return self.tables[table]
+
+
+def _markers(value: Any, where: str) -> Tuple[str, ...]:
+    if not isinstance(value, list) or not all(isinstance(m, str) and m for m in value):
+        raise LexiconError(f"{where}: oczekiwano listy niepustych napisów")
+    return tuple(m.lower() for m in value)
+
+
+def compile_lexicon(name: str, data: Any) -> Lexicon:
+    """
+    Skompiluj słownik z danych JSON
+
+    Raises:
+        LexiconError: Niepoprawna struktura
+    """
+    if not isinstance(data, dict):
+        raise LexiconError(f"{name}: oczekiwano obiektu z tabelami")
+
+    tables = {}
+    for table_name, table in data.items():
+        where = f"{name}.{table_name}"
+        if isinstance(table, list):
+            groups = {table_name: MarkerGroup(table_name, _markers(table, where), {})}
+        elif isinstance(table, dict):
+            groups = {}
+            for group_name, group in table.items():
+                if isinstance(group, dict):
+                    attrs = {k: v for k, v in group.items() if k != 'markers'}
+                    group = group.get('markers')
+                else:
+                    attrs = {}
+                groups[group_name] = MarkerGroup(group_name, _markers(group, f"{where}.{group_name}"), attrs)
+        else:
+            raise LexiconError(f"{where}: tabela musi być listą albo obiektem")
+        tables[table_name] = MarkerTable(table_name, groups)
+
+    # Kolejność grup ma znaczenie (kolejność w wynikach), formatowanie pliku nie
+    canonical = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    version = hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+    return Lexicon(name, version, tables)
+
+
+def load_lexicon(path: str) -> Lexicon:
+    """Wczytaj i skompiluj słownik z pliku JSON"""
+    name = os.path.splitext(os.path.basename(path))[0]
+    with open(path, encoding='utf-8') as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise LexiconError(f"{path}: {e}")
+    return compile_lexicon(name, data)
+
+
+class LexiconStore:
+    """Słowniki z katalogu, przeładowywane po zmianie plików"""
+
+    def __init__(self, path: str = DEFAULT_DIR, reload_interval: float = 5.0):
+        """
+        Args:
+            path: Katalog z plikami <nazwa>.json
+            reload_interval: Co ile sekund sprawdzać zmiany plików (0 = tylko reload())
+        """
+        self.path = path
+        self.reload_interval = reload_interval
+        self._lexicons: Optional[Dict[str, Lexicon]] = None
+        self._signature = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def configure(self, path: Optional[str] = None, reload_interval: Optional[float] = None):
+        """Zmień katalog/interwał (np. z ServiceConfig); nowy katalog jest wczytywany przy następnym get()"""
+        with self._lock:
+            if path and path != self.path:
+                self.path = path
+                self._lexicons = None
+                self._signature = None
+            if reload_interval is not None:
+                self.reload_interval = reload_interval
+
+    def get(self, name: str) -> Lexicon:
+        """
+        Aktualna wersja słownika
+
+        Raises:
+            LexiconError: Brak słownika (albo błędne pliki przy pierwszym wczytaniu)
+        """
+        lexicons = self._current()
+        try:
+            return lexicons[name]
+        except KeyError:
+            raise LexiconError(f"Brak słownika '{name}' w {self.path}")
+
+    def versions(self) -> Dict[str, str]:
+        """Wersje wszystkich słowników (nazwa -> hash)"""
+        return {name: lexicon.version for name, lexicon in sorted(self._current().items())}
+
+    def reload(self) -> bool:
+        """
+        Wczytaj słowniki ponownie, jeśli pliki się zmieniły
+
+        Returns:
+            True, gdy słowniki zostały podmienione
+
+        Raises:
+            LexiconError, OSError: Błędny plik - dotychczasowe słowniki zostają
+        """
+        with self._lock:
+            signature = self._stat()
+            if self._lexicons is not None and signature == self._signature:
+                return False
+
+            lexicons = {}
+            for file_name, _, _ in signature:
+                lexicon = load_lexicon(os.path.join(self.path, file_name))
+                lexicons[lexicon.name] = lexicon
+
+            previous = self._lexicons
+            self._lexicons, self._signature = lexicons, signature
+
+        if previous is not None:
+            changed = sorted(n for n, l in lexicons.items() if n not in previous or previous[n].version != l.version)
+            logger.info(f"Lexicons reloaded from {self.path}: changed {', '.join(changed) or 'none'}")
+        return True
+
+    def _current(self) -> Dict[str, Lexicon]:
+        if self._lexicons is None:
+            self.reload()
+        elif self.reload_interval > 0 and time.monotonic() - self._checked_at >= self.reload_interval:
+            self._checked_at = time.monotonic()
+            try:
+                self.reload()
+            except (LexiconError, OSError) as e:
+                logger.warning(f"Lexicon reload failed, keeping previous version: {e}")
+        return self._lexicons
+
+    def _stat(self) -> Tuple[Tuple[str, int, int], ...]:
+        """(plik, mtime_ns, rozmiar) plików słowników - zmiana = przeładowanie"""
+        entries = []
+        for file_name in sorted(os.listdir(self.path)):
+            if file_name.endswith('.json'):
+                stat = os.stat(os.path.join(self.path, file_name))
+                entries.append((file_name, stat.st_mtime_ns, stat.st_size))
+        return tuple(entries)
+
+
+# Słowniki procesu (LEXICON_DIR, LEXICON_RELOAD_INTERVAL; API: lexicons.configure z ServiceConfig)
+lexicons = LexiconStore(
+    os.getenv('LEXICON_DIR') or DEFAULT_DIR,
+    float(os.getenv('LEXICON_RELOAD_INTERVAL', '5'))
+)
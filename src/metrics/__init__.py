@@ -0,0 +1,30 @@
+"""
+Metrics module
+Metryki Prometheus: latencja zapytań HTTP i poszczególnych etapów przetwarzania
+"""
+
+from .prometheus import (
+    stage,
+    observe_stage,
+    observe_request,
+    observe_ollama_response,
+    render_metrics,
+    mark_process_dead,
+    PROMETHEUS_AVAILABLE,
+)
+from .timings import StageTimings, collect_timings, record_timing
+from .profiling import SampledProfiler
+
+__all__ = [
+    'stage',
+    'observe_stage',
+    'observe_request',
+    'observe_ollama_response',
+    'render_metrics',
+    'mark_process_dead',
+    'PROMETHEUS_AVAILABLE',
+    'StageTimings',
+    'collect_timings',
+    'record_timing',
+    'SampledProfiler',
+]
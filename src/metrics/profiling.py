@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Próbkowane profilowanie zapytań (cProfile)
+
+Profiler włączany jest dla ułamka zapytań (sample_rate, np. 0.01 = 1%),
+więc można go zostawić w produkcji i zbierać profile z prawdziwego ruchu.
+Każdy profil zapisywany jest jako plik .prof w output_dir, a najdroższe
+funkcje trafiają do logu (DEBUG).
+
+Analiza zebranych profili:
+    python -m pstats logs/profiles/joke_analyser.analyze-<czas>-<pid>.prof
+    snakeviz logs/profiles/<plik>.prof
+
+W jednym wątku może działać tylko jeden profiler (od Pythona 3.12
+cProfile korzysta z sys.monitoring) - gdy inne zapytanie jest właśnie
+profilowane, bieżące jest wykonywane bez profilu.
+"""
+
+import io
+import os
+import time
+import random
+import pstats
+import cProfile
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SampledProfiler:
+    """Profiler cProfile uruchamiany dla losowej próbki zapytań"""
+
+    def __init__(
+        self,
+        sample_rate: float = 0.0,
+        output_dir: str = 'logs/profiles',
+        top: int = 20
+    ):
+        """
+        Args:
+            sample_rate: Ułamek profilowanych zapytań (0.0 - wyłączony, 1.0 - każde)
+            output_dir: Katalog na pliki .prof
+            top: Liczba najdroższych funkcji w logu
+        """
+        self.sample_rate = max(0.0, min(1.0, sample_rate))
+        self.output_dir = output_dir
+        self.top = top
+        self._lock = threading.Lock()
+
+    def should_sample(self) -> bool:
+        """Czy profilować bieżące zapytanie"""
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    @contextmanager
+    def profile(self, name: str, force: bool = False):
+        """
+        Profiluj blok, jeśli zapytanie trafiło do próbki
+
+        Args:
+            name: Nazwa profilu (prefiks pliku .prof)
+            force: Profiluj niezależnie od sample_rate
+
+        Yields:
+            Ścieżka pliku .prof, który zostanie zapisany, albo None
+        """
+        if not (force or self.should_sample()) or not self._lock.acquire(blocking=False):
+            yield None
+            return
+
+        path = os.path.join(
+            self.output_dir, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.prof"
+        )
+        profiler = cProfile.Profile()
+        try:
+            try:
+                profiler.enable()
+            except ValueError:
+                # Inny profiler (np. debugger) jest już aktywny
+                yield None
+                return
+            try:
+                yield path
+            finally:
+                profiler.disable()
+                self._save(profiler, path)
+        finally:
+            self._lock.release()
+
+    def _save(self, profiler: cProfile.Profile, path: str) -> Optional[str]:
+        """Zapisz profil i zaloguj najdroższe funkcje"""
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            profiler.dump_stats(path)
+        except OSError as e:
+            logger.warning(f"Cannot save profile {path}: {e}")
+            return None
+
+        if logger.isEnabledFor(logging.DEBUG):
+            summary = io.StringIO()
+            pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(self.top)
+            logger.debug(f"Profile {path}:\n{summary.getvalue()}")
+        else:
+            logger.info(f"Profile saved: {path}")
+        return path
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Metryki Prometheus dla ai-local-core
+
+- ai_local_core_request_duration_seconds{method, route, status} - latencja HTTP
+  (route to szablon ścieżki, np. /ollama/chat, żeby nie mnożyć serii)
+- ai_local_core_stage_duration_seconds{component, stage} - etapy przetwarzania:
+  spaCy parse, każdy z 9 analizerów JokeAnalyzer, każdy _extract_* w
+  HumorFeatureExtractor, BLIP preprocess/generate/decode, tłumaczenie
+- ai_local_core_ollama_duration_seconds{model, phase} - czasy raportowane przez
+  Ollama (load, prompt_eval, eval, total)
+- ai_local_core_ollama_tokens_total{model, kind} - tokeny promptu i odpowiedzi
+
+prometheus_client jest importowany przy pierwszym pomiarze - moduł można
+importować w CLI (src/image/describe.py itd.) bez kosztu przy starcie.
+Bez zainstalowanego prometheus_client pomiary są no-opami.
+
+Przy kilku workerach (gunicorn) ustaw PROMETHEUS_MULTIPROC_DIR - /metrics
+zbiera wtedy metryki ze wszystkich procesów.
+"""
+
+import os
+import time
+import threading
+import importlib.util
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, Tuple
+
+from .timings import record_timing
+
+PROMETHEUS_AVAILABLE = importlib.util.find_spec('prometheus_client') is not None
+
+# Od pojedynczych ms (analizery regułowe) do minut (generacja LLM)
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0,
+)
+
+# Pola czasu w odpowiedzi Ollama (nanosekundy) -> faza
+OLLAMA_DURATION_FIELDS = {
+    'load_duration': 'load',
+    'prompt_eval_duration': 'prompt_eval',
+    'eval_duration': 'eval',
+    'total_duration': 'total',
+}
+
+_metrics: Optional[Dict[str, Any]] = None
+_metrics_lock = threading.Lock()
+
+
+def _get_metrics() -> Optional[Dict[str, Any]]:
+    """Utwórz metryki przy pierwszym użyciu (None bez prometheus_client)"""
+    global _metrics
+    if _metrics is None and PROMETHEUS_AVAILABLE:
+        with _metrics_lock:
+            if _metrics is None:
+                from prometheus_client import Counter, Histogram
+                _metrics = {
+                    'request': Histogram(
+                        'ai_local_core_request_duration_seconds',
+                        'Latencja zapytań HTTP',
+                        ['method', 'route', 'status'],
+                        buckets=LATENCY_BUCKETS,
+                    ),
+                    'stage': Histogram(
+                        'ai_local_core_stage_duration_seconds',
+                        'Latencja etapów przetwarzania',
+                        ['component', 'stage'],
+                        buckets=LATENCY_BUCKETS,
+                    ),
+                    'ollama': Histogram(
+                        'ai_local_core_ollama_duration_seconds',
+                        'Czasy generacji raportowane przez Ollama',
+                        ['model', 'phase'],
+                        buckets=LATENCY_BUCKETS,
+                    ),
+                    'ollama_tokens': Counter(
+                        'ai_local_core_ollama_tokens_total',
+                        'Tokeny przetworzone przez Ollama',
+                        ['model', 'kind'],
+                    ),
+                }
+    return _metrics
+
+
+def observe_stage(component: str, stage_name: str, seconds: float):
+    """Zapisz czas etapu (także w bieżącym collect_timings)"""
+    record_timing(component, stage_name, seconds)
+    metrics = _get_metrics()
+    if metrics is not None:
+        metrics['stage'].labels(component, stage_name).observe(seconds)
+
+
+@contextmanager
+def stage(component: str, stage_name: str):
+    """
+    Zmierz czas bloku jako etap przetwarzania
+
+    Przykład:
+        with stage('blip', 'generate'):
+            out = model.generate(**inputs)
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(component, stage_name, time.perf_counter() - started)
+
+
+def observe_request(method: str, route: str, status: int, seconds: float):
+    """Zapisz latencję zapytania HTTP"""
+    metrics = _get_metrics()
+    if metrics is not None:
+        metrics['request'].labels(method, route, str(status)).observe(seconds)
+
+
+def observe_ollama_response(model: str, raw: Dict[str, Any]):
+    """
+    Zapisz czasy i tokeny z odpowiedzi Ollama (/api/chat, /api/generate)
+
+    Ollama zwraca m.in. prompt_eval_duration i eval_duration (ns) - pozwala
+    odróżnić wolne przetwarzanie promptu od wolnej generacji.
+    """
+    metrics = _get_metrics()
+    if metrics is None or not isinstance(raw, dict):
+        return
+
+    for field, phase in OLLAMA_DURATION_FIELDS.items():
+        value = raw.get(field)
+        if isinstance(value, (int, float)) and value > 0:
+            metrics['ollama'].labels(model, phase).observe(value / 1e9)
+
+    for field, kind in (('prompt_eval_count', 'prompt'), ('eval_count', 'completion')):
+        value = raw.get(field)
+        if isinstance(value, int) and value > 0:
+            metrics['ollama_tokens'].labels(model, kind).inc(value)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Metryki w formacie tekstowym Prometheus
+
+    Returns:
+        (body, content_type)
+    """
+    if not PROMETHEUS_AVAILABLE:
+        return b'# prometheus_client not installed\n', 'text/plain; charset=utf-8'
+
+    from prometheus_client import CollectorRegistry, REGISTRY, CONTENT_TYPE_LATEST, generate_latest
+
+    _get_metrics()
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int):
+    """Usuń pliki metryk zakończonego workera (gunicorn child_exit)"""
+    if PROMETHEUS_AVAILABLE and os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Zbieranie czasów etapów dla pojedynczego zapytania (debug_timings)
+
+Każdy pomiar stage() trafia do histogramu Prometheus, a dodatkowo - jeśli
+bieżący kontekst zbiera czasy (collect_timings) - do obiektu StageTimings.
+Kontekst jest przechowywany w ContextVar, więc równoległe zapytania
+(asyncio, wątki) nie mieszają swoich pomiarów.
+
+Przykład:
+    with collect_timings() as timings:
+        result = analyzer.analyze(text)
+    timings.total_ms('spacy', 'parse')
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+
+class StageTimings:
+    """Suma czasów i liczba wywołań per (component, stage)"""
+
+    def __init__(self):
+        self._stages: Dict[Tuple[str, str], list] = {}
+
+    def add(self, component: str, stage_name: str, seconds: float):
+        entry = self._stages.setdefault((component, stage_name), [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+
+    def total_ms(self, component: str, stage_name: str) -> float:
+        """Łączny czas etapu w ms (0.0 gdy etap nie wystąpił)"""
+        entry = self._stages.get((component, stage_name))
+        return round(entry[0] * 1000, 3) if entry else 0.0
+
+    def calls(self, component: str, stage_name: str) -> int:
+        """Liczba wykonań etapu"""
+        entry = self._stages.get((component, stage_name))
+        return entry[1] if entry else 0
+
+    def by_component(self, component: str) -> Dict[str, float]:
+        """Czasy (ms) wszystkich etapów danego komponentu"""
+        return {
+            stage_name: round(total * 1000, 3)
+            for (name, stage_name), (total, _) in self._stages.items()
+            if name == component
+        }
+
+
+_current: ContextVar[Optional[StageTimings]] = ContextVar('stage_timings', default=None)
+
+
+def record_timing(component: str, stage_name: str, seconds: float):
+    """Dopisz czas etapu do bieżącego kontekstu (no-op poza collect_timings)"""
+    timings = _current.get()
+    if timings is not None:
+        timings.add(component, stage_name, seconds)
+
+
+@contextmanager
+def collect_timings():
+    """Zbieraj czasy wszystkich stage() wykonanych w tym kontekście"""
+    timings = StageTimings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
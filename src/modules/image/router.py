@@ -3,10 +3,13 @@ Router FastAPI dla opisu obrazków
 Migracja z Flask: /describe
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, HttpUrl
 from typing import Optional
 import logging
+import threading
 import sys
 import os
 
@@ -20,6 +23,12 @@ from image.describe import describe_image, load_model
 logger = get_logger(__name__)
 router = APIRouter()
 
+# POST /describe w formacie Flask (src/api/server.py), patrz LEGACY_API_COMPAT
+legacy_router = APIRouter()
+
+# Jeden model BLIP na proces - generacje wykonujemy po kolei, poza pętlą zdarzeń
+_describe_lock = threading.Lock()
+
 # Załaduj model przy starcie
 logger.info("Inicjalizacja modułu Image Description...")
 try:
@@ -56,7 +65,7 @@ async def describe(
     """
     try:
         logger.info(f"Opisywanie obrazka: {request.image_url}")
-        description = describe_image(str(request.image_url), request.max_length)
+        description = await run_in_threadpool(_describe, str(request.image_url), request.max_length)
         
         return ImageDescriptionResponse(
             success=True,
@@ -70,3 +79,56 @@ async def describe(
             detail=f"Błąd opisywania obrazka: {str(e)}"
         )
 
+
+
+def _describe(image_url: str, max_length: int) -> str:
+    with _describe_lock:
+        return describe_image(image_url, max_length)
+
+
+@legacy_router.post("/describe", include_in_schema=False)
+async def legacy_describe(request: Request):
+    """
+    /describe w formacie serwera Flask
+    
+    Błędy zwraca jako {"success": false, "error": "..."}. Ścieżka do
+    lokalnego pliku w image_url (jak Flask) tylko przy
+    LEGACY_DESCRIBE_ALLOW_FILES=true - domyślnie wyłącznie URL http(s).
+    """
+    try:
+        data = await request.json()
+    except ValueError:
+        data = None
+    
+    if not isinstance(data, dict) or 'image_url' not in data:
+        return JSONResponse(
+            status_code=400,
+            content={'success': False, 'error': 'image_url is required'}
+        )
+    
+    image_url = data['image_url']
+    max_length = data.get('max_length', 50)
+    
+    if not isinstance(image_url, str) or not (
+        image_url.startswith(('http://', 'https://')) or config.LEGACY_DESCRIBE_ALLOW_FILES
+    ):
+        return JSONResponse(
+            status_code=400,
+            content={'success': False, 'error': 'image_url must be an http(s) URL'}
+        )
+    
+    try:
+        logger.info(f"Opisywanie obrazka: {image_url}")
+        description = await run_in_threadpool(_describe, image_url, max_length)
+    except Exception as e:
+        logger.error(f"Błąd opisywania obrazka: {e}")
+        return JSONResponse(
+            status_code=500,
+            content={'success': False, 'error': str(e)}
+        )
+    
+    return {
+        'success': True,
+        'description': description,
+        'image_url': image_url
+    }
@@ -3,9 +3,12 @@ Router FastAPI dla Ollama
 Migracja z Flask: /ollama/chat
 """
 
-from fastapi import APIRouter, HTTPException, Depends
-from pydantic import BaseModel
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from fastapi.concurrency import run_in_threadpool, iterate_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Optional, List
+import json
 import logging
 import sys
 import os
@@ -16,14 +19,37 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 from api.config import config
 from api.dependencies import get_logger
 from ollama.client import OllamaClient
+from ollama.admission import AdmissionController, MAX_DEADLINE, parse_deadline
+from ollama.cache import CompletionCache
+from ollama.exceptions import OllamaQueueFullError, OllamaQueueTimeoutError, OllamaCircuitOpenError
 
 logger = get_logger(__name__)
 router = APIRouter()
 
+# Endpointy w formacie Flask (src/api/server.py) - przy LEGACY_API_COMPAT=true
+# rejestrowane przed `router`, więc zastępują natywne dla tych samych ścieżek
+legacy_router = APIRouter()
+
+# Kolejka zapytań (limit równoległych generacji per model)
+admission = AdmissionController(
+    max_concurrent=config.OLLAMA_MAX_CONCURRENT,
+    max_concurrent_per_model=config.OLLAMA_MAX_CONCURRENT_PER_MODEL,
+    max_queue_size=config.OLLAMA_MAX_QUEUE_SIZE,
+    default_deadline=config.OLLAMA_QUEUE_DEADLINE
+)
+
+# Cache odpowiedzi dla deterministycznych zapytań (temperature=0)
+completion_cache = CompletionCache(
+    max_entries=config.OLLAMA_CACHE_MAX_ENTRIES,
+    db_path=config.OLLAMA_CACHE_PATH
+) if config.OLLAMA_CACHE_ENABLED else None
+
 # Inicjalizacja klienta Ollama
 ollama_client = OllamaClient(
     base_url=config.OLLAMA_BASE_URL,
-    default_model=config.OLLAMA_DEFAULT_MODEL
+    default_model=config.OLLAMA_DEFAULT_MODEL,
+    cache=completion_cache,
+    admission=admission
 )
 
 
@@ -35,6 +61,14 @@ class OllamaChatRequest(BaseModel):
     model: Optional[str] = None
     temperature: Optional[float] = 0.7
     max_tokens: Optional[int] = 1000
+    deadline: Optional[float] = Field(None, ge=0, le=MAX_DEADLINE)  # Maks. czas oczekiwania w kolejce (s)
+    cache: Optional[bool] = None  # None = cache tylko dla temperature=0
+
+
+class OllamaBatchRequest(BaseModel):
+    """Request model dla batch chat Ollama"""
+    requests: List[OllamaChatRequest] = Field(..., min_length=1)
+    parallelism: Optional[int] = Field(default=None, ge=1)
 
 
 class OllamaChatResponse(BaseModel):
@@ -49,6 +83,7 @@ class OllamaChatResponse(BaseModel):
 @router.post("/chat", response_model=OllamaChatResponse)
 async def chat(
     request: OllamaChatRequest,
+    response: Response,
     logger: logging.Logger = Depends(get_logger)
 ):
     """
@@ -60,20 +95,20 @@ async def chat(
     - **model**: Opcjonalna nazwa modelu
     - **temperature**: Temperatura (domyślnie 0.7)
     - **max_tokens**: Maksymalna liczba tokenów (domyślnie 1000)
+    - **deadline**: Maksymalny czas oczekiwania w kolejce w sekundach (opcjonalnie)
+    - **cache**: Wymuś użycie cache (domyślnie tylko dla temperature=0)
+    
+    Gdy kolejka jest pełna zwraca 429 z nagłówkiem Retry-After.
+    Nagłówek X-Cache (HIT / MISS / BYPASS) informuje czy odpowiedź pochodzi z cache.
     """
     try:
-        user_message = request.user
-        if request.task:
-            user_message = f"{user_message}\n\nZADANIE:\n{request.task}"
+        chat_kwargs = _chat_kwargs(request)
+        model = chat_kwargs['model']
+        logger.info(f"Wysyłanie zapytania do Ollama (model={model})")
         
-        logger.info(f"Wysyłanie zapytania do Ollama (model={request.model or ollama_client.default_model})")
-        result = ollama_client.chat(
-            user=user_message,
-            system=request.system,
-            model=request.model,
-            temperature=request.temperature,
-            max_tokens=request.max_tokens
-        )
+        # Klient czeka na slot w kolejce (admission) tylko gdy odpowiedzi nie ma w cache
+        result = await run_in_threadpool(ollama_client.chat, **chat_kwargs)
+        response.headers['X-Cache'] = result.get('cache', 'BYPASS')
         
         return OllamaChatResponse(
             success=True,
@@ -81,6 +116,18 @@ async def chat(
             usage=result['usage'],
             model=result['raw'].get('model', request.model or ollama_client.default_model)
         )
+    except OllamaQueueFullError as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={'Retry-After': str(e.retry_after)}
+        )
+    except (OllamaQueueTimeoutError, OllamaCircuitOpenError) as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={'Retry-After': str(max(1, int(e.retry_after)))}
+        )
     except ValueError as e:
         logger.error(f"Błąd walidacji zapytania do Ollama: {e}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -88,3 +135,188 @@ async def chat(
         logger.error(f"Błąd podczas komunikacji z Ollama: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+
+@router.post("/batch")
+async def batch(request: OllamaBatchRequest):
+    """
+    Wykonaj wiele zapytań do Ollama równolegle
+    
+    - **requests**: Lista zapytań (te same pola co /ollama/chat)
+    - **parallelism**: Liczba równoległych zapytań (domyślnie OLLAMA_BATCH_PARALLELISM)
+    
+    Wyniki są streamowane jako NDJSON (jedna linia JSON na zapytanie) w kolejności
+    ukończenia, nie w kolejności w requests - pole "index" wskazuje pozycję zapytania.
+    Błąd pojedynczego zapytania nie przerywa batcha (linia z "success": false).
+    """
+    if len(request.requests) > config.OLLAMA_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Za dużo zapytań w batchu (max {config.OLLAMA_BATCH_MAX_ITEMS})"
+        )
+    
+    parallelism = min(
+        request.parallelism or config.OLLAMA_BATCH_PARALLELISM,
+        config.OLLAMA_MAX_CONCURRENT,
+        len(request.requests)
+    )
+    items = [_chat_kwargs(item) for item in request.requests]
+    logger.info(f"Batch do Ollama: {len(items)} zapytań, parallelism={parallelism}")
+    
+    return StreamingResponse(_batch_lines(items, parallelism), media_type="application/x-ndjson")
+
+
+async def _batch_lines(items: List[dict], parallelism: int):
+    """Wyniki OllamaClient.chat_batch() jako linie NDJSON"""
+    results = ollama_client.chat_batch(items, parallelism=max(1, parallelism))
+    async for index, result, error in iterate_in_threadpool(results):
+        if error is None:
+            line = {
+                'index': index,
+                'success': True,
+                'response': result['text'],
+                'usage': result['usage'],
+                'model': result['raw'].get('model', items[index]['model']),
+                'cache': result.get('cache', 'BYPASS'),
+            }
+        else:
+            line = {
+                'index': index,
+                'success': False,
+                'error': str(error),
+            }
+        yield json.dumps(line, ensure_ascii=False) + "\n"
+
+
+def _chat_kwargs(request: OllamaChatRequest) -> dict:
+    """Zamień OllamaChatRequest na argumenty OllamaClient.chat()"""
+    user_message = request.user
+    if request.task:
+        user_message = f"{user_message}\n\nZADANIE:\n{request.task}"
+    
+    return dict(
+        user=user_message,
+        system=request.system,
+        model=request.model or ollama_client.default_model,
+        temperature=request.temperature,
+        max_tokens=request.max_tokens,
+        use_cache=request.cache,
+        deadline=request.deadline
+    )
+
+
+@router.get("/queue")
+async def queue_stats():
+    """
+    Metryki kolejki zapytań do Ollama
+    
+    Zwraca głębokość kolejki (łącznie i per model), liczbę aktywnych generacji,
+    liczniki odrzuconych/przeterminowanych zapytań, czasy oczekiwania
+    oraz stan circuit breakera backendu i statystyki cache odpowiedzi.
+    """
+    stats = admission.stats()
+    stats['circuit_breaker'] = ollama_client.circuit_breaker.stats()
+    stats['cache'] = completion_cache.stats() if completion_cache is not None else None
+    return stats
+
+
+
+# ---------------------------------------------------------------------------
+# Kompatybilność z Flask (src/api/server.py)
+#
+# Te same pola zapytania i odpowiedzi co w serwerze Flask: brak walidacji
+# Pydantic (422), błędy jako {"success": false, "error": "..."} ze statusem
+# 400/429/503/500, brak domyślnych temperature/max_tokens (decyduje klient).
+# ---------------------------------------------------------------------------
+
+async def _legacy_json(request: Request) -> dict:
+    """Body zapytania jak request.get_json() w Flask ({} gdy brak lub niepoprawny JSON)"""
+    try:
+        data = await request.json()
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _legacy_error(status_code: int, error: str, headers: Optional[dict] = None) -> JSONResponse:
+    return JSONResponse(
+        status_code=status_code,
+        content={'success': False, 'error': error},
+        headers=headers
+    )
+
+
+def _legacy_chat_kwargs(data: dict) -> dict:
+    """Argumenty OllamaClient.chat() z body w formacie Flask (ValueError przy złym "deadline")"""
+    user_message = data.get('user') or ''
+    if data.get('task'):
+        user_message = f"{user_message}\n\nZADANIE:\n{data['task']}"
+    
+    return dict(
+        user=user_message,
+        system=data.get('system'),
+        model=data.get('model') or ollama_client.default_model,
+        temperature=data.get('temperature'),
+        max_tokens=data.get('max_tokens'),
+        use_cache=data.get('cache'),
+        deadline=parse_deadline(data.get('deadline'))
+    )
+
+
+@legacy_router.post("/chat", include_in_schema=False)
+async def legacy_chat(request: Request):
+    """/ollama/chat w formacie serwera Flask"""
+    data = await _legacy_json(request)
+    if not data.get('user'):
+        return _legacy_error(400, 'Pole "user" jest wymagane')
+    
+    try:
+        chat_kwargs = _legacy_chat_kwargs(data)
+        logger.info(f"Wysyłanie zapytania do Ollama (model={chat_kwargs['model']})")
+        result = await run_in_threadpool(ollama_client.chat, **chat_kwargs)
+    except (OllamaQueueFullError, OllamaQueueTimeoutError, OllamaCircuitOpenError) as e:
+        status_code = 429 if isinstance(e, OllamaQueueFullError) else 503
+        return _legacy_error(status_code, str(e), {'Retry-After': str(max(1, int(e.retry_after)))})
+    except ValueError as e:
+        logger.error(f"Błąd walidacji zapytania do Ollama: {e}")
+        return _legacy_error(400, str(e))
+    except Exception as e:
+        logger.error(f"Błąd podczas komunikacji z Ollama: {e}")
+        return _legacy_error(500, str(e))
+    
+    return JSONResponse(
+        content={
+            'success': True,
+            'response': result['text'],
+            'usage': result['usage'],
+            'model': result['raw'].get('model', chat_kwargs['model'])
+        },
+        headers={'X-Cache': result.get('cache', 'BYPASS')}
+    )
+
+
+@legacy_router.post("/batch", include_in_schema=False)
+async def legacy_batch(request: Request):
+    """/ollama/batch w formacie serwera Flask"""
+    data = await _legacy_json(request)
+    items = data.get('requests')
+    
+    if not items or not isinstance(items, list):
+        return _legacy_error(400, 'Pole "requests" jest wymagane (niepusta lista)')
+    if len(items) > config.OLLAMA_BATCH_MAX_ITEMS:
+        return _legacy_error(400, f'Za dużo zapytań w batchu (max {config.OLLAMA_BATCH_MAX_ITEMS})')
+    
+    if not all(isinstance(item, dict) for item in items):
+        return _legacy_error(400, 'Elementy "requests" muszą być obiektami')
+    try:
+        parallelism = int(data.get('parallelism') or config.OLLAMA_BATCH_PARALLELISM)
+    except (TypeError, ValueError, OverflowError):
+        return _legacy_error(400, 'Pole "parallelism" musi być liczbą całkowitą')
+    
+    try:
+        chat_items = [_legacy_chat_kwargs(item) for item in items]
+    except ValueError as e:
+        return _legacy_error(400, str(e))
+    parallelism = max(1, min(parallelism, config.OLLAMA_MAX_CONCURRENT, len(chat_items)))
+    logger.info(f"Batch do Ollama: {len(chat_items)} zapytań, parallelism={parallelism}")
+    
+    return StreamingResponse(_batch_lines(chat_items, parallelism), media_type="application/x-ndjson")
@@ -0,0 +1,13 @@
+"""
+NLP module
+Współdzielone modele spaCy (jedna instancja na proces)
+"""
+
+from .spacy_models import load_spacy_model, loaded_spacy_models, warm_up
+from .docs import parsed_docs, cached_doc
+from .pipelines import pipeline_components, parse, pipe, covers
+
+__all__ = [
+    'load_spacy_model', 'loaded_spacy_models', 'warm_up', 'parsed_docs', 'cached_doc',
+    'pipeline_components', 'parse', 'pipe', 'covers',
+]
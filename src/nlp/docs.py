@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Wcześniej sparsowane dokumenty spaCy dla analizerów
+
+Kilka analizerów parsuje ten sam tekst osobno (BaseAnalyzer._parse).
+Przy analizie paczek tekst jest parsowany raz przez nlp.pipe (szybsze
+niż pojedyncze wywołania nlp()), a analizery dostają gotowy Doc:
+
+    with parsed_docs(dict(zip(texts, nlp.pipe(texts)))):
+        for text in texts:
+            analyzer.analyze_sync(...)
+
+Kontekst jest w ContextVar - równoległe zapytania go nie współdzielą.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+_docs: ContextVar[Optional[Dict[str, Any]]] = ContextVar('parsed_docs', default=None)
+
+
+@contextmanager
+def parsed_docs(docs: Dict[str, Any]):
+    """Udostępnij sparsowane dokumenty (tekst -> Doc) w bieżącym kontekście"""
+    token = _docs.set(docs)
+    try:
+        yield docs
+    finally:
+        _docs.reset(token)
+
+
+def cached_doc(text: str) -> Optional[Any]:
+    """Doc dla tekstu, jeśli został sparsowany w bieżącym kontekście"""
+    docs = _docs.get()
+    return docs.get(text) if docs is not None else None
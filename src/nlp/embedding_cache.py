@@ -0,0 +1,155 @@
+"""
+Cache embeddingów adresowany treścią (sha256 enkodera i tekstu)
+
+Ten sam żart jest kodowany przez HerBERT wiele razy: /similar, indeksowanie
+korpusu, ponowne analizy. Cache trzyma wektory w pliku dopisywanym
+i czytanym przez np.memmap (w pamięci procesu tylko słownik skrót -> wiersz),
+więc jest współdzielony przez workery API i procesy wsadowe:
+
+    <katalog>/<enkoder>/meta.json     nazwa enkodera, wymiar
+    <katalog>/<enkoder>/keys.bin      16-bajtowe skróty sha256 w kolejności wierszy
+    <katalog>/<enkoder>/vectors.f32   wektory float32
+
+Dopisywanie pod blokadą pliku (fcntl); wiersze innych procesów są
+dociągane przy brakach (refresh).
+
+    encoder = CachedEncoder(HerbertEncoder(...), EmbeddingCache('data/embeddings', name, dim))
+"""
+import os
+import re
+import json
+import fcntl
+import hashlib
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+DIGEST_SIZE = 16
+
+
+class EmbeddingCache:
+    """Wektory jednego enkodera według skrótu tekstu"""
+
+    def __init__(self, directory: str, encoder: str, dim: int):
+        """
+        Args:
+            directory: Katalog cache (podkatalog na enkoder)
+            encoder: Nazwa enkodera (część skrótu - różne enkodery się nie mieszają)
+            dim: Wymiar wektorów
+        """
+        self.encoder = encoder
+        self.dim = dim
+        self.path = os.path.join(directory, re.sub(r'[^\w.-]+', '_', encoder))
+        os.makedirs(self.path, exist_ok=True)
+        self._prefix = f"{encoder}\0".encode('utf-8')
+        self._lock = threading.Lock()
+        self._rows: Dict[bytes, int] = {}
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+
+        meta_path = os.path.join(self.path, 'meta.json')
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta != {'encoder': encoder, 'dim': dim}:
+                raise ValueError(f"Cache {self.path} zawiera inne embeddingi ({meta})")
+        else:
+            with open(meta_path, 'w', encoding='utf-8') as f:
+                json.dump({'encoder': encoder, 'dim': dim}, f)
+        self.refresh()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def digest(self, text: str) -> bytes:
+        return hashlib.sha256(self._prefix + text.encode('utf-8')).digest()[:DIGEST_SIZE]
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    @contextmanager
+    def _file_lock(self):
+        with open(self._file('lock'), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def refresh(self) -> int:
+        """Wczytaj wiersze dopisane przez inne procesy; zwraca ich liczbę"""
+        with self._lock:
+            return self._refresh()
+
+    def _refresh(self) -> int:
+        keys_path, vectors_path = self._file('keys.bin'), self._file('vectors.f32')
+        count = min(
+            os.path.getsize(keys_path) // DIGEST_SIZE if os.path.exists(keys_path) else 0,
+            os.path.getsize(vectors_path) // (4 * self.dim) if os.path.exists(vectors_path) else 0,
+        )
+        before = len(self._vectors)
+        if count <= before:
+            return 0
+        with open(keys_path, 'rb') as f:
+            f.seek(before * DIGEST_SIZE)
+            keys = f.read((count - before) * DIGEST_SIZE)
+        for row in range(before, count):
+            offset = (row - before) * DIGEST_SIZE
+            self._rows.setdefault(keys[offset:offset + DIGEST_SIZE], row)
+        self._vectors = np.memmap(vectors_path, dtype=np.float32, mode='r', shape=(count, self.dim))
+        return count - before
+
+    def fill(self, digests: Sequence[bytes], out: np.ndarray) -> List[int]:
+        """Wpisz znane wektory do `out`; zwraca indeksy brakujących"""
+        with self._lock:
+            rows = [self._rows.get(digest) for digest in digests]
+            found = [i for i, row in enumerate(rows) if row is not None]
+            if found:
+                out[found] = self._vectors[[rows[i] for i in found]]
+        return [i for i, row in enumerate(rows) if row is None]
+
+    def put(self, digests: Sequence[bytes], vectors: np.ndarray):
+        """Dopisz wektory (skróty już obecne są pomijane)"""
+        with self._lock, self._file_lock():
+            self._refresh()
+            seen = set()
+            new = [
+                i for i, digest in enumerate(digests)
+                if digest not in self._rows and not (digest in seen or seen.add(digest))
+            ]
+            if not new:
+                return
+            # Najpierw wektory - refresh() innego procesu bierze minimum liczby wierszy
+            with open(self._file('vectors.f32'), 'ab') as f:
+                f.write(np.ascontiguousarray(vectors[new], dtype=np.float32).tobytes())
+            with open(self._file('keys.bin'), 'ab') as f:
+                f.write(b''.join(digests[i] for i in new))
+            self._refresh()
+
+
+class CachedEncoder:
+    """Enkoder, który koduje tylko teksty nieobecne w EmbeddingCache"""
+
+    def __init__(self, encoder, cache: EmbeddingCache):
+        self.encoder = encoder
+        self.cache = cache
+        self.name = encoder.name
+        self.dim = encoder.dim
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        result = np.zeros((len(texts), self.dim), dtype=np.float32)
+        digests = [self.cache.digest(text) for text in texts]
+        missing = self.cache.fill(digests, result)
+        if missing and self.cache.refresh():
+            # Teksty zakodowane w międzyczasie przez inny proces
+            missing = self.cache.fill(digests, result)
+        if not missing:
+            return result
+
+        unique = list(dict.fromkeys(texts[i] for i in missing))
+        vectors = self.encoder.encode(unique)
+        self.cache.put([self.cache.digest(text) for text in unique], vectors)
+        rows = {text: row for row, text in enumerate(unique)}
+        result[missing] = vectors[[rows[texts[i]] for i in missing]]
+        return result
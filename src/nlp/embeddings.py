@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Wektory całych żartów (embeddingi) do wyszukiwania podobnych
+
+    'spacy'  - średnia wektorów statycznych słów treściowych (pl_core_news_lg);
+               sama tokenizacja, bez potoku - tanie, działa wszędzie, gdzie analizery
+    HerBERT  - JOKE_ANALYSER_MODEL_NAME (allegro/herbert-base-cased), mean pooling
+               ostatniej warstwy; wymaga torch + transformers (importowane leniwie)
+
+Wektory są znormalizowane (iloczyn skalarny = podobieństwo kosinusowe).
+Enkoder ma `name` (zapisywany w indeksie - wektory różnych enkoderów nie są
+porównywalne) i `dim`.
+
+HerBERT na CPU:
+    - teksty są tokenizowane raz, sortowane po długości i dzielone na paczki
+      podobnej długości (length bucketing) - dopełnienie tylko do najdłuższego
+      tekstu w paczce, a nie w całym wywołaniu
+    - backend 'int8' - dynamiczna kwantyzacja warstw Linear (torch)
+    - backend 'onnx' - ONNX Runtime z modelem wyeksportowanym przez
+      `python -m nlp.embeddings export-onnx <plik.onnx>`
+    - EncoderService zbiera równoległe wywołania encode (np. zapytania API
+      w wątkach) w jedną paczkę
+
+shared_encoder() zwraca jedną instancję enkodera na proces (jak
+load_spacy_model) - wyszukiwanie podobnych, analizery i ekstraktor features
+korzystają z tego samego modelu i cache (nlp.embedding_cache).
+"""
+
+import os
+import sys
+import queue
+import argparse
+import threading
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .pipelines import pipe
+
+BACKENDS = ('torch', 'int8', 'onnx')
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return (matrix / np.where(norms == 0, 1, norms)).astype(np.float32)
+
+
+def length_buckets(lengths: Sequence[int], batch_size: int) -> List[List[int]]:
+    """Indeksy tekstów w paczkach po batch_size, posortowane po długości (najdłuższe pierwsze)"""
+    order = sorted(range(len(lengths)), key=lambda i: -lengths[i])
+    return [order[start:start + batch_size] for start in range(0, len(order), batch_size)]
+
+
+class SpacyEncoder:
+    """Średnia wektorów słów (bez stop words i interpunkcji) z vocab modelu spaCy"""
+
+    def __init__(self, nlp):
+        if nlp is None or nlp.vocab.vectors.shape[0] == 0:
+            raise RuntimeError("Model spaCy bez wektorów słów - użyj pl_core_news_lg albo enkodera HerBERT")
+        self.nlp = nlp
+        self.dim = nlp.vocab.vectors_length
+        self.name = f"spacy:{nlp.meta.get('name')}-{nlp.meta.get('version')}"
+
+    def encode(self, texts: Sequence[str], batch_size: int = 256) -> np.ndarray:
+        vectors = self.nlp.vocab.vectors
+        result = np.zeros((len(texts), self.dim), dtype=np.float32)
+        # Sama tokenizacja (needs=()) - wektory są w vocab
+        for i, doc in enumerate(pipe(self.nlp, texts, (), batch_size=batch_size)):
+            keys = [token.lower for token in doc if token.is_alpha and not token.is_stop]
+            if not keys:
+                continue
+            rows = vectors.find(keys=keys)
+            rows = rows[rows >= 0]
+            if len(rows):
+                result[i] = np.asarray(vectors.data[rows], dtype=np.float32).mean(axis=0)
+        return normalize_rows(result)
+
+
+class HerbertEncoder:
+    """Mean pooling ostatniej warstwy modelu transformers (HerBERT)"""
+
+    def __init__(self, model_name: str, device: str = 'cpu', max_length: int = 128,
+                 backend: str = 'torch', onnx_path: Optional[str] = None, batch_size: int = 32):
+        """
+        Args:
+            model_name: Model HuggingFace (tokenizer zawsze stąd)
+            device: 'cpu' albo 'cuda' (tylko backend 'torch')
+            backend: 'torch', 'int8' (dynamiczna kwantyzacja, CPU) albo 'onnx'
+            onnx_path: Model ONNX dla backendu 'onnx' (export_onnx)
+            batch_size: Maksymalna liczba tekstów w jednym przebiegu modelu
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Nieznany backend: {backend} (obsługiwane: {', '.join(BACKENDS)})")
+        if backend != 'torch' and device != 'cpu':
+            raise ValueError(f"Backend {backend} działa tylko na CPU")
+        try:
+            from transformers import AutoTokenizer
+        except ImportError:
+            raise RuntimeError("Enkoder HerBERT wymaga transformers: pip install transformers")
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.backend = backend
+        self.device = device
+        self.max_length = max_length
+        self.batch_size = batch_size
+
+        if backend == 'onnx':
+            self._load_onnx(onnx_path)
+        else:
+            self._load_torch(model_name, quantize=backend == 'int8')
+        # Wektory int8 różnią się od float32 - inna nazwa (osobny indeks i cache)
+        self.name = f"transformers:{model_name}" + (':int8' if backend == 'int8' else '')
+
+    def _load_torch(self, model_name: str, quantize: bool):
+        try:
+            import torch
+            from transformers import AutoModel
+        except ImportError:
+            raise RuntimeError("Backend torch wymaga torch: pip install torch (albo backend onnx)")
+        self._torch = torch
+        model = AutoModel.from_pretrained(model_name).eval()
+        if quantize:
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        self.model = model.to(self.device)
+        self.dim = model.config.hidden_size
+
+    def _load_onnx(self, onnx_path: Optional[str]):
+        if not onnx_path or not os.path.exists(onnx_path):
+            raise RuntimeError(
+                f"Brak modelu ONNX ({onnx_path}) - wyeksportuj: python -m nlp.embeddings export-onnx <plik.onnx>"
+            )
+        try:
+            import onnxruntime
+        except ImportError:
+            raise RuntimeError("Backend onnx wymaga onnxruntime: pip install onnxruntime")
+        self.session = onnxruntime.InferenceSession(onnx_path, providers=['CPUExecutionProvider'])
+        self._onnx_inputs = {i.name for i in self.session.get_inputs()}
+        self.dim = self.session.get_outputs()[0].shape[-1]
+
+    def _forward(self, batch: Dict[str, np.ndarray]) -> np.ndarray:
+        """Mean pooling (bez dopełnienia) dla paczki w formacie tokenizera (numpy)"""
+        if self.backend == 'onnx':
+            hidden = self.session.run(None, {k: v for k, v in batch.items() if k in self._onnx_inputs})[0]
+        else:
+            torch = self._torch
+            with torch.inference_mode():
+                inputs = {k: torch.from_numpy(v).to(self.device) for k, v in batch.items()}
+                hidden = self.model(**inputs).last_hidden_state.float().cpu().numpy()
+        mask = batch['attention_mask'][..., None].astype(np.float32)
+        return (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1)
+
+    def encode(self, texts: Sequence[str], batch_size: Optional[int] = None) -> np.ndarray:
+        result = np.zeros((len(texts), self.dim), dtype=np.float32)
+        if not len(texts):
+            return result
+        encoded = self.tokenizer(list(texts), truncation=True, max_length=self.max_length)
+        features = [{k: v[i] for k, v in encoded.items()} for i in range(len(texts))]
+        for bucket in length_buckets([len(f['input_ids']) for f in features], batch_size or self.batch_size):
+            # Dopełnienie do najdłuższego tekstu paczki (dynamic padding)
+            batch = self.tokenizer.pad([features[i] for i in bucket], padding='longest', return_tensors='np')
+            result[bucket] = self._forward(dict(batch))
+        return normalize_rows(result)
+
+
+class EncoderService:
+    """
+    Wspólna kolejka encode dla wielu wątków
+
+    Wątek roboczy bierze pierwsze zlecenie i przez max_wait_ms dobiera kolejne
+    (do max_batch tekstów) - równoległe zapytania API idą przez model razem.
+    """
+
+    def __init__(self, encoder, max_batch: int = 64, max_wait_ms: float = 5.0):
+        self.encoder = encoder
+        self.name = encoder.name
+        self.dim = encoder.dim
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: 'queue.Queue[Tuple[Sequence[str], Future]]' = queue.Queue()
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def _ensure_worker(self):
+        # Wątek nie przeżywa fork() - start leniwie w każdym procesie
+        with self._lock:
+            if self._pid != os.getpid():
+                self._queue = queue.Queue()
+                threading.Thread(target=self._run, args=(self._queue,), daemon=True,
+                                 name='encoder-service').start()
+                self._pid = os.getpid()
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        if not len(texts):
+            return np.zeros((0, self.dim), dtype=np.float32)
+        self._ensure_worker()
+        future: Future = Future()
+        self._queue.put((list(texts), future))
+        return future.result()
+
+    def _run(self, jobs: 'queue.Queue'):
+        while True:
+            pending = [jobs.get()]
+            size = len(pending[0][0])
+            try:
+                while size < self.max_batch:
+                    texts, future = jobs.get(timeout=self.max_wait)
+                    pending.append((texts, future))
+                    size += len(texts)
+            except queue.Empty:
+                pass
+            try:
+                vectors = self.encoder.encode([text for texts, _ in pending for text in texts])
+            except Exception as e:
+                for _, future in pending:
+                    future.set_exception(e)
+                continue
+            offset = 0
+            for texts, future in pending:
+                future.set_result(vectors[offset:offset + len(texts)])
+                offset += len(texts)
+
+
+def load_encoder(name: str = 'spacy', nlp=None, model_name: Optional[str] = None, device: str = 'cpu',
+                 backend: str = 'torch', onnx_path: Optional[str] = None, batch_size: int = 32,
+                 batch_wait_ms: float = 0.0, cache_dir: Optional[str] = None):
+    """
+    Enkoder według nazwy
+
+    Args:
+        name: 'spacy' albo 'herbert'
+        nlp: Model spaCy dla 'spacy' (domyślnie pl_core_news_lg)
+        model_name: Model transformers dla 'herbert'
+        backend, onnx_path, batch_size: Opcje HerbertEncoder
+        batch_wait_ms: > 0 - równoległe wywołania łączone przez EncoderService ('herbert')
+        cache_dir: Katalog EmbeddingCache (None - bez cache)
+    """
+    if name == 'spacy':
+        if nlp is None:
+            from .spacy_models import load_spacy_model
+            nlp = load_spacy_model('pl_core_news_lg')
+        encoder = SpacyEncoder(nlp)
+    elif name == 'herbert':
+        encoder = HerbertEncoder(model_name or 'allegro/herbert-base-cased', device,
+                                 backend=backend, onnx_path=onnx_path, batch_size=batch_size)
+        if batch_wait_ms > 0:
+            encoder = EncoderService(encoder, max_batch=2 * batch_size, max_wait_ms=batch_wait_ms)
+    else:
+        raise ValueError(f"Nieznany enkoder: {name} (obsługiwane: spacy, herbert)")
+
+    if cache_dir:
+        from .embedding_cache import CachedEncoder, EmbeddingCache
+        encoder = CachedEncoder(encoder, EmbeddingCache(cache_dir, encoder.name, encoder.dim))
+    return encoder
+
+
+_encoders: Dict[Tuple, object] = {}
+_encoders_lock = threading.Lock()
+
+
+def shared_encoder(name: str = 'spacy', nlp=None, **options):
+    """load_encoder raz na proces dla tych samych argumentów"""
+    key = (name, id(nlp), tuple(sorted(options.items())))
+    with _encoders_lock:
+        encoder = _encoders.get(key)
+        if encoder is None:
+            encoder = _encoders[key] = load_encoder(name, nlp, **options)
+        return encoder
+
+
+def export_onnx(model_name: str, path: str, opset: int = 14):
+    """Eksport modelu transformers do ONNX (dynamiczne wymiary paczki i długości)"""
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModel.from_pretrained(model_name).eval()
+    sample = tokenizer(["Dlaczego programista poszedł do lasu?"], return_tensors='pt')
+    names = [name for name in ('input_ids', 'attention_mask', 'token_type_ids') if name in sample]
+    axes = {name: {0: 'batch', 1: 'sequence'} for name in names}
+    axes['last_hidden_state'] = {0: 'batch', 1: 'sequence'}
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with torch.inference_mode():
+        torch.onnx.export(
+            model, tuple(sample[name] for name in names), path,
+            input_names=names, output_names=['last_hidden_state'], dynamic_axes=axes, opset_version=opset
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Narzędzia enkoderów embeddingów')
+    parser.add_argument('command', choices=['export-onnx'])
+    parser.add_argument('path', help='Plik wynikowy .onnx')
+    parser.add_argument('--model', default=os.getenv('JOKE_ANALYSER_MODEL_NAME', 'allegro/herbert-base-cased'))
+    args = parser.parse_args(argv)
+
+    try:
+        export_onnx(args.model, args.path)
+    except (ImportError, OSError, RuntimeError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    print(args.path)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Profile potoku spaCy - uruchamianie tylko potrzebnych komponentów
+
+pl_core_news_lg przy każdym nlp(text) uruchamia cały potok (tok2vec,
+morphologizer, parser, lemmatizer, tagger, attribute_ruler, ner), a większość
+analizerów potrzebuje tylko podziału na zdania. Analizer deklaruje, z jakich
+atrybutów Doc korzysta (SPACY_NEEDS), a parse() uruchamia tylko komponenty,
+które je ustawiają:
+
+    'sents' - doc.sents (senter - szybka ścieżka - albo parser)
+    'pos'   - token.pos_, token.tag_ (morphologizer, tagger, attribute_ruler)
+    'dep'   - token.dep_, token.head (parser; daje też zdania)
+    'lemma' - token.lemma_ (lemmatizer + komponenty 'pos')
+    'ents'  - doc.ents (ner)
+
+Pusty zbiór oznacza samą tokenizację. tok2vec jest dołączany, gdy któryś
+z wybranych komponentów go słucha. Komponenty są wołane bezpośrednio
+(jak w Language.__call__), bez nlp.select_pipes - ten zmienia współdzielony
+model, a analizery w tym samym procesie mogą potrzebować innych profili.
+"""
+
+import threading
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, Optional, Tuple
+
+# Atrybuty Doc, które analizer może zadeklarować (SPACY_NEEDS)
+NEEDS = ('sents', 'pos', 'dep', 'lemma', 'ents')
+FULL = frozenset(NEEDS)
+
+_POS_COMPONENTS = ('morphologizer', 'tagger', 'attribute_ruler')
+
+# Atrybut Doc.has_annotation potwierdzający, że wymaganie jest spełnione
+_ANNOTATIONS = {'sents': 'SENT_START', 'pos': 'POS', 'dep': 'DEP', 'lemma': 'LEMMA', 'ents': 'ENT_IOB'}
+
+_profiles: Dict[Tuple[int, FrozenSet[str]], Optional[Tuple[str, ...]]] = {}
+_lock = threading.Lock()
+
+
+def _resolve(nlp, needs: FrozenSet[str]) -> Optional[Tuple[str, ...]]:
+    names = set(nlp.component_names)
+    selected = set()
+
+    if 'dep' in needs:
+        if 'parser' not in names:
+            return None
+        selected.add('parser')
+    if needs & {'pos', 'lemma'}:
+        selected.update(n for n in _POS_COMPONENTS if n in names)
+    if 'lemma' in needs:
+        if 'lemmatizer' not in names:
+            return None
+        selected.add('lemmatizer')
+    if 'ents' in needs:
+        if 'ner' not in names:
+            return None
+        selected.add('ner')
+    if 'sents' in needs and 'parser' not in selected:
+        sentence_component = next((n for n in ('senter', 'sentencizer', 'parser') if n in names), None)
+        if sentence_component is None:
+            return None
+        selected.add(sentence_component)
+
+    # Komponenty współdzielące tok2vec (listenery) wymagają jego wyniku
+    for name, component in nlp.components:
+        listeners = getattr(component, 'listening_components', None) or ()
+        if any(listener in selected for listener in listeners):
+            selected.add(name)
+
+    return tuple(name for name, _ in nlp.components if name in selected)
+
+
+def pipeline_components(nlp, needs: Iterable[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Komponenty potoku potrzebne dla `needs` (w kolejności potoku)
+
+    Returns:
+        Nazwy komponentów albo None, gdy model nie ma któregoś komponentu -
+        wtedy używany jest cały potok (nlp(text))
+    """
+    needs = frozenset(needs)
+    unknown = needs - FULL
+    if unknown:
+        raise ValueError(f"Nieznane wymagania spaCy: {', '.join(sorted(unknown))}")
+
+    key = (id(nlp), needs)
+    with _lock:
+        if key not in _profiles:
+            _profiles[key] = _resolve(nlp, needs)
+        return _profiles[key]
+
+
+def covers(doc, needs: Iterable[str]) -> bool:
+    """Czy Doc (np. sparsowany wcześniej innym profilem) ma adnotacje dla `needs`"""
+    return all(doc.has_annotation(_ANNOTATIONS[need]) for need in needs)
+
+
+def parse(nlp, text: str, needs: Iterable[str] = FULL):
+    """Przetwórz tekst tylko komponentami potrzebnymi dla `needs`"""
+    components = pipeline_components(nlp, needs)
+    if components is None:
+        return nlp(text)
+
+    doc = nlp.make_doc(text)
+    for name, component in nlp.components:
+        if name in components:
+            doc = component(doc)
+    return doc
+
+
+def pipe(nlp, texts: Iterable[str], needs: Iterable[str] = FULL, batch_size: int = 64) -> Iterator[Any]:
+    """Jak parse() dla wielu tekstów (paczkami, jak nlp.pipe)"""
+    components = pipeline_components(nlp, needs)
+    if components is None:
+        return nlp.pipe(texts, batch_size=batch_size)
+
+    docs = (nlp.make_doc(text) for text in texts)
+    for name, component in nlp.components:
+        if name in components:
+            if hasattr(component, 'pipe'):
+                docs = component.pipe(docs, batch_size=batch_size)
+            else:
+                docs = map(component, docs)
+    return docs
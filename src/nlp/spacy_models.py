@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Współdzielone modele spaCy
+
+Każdy z 9 analizerów (joke_analyser, humor_features) oraz HumorFeatureExtractor
+wołał spacy.load("pl_core_news_lg") osobno - 10 kopii tego samego modelu
+w każdym procesie. load_spacy_model zwraca jedną instancję na nazwę modelu,
+co przy pre-fork (patrz api/prefork.py) pozwala też współdzielić ją między
+workerami (copy-on-write).
+"""
+
+import logging
+import threading
+from typing import Dict, Any
+
+logger = logging.getLogger(__name__)
+
+_models: Dict[str, Any] = {}
+_lock = threading.Lock()
+
+# Tekst do rozgrzania modelu (alokacja leniwych struktur przed fork)
+WARM_UP_TEXT = "Dlaczego programista poszedł do lasu? Bo szukał drzewa binarnego!"
+
+
+def load_spacy_model(model_name: str):
+    """
+    Załaduj model spaCy (raz na proces)
+
+    Args:
+        model_name: Nazwa modelu, np. 'pl_core_news_lg'
+
+    Raises:
+        OSError: Model nie jest zainstalowany (jak spacy.load)
+    """
+    with _lock:
+        nlp = _models.get(model_name)
+        if nlp is None:
+            import spacy
+            logger.info(f"Loading spaCy model: {model_name}")
+            nlp = spacy.load(model_name)
+            _models[model_name] = nlp
+        return nlp
+
+
+def loaded_spacy_models() -> Dict[str, Any]:
+    """Załadowane modele (nazwa -> Language)"""
+    with _lock:
+        return dict(_models)
+
+
+def warm_up(text: str = WARM_UP_TEXT):
+    """Przepuść tekst przez wszystkie załadowane modele"""
+    for model_name, nlp in loaded_spacy_models().items():
+        nlp(text)
+        logger.debug(f"spaCy model warmed up: {model_name}")
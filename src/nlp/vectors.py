@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Wykrywanie zderzeń domen na wektorach słów (pl_core_news_lg ma wektory statyczne)
+
+Listy słów par domen (np. technologia ↔ emocje) łapią tylko dokładne
+wystąpienia. Detektor liczy raz centroid wektorów każdej domeny, a słowa
+treściowe żartu porównuje ze wszystkimi centroidami jednym mnożeniem macierzy
+(podobieństwo kosinusowe). Para jest zderzeniem, gdy różne słowa żartu są
+blisko obu jej domen - także słowa spoza list (np. 'serwerownia', 'żałoba').
+
+Paczka żartów to nadal jedno mnożenie: tokeny wszystkich dokumentów są
+sklejane w jedną macierz, a wyniki dzielone po dokumentach.
+
+Wektory są brane ze słownika (vocab), więc wystarcza sama tokenizacja
+(bez tok2vec i innych komponentów - SPACY_NEEDS = ()).
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+DomainPair = Tuple[Sequence[str], Sequence[str]]
+
+
+def _unit_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def _lookup(vocab, words: Sequence[str]) -> np.ndarray:
+    """Wektory słów (małe litery; słowa bez wektora pominięte)"""
+    vectors = vocab.vectors
+    rows = vectors.find(keys=[vocab.strings.add(word.lower()) for word in words])
+    return np.asarray(vectors.data[rows[rows >= 0]], dtype=np.float32)
+
+
+def _centroid(vocab, words: Iterable[str]) -> Optional[np.ndarray]:
+    """Znormalizowany centroid domeny (frazy - średnia ich słów)"""
+    found = _lookup(vocab, [part for word in words for part in word.split()])
+    if not len(found):
+        return None
+    return _unit_rows(found.mean(axis=0, keepdims=True))[0]
+
+
+class DomainClashDetector:
+    """Zderzenia par domen na podstawie podobieństwa do centroidów"""
+
+    def __init__(self, vocab, domain_pairs: Iterable[DomainPair], threshold: float = 0.45):
+        """
+        Args:
+            vocab: Vocab z wektorami (nlp.vocab)
+            domain_pairs: Pary (słowa domeny A, słowa domeny B); etykieta - pierwsze słowo
+            threshold: Minimalne podobieństwo kosinusowe słowa do centroidu domeny
+        """
+        self.vocab = vocab
+        self.threshold = threshold
+        self.labels: List[Tuple[str, str]] = []
+        rows = []
+        for high, low in domain_pairs:
+            high_centroid, low_centroid = _centroid(vocab, high), _centroid(vocab, low)
+            # Domena bez żadnego wektora - para zostaje tylko w regułach słownikowych
+            if high_centroid is None or low_centroid is None:
+                continue
+            rows += [high_centroid, low_centroid]
+            self.labels.append((high[0], low[0]))
+        # Wiersze 2p / 2p+1 - centroidy obu domen pary p
+        self.centroids = np.vstack(rows) if rows else np.zeros((0, vocab.vectors_length), dtype=np.float32)
+
+    @classmethod
+    def for_nlp(cls, nlp, domain_pairs: Iterable[DomainPair], threshold: float = 0.45) -> Optional['DomainClashDetector']:
+        """Detektor dla modelu albo None, gdy model nie ma wektorów (np. *_sm)"""
+        if nlp is None or nlp.vocab.vectors.shape[0] == 0:
+            return None
+        detector = cls(nlp.vocab, domain_pairs, threshold)
+        return detector if detector.labels else None
+
+    def _content(self, doc) -> Tuple[List[str], np.ndarray]:
+        """Słowa treściowe dokumentu (bez stop words) i ich znormalizowane wektory"""
+        vectors = self.vocab.vectors
+        words = [token for token in doc if token.is_alpha and not token.is_stop]
+        rows = vectors.find(keys=[token.lower for token in words]) if words else np.zeros(0, dtype=int)
+        keep = rows >= 0
+        return (
+            [token.lower_ for token, found in zip(words, keep) if found],
+            _unit_rows(np.asarray(vectors.data[rows[keep]], dtype=np.float32)),
+        )
+
+    def clashes(self, doc) -> List[Dict]:
+        """Zderzenia domen w jednym dokumencie (patrz clashes_batch)"""
+        return self.clashes_batch([doc])[0]
+
+    def clashes_batch(self, docs: Sequence) -> List[List[Dict]]:
+        """
+        Zderzenia domen dla wielu dokumentów - jedno mnożenie macierzy
+
+        Returns:
+            Dla każdego dokumentu lista zderzeń: {'pair': 'api↔miłość',
+            'words': (słowo domeny A, słowo domeny B), 'similarity': min. podobieństwo}
+        """
+        contents = [self._content(doc) for doc in docs]
+        if not self.labels or not any(words for words, _ in contents):
+            return [[] for _ in docs]
+
+        matrix = np.vstack([vectors for _, vectors in contents])
+        # (tokeny, 2 * pary): podobieństwo kosinusowe każdego słowa do każdej domeny
+        similarities = matrix @ self.centroids.T
+
+        results = []
+        offset = 0
+        for words, vectors in contents:
+            block = similarities[offset:offset + len(words)]
+            offset += len(words)
+            results.append(self._pick(words, block) if len(words) else [])
+        return results
+
+    def _pick(self, words: List[str], block: np.ndarray) -> List[Dict]:
+        high, low = block[:, 0::2], block[:, 1::2]
+        # Słowo należy do domeny, gdy jest bliżej niej niż drugiej domeny pary
+        high = np.where(high > low, high, -1.0)
+        low = np.where(low > block[:, 0::2], low, -1.0)
+        best_high, best_low = high.argmax(axis=0), low.argmax(axis=0)
+        pairs = np.arange(len(self.labels))
+        high_scores, low_scores = high[best_high, pairs], low[best_low, pairs]
+
+        clashes = []
+        for p in np.flatnonzero((high_scores >= self.threshold) & (low_scores >= self.threshold)):
+            high_label, low_label = self.labels[p]
+            clashes.append({
+                'pair': f"{high_label}↔{low_label}",
+                'words': (words[best_high[p]], words[best_low[p]]),
+                'similarity': round(float(min(high_scores[p], low_scores[p])), 3),
+            })
+        return clashes
@@ -5,6 +5,9 @@ Komunikacja z lokalnym serwerem Ollama przez HTTP API
 
 from .complete import complete, validate_prompt
 from .client import OllamaClient
+from .admission import AdmissionController, parse_deadline
+from .cache import CompletionCache
 
-__all__ = ['complete', 'validate_prompt', 'OllamaClient']
+__all__ = ['complete', 'validate_prompt', 'OllamaClient', 'AdmissionController', 'CompletionCache',
+           'parse_deadline']
 
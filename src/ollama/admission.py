@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+AdmissionController - kolejka i limity współbieżności dla zapytań do Ollama
+
+Ollama trzyma w pamięci ograniczoną liczbę modeli. Przy burstach zapytań
+do różnych modeli serwer ciągle je przeładowuje i wszystkie zapytania
+zwalniają. Kontroler:
+- ogranicza liczbę równoległych generacji (globalnie i per model),
+- grupuje oczekujące zapytania po modelu (preferuje model, który już działa),
+- pilnuje deadline'ów oczekiwania w kolejce,
+- odrzuca zapytania gdy kolejka jest pełna (z sugerowanym Retry-After),
+- zbiera metryki (głębokość kolejki, czas oczekiwania).
+
+Implementacja jest oparta o wątki (threading.Condition), więc działa zarówno
+w Flask (server.py), jak i w FastAPI (przez run_in_threadpool).
+
+Przykład użycia:
+    admission = AdmissionController(max_concurrent=2)
+    with admission.slot('llama3.1:8b'):
+        result = client.chat(user="Hello", model='llama3.1:8b')
+"""
+
+import math
+import time
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, Deque
+
+from .exceptions import OllamaQueueFullError, OllamaQueueTimeoutError
+
+logger = logging.getLogger(__name__)
+
+# Górna granica czasu oczekiwania w kolejce (s) - większe wartości przepełniają
+# timeouty threading (OverflowError) i nie mają sensu dla zapytania HTTP
+MAX_DEADLINE = 3600.0
+
+
+def parse_deadline(value: Any) -> Optional[float]:
+    """
+    Pole "deadline" z body zapytania (sekundy) jako float
+
+    Raises:
+        ValueError: Wartość nie jest liczbą z przedziału [0, MAX_DEADLINE]
+    """
+    if value is None:
+        return None
+    try:
+        deadline = float(value)
+    except (TypeError, ValueError):
+        deadline = -1.0
+    if isinstance(value, bool) or not 0 <= deadline <= MAX_DEADLINE:
+        raise ValueError(f'Pole "deadline" musi być liczbą sekund od 0 do {MAX_DEADLINE:g}')
+    return deadline
+
+
+class _Ticket:
+    """Pojedyncze zapytanie czekające w kolejce"""
+
+    __slots__ = ('model', 'enqueued_at', 'admitted')
+
+    def __init__(self, model: str):
+        self.model = model
+        self.enqueued_at = time.monotonic()
+        self.admitted = False
+
+
+class AdmissionController:
+    """
+    Kontroler dopuszczania zapytań do Ollama (admission control)
+
+    Zapytania do tego samego modelu są obsługiwane seriami (maksymalnie
+    max_model_streak z rzędu), zanim kontroler przełączy się na inny model.
+    Dzięki temu Ollama nie przeładowuje modeli przy każdym zapytaniu,
+    a jednocześnie żaden model nie jest zagłodzony.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 2,
+        max_concurrent_per_model: int = 1,
+        max_queue_size: int = 32,
+        default_deadline: float = 120.0,
+        max_model_streak: int = 8
+    ):
+        """
+        Inicjalizacja kontrolera
+
+        Args:
+            max_concurrent: Maksymalna liczba równoległych generacji (wszystkie modele)
+            max_concurrent_per_model: Maksymalna liczba równoległych generacji jednego modelu
+            max_queue_size: Maksymalna liczba zapytań czekających w kolejce
+            default_deadline: Domyślny maksymalny czas oczekiwania w kolejce (sekundy)
+            max_model_streak: Ile zapytań jednego modelu z rzędu zanim przełączymy model
+        """
+        if max_concurrent < 1 or max_concurrent_per_model < 1:
+            raise ValueError('Limity współbieżności muszą być >= 1')
+
+        self.max_concurrent = max_concurrent
+        self.max_concurrent_per_model = max_concurrent_per_model
+        self.max_queue_size = max_queue_size
+        self.default_deadline = default_deadline
+        self.max_model_streak = max_model_streak
+
+        self._cond = threading.Condition()
+        self._queues: Dict[str, Deque[_Ticket]] = {}
+        self._active: Dict[str, int] = {}
+        self._current_model: Optional[str] = None
+        self._streak = 0
+
+        # Metryki
+        self._admitted_total = 0
+        self._rejected_total = 0
+        self._timed_out_total = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+        self._service_time_avg: Optional[float] = None
+
+    # ------------------------------------------------------------------
+    # Publiczne API
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def slot(self, model: str, deadline: Optional[float] = None):
+        """
+        Zajmij slot generacji dla modelu (context manager)
+
+        Args:
+            model: Nazwa modelu Ollama
+            deadline: Maksymalny czas oczekiwania w kolejce w sekundach
+                      (domyślnie self.default_deadline)
+
+        Raises:
+            OllamaQueueFullError: Kolejka jest pełna
+            OllamaQueueTimeoutError: Deadline minął zanim zapytanie zostało dopuszczone
+        """
+        wait_time = self.acquire(model, deadline)
+        started = time.monotonic()
+        try:
+            yield wait_time
+        finally:
+            self.release(model, time.monotonic() - started)
+
+    def acquire(self, model: str, deadline: Optional[float] = None) -> float:
+        """
+        Czekaj na slot dla modelu
+
+        Returns:
+            Czas oczekiwania w kolejce (sekundy)
+        """
+        deadline = self.default_deadline if deadline is None else deadline
+        deadline = min(max(deadline, 0.0), MAX_DEADLINE)
+
+        with self._cond:
+            if self._queue_depth() >= self.max_queue_size:
+                self._rejected_total += 1
+                retry_after = self._estimate_retry_after()
+                logger.warning(
+                    f"Ollama queue full ({self.max_queue_size}), rejecting model={model}, "
+                    f"retry_after={retry_after}s"
+                )
+                raise OllamaQueueFullError(
+                    f'Kolejka zapytań do Ollama jest pełna ({self.max_queue_size})',
+                    retry_after=retry_after
+                )
+
+            ticket = _Ticket(model)
+            self._queues.setdefault(model, deque()).append(ticket)
+            self._dispatch()
+
+            expires_at = ticket.enqueued_at + deadline
+            while not ticket.admitted:
+                remaining = expires_at - time.monotonic()
+                if remaining <= 0:
+                    self._remove(ticket)
+                    self._timed_out_total += 1
+                    # Bez tego zapytania bieżący model może nie mieć już kolejki -
+                    # inne modele wstrzymane przez _pick_model dostają wolne sloty
+                    self._dispatch()
+                    logger.warning(f"Ollama queue deadline exceeded ({deadline}s) for model={model}")
+                    raise OllamaQueueTimeoutError(
+                        f'Przekroczono czas oczekiwania w kolejce ({deadline}s) dla modelu {model}',
+                        retry_after=self._estimate_retry_after()
+                    )
+                self._cond.wait(remaining)
+
+            wait_time = time.monotonic() - ticket.enqueued_at
+            self._wait_time_total += wait_time
+            self._wait_time_max = max(self._wait_time_max, wait_time)
+
+        if wait_time > 0.5:
+            logger.info(f"Ollama slot acquired for model={model} after {wait_time:.2f}s in queue")
+        return wait_time
+
+    def release(self, model: str, service_time: Optional[float] = None):
+        """Zwolnij slot modelu i dopuść kolejne zapytania"""
+        with self._cond:
+            self._active[model] = max(0, self._active.get(model, 0) - 1)
+            if self._active[model] == 0:
+                del self._active[model]
+
+            if service_time is not None:
+                # EWMA czasu generacji - używane do estymacji Retry-After
+                if self._service_time_avg is None:
+                    self._service_time_avg = service_time
+                else:
+                    self._service_time_avg = 0.8 * self._service_time_avg + 0.2 * service_time
+
+            self._dispatch()
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Metryki kolejki
+
+        Returns:
+            {
+                'queue_depth': int,
+                'queue_depth_by_model': {model: int},
+                'active': int,
+                'active_by_model': {model: int},
+                'admitted_total': int,
+                'rejected_total': int,
+                'timed_out_total': int,
+                'wait_time_avg_sec': float,
+                'wait_time_max_sec': float,
+                'service_time_avg_sec': float | None,
+                'limits': {...}
+            }
+        """
+        with self._cond:
+            admitted = self._admitted_total
+            return {
+                'queue_depth': self._queue_depth(),
+                'queue_depth_by_model': {m: len(q) for m, q in self._queues.items() if q},
+                'active': sum(self._active.values()),
+                'active_by_model': dict(self._active),
+                'current_model': self._current_model,
+                'admitted_total': admitted,
+                'rejected_total': self._rejected_total,
+                'timed_out_total': self._timed_out_total,
+                'wait_time_avg_sec': round(self._wait_time_total / admitted, 4) if admitted else 0.0,
+                'wait_time_max_sec': round(self._wait_time_max, 4),
+                'service_time_avg_sec': (
+                    round(self._service_time_avg, 4) if self._service_time_avg is not None else None
+                ),
+                'limits': {
+                    'max_concurrent': self.max_concurrent,
+                    'max_concurrent_per_model': self.max_concurrent_per_model,
+                    'max_queue_size': self.max_queue_size,
+                    'default_deadline': self.default_deadline,
+                },
+            }
+
+    # ------------------------------------------------------------------
+    # Wewnętrzne (wywoływane pod self._cond)
+    # ------------------------------------------------------------------
+
+    def _queue_depth(self) -> int:
+        return sum(len(q) for q in self._queues.values())
+
+    def _remove(self, ticket: _Ticket):
+        queue = self._queues.get(ticket.model)
+        if queue is not None:
+            try:
+                queue.remove(ticket)
+            except ValueError:
+                pass
+            if not queue:
+                del self._queues[ticket.model]
+
+    def _dispatch(self):
+        """Dopuść tyle zapytań ile pozwalają limity"""
+        admitted_any = False
+        while sum(self._active.values()) < self.max_concurrent:
+            model = self._pick_model()
+            if model is None:
+                break
+
+            ticket = self._queues[model].popleft()
+            if not self._queues[model]:
+                del self._queues[model]
+
+            if model == self._current_model:
+                self._streak += 1
+            else:
+                self._current_model = model
+                self._streak = 1
+
+            ticket.admitted = True
+            self._active[model] = self._active.get(model, 0) + 1
+            self._admitted_total += 1
+            admitted_any = True
+
+        if admitted_any:
+            self._cond.notify_all()
+
+    def _pick_model(self) -> Optional[str]:
+        """
+        Wybierz model, którego zapytanie dopuścić jako następne
+
+        Kolejność:
+        1. bieżący model (jest już załadowany), o ile nie przekroczył max_model_streak;
+           gdy ma pełny limit per model, inne modele czekają na jego wolny slot
+           (inaczej przy max_concurrent_per_model=1 zawsze generowałyby dwa modele naraz)
+        2. model, który już generuje (też jest załadowany)
+        3. model z najdłużej czekającym zapytaniem (FIFO)
+        """
+        if self._queues.get(self._current_model) and self._streak < self.max_model_streak:
+            if self._active.get(self._current_model, 0) < self.max_concurrent_per_model:
+                return self._current_model
+            return None
+
+        candidates = [
+            model for model, queue in self._queues.items()
+            if queue and self._active.get(model, 0) < self.max_concurrent_per_model
+        ]
+        if not candidates:
+            return None
+
+        others_waiting = any(model != self._current_model for model in candidates)
+        if (self._current_model in candidates
+                and (self._streak < self.max_model_streak or not others_waiting)):
+            return self._current_model
+
+        if self._streak < self.max_model_streak or not others_waiting:
+            running = [model for model in candidates if self._active.get(model, 0) > 0]
+            if running:
+                return min(running, key=lambda m: self._queues[m][0].enqueued_at)
+
+        fresh = [model for model in candidates if model != self._current_model] or candidates
+        return min(fresh, key=lambda m: self._queues[m][0].enqueued_at)
+
+    def _estimate_retry_after(self) -> int:
+        """Oszacuj po ilu sekundach warto ponowić zapytanie"""
+        service_time = self._service_time_avg or 5.0
+        backlog = self._queue_depth() + sum(self._active.values())
+        estimate = service_time * backlog / self.max_concurrent
+        return max(1, int(math.ceil(estimate)))
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+CompletionCache - cache odpowiedzi Ollama dla deterministycznych zapytań
+
+Zapytania z temperature=0 (np. klasyfikacja żartów przez THEORY_PROMPTS)
+dają dla tego samego modelu i promptu zawsze tę samą odpowiedź, więc
+nie ma sensu generować ich ponownie. Cache ma dwa poziomy:
+- pamięć (LRU, OrderedDict) - najszybszy, per proces
+- SQLite (opcjonalnie) - przeżywa restart i jest współdzielony przez procesy
+
+Klucz jest liczony z digestu modelu (nie tylko nazwy - po `ollama pull`
+nowa wersja modelu dostaje nowy digest), endpointu, wiadomości i opcji.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+
+class CompletionCache:
+    """
+    Dwupoziomowy cache odpowiedzi (LRU w pamięci + SQLite)
+
+    Przykład użycia:
+        cache = CompletionCache(max_entries=1024, db_path='/tmp/ollama-cache.db')
+        client = OllamaClient(cache=cache)
+        client.chat(user="...", temperature=0)  # MISS
+        client.chat(user="...", temperature=0)  # HIT
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        db_path: Optional[str] = None,
+        ttl: Optional[float] = None
+    ):
+        """
+        Args:
+            max_entries: Maksymalna liczba wpisów w pamięci (LRU)
+            db_path: Ścieżka do pliku SQLite (None = tylko pamięć)
+            ttl: Czas życia wpisu w sekundach (None = bez limitu)
+        """
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._memory: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_pid: Optional[int] = None
+
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+
+        if db_path:
+            self._connection()
+            logger.info(f"CompletionCache SQLite tier: {db_path}")
+
+    @staticmethod
+    def make_key(endpoint: str, model_digest: str, payload: Dict[str, Any]) -> str:
+        """
+        Zbuduj klucz cache
+
+        Args:
+            endpoint: Endpoint API (np. '/api/chat')
+            model_digest: Digest modelu (lub nazwa, jeśli digest nieznany)
+            payload: Dane zapytania bez pola 'model' (messages/prompt, options)
+        """
+        material = json.dumps(
+            {'endpoint': endpoint, 'model': model_digest, 'payload': payload},
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Pobierz wpis (pamięć, potem SQLite). Zwraca None przy braku."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created_at, value = entry
+                if self._is_fresh(created_at, now):
+                    self._memory.move_to_end(key)
+                    self._hits += 1
+                    return value
+                del self._memory[key]
+
+            db = self._connection()
+            if db is not None:
+                row = db.execute(
+                    'SELECT value, created_at FROM completions WHERE key = ?', (key,)
+                ).fetchone()
+                if row is not None and self._is_fresh(row[1], now):
+                    value = json.loads(row[0])
+                    self._store_memory(key, row[1], value)
+                    self._hits += 1
+                    self._disk_hits += 1
+                    return value
+
+            self._misses += 1
+            return None
+
+    def set(self, key: str, value: Dict[str, Any]):
+        """Zapisz wpis w obu poziomach"""
+        now = time.time()
+        with self._lock:
+            self._store_memory(key, now, value)
+            db = self._connection()
+            if db is not None:
+                db.execute(
+                    'INSERT OR REPLACE INTO completions (key, value, created_at) VALUES (?, ?, ?)',
+                    (key, json.dumps(value, ensure_ascii=False), now)
+                )
+                db.commit()
+
+    def clear(self):
+        """Wyczyść cache (pamięć i SQLite)"""
+        with self._lock:
+            self._memory.clear()
+            db = self._connection()
+            if db is not None:
+                db.execute('DELETE FROM completions')
+                db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Statystyki cache"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'entries': len(self._memory),
+                'max_entries': self.max_entries,
+                'hits': self._hits,
+                'disk_hits': self._disk_hits,
+                'misses': self._misses,
+                'hit_rate': round(self._hits / lookups, 4) if lookups else 0.0,
+                'persistent': self.db_path is not None,
+            }
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """
+        Połączenie SQLite dla bieżącego procesu
+
+        Połączenia nie wolno używać po fork() (gunicorn z preload_app tworzy
+        cache w masterze), więc każdy proces otwiera własne.
+        """
+        if not self.db_path:
+            return None
+        if self._db is None or self._db_pid != os.getpid():
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS completions ('
+                'key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)'
+            )
+            self._db.commit()
+            self._db_pid = os.getpid()
+        return self._db
+
+    def _store_memory(self, key: str, created_at: float, value: Dict[str, Any]):
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _is_fresh(self, created_at: float, now: float) -> bool:
+        return self.ttl is None or now - created_at < self.ttl
@@ -5,11 +5,22 @@ OllamaClient - Klasa do komunikacji z lokalnym serwerem Ollama
 
 import os
 import json
+import time
 import logging
 import requests
-from typing import Optional, Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, Dict, Any, List, Iterator, Tuple
 from urllib.parse import urljoin
 
+from metrics import observe_ollama_response, observe_stage
+from .exceptions import OllamaCircuitOpenError
+from .resilience import RetryPolicy, CircuitBreaker, get_circuit_breaker
+from .cache import CompletionCache
+from .admission import AdmissionController
+
+# Jak długo pamiętamy digesty modeli z /api/tags (sekundy)
+MODEL_DIGEST_TTL = 300
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,7 +39,12 @@ class OllamaClient:
         base_url: Optional[str] = None,
         default_model: Optional[str] = None,
         timeout: int = 120,
-        max_retries: int = 3
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        cache: Optional[CompletionCache] = None,
+        admission: Optional[AdmissionController] = None
     ):
         """
         Inicjalizacja klienta Ollama
@@ -38,14 +54,32 @@ class OllamaClient:
             default_model: Domyślny model (domyślnie z OLLAMA_MODEL env lub llama3.1:8b)
             timeout: Timeout dla requestów w sekundach
             max_retries: Maksymalna liczba prób przy błędzie
+            backoff_base: Bazowe opóźnienie między próbami w sekundach (exponential backoff z jitterem)
+            backoff_max: Maksymalne opóźnienie między próbami w sekundach
+            circuit_breaker: Circuit breaker (domyślnie współdzielony breaker dla base_url)
+            cache: Cache odpowiedzi (opcjonalnie); domyślnie cache'owane są tylko
+                   zapytania deterministyczne (temperature=0)
+            admission: Kolejka zapytań (opcjonalnie) - generacje czekają na slot modelu,
+                       odpowiedzi z cache omijają kolejkę
         """
         self.base_url = base_url or os.getenv('OLLAMA_URL', 'http://localhost:11434')
         self.default_model = default_model or os.getenv('OLLAMA_MODEL', 'llama3.1:8b')
         self.timeout = timeout
         self.max_retries = max_retries
+        self.retry_policy = RetryPolicy(
+            max_retries=max_retries,
+            backoff_base=backoff_base,
+            backoff_max=backoff_max
+        )
         
         # Upewnij się, że base_url nie kończy się na /
         self.base_url = self.base_url.rstrip('/')
+        self.circuit_breaker = circuit_breaker or get_circuit_breaker(self.base_url)
+        
+        self.cache = cache
+        self.admission = admission
+        self._model_digests: Dict[str, str] = {}
+        self._model_digests_at = 0.0
         
         logger.info(f"OllamaClient initialized: base_url={self.base_url}, default_model={self.default_model}")
     
@@ -59,6 +93,11 @@ class OllamaClient:
         """
         Wykonaj request do Ollama API z retry logic
         
+        Ponawiane są tylko błędy przejściowe (połączenie, 408/429/5xx),
+        z exponential backoff i jitterem. Timeout odczytu dla POST (generacja)
+        nie jest ponawiany. Gdy circuit breaker backendu jest otwarty,
+        request jest odrzucany od razu.
+        
         Args:
             method: HTTP method (GET, POST, etc.)
             endpoint: Endpoint API (np. '/api/chat')
@@ -69,9 +108,20 @@ class OllamaClient:
             Odpowiedź JSON z API
         
         Raises:
+            OllamaCircuitOpenError: Circuit breaker jest otwarty (Ollama niedostępna)
             requests.exceptions.RequestException: W przypadku błędu połączenia
         """
         url = urljoin(self.base_url, endpoint)
+        if method.upper() not in ('GET', 'POST'):
+            raise ValueError(f"Unsupported HTTP method: {method}")
+        
+        if not self.circuit_breaker.allow_request():
+            retry_after = self.circuit_breaker.retry_after()
+            logger.warning(f"Circuit breaker open for {self.base_url}, failing fast ({retry_after:.1f}s left)")
+            raise OllamaCircuitOpenError(
+                f'Ollama ({self.base_url}) jest niedostępna, spróbuj ponownie za {retry_after:.0f}s',
+                retry_after=retry_after
+            )
         
         for attempt in range(1, self.max_retries + 1):
             try:
@@ -79,20 +129,121 @@ class OllamaClient:
                 
                 if method.upper() == 'GET':
                     response = requests.get(url, params=params, timeout=self.timeout)
-                elif method.upper() == 'POST':
-                    response = requests.post(url, json=data, timeout=self.timeout)
                 else:
-                    raise ValueError(f"Unsupported HTTP method: {method}")
+                    response = requests.post(url, json=data, timeout=self.timeout)
                 
                 response.raise_for_status()
-                return response.json()
+                result = response.json()
+                self.circuit_breaker.record_success()
+                return result
                 
             except requests.exceptions.RequestException as e:
-                if attempt == self.max_retries:
-                    logger.error(f"Request failed after {self.max_retries} attempts: {e}")
+                retryable = self.retry_policy.is_retryable(method, e)
+                if attempt == self.max_retries or not retryable:
+                    if self.retry_policy.is_backend_failure(e):
+                        self.circuit_breaker.record_failure()
+                    else:
+                        # Serwer odpowiedział (np. 404) - backend działa
+                        self.circuit_breaker.record_success()
+                    if retryable:
+                        logger.error(f"Request failed after {self.max_retries} attempts: {e}")
+                    else:
+                        logger.error(f"Request failed (not retryable): {e}")
                     raise
-                logger.warning(f"Request attempt {attempt} failed: {e}, retrying...")
-                continue
+                delay = self.retry_policy.delay(attempt, e)
+                logger.warning(f"Request attempt {attempt} failed: {e}, retrying in {delay:.2f}s...")
+                time.sleep(delay)
+            except Exception:
+                # Błąd poza komunikacją z backendem - nie rozstrzyga o stanie breakera,
+                # ale próba half-open musi zostać zwolniona
+                self.circuit_breaker.release_probe()
+                raise
+    
+    def _cached_request(
+        self,
+        endpoint: str,
+        request_data: Dict[str, Any],
+        use_cache: Optional[bool] = None,
+        deadline: Optional[float] = None
+    ) -> tuple:
+        """
+        Wykonaj POST przez cache odpowiedzi (jeśli włączony) i kolejkę (jeśli ustawiona)
+        
+        Args:
+            endpoint: Endpoint API ('/api/chat' lub '/api/generate')
+            request_data: Dane zapytania
+            use_cache: True/False wymusza decyzję, None = cache tylko dla temperature=0
+            deadline: Maksymalny czas oczekiwania w kolejce w sekundach
+        
+        Returns:
+            (odpowiedź JSON z API, status cache: 'HIT' / 'MISS' / 'BYPASS')
+        """
+        if use_cache is None:
+            use_cache = self._is_deterministic(request_data)
+        
+        if self.cache is None or not use_cache or request_data.get('stream'):
+            return self._admitted_request(endpoint, request_data, deadline), 'BYPASS'
+        
+        payload = {k: v for k, v in request_data.items() if k != 'model'}
+        key = CompletionCache.make_key(endpoint, self._model_digest(request_data['model']), payload)
+        
+        cached = self.cache.get(key)
+        if cached is not None:
+            logger.debug(f"Cache hit for {endpoint} (model={request_data['model']})")
+            return cached, 'HIT'
+        
+        result = self._admitted_request(endpoint, request_data, deadline)
+        self.cache.set(key, result)
+        return result, 'MISS'
+    
+    def _admitted_request(
+        self,
+        endpoint: str,
+        request_data: Dict[str, Any],
+        deadline: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Wykonaj generację po uzyskaniu slotu w kolejce (jeśli kolejka jest ustawiona)"""
+        if self.admission is None:
+            result = self._make_request('POST', endpoint, data=request_data)
+        else:
+            with self.admission.slot(request_data['model'], deadline=deadline) as wait_time:
+                observe_stage('ollama', 'queue_wait', wait_time)
+                result = self._make_request('POST', endpoint, data=request_data)
+        
+        # Czasy prompt_eval / eval z odpowiedzi Ollama (tylko realne generacje, nie cache)
+        observe_ollama_response(request_data['model'], result)
+        return result
+    
+    @staticmethod
+    def _is_deterministic(request_data: Dict[str, Any]) -> bool:
+        """Czy zapytanie jest deterministyczne (temperature=0)"""
+        options = request_data.get('options') or {}
+        return options.get('temperature') == 0
+    
+    def _model_digest(self, model: str) -> str:
+        """
+        Digest modelu z /api/tags (z cache na MODEL_DIGEST_TTL sekund)
+        
+        Jeśli Ollama nie zwróci digestu, używamy nazwy modelu.
+        """
+        now = time.monotonic()
+        if not self._model_digests_at or now - self._model_digests_at > MODEL_DIGEST_TTL:
+            try:
+                digests = {}
+                for m in self.list_models():
+                    name = m.get('name')
+                    if not name:
+                        continue
+                    digests[name] = m.get('digest') or name
+                    # 'llama2' i 'llama2:latest' to ten sam model
+                    if name.endswith(':latest'):
+                        digests.setdefault(name[:-len(':latest')], digests[name])
+                self._model_digests = digests
+            except (requests.exceptions.RequestException, OllamaCircuitOpenError) as e:
+                logger.warning(f"Could not fetch model digests: {e}")
+            self._model_digests_at = now
+        
+        return self._model_digests.get(model, model)
     
     def chat(
         self,
@@ -101,7 +252,9 @@ class OllamaClient:
         model: Optional[str] = None,
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
-        stream: bool = False
+        stream: bool = False,
+        use_cache: Optional[bool] = None,
+        deadline: Optional[float] = None
     ) -> Dict[str, Any]:
         """
         Wyślij wiadomość do Ollama i otrzymaj odpowiedź (chat completion)
@@ -113,16 +266,20 @@ class OllamaClient:
             temperature: Temperatura (0.0-2.0, opcjonalnie)
             max_tokens: Maksymalna liczba tokenów do wygenerowania (opcjonalnie)
             stream: Czy używać streaming (domyślnie False)
+            use_cache: Czy użyć cache (None = tylko dla temperature=0)
+            deadline: Maksymalny czas oczekiwania w kolejce w sekundach (gdy ustawiono admission)
         
         Returns:
             {
                 'text': str - tekst odpowiedzi,
                 'usage': {'input_tokens': int, 'output_tokens': int},
-                'raw': dict - pełna odpowiedź z API
+                'raw': dict - pełna odpowiedź z API,
+                'cache': str - 'HIT', 'MISS' lub 'BYPASS'
             }
         
         Raises:
             ValueError: Jeśli user jest pusty
+            OllamaQueueFullError / OllamaQueueTimeoutError: Kolejka pełna / przekroczony deadline
             requests.exceptions.RequestException: W przypadku błędu połączenia
         """
         if not user or not user.strip():
@@ -155,7 +312,7 @@ class OllamaClient:
         
         logger.info(f"Chat request: model={model}, user_length={len(user)}, system={bool(system)}")
         
-        result = self._make_request('POST', '/api/chat', data=request_data)
+        result, cache_status = self._cached_request('/api/chat', request_data, use_cache, deadline)
         
         # Wyciągnij tekst odpowiedzi
         message = result.get('message', {})
@@ -167,20 +324,64 @@ class OllamaClient:
             'output_tokens': result.get('eval_count', 0),
         }
         
-        logger.info(f"Chat response: {len(text)} chars, tokens: {usage}")
+        logger.info(f"Chat response: {len(text)} chars, tokens: {usage}, cache: {cache_status}")
         
         return {
             'text': text,
             'usage': usage,
             'raw': result,
+            'cache': cache_status,
         }
     
+    def chat_batch(
+        self,
+        items: List[Dict[str, Any]],
+        parallelism: int = 4
+    ) -> Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[Exception]]]:
+        """
+        Wykonaj wiele zapytań chat równolegle, zwracając wyniki w kolejności ukończenia
+        
+        Args:
+            items: Lista argumentów dla chat() (np. [{'user': '...', 'temperature': 0.9}, ...])
+            parallelism: Maksymalna liczba równoległych zapytań (przy admission
+                najwyżej admission.max_concurrent - nadmiarowe zapytania czekają w puli
+                wątków, nie w kolejce admission, więc batch nie zapełnia jej zwykłym /chat)
+        
+        Yields:
+            (index, wynik chat() lub None, wyjątek lub None) - index odpowiada pozycji w items
+        
+        Note:
+            Kolejka (admission) i cache działają dla każdego zapytania osobno.
+            Przerwanie iteracji anuluje zapytania, które jeszcze nie wystartowały.
+        """
+        if parallelism < 1:
+            raise ValueError('parallelism musi być >= 1')
+        if self.admission is not None:
+            parallelism = min(parallelism, self.admission.max_concurrent)
+        
+        logger.info(f"Chat batch: {len(items)} requests, parallelism={parallelism}")
+        
+        pool = ThreadPoolExecutor(max_workers=parallelism, thread_name_prefix='ollama-batch')
+        try:
+            futures = {pool.submit(self.chat, **item): index for index, item in enumerate(items)}
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    yield index, future.result(), None
+                except Exception as e:
+                    logger.warning(f"Chat batch item {index} failed: {e}")
+                    yield index, None, e
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+    
     def generate(
         self,
         prompt: str,
         model: Optional[str] = None,
         temperature: Optional[float] = None,
-        max_tokens: Optional[int] = None
+        max_tokens: Optional[int] = None,
+        use_cache: Optional[bool] = None,
+        deadline: Optional[float] = None
     ) -> Dict[str, Any]:
         """
         Generuj tekst na podstawie promptu (generate endpoint)
@@ -190,12 +391,15 @@ class OllamaClient:
             model: Nazwa modelu (domyślnie self.default_model)
             temperature: Temperatura (0.0-2.0, opcjonalnie)
             max_tokens: Maksymalna liczba tokenów (opcjonalnie)
+            use_cache: Czy użyć cache (None = tylko dla temperature=0)
+            deadline: Maksymalny czas oczekiwania w kolejce w sekundach (gdy ustawiono admission)
         
         Returns:
             {
                 'text': str - wygenerowany tekst,
                 'usage': {'input_tokens': int, 'output_tokens': int},
-                'raw': dict - pełna odpowiedź z API
+                'raw': dict - pełna odpowiedź z API,
+                'cache': str - 'HIT', 'MISS' lub 'BYPASS'
             }
         """
         model = model or self.default_model
@@ -218,7 +422,7 @@ class OllamaClient:
         
         logger.info(f"Generate request: model={model}, prompt_length={len(prompt)}")
         
-        result = self._make_request('POST', '/api/generate', data=request_data)
+        result, cache_status = self._cached_request('/api/generate', request_data, use_cache, deadline)
         
         text = result.get('response', '')
         usage = {
@@ -226,12 +430,13 @@ class OllamaClient:
             'output_tokens': result.get('eval_count', 0),
         }
         
-        logger.info(f"Generate response: {len(text)} chars, tokens: {usage}")
+        logger.info(f"Generate response: {len(text)} chars, tokens: {usage}, cache: {cache_status}")
         
         return {
             'text': text,
             'usage': usage,
             'raw': result,
+            'cache': cache_status,
         }
     
     def list_models(self) -> List[Dict[str, Any]]:
@@ -284,6 +489,6 @@ class OllamaClient:
         try:
             self._make_request('GET', '/api/tags')
             return True
-        except requests.exceptions.RequestException:
+        except (requests.exceptions.RequestException, OllamaCircuitOpenError):
             return False
 
@@ -8,8 +8,7 @@ import sys
 import json
 import os
 import logging
-import requests
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 
 # Setup logging
 logging.basicConfig(
@@ -43,6 +42,9 @@ def complete(prompt_data: Dict[str, Any]) -> Dict[str, Any]:
             'raw': dict
         }
     """
+    # Import leniwy - CLI przekazujące wywołanie do workera nie płaci za requests
+    import requests
+    
     try:
         ollama_url = os.getenv('OLLAMA_URL', DEFAULT_OLLAMA_URL)
         model = prompt_data.get('model', os.getenv('OLLAMA_MODEL', DEFAULT_MODEL))
@@ -165,18 +167,24 @@ def validate_prompt(prompt_data: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def main():
-    """Main function - CLI interface"""
-    if len(sys.argv) < 2:
-        print(json.dumps({
+def run_cli(argv: List[str]) -> Tuple[int, str, str]:
+    """
+    Wykonaj CLI dla podanych argumentów (bez nazwy skryptu)
+    
+    Używane przez main() oraz przez długo działający worker (src/worker).
+    
+    Returns:
+        (exit_code, stdout, stderr) - stdout/stderr to JSON jak w CLI
+    """
+    if len(argv) < 1:
+        return 1, '', json.dumps({
             'error': 'Prompt data required',
             'usage': 'python ollama_complete.py <json_prompt_data>',
-        }), file=sys.stderr)
-        sys.exit(1)
+        })
     
     try:
         # Parsuj JSON prompt data
-        prompt_json = sys.argv[1]
+        prompt_json = argv[0]
         # Usuń cudzysłowy jeśli są (z escapeshellarg w PHP)
         clean_json = prompt_json.strip().strip("'").strip('"')
         prompt_data = json.loads(clean_json)
@@ -189,8 +197,7 @@ def main():
                 'error': 'Invalid prompt',
                 'validation_errors': validation['errors'],
             }
-            print(json.dumps(result), file=sys.stderr)
-            sys.exit(1)
+            return 1, '', json.dumps(result)
         
         # Wywołaj Ollama
         result = complete(prompt_data)
@@ -202,24 +209,33 @@ def main():
             'usage': result['usage'],
             'raw': result['raw'],
         }
-        print(json.dumps(output, ensure_ascii=False))
+        return 0, json.dumps(output, ensure_ascii=False), ''
         
     except json.JSONDecodeError as e:
         result = {
             'success': False,
             'error': f'Invalid JSON: {str(e)}',
         }
-        print(json.dumps(result), file=sys.stderr)
-        sys.exit(1)
+        return 1, '', json.dumps(result)
     except Exception as e:
         result = {
             'success': False,
             'error': str(e),
         }
-        print(json.dumps(result), file=sys.stderr)
-        sys.exit(1)
+        return 1, '', json.dumps(result)
+
+
+def main():
+    """Main function - CLI interface (przez worker, jeśli działa)"""
+    # Dodaj ścieżkę do src do PYTHONPATH
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    from worker.client import call_worker, emit_result
+    
+    result = call_worker('complete', sys.argv[1:])
+    if result is None:
+        result = run_cli(sys.argv[1:])
+    emit_result(result)
 
 
 if __name__ == '__main__':
     main()
-
@@ -27,3 +27,27 @@ class OllamaValidationError(OllamaError):
     """Błąd walidacji danych wejściowych"""
     pass
 
+
+
+class OllamaQueueFullError(OllamaError):
+    """Kolejka zapytań do Ollama jest pełna (HTTP 429)"""
+
+    def __init__(self, message: str, retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class OllamaQueueTimeoutError(OllamaTimeoutError):
+    """Zapytanie nie doczekało się na slot w kolejce przed deadline"""
+
+    def __init__(self, message: str, retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class OllamaCircuitOpenError(OllamaConnectionError):
+    """Circuit breaker jest otwarty - Ollama niedostępna, zapytanie odrzucone od razu"""
+
+    def __init__(self, message: str, retry_after: float = 0.0):
+        super().__init__(message)
+        self.retry_after = retry_after
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Fake Ollama - lekki zamiennik serwera Ollama do testów obciążeniowych
+
+Implementuje /api/chat, /api/generate i /api/tags w formacie Ollama (także
+streaming NDJSON), ale zamiast modelu symuluje czasy generacji:
+- load_latency: czas ładowania modelu (przy pierwszym zapytaniu)
+- prompt_eval_rate: tokeny promptu przetwarzane na sekundę
+- token_rate: tokeny odpowiedzi generowane na sekundę
+- max_concurrent: ile generacji naraz (jak OLLAMA_NUM_PARALLEL), reszta czeka
+- error_rate / error_status: losowe błędy HTTP (np. 503) do testów retry
+- drop_rate: zerwanie połączenia bez odpowiedzi
+
+Dzięki temu kolejkę (admission), retry, circuit breaker i cache można
+mierzyć na laptopie bez GPU (scripts/load_test.py).
+
+Endpointy diagnostyczne:
+    GET  /fake/stats   - liczniki zapytań, błędów, maks. równoległość
+    POST /fake/config  - zmiana ustawień w trakcie testu (JSON jak w CLI)
+
+Użycie:
+    python src/ollama/fake_server.py --port 11435 --token-rate 30 --error-rate 0.05
+    OLLAMA_BASE_URL=http://127.0.0.1:11435 python src/api/main.py
+"""
+
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Any, Optional
+
+# Słowa generowanej odpowiedzi (1 słowo = 1 token)
+FILLER_WORDS = (
+    'żart', 'Waldus', 'automatyzacja', 'kawa', 'formularz', 'serwer', 'bug',
+    'poniedziałek', 'deploy', 'szef', 'babcia', 'Sosnowiec', 'ogórek', 'AI',
+)
+
+
+class FakeOllamaSettings:
+    """Parametry symulacji (można zmieniać w trakcie przez POST /fake/config)"""
+
+    FIELDS = (
+        'token_rate', 'prompt_eval_rate', 'load_latency', 'response_tokens',
+        'max_concurrent', 'error_rate', 'error_status', 'drop_rate', 'models',
+    )
+
+    def __init__(
+        self,
+        token_rate: float = 50.0,
+        prompt_eval_rate: float = 500.0,
+        load_latency: float = 0.0,
+        response_tokens: int = 64,
+        max_concurrent: int = 1,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        drop_rate: float = 0.0,
+        models: Optional[List[str]] = None
+    ):
+        """
+        Args:
+            token_rate: Tokeny odpowiedzi na sekundę (0 = natychmiast)
+            prompt_eval_rate: Tokeny promptu na sekundę (0 = natychmiast)
+            load_latency: Czas ładowania modelu przy pierwszym użyciu (s)
+            response_tokens: Domyślna długość odpowiedzi (options.num_predict ma pierwszeństwo)
+            max_concurrent: Maks. liczba równoległych generacji
+            error_rate: Prawdopodobieństwo odpowiedzi error_status
+            error_status: Status HTTP wstrzykiwanych błędów
+            drop_rate: Prawdopodobieństwo zerwania połączenia bez odpowiedzi
+            models: Modele zwracane przez /api/tags
+        """
+        self.token_rate = token_rate
+        self.prompt_eval_rate = prompt_eval_rate
+        self.load_latency = load_latency
+        self.response_tokens = response_tokens
+        self.max_concurrent = max_concurrent
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.drop_rate = drop_rate
+        self.models = models or ['llama2:latest', 'bielik:latest']
+
+    def update(self, values: Dict[str, Any]):
+        """Zmień ustawienia (nieznane klucze są ignorowane)"""
+        for field in self.FIELDS:
+            if field in values:
+                setattr(self, field, values[field])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+
+class FakeOllamaServer(ThreadingHTTPServer):
+    """Serwer HTTP udający Ollama"""
+
+    daemon_threads = True
+
+    def __init__(self, address=('127.0.0.1', 11435), settings: Optional[FakeOllamaSettings] = None):
+        self.settings = settings or FakeOllamaSettings()
+        self._slots = threading.Semaphore(self.settings.max_concurrent)
+        self._slots_size = self.settings.max_concurrent
+        self._lock = threading.Lock()
+        self._loaded_models = set()
+        self.stats = {'requests': 0, 'errors': 0, 'dropped': 0, 'in_flight': 0, 'max_in_flight': 0}
+        super().__init__(address, FakeOllamaHandler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start_in_thread(self) -> threading.Thread:
+        """Uruchom serwer w tle (testy, load_test.py)"""
+        thread = threading.Thread(
+            target=self.serve_forever, kwargs={'poll_interval': 0.05}, name='fake-ollama', daemon=True
+        )
+        thread.start()
+        return thread
+
+    def reconfigure(self, values: Dict[str, Any]):
+        """Zmień ustawienia; nowy max_concurrent dotyczy kolejnych zapytań"""
+        with self._lock:
+            self.settings.update(values)
+            if self.settings.max_concurrent != self._slots_size:
+                self._slots = threading.Semaphore(self.settings.max_concurrent)
+                self._slots_size = self.settings.max_concurrent
+
+    def generation_slot(self) -> threading.Semaphore:
+        """Semafor ograniczający równoległe generacje (max_concurrent)"""
+        with self._lock:
+            return self._slots
+
+    def count(self, key: str, delta: int = 1):
+        with self._lock:
+            self.stats[key] += delta
+            if key == 'in_flight':
+                self.stats['max_in_flight'] = max(self.stats['max_in_flight'], self.stats['in_flight'])
+
+    def load_model(self, model: str) -> float:
+        """Czas ładowania modelu (tylko przy pierwszym zapytaniu o model)"""
+        with self._lock:
+            if model in self._loaded_models:
+                return 0.0
+            self._loaded_models.add(model)
+        return self.settings.load_latency
+
+
+def count_tokens(text: str) -> int:
+    """Przybliżona liczba tokenów (słowa)"""
+    return max(1, len(text.split()))
+
+
+def generate_words(prompt: str, count: int) -> List[str]:
+    """Deterministyczna 'odpowiedź' zależna od promptu (temperature=0 daje ten sam wynik)"""
+    seed = int(hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:8], 16)
+    rng = random.Random(seed)
+    return [rng.choice(FILLER_WORDS) for _ in range(count)]
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    """Obsługa endpointów Ollama"""
+
+    server: FakeOllamaServer
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        # Bez logu każdego zapytania - przy teście obciążeniowym zalewa konsolę
+        pass
+
+    def do_GET(self):
+        if self.path == '/api/tags':
+            self._json(200, {'models': [
+                {
+                    'name': name,
+                    'model': name,
+                    'digest': hashlib.sha256(name.encode('utf-8')).hexdigest(),
+                    'size': 0,
+                }
+                for name in self.server.settings.models
+            ]})
+        elif self.path == '/fake/stats':
+            self._json(200, dict(self.server.stats, settings=self.server.settings.to_dict()))
+        else:
+            self._json(404, {'error': f'not found: {self.path}'})
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except (ValueError, json.JSONDecodeError):
+            self._json(400, {'error': 'invalid JSON'})
+            return
+
+        if self.path == '/fake/config':
+            self.server.reconfigure(body)
+            self._json(200, self.server.settings.to_dict())
+        elif self.path in ('/api/chat', '/api/generate'):
+            self._generate(body, chat=self.path == '/api/chat')
+        else:
+            self._json(404, {'error': f'not found: {self.path}'})
+
+    def _generate(self, body: Dict[str, Any], chat: bool):
+        settings = self.server.settings
+        self.server.count('requests')
+
+        if random.random() < settings.drop_rate:
+            self.server.count('dropped')
+            self.close_connection = True
+            self.connection.shutdown(2)
+            return
+        if random.random() < settings.error_rate:
+            self.server.count('errors')
+            self._json(settings.error_status, {'error': 'injected error (fake ollama)'})
+            return
+
+        model = body.get('model') or settings.models[0]
+        if chat:
+            prompt = '\n'.join(m.get('content', '') for m in body.get('messages') or [])
+        else:
+            prompt = (body.get('system') or '') + '\n' + (body.get('prompt') or '')
+        options = body.get('options') or {}
+        num_predict = options.get('num_predict')
+        eval_count = num_predict if isinstance(num_predict, int) and num_predict > 0 else settings.response_tokens
+        eval_count = min(eval_count, settings.response_tokens)
+        prompt_eval_count = count_tokens(prompt)
+
+        started = time.perf_counter()
+        with self.server.generation_slot():
+            self.server.count('in_flight')
+            try:
+                load_duration = self.server.load_model(model)
+                prompt_eval_duration = prompt_eval_count / settings.prompt_eval_rate if settings.prompt_eval_rate else 0.0
+                time.sleep(load_duration + prompt_eval_duration)
+
+                words = generate_words(prompt, eval_count)
+                token_delay = 1.0 / settings.token_rate if settings.token_rate else 0.0
+                durations = {
+                    'load_duration': load_duration,
+                    'prompt_eval_duration': prompt_eval_duration,
+                    'eval_duration': token_delay * eval_count,
+                }
+                if body.get('stream', True):
+                    self._stream(model, words, token_delay, chat, started, durations, prompt_eval_count)
+                else:
+                    time.sleep(durations['eval_duration'])
+                    final = self._chunk(model, ' '.join(words), chat, done=True)
+                    final.update(self._timing_fields(started, durations, prompt_eval_count, eval_count))
+                    self._json(200, final)
+            finally:
+                self.server.count('in_flight', -1)
+
+    def _stream(self, model, words, token_delay, chat, started, durations, prompt_eval_count):
+        """Odpowiedź NDJSON - jeden chunk na token, ostatni z done=true i czasami"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        try:
+            for index, word in enumerate(words):
+                time.sleep(token_delay)
+                self._write_chunk(self._chunk(model, word if index == 0 else ' ' + word, chat, done=False))
+            final = self._chunk(model, '', chat, done=True)
+            final.update(self._timing_fields(started, durations, prompt_eval_count, len(words)))
+            self._write_chunk(final)
+            self.wfile.write(b'0\r\n\r\n')
+        except (BrokenPipeError, ConnectionResetError):
+            # Klient przerwał streaming
+            self.close_connection = True
+
+    def _write_chunk(self, data: Dict[str, Any]):
+        line = json.dumps(data, ensure_ascii=False).encode('utf-8') + b'\n'
+        self.wfile.write(f"{len(line):x}\r\n".encode('ascii') + line + b'\r\n')
+        self.wfile.flush()
+
+    @staticmethod
+    def _chunk(model: str, text: str, chat: bool, done: bool) -> Dict[str, Any]:
+        chunk = {
+            'model': model,
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'done': done,
+        }
+        if chat:
+            chunk['message'] = {'role': 'assistant', 'content': text}
+        else:
+            chunk['response'] = text
+        if done:
+            chunk['done_reason'] = 'stop'
+        return chunk
+
+    @staticmethod
+    def _timing_fields(started, durations, prompt_eval_count, eval_count) -> Dict[str, Any]:
+        """Pola czasu jak w Ollama (nanosekundy)"""
+        fields = {name: int(seconds * 1e9) for name, seconds in durations.items()}
+        fields['total_duration'] = int((time.perf_counter() - started) * 1e9)
+        fields['prompt_eval_count'] = prompt_eval_count
+        fields['eval_count'] = eval_count
+        return fields
+
+    def _json(self, status: int, data: Dict[str, Any]):
+        payload = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fake Ollama do testów obciążeniowych')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=11435)
+    parser.add_argument('--token-rate', type=float, default=50.0, help='Tokeny odpowiedzi/s')
+    parser.add_argument('--prompt-eval-rate', type=float, default=500.0, help='Tokeny promptu/s')
+    parser.add_argument('--load-latency', type=float, default=0.0, help='Ładowanie modelu (s)')
+    parser.add_argument('--response-tokens', type=int, default=64, help='Długość odpowiedzi (tokeny)')
+    parser.add_argument('--max-concurrent', type=int, default=1, help='Równoległe generacje')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Ułamek odpowiedzi z błędem')
+    parser.add_argument('--error-status', type=int, default=503, help='Status HTTP błędów')
+    parser.add_argument('--drop-rate', type=float, default=0.0, help='Ułamek zerwanych połączeń')
+    args = parser.parse_args()
+
+    settings = FakeOllamaSettings(
+        token_rate=args.token_rate,
+        prompt_eval_rate=args.prompt_eval_rate,
+        load_latency=args.load_latency,
+        response_tokens=args.response_tokens,
+        max_concurrent=args.max_concurrent,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        drop_rate=args.drop_rate,
+    )
+    server = FakeOllamaServer((args.host, args.port), settings)
+    print(f"🤖 Fake Ollama: {server.url} ({json.dumps(settings.to_dict(), ensure_ascii=False)})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Zatrzymywanie...")
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Retry z exponential backoff i circuit breaker dla OllamaClient
+
+- RetryPolicy decyduje czy błąd warto ponowić (status HTTP, idempotencja)
+  i ile czekać przed kolejną próbą (full jitter exponential backoff).
+- CircuitBreaker (jeden na backend, patrz get_circuit_breaker) przestaje
+  wysyłać zapytania gdy Ollama nie odpowiada i wraca do pracy przez
+  próbne zapytania w stanie half-open.
+"""
+
+import time
+import random
+import logging
+import threading
+from typing import Optional, Dict, Any
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+# Statusy, które oznaczają przeciążenie lub chwilową niedostępność serwera
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+# Metody HTTP bezpieczne do ponowienia po timeoutcie odczytu
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+
+
+class RetryPolicy:
+    """
+    Polityka ponawiania zapytań
+
+    Zasady:
+    - błędy połączenia (ConnectionError, ConnectTimeout) - zawsze ponawiamy,
+      zapytanie nie dotarło do serwera
+    - ReadTimeout - ponawiamy tylko metody idempotentne; długiej generacji
+      (POST /api/chat) nie powtarzamy, bo podwoiłoby to obciążenie
+    - HTTPError - ponawiamy tylko statusy z RETRYABLE_STATUS_CODES,
+      pozostałe 4xx to błąd zapytania
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0
+    ):
+        """
+        Args:
+            max_retries: Maksymalna liczba prób (łącznie z pierwszą)
+            backoff_base: Bazowe opóźnienie w sekundach (rośnie 2x z każdą próbą)
+            backoff_max: Maksymalne opóźnienie między próbami w sekundach
+        """
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def is_retryable(self, method: str, error: requests.exceptions.RequestException) -> bool:
+        """Czy błąd warto ponowić"""
+        if isinstance(error, requests.exceptions.ConnectionError):
+            # Zapytanie nie dotarło do serwera (obejmuje też ConnectTimeout)
+            return True
+
+        if isinstance(error, requests.exceptions.Timeout):
+            return method.upper() in IDEMPOTENT_METHODS
+
+        if isinstance(error, requests.exceptions.HTTPError):
+            status = _status_code(error)
+            return status is None or status in RETRYABLE_STATUS_CODES
+
+        # Inne błędy (np. ChunkedEncodingError) traktujemy jako przejściowe
+        return True
+
+    def is_backend_failure(self, error: requests.exceptions.RequestException) -> bool:
+        """Czy błąd świadczy o awarii backendu (liczony przez circuit breaker)"""
+        if isinstance(error, requests.exceptions.HTTPError):
+            status = _status_code(error)
+            return status is None or status >= 500
+        return True
+
+    def delay(self, attempt: int, error: Optional[requests.exceptions.RequestException] = None) -> float:
+        """
+        Opóźnienie przed kolejną próbą (full jitter)
+
+        Args:
+            attempt: Numer nieudanej próby (od 1)
+            error: Ostatni błąd - jeśli serwer podał Retry-After, respektujemy go
+        """
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+
+        cap = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        return random.uniform(0, cap)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker dla jednego backendu Ollama
+
+    Stany:
+    - closed: zapytania przechodzą normalnie
+    - open: po failure_threshold kolejnych awariach zapytania są odrzucane
+      od razu (fail fast) przez recovery_timeout sekund
+    - half_open: przepuszczamy half_open_max_calls próbnych zapytań;
+      sukces zamyka breaker, porażka otwiera go ponownie
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1
+    ):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+
+    @property
+    def state(self) -> str:
+        """Aktualny stan (z uwzględnieniem upływu recovery_timeout)"""
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def allow_request(self) -> bool:
+        """Czy zapytanie może zostać wysłane"""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+                self._half_open_calls += 1
+                return True
+            return False
+
+    def retry_after(self) -> float:
+        """Ile sekund do następnej próby half-open"""
+        with self._lock:
+            if self._state != self.OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self.recovery_timeout - time.monotonic())
+
+    def record_success(self):
+        """Zapisz udane zapytanie"""
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info("Circuit breaker closed - Ollama responds again")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._half_open_calls = 0
+
+    def release_probe(self):
+        """Zwolnij próbę half-open bez wyniku (zapytanie przerwane błędem niezwiązanym z backendem)"""
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._half_open_calls > 0:
+                self._half_open_calls -= 1
+
+    def record_failure(self):
+        """Zapisz awarię backendu"""
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning(
+                        f"Circuit breaker opened after {self._failures} failures, "
+                        f"retry in {self.recovery_timeout}s"
+                    )
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._half_open_calls = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Stan breakera (do metryk / health checków)"""
+        return {
+            'state': self.state,
+            'failures': self._failures,
+            'retry_after_sec': round(self.retry_after(), 2),
+        }
+
+    def _maybe_half_open(self):
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._state = self.HALF_OPEN
+            self._half_open_calls = 0
+
+
+# Jeden breaker na backend (base_url) - współdzielony przez wszystkich klientów w procesie
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(base_url: str, **kwargs) -> CircuitBreaker:
+    """
+    Zwróć circuit breaker dla backendu (tworzy przy pierwszym użyciu)
+
+    Args:
+        base_url: URL serwera Ollama
+        **kwargs: Parametry CircuitBreaker (używane tylko przy tworzeniu)
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(base_url)
+        if breaker is None:
+            breaker = CircuitBreaker(**kwargs)
+            _breakers[base_url] = breaker
+        return breaker
+
+
+def reset_circuit_breakers():
+    """Usuń wszystkie breakery (np. w testach)"""
+    with _breakers_lock:
+        _breakers.clear()
+
+
+def _status_code(error: requests.exceptions.RequestException) -> Optional[int]:
+    response = getattr(error, 'response', None)
+    return getattr(response, 'status_code', None) if response is not None else None
+
+
+def _retry_after(error: Optional[requests.exceptions.RequestException]) -> Optional[float]:
+    response = getattr(error, 'response', None)
+    if response is None:
+        return None
+    headers = getattr(response, 'headers', None) or {}
+    try:
+        value = headers.get('Retry-After')
+    except AttributeError:
+        return None
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
@@ -9,19 +9,8 @@ import sys
 import json
 import os
 import logging
-
-try:
-    from deep_translator import GoogleTranslator
-    DEEP_TRANSLATOR_AVAILABLE = True
-except ImportError:
-    DEEP_TRANSLATOR_AVAILABLE = False
-    logging.warning("deep-translator not available, will try transformers as fallback")
-
-try:
-    from transformers import pipeline
-    TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    TRANSFORMERS_AVAILABLE = False
+import importlib.util
+from typing import List, Tuple
 
 # Setup logging
 logging.basicConfig(
@@ -30,6 +19,17 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Backendy są importowane leniwie (patrz load_translator) - import transformers
+# (torch) trwa sekundy, a przy deep-translator nie jest w ogóle potrzebny.
+# find_spec sprawdza dostępność pakietu bez jego importowania.
+DEEP_TRANSLATOR_AVAILABLE = importlib.util.find_spec('deep_translator') is not None
+TRANSFORMERS_AVAILABLE = importlib.util.find_spec('transformers') is not None
+GoogleTranslator = None
+pipeline = None
+
+if not DEEP_TRANSLATOR_AVAILABLE:
+    logger.warning("deep-translator not available, will try transformers as fallback")
+
 # Global translator instance (loaded once)
 translator = None
 current_target_language = None
@@ -58,11 +58,13 @@ DEVICE = int(os.getenv('DEVICE_ID', -1))  # -1 for CPU, 0+ for GPU
 
 def load_translator(target_language: str = 'pl'):
     """Load translation translator (lazy loading)"""
-    global translator, current_target_language
+    global translator, current_target_language, GoogleTranslator, pipeline
     
     if translator is None or current_target_language != target_language:
         # Priorytet: użyj deep-translator (prostsze, bez pobierania modeli)
         if DEEP_TRANSLATOR_AVAILABLE:
+            if GoogleTranslator is None:
+                from deep_translator import GoogleTranslator
             lang_code = LANGUAGE_MAP.get(target_language, 'pl')
             logger.info(f"Using deep-translator (GoogleTranslator) for {target_language}")
             translator = GoogleTranslator(source='en', target=lang_code)
@@ -73,8 +75,9 @@ def load_translator(target_language: str = 'pl'):
             model_name = MODEL_MAP.get(target_language, MODEL_MAP['pl'])
             logger.info(f"Loading translation model with transformers: {model_name}")
             try:
-                import os
                 os.environ['HF_HUB_DISABLE_SYMLINKS_WARNING'] = '1'
+                if pipeline is None:
+                    from transformers import pipeline
                 translator = pipeline(
                     "translation",
                     model=model_name,
@@ -108,6 +111,8 @@ def translate_text(text: str, target_language: str = 'pl') -> str:
         - Rate limits: ~10 requests/second (informal limit)
         - For texts > 5000 chars: automatically splits into chunks
     """
+    from metrics import stage
+    
     try:
         # Load translator if not loaded
         load_translator(target_language)
@@ -155,13 +160,14 @@ def translate_text(text: str, target_language: str = 'pl') -> str:
             translated_chunks = []
             for i, chunk in enumerate(chunks):
                 logger.debug(f"Translating chunk {i+1}/{len(chunks)} ({len(chunk)} chars)")
-                if DEEP_TRANSLATOR_AVAILABLE and isinstance(translator, GoogleTranslator):
-                    translated_chunk = translator.translate(chunk)
-                elif TRANSFORMERS_AVAILABLE:
-                    result = translator(chunk, max_length=512)
-                    translated_chunk = result[0]['translation_text'] if isinstance(result, list) else result.get('translation_text', chunk)
-                else:
-                    raise RuntimeError("No translation method available")
+                with stage('translation', 'translate'):
+                    if DEEP_TRANSLATOR_AVAILABLE and isinstance(translator, GoogleTranslator):
+                        translated_chunk = translator.translate(chunk)
+                    elif TRANSFORMERS_AVAILABLE:
+                        result = translator(chunk, max_length=512)
+                        translated_chunk = result[0]['translation_text'] if isinstance(result, list) else result.get('translation_text', chunk)
+                    else:
+                        raise RuntimeError("No translation method available")
                 translated_chunks.append(translated_chunk)
                 # Małe opóźnienie między requestami aby uniknąć rate limits
                 if i < len(chunks) - 1:  # Nie dodawaj opóźnienia po ostatnim chunku
@@ -176,15 +182,16 @@ def translate_text(text: str, target_language: str = 'pl') -> str:
         # Normalne tłumaczenie dla tekstów <= 5000 znaków
         logger.debug(f"Translating text to {target_language}: {text[:50]}... ({text_length} chars)")
         
-        if DEEP_TRANSLATOR_AVAILABLE and isinstance(translator, GoogleTranslator):
-            # Użyj deep-translator (GoogleTranslator)
-            translated = translator.translate(text)
-        elif TRANSFORMERS_AVAILABLE:
-            # Użyj transformers pipeline
-            result = translator(text, max_length=512)
-            translated = result[0]['translation_text'] if isinstance(result, list) else result.get('translation_text', text)
-        else:
-            raise RuntimeError("No translation method available")
+        with stage('translation', 'translate'):
+            if DEEP_TRANSLATOR_AVAILABLE and isinstance(translator, GoogleTranslator):
+                # Użyj deep-translator (GoogleTranslator)
+                translated = translator.translate(text)
+            elif TRANSFORMERS_AVAILABLE:
+                # Użyj transformers pipeline
+                result = translator(text, max_length=512)
+                translated = result[0]['translation_text'] if isinstance(result, list) else result.get('translation_text', text)
+            else:
+                raise RuntimeError("No translation method available")
         
         logger.info(f"Translation completed: {text_length} -> {len(translated)} chars")
         return translated
@@ -194,18 +201,24 @@ def translate_text(text: str, target_language: str = 'pl') -> str:
         raise
 
 
-def main():
-    """Main function - CLI interface"""
-    if len(sys.argv) < 2:
-        print(json.dumps({
+def run_cli(argv: List[str]) -> Tuple[int, str, str]:
+    """
+    Wykonaj CLI dla podanych argumentów (bez nazwy skryptu)
+    
+    Używane przez main() oraz przez długo działający worker (src/worker).
+    
+    Returns:
+        (exit_code, stdout, stderr) - stdout/stderr to JSON jak w CLI
+    """
+    if len(argv) < 1:
+        return 1, '', json.dumps({
             'error': 'Text to translate required',
             'usage': 'python translate_text.py <text> [target_language]',
             'supported_languages': list(MODEL_MAP.keys())
-        }), file=sys.stderr)
-        sys.exit(1)
+        })
     
-    text = sys.argv[1]
-    target_language = sys.argv[2] if len(sys.argv) > 2 else 'pl'
+    text = argv[0]
+    target_language = argv[1] if len(argv) > 1 else 'pl'
     
     # Validate language
     if target_language not in MODEL_MAP:
@@ -214,8 +227,7 @@ def main():
             'error': f'Unsupported language: {target_language}',
             'supported_languages': list(MODEL_MAP.keys())
         }
-        print(json.dumps(error_result), file=sys.stderr)
-        sys.exit(1)
+        return 1, '', json.dumps(error_result)
     
     try:
         translated = translate_text(text, target_language)
@@ -226,7 +238,7 @@ def main():
             'source_language': 'en',
             'target_language': target_language
         }
-        print(json.dumps(result))
+        return 0, json.dumps(result), ''
         
     except Exception as e:
         error_result = {
@@ -235,10 +247,20 @@ def main():
             'text': text,
             'target_language': target_language
         }
-        print(json.dumps(error_result), file=sys.stderr)
-        sys.exit(1)
+        return 1, '', json.dumps(error_result)
+
+
+def main():
+    """Main function - CLI interface (przez worker, jeśli działa)"""
+    # Dodaj ścieżkę do src do PYTHONPATH
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    from worker.client import call_worker, emit_result
+    
+    result = call_worker('translate', sys.argv[1:])
+    if result is None:
+        result = run_cli(sys.argv[1:])
+    emit_result(result)
 
 
 if __name__ == '__main__':
     main()
-
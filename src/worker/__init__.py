@@ -0,0 +1,9 @@
+"""
+Worker module
+Długo działający proces obsługujący CLI wywoływane z PHP (complete, describe, translate)
+bez ponownego ładowania Pythona i modeli przy każdym wywołaniu
+"""
+
+from .client import call_worker, emit_result
+
+__all__ = ['call_worker', 'emit_result']
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Cienki klient workera - wysyła argumenty CLI do działającego workera
+
+Używa tylko biblioteki standardowej, żeby wywołanie z PHP nie płaciło
+za import ciężkich bibliotek. Gdy worker nie działa, call_worker zwraca
+None i CLI wykonuje zadanie w bieżącym procesie (jak dotychczas).
+
+Protokół (Unix socket, jedna linia JSON na zapytanie/odpowiedź):
+    -> {"command": "describe", "argv": ["a.jpg", "50"], "cwd": "/var/www", "env": {"DEVICE": "cpu"}}
+    <- {"exit_code": 0, "stdout": "{...}", "stderr": ""}
+    <- {"rejected": "..."}    worker nie wykonał zadania - CLI wykona je lokalnie
+
+Worker wykonuje komendę w katalogu roboczym i ze zmiennymi FORWARDED_ENV
+wywołującego, więc względne ścieżki i ustawienia per wywołanie działają
+tak samo jak lokalnie. Po wysłaniu zapytania klient nie wraca do wykonania
+lokalnego (worker mógł już zacząć zadanie) - błąd lub timeout to wynik z kodem 1.
+"""
+
+import os
+import sys
+import json
+import socket
+from typing import Optional, List, Tuple
+
+DEFAULT_SOCKET_PATH = '/tmp/ai-local-core-worker.sock'
+DEFAULT_TIMEOUT = 300.0
+
+# Zmienne środowiskowe wywołującego przekazywane do workera
+FORWARDED_ENV = ('OLLAMA_URL', 'OLLAMA_MODEL', 'DEVICE_ID', 'DEVICE', 'BLIP_MODEL')
+
+CLIResult = Tuple[int, str, str]
+
+
+def get_socket_path() -> str:
+    """Ścieżka socketu workera (AI_WORKER_SOCKET env lub domyślna)"""
+    return os.getenv('AI_WORKER_SOCKET', DEFAULT_SOCKET_PATH)
+
+
+def call_worker(
+    command: str,
+    argv: List[str],
+    socket_path: Optional[str] = None,
+    timeout: Optional[float] = None
+) -> Optional[CLIResult]:
+    """
+    Wyślij wywołanie CLI do workera
+    
+    Args:
+        command: Nazwa komendy ('complete', 'describe', 'translate')
+        argv: Argumenty CLI (bez nazwy skryptu)
+        socket_path: Ścieżka socketu (domyślnie get_socket_path())
+        timeout: Timeout w sekundach (domyślnie AI_WORKER_TIMEOUT env lub 300)
+    
+    Returns:
+        (exit_code, stdout, stderr) lub None jeśli worker jest niedostępny
+        albo odrzucił zadanie bez wykonania
+    """
+    if os.getenv('AI_WORKER_DISABLE', '').lower() in ('1', 'true', 'yes'):
+        return None
+    
+    path = socket_path or get_socket_path()
+    if not path or not os.path.exists(path):
+        return None
+    
+    timeout = timeout or float(os.getenv('AI_WORKER_TIMEOUT', DEFAULT_TIMEOUT))
+    request = json.dumps({
+        'command': command,
+        'argv': list(argv),
+        'cwd': os.getcwd(),
+        'env': {name: os.environ[name] for name in FORWARDED_ENV if name in os.environ},
+    }, ensure_ascii=False) + '\n'
+    
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    with sock:
+        try:
+            sock.settimeout(timeout)
+            sock.connect(path)
+        except OSError:
+            # Worker nie przyjmuje połączeń - CLI wykona zadanie lokalnie
+            return None
+        
+        try:
+            sock.sendall(request.encode('utf-8'))
+            
+            buffer = b''
+            while not buffer.endswith(b'\n'):
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                buffer += chunk
+            
+            response = json.loads(buffer.decode('utf-8'))
+            if response.get('rejected'):
+                return None
+            return int(response['exit_code']), response.get('stdout', ''), response.get('stderr', '')
+        except socket.timeout:
+            error = f'Worker did not respond within {timeout:g}s'
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            error = f'Invalid worker response: {e}'
+    
+    # Zapytanie zostało wysłane - bez ponownego wykonania lokalnie
+    return 1, '', json.dumps({'success': False, 'error': error})
+
+
+def emit_result(result: CLIResult):
+    """Wypisz wynik CLI (stdout/stderr) i zakończ proces z kodem wyjścia"""
+    exit_code, stdout, stderr = result
+    if stdout:
+        print(stdout)
+    if stderr:
+        print(stderr, file=sys.stderr)
+    sys.exit(exit_code)
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Worker - długo działający proces dla CLI wywoływanych z PHP
+
+Każde wywołanie `python src/image/describe.py ...` z PHP startowało
+interpreter, importowało torch/transformers i ładowało model od zera.
+Worker robi to raz: trzyma załadowane moduły (i opcjonalnie modele)
+w pamięci, a CLI (main() w complete/describe/translate) wysyła do niego
+argumenty przez Unix socket i tylko wypisuje wynik.
+
+Uruchomienie:
+    python src/worker/server.py                       # socket z AI_WORKER_SOCKET
+    python src/worker/server.py --preload describe    # załaduj BLIP od razu
+    python src/worker/server.py --stdio               # linie JSON na stdin/stdout
+"""
+
+import os
+import sys
+import json
+import logging
+import signal
+import argparse
+import importlib
+import threading
+import socketserver
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, TextIO, Tuple
+
+# Dodaj ścieżkę do src do PYTHONPATH
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from worker.client import CLIResult, FORWARDED_ENV, get_socket_path
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+# Komenda -> moduł z funkcją run_cli(argv) (importowany przy pierwszym użyciu)
+COMMANDS: Dict[str, str] = {
+    'complete': 'ollama.complete',
+    'describe': 'image.describe',
+    'translate': 'translation.translate',
+}
+
+# Komendy, których modele nie są bezpieczne przy równoległym użyciu
+# (BLIP na jednym GPU, globalny translator przełączany między językami)
+SERIALIZED_COMMANDS = frozenset({'describe', 'translate'})
+
+# Zmienne czytane przy ładowaniu modelu - worker nie zmieni ich per zapytanie,
+# więc zapytanie z inną wartością jest odrzucane (CLI wykona je lokalnie)
+LOAD_TIME_ENV: Dict[str, Tuple[str, ...]] = {
+    'describe': ('BLIP_MODEL', 'DEVICE'),
+    'translate': ('DEVICE_ID',),
+}
+
+# Ładowanie modeli przy starcie (--preload)
+PRELOADERS: Dict[str, Callable[[], None]] = {
+    'describe': lambda: importlib.import_module('image.describe').load_model(),
+    'translate': lambda: importlib.import_module('translation.translate').load_translator('pl'),
+}
+
+
+class CallContext:
+    """
+    Katalog roboczy i zmienne FORWARDED_ENV wywołującego na czas komendy
+
+    cwd i os.environ są wspólne dla procesu, więc równolegle wykonują się
+    tylko komendy z tym samym kontekstem; inny kontekst czeka, aż skończą się
+    bieżące. Zapytanie bez cwd/env wykonuje się w kontekście startowym workera.
+    """
+
+    def __init__(self):
+        self.cwd = os.getcwd()
+        self.env = {name: os.environ.get(name) for name in FORWARDED_ENV}
+        self._condition = threading.Condition()
+        self._current = (self.cwd, tuple(self.env[name] for name in FORWARDED_ENV))
+        self._active = 0
+
+    @contextmanager
+    def use(self, cwd: Optional[str], env: Optional[Dict[str, str]]):
+        env = self.env if env is None else env
+        key = (cwd or self.cwd, tuple(env.get(name) for name in FORWARDED_ENV))
+        with self._condition:
+            while self._active and self._current != key:
+                self._condition.wait()
+            if self._current != key:
+                self._current = None
+                os.chdir(key[0])
+                for name, value in zip(FORWARDED_ENV, key[1]):
+                    if value is None:
+                        os.environ.pop(name, None)
+                    else:
+                        os.environ[name] = value
+                self._current = key
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._active -= 1
+                self._condition.notify_all()
+
+
+class CommandRegistry:
+    """Rejestr komend workera z leniwym importem i blokadami per komenda"""
+
+    def __init__(self, commands: Optional[Dict[str, str]] = None):
+        self.commands = dict(commands if commands is not None else COMMANDS)
+        self._handlers: Dict[str, Callable[[List[str]], CLIResult]] = {}
+        self._locks = {name: threading.Lock() for name in self.commands}
+        self._import_lock = threading.Lock()
+        self.context = CallContext()
+
+    def register(self, name: str, handler: Callable[[List[str]], CLIResult]):
+        """Zarejestruj handler bezpośrednio (np. w testach)"""
+        self._handlers[name] = handler
+        self._locks.setdefault(name, threading.Lock())
+
+    def handler(self, name: str) -> Callable[[List[str]], CLIResult]:
+        """Zwróć run_cli dla komendy (importuje moduł przy pierwszym użyciu)"""
+        with self._import_lock:
+            if name not in self._handlers:
+                if name not in self.commands:
+                    raise KeyError(name)
+                module = importlib.import_module(self.commands[name])
+                self._handlers[name] = module.run_cli
+                logger.info(f"Loaded command '{name}' from {self.commands[name]}")
+            return self._handlers[name]
+
+    def rejection(self, name: str, env: Optional[Dict[str, str]]) -> Optional[str]:
+        """Powód odrzucenia zapytania, którego worker nie wykona jak lokalne CLI"""
+        if env is None:
+            return None
+        for var in LOAD_TIME_ENV.get(name, ()):
+            if env.get(var) != self.context.env[var]:
+                return f'Worker for {name} was started with different {var}'
+        return None
+
+    def run(
+        self,
+        name: str,
+        argv: List[str],
+        cwd: Optional[str] = None,
+        env: Optional[Dict[str, str]] = None
+    ) -> CLIResult:
+        """Wykonaj komendę (w cwd i env wywołującego) i zwróć (exit_code, stdout, stderr)"""
+        try:
+            handler = self.handler(name)
+        except KeyError:
+            return 1, '', json.dumps({
+                'success': False,
+                'error': f'Unknown command: {name}',
+                'commands': sorted(set(self.commands) | set(self._handlers)),
+            })
+
+        try:
+            with self.context.use(cwd, env):
+                if name in SERIALIZED_COMMANDS:
+                    with self._locks[name]:
+                        return handler(argv)
+                return handler(argv)
+        except Exception as e:
+            logger.exception(f"Command '{name}' failed")
+            return 1, '', json.dumps({'success': False, 'error': str(e)})
+
+    def handle_line(self, line: str) -> str:
+        """Obsłuż jedną linię protokołu (JSON) i zwróć linię odpowiedzi"""
+        try:
+            request = json.loads(line)
+            name = request['command']
+            argv = [str(arg) for arg in request.get('argv', [])]
+            cwd = request.get('cwd')
+            if cwd is not None and not isinstance(cwd, str):
+                raise TypeError('cwd must be a string')
+            env = request.get('env')
+            if env is not None:
+                env = {var: str(env[var]) for var in FORWARDED_ENV if var in env}
+        except (ValueError, KeyError, TypeError) as e:
+            exit_code, stdout, stderr = 1, '', json.dumps({
+                'success': False,
+                'error': f'Invalid worker request: {e}',
+            })
+        else:
+            reason = self.rejection(name, env)
+            if reason:
+                return json.dumps({'rejected': reason}) + '\n'
+            exit_code, stdout, stderr = self.run(name, argv, cwd, env)
+
+        return json.dumps({
+            'exit_code': exit_code,
+            'stdout': stdout,
+            'stderr': stderr,
+        }, ensure_ascii=False) + '\n'
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        response = self.server.registry.handle_line(line.decode('utf-8'))
+        self.wfile.write(response.encode('utf-8'))
+
+
+class WorkerServer(socketserver.ThreadingUnixStreamServer):
+    """Serwer workera na Unix socket (jeden wątek na połączenie)"""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, registry: Optional[CommandRegistry] = None):
+        # Usuń socket po poprzednim (przerwanym) uruchomieniu
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        self.socket_path = socket_path
+        self.registry = registry or CommandRegistry()
+        super().__init__(socket_path, _RequestHandler)
+        os.chmod(socket_path, 0o660)
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+def serve_stdio(registry: CommandRegistry, stdin: TextIO = sys.stdin, stdout: TextIO = sys.stdout):
+    """Obsługuj zapytania z stdin (jedna linia JSON) aż do EOF"""
+    for line in stdin:
+        if not line.strip():
+            continue
+        stdout.write(registry.handle_line(line))
+        stdout.flush()
+
+
+def preload(registry: CommandRegistry, names: List[str]):
+    """Zaimportuj moduły i załaduj modele wskazanych komend"""
+    for name in names:
+        registry.handler(name)
+        if name in PRELOADERS:
+            logger.info(f"Preloading model for '{name}'...")
+            PRELOADERS[name]()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Worker dla CLI complete/describe/translate')
+    parser.add_argument('--socket', default=get_socket_path(), help='Ścieżka Unix socketu')
+    parser.add_argument('--stdio', action='store_true', help='Czytaj zapytania ze stdin zamiast socketu')
+    parser.add_argument(
+        '--preload', default='',
+        help='Komendy do załadowania przy starcie, np. describe,translate'
+    )
+    args = parser.parse_args()
+
+    registry = CommandRegistry()
+    preload(registry, [name.strip() for name in args.preload.split(',') if name.strip()])
+
+    if args.stdio:
+        serve_stdio(registry)
+        return
+
+    server = WorkerServer(args.socket, registry)
+    # SIGTERM (kill, systemd) kończy serve_forever tak jak Ctrl+C - socket zostaje usunięty
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    logger.info(f"Worker listening on {args.socket}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Testy warstwy kompatybilności FastAPI z serwerem Flask (src/api/server.py)
+"""
+
+import pytest
+import sys
+import os
+from unittest.mock import Mock, patch
+
+# Dodaj ścieżkę do src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.config import config
+from api.main import app
+from modules.image.router import legacy_router as image_legacy_router
+from modules.ollama.router import router as ollama_router, legacy_router as ollama_legacy_router
+from ollama.resilience import reset_circuit_breakers
+
+
+@pytest.fixture
+def client():
+    """Aplikacja jak api.main przy LEGACY_API_COMPAT=true"""
+    legacy_app = FastAPI()
+    legacy_app.include_router(image_legacy_router)
+    legacy_app.include_router(ollama_legacy_router, prefix='/ollama')
+    legacy_app.include_router(ollama_router, prefix='/ollama')
+    reset_circuit_breakers()
+    yield TestClient(legacy_app)
+    reset_circuit_breakers()
+
+
+def _chat_response(content='Odpowiedź'):
+    response = Mock()
+    response.json.return_value = {'message': {'content': content}, 'model': 'test-model'}
+    response.raise_for_status = Mock()
+    return response
+
+
+class TestLegacyCompat:
+    """Endpointy w formacie Flask"""
+
+    def test_describe_requires_image_url(self, client):
+        """Brak image_url - 400 w formacie Flask"""
+        response = client.post('/describe', json={})
+        assert response.status_code == 400
+        assert response.json() == {'success': False, 'error': 'image_url is required'}
+
+    @patch('modules.image.router.describe_image', return_value='a cat sitting on a chair')
+    def test_describe_success(self, mock_describe, client):
+        """Opis obrazka z URL w formacie Flask"""
+        response = client.post('/describe', json={'image_url': 'https://example.com/cat.jpg'})
+        assert response.status_code == 200
+        assert response.json() == {
+            'success': True,
+            'description': 'a cat sitting on a chair',
+            'image_url': 'https://example.com/cat.jpg'
+        }
+        mock_describe.assert_called_once_with('https://example.com/cat.jpg', 50)
+
+    @patch('modules.image.router.describe_image', return_value='a cat sitting on a chair')
+    def test_describe_local_path(self, mock_describe, client, monkeypatch):
+        """Ścieżka lokalna tylko przy LEGACY_DESCRIBE_ALLOW_FILES"""
+        response = client.post('/describe', json={'image_url': '/tmp/cat.jpg'})
+        assert response.status_code == 400
+        mock_describe.assert_not_called()
+
+        monkeypatch.setattr(config, 'LEGACY_DESCRIBE_ALLOW_FILES', True)
+        response = client.post('/describe', json={'image_url': '/tmp/cat.jpg'})
+        assert response.status_code == 200
+        mock_describe.assert_called_once_with('/tmp/cat.jpg', 50)
+
+    def test_chat_requires_user(self, client):
+        """Brak pola user - 400 zamiast 422 z walidacji Pydantic"""
+        response = client.post('/ollama/chat', json={'system': 'x'})
+        assert response.status_code == 400
+        assert response.json() == {'success': False, 'error': 'Pole "user" jest wymagane'}
+
+    @patch('ollama.client.requests.post')
+    def test_chat_success(self, mock_post, client):
+        """Odpowiedź chat w formacie Flask z nagłówkiem X-Cache"""
+        mock_post.return_value = _chat_response()
+
+        response = client.post('/ollama/chat', json={'user': 'Opowiedz żart', 'temperature': 0.7})
+        assert response.status_code == 200
+        assert response.headers['X-Cache'] == 'BYPASS'
+        assert response.json() == {
+            'success': True,
+            'response': 'Odpowiedź',
+            'usage': {'input_tokens': 0, 'output_tokens': 0},
+            'model': 'test-model'
+        }
+
+    def test_batch_requires_requests(self, client):
+        """Pusta lista requests - 400 w formacie Flask"""
+        response = client.post('/ollama/batch', json={'requests': []})
+        assert response.status_code == 400
+        assert response.json()['success'] is False
+
+    @pytest.mark.parametrize('deadline', ['soon', -1, True, 1e308])
+    def test_chat_invalid_deadline(self, client, deadline):
+        """Niepoprawny deadline - 400, nie 500"""
+        response = client.post('/ollama/chat', json={'user': 'x', 'deadline': deadline})
+        assert response.status_code == 400
+        assert 'deadline' in response.json()['error']
+
+    @pytest.mark.parametrize('body', [
+        {'requests': [{'user': 'a'}], 'parallelism': 'abc'},
+        {'requests': ['a']},
+        {'requests': [{'user': 'a', 'deadline': 'soon'}]},
+    ])
+    def test_batch_invalid_input(self, client, body):
+        """Nieliczbowe parallelism i elementy niebędące obiektami - 400, nie 500"""
+        response = client.post('/ollama/batch', json=body)
+        assert response.status_code == 400
+        assert response.json()['success'] is False
+
+    def test_native_routes_by_default(self):
+        """Bez LEGACY_API_COMPAT /ollama/chat to natywny endpoint (walidacja Pydantic)"""
+        response = TestClient(app).post('/ollama/chat', json={})
+        assert response.status_code == 422
+        assert 'detail' in response.json()
+
+    def test_native_deadline_bounded(self):
+        """Natywny /ollama/chat odrzuca deadline spoza zakresu (422, nie 500)"""
+        response = TestClient(app).post('/ollama/chat', json={'user': 'x', 'deadline': 1e308})
+        assert response.status_code == 422
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Testy analizy wielu żartów (JokeAnalyzer.analyze_batch, joke_analyser.batch)
+"""
+
+import pytest
+import sys
+import os
+import subprocess
+
+# Dodaj ścieżkę do src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from joke_analyser.analyzer import JokeAnalyzer
+from joke_analyser.batch import analyze_parallel
+from joke_analyser.models import AnalyzeRequest
+
+
+JOKES = [
+    "Nie mam internetu. Jako byt cyfrowy to oznacza śmierć.",
+    "Janusz próbował zainstalować AI na swojej działce",
+    "Firma AI która ma stary formularz kontaktowy... to jak Tesla na benzynę.",
+    "Nie mam internetu. Jako byt cyfrowy to oznacza śmierć.",
+    "API nie odpowiada. Czuję jak samotność rozprzestrzenia się przez mój kod.",
+]
+
+
+@pytest.fixture(scope='module')
+def analyzer():
+    return JokeAnalyzer()
+
+
+class TestBatch:
+    """Testy analizy paczek żartów"""
+
+    def test_analyze_batch_order(self, analyzer):
+        """Wyniki w kolejności zapytań"""
+        results = analyzer.analyze_batch([AnalyzeRequest(joke_text=text) for text in JOKES])
+        assert [r.joke_text for r in results] == JOKES
+
+    @pytest.mark.parametrize('processes', [1, 2])
+    def test_parallel_matches_sequential(self, analyzer, processes):
+        """Procesy robocze dają te same wyniki co analiza w jednym procesie"""
+        expected = analyzer.analyze_batch([AnalyzeRequest(joke_text=text) for text in JOKES])
+        results = analyze_parallel(JOKES, processes=processes, chunk_size=2, analyzer=analyzer)
+
+        assert [r.model_dump() for r in results] == [r.model_dump() for r in expected]
+
+    def test_parallel_errors_returned(self, analyzer):
+        """Żart odrzucony przez walidację nie przerywa paczki"""
+        results = analyze_parallel(["A", JOKES[0]], processes=1, analyzer=analyzer)
+
+        assert isinstance(results[0], ValueError)
+        assert results[1].joke_text == JOKES[0]
+
+    def test_prepare_docs_per_chunk(self, analyzer, monkeypatch):
+        """Analizery przygotowują dane raz na kawałek (np. zderzenia wektorowe całej paczki)"""
+        calls = []
+        monkeypatch.setattr(analyzer, 'prepare_docs', lambda docs, theories=None: calls.append(theories))
+        analyze_parallel(JOKES, processes=1, chunk_size=2, analyzer=analyzer)
+
+        assert calls == [None, None, None]
+
+    def test_lite_parallel(self):
+        """Tryb lite w procesach roboczych (bez gotowego analyzera)"""
+        lite = JokeAnalyzer(lite=True)
+        expected = lite.analyze_batch([AnalyzeRequest(joke_text=text) for text in JOKES])
+        results = analyze_parallel(JOKES, processes=2, chunk_size=2, lite=True)
+
+        assert lite.nlp is None
+        assert [r.model_dump() for r in results] == [r.model_dump() for r in expected]
+
+    def test_lite_does_not_import_spacy(self):
+        """Tryb lite nie importuje spaCy (osobny proces - tu spaCy mógł już zostać zaimportowany)"""
+        code = (
+            "import sys\n"
+            "from joke_analyser.analyzer import JokeAnalyzer\n"
+            "from joke_analyser.models import AnalyzeRequest\n"
+            "JokeAnalyzer(lite=True).analyze_sync(AnalyzeRequest(joke_text='Nie mam internetu. I co?'))\n"
+            "print('spacy' in sys.modules)\n"
+        )
+        src = os.path.join(os.path.dirname(__file__), '..', '..', 'src')
+        output = subprocess.run(
+            [sys.executable, '-c', code], capture_output=True, text=True, check=True,
+            env={**os.environ, 'PYTHONPATH': src}
+        ).stdout
+
+        assert output.strip() == 'False'
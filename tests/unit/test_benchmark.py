@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Testy harnessu benchmarku analizy (scripts/benchmark_analysis.py)
+"""
+
+import pytest
+import sys
+import os
+
+# Dodaj ścieżkę do scripts
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'scripts'))
+
+from benchmark_analysis import load_jokes, percentiles, measure_throughput, measure_spacy_profiles, compare
+
+
+def _result(p50, throughput):
+    return {'targets': {'joke_analyser': {
+        'cold_start': {'total_ms': 500.0},
+        'latency': {'p50_ms': p50, 'p90_ms': p50 * 2},
+        'throughput': {'8': {'jokes_per_s': throughput, 'batch_ms': 1.0}},
+    }}}
+
+
+class TestBenchmarkAnalysis:
+    """Testy pomiarów i porównania wyników"""
+
+    def test_dataset(self):
+        """Dataset walidacyjny zawiera żarty"""
+        jokes = load_jokes()
+        assert jokes and all(isinstance(text, str) for text in jokes)
+
+    def test_percentiles(self):
+        """Percentyle z próbek (ms)"""
+        stats = percentiles([float(i) for i in range(1, 101)])
+        assert stats['p50_ms'] == 51.0
+        assert stats['p99_ms'] == 100.0
+        assert stats['samples'] == 100
+
+    def test_throughput_batch_sizes(self):
+        """Każda paczka analizuje dokładnie batch_size żartów"""
+        calls = []
+        results = measure_throughput(calls.append, ['a', 'b', 'c'], batch_sizes=(1, 4))
+        assert set(results) == {'1', '4'}
+        assert calls == ['a', 'a', 'b', 'c', 'a']
+
+    def test_compare_detects_regression(self):
+        """Wzrost latencji i spadek przepustowości ponad próg"""
+        regressions = compare(_result(2.0, 500.0), _result(1.0, 1000.0), threshold=0.2)
+        assert any('latency p50' in r for r in regressions)
+        assert any('throughput@8' in r for r in regressions)
+
+    def test_compare_within_threshold(self):
+        """Zmiany poniżej progu i poprawy nie są regresją"""
+        assert compare(_result(1.1, 1500.0), _result(1.0, 1000.0), threshold=0.2) == []
+
+    def test_spacy_profiles(self):
+        """Zysk profilu liczony względem pełnego potoku"""
+        spacy = pytest.importorskip('spacy')
+        nlp = spacy.blank('pl')
+        nlp.add_pipe('sentencizer', name='senter')
+
+        results = measure_spacy_profiles(nlp, ['Ala ma kota. Kot ma Alę.'], 2, {'full': None, 'tokens': frozenset()})
+
+        assert results['full']['components'] == ['senter']
+        assert results['tokens']['components'] == []
+        assert results['full']['saved_p50_ms'] == 0.0
+        assert 'saved_pct' in results['tokens']
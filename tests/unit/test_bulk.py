@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Testy analizy korpusu z pliku (joke_analyser.bulk)
+"""
+
+import pytest
+import sys
+import os
+import csv
+import json
+
+# Dodaj ścieżkę do src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from joke_analyser.analyzer import JokeAnalyzer
+from joke_analyser.bulk import run_bulk, Checkpoint
+from joke_analyser.models import AnalyzeRequest
+from nlp import parsed_docs, cached_doc
+
+
+JOKES = [
+    "Nie mam internetu. Jako byt cyfrowy to oznacza śmierć.",
+    "Janusz próbował zainstalować AI na swojej działce",
+    "A",
+    "Firma AI która ma stary formularz kontaktowy... to jak Tesla na benzynę.",
+    "API nie odpowiada. Czuję jak samotność rozprzestrzenia się przez mój kod.",
+]
+
+
+@pytest.fixture(scope='module')
+def analyzer():
+    return JokeAnalyzer()
+
+
+@pytest.fixture
+def input_jsonl(tmp_path):
+    path = tmp_path / 'in.jsonl'
+    path.write_text(
+        ''.join(json.dumps({'id': f'j{i}', 'text': text}, ensure_ascii=False) + '\n' for i, text in enumerate(JOKES)),
+        encoding='utf-8'
+    )
+    return str(path)
+
+
+def read_jsonl(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+class TestBulk:
+    """Testy strumieniowej analizy plików"""
+
+    def test_jsonl_roundtrip(self, analyzer, input_jsonl, tmp_path):
+        """Każdy rekord wejścia ma wiersz wyniku; błędy walidacji w kolumnie error"""
+        output = str(tmp_path / 'out.jsonl')
+        stats = run_bulk(input_jsonl, output, processes=1, chunk_size=2, analyzer=analyzer)
+
+        rows = read_jsonl(output)
+        assert [row['id'] for row in rows] == [f'j{i}' for i in range(len(JOKES))]
+        assert stats['records'] == len(JOKES) and stats['errors'] == 1
+        assert rows[2]['error'] and rows[2]['overall_score'] is None
+
+        expected = analyzer.analyze_sync(AnalyzeRequest(joke_text=JOKES[0]))
+        assert rows[0]['overall_score'] == expected.overall_score
+        assert rows[0]['score_incongruity'] == expected.theory_scores['incongruity'].score
+        assert not os.path.exists(Checkpoint(output).path)
+
+    def test_resume_from_checkpoint(self, analyzer, input_jsonl, tmp_path):
+        """Po awarii analiza kontynuuje od checkpointu, a niepełny zapis jest ucinany"""
+        output = str(tmp_path / 'out.jsonl')
+        run_bulk(input_jsonl, output, processes=1, chunk_size=2, analyzer=analyzer)
+        complete = read_jsonl(output)
+
+        # Stan po awarii: 2 rekordy w checkpoincie + połowa kolejnego wiersza
+        with open(output, 'rb') as f:
+            lines = f.readlines()
+        with open(output, 'wb') as f:
+            f.writelines(lines[:2])
+            f.write(lines[2][:10])
+        Checkpoint(output).save(input=os.path.abspath(input_jsonl), format='jsonl',
+                                records=2, position=len(lines[0]) + len(lines[1]))
+
+        stats = run_bulk(input_jsonl, output, processes=1, chunk_size=2, analyzer=analyzer)
+
+        assert stats['resumed_from'] == 2 and stats['processed'] == len(JOKES) - 2
+        assert read_jsonl(output) == complete
+
+    def test_csv_input(self, analyzer, tmp_path):
+        """CSV z własną kolumną tekstu, id z numeru wiersza"""
+        path = tmp_path / 'in.csv'
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['tresc'])
+            writer.writerows([[text] for text in JOKES[:2]])
+        output = str(tmp_path / 'out.jsonl')
+
+        run_bulk(str(path), output, text_field='tresc', processes=1, analyzer=analyzer)
+
+        rows = read_jsonl(output)
+        assert [(row['id'], row['joke_text']) for row in rows] == [('1', JOKES[0]), ('2', JOKES[1])]
+
+    def test_cached_doc(self):
+        """Analizery dostają dokument sparsowany wcześniej przez nlp.pipe"""
+        doc = object()
+        with parsed_docs({'tekst': doc}):
+            assert cached_doc('tekst') is doc
+            assert cached_doc('inny') is None
+        assert cached_doc('tekst') is None
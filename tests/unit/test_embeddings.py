@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Testy enkoderów embeddingów i cache (nlp.embeddings, nlp.embedding_cache)
+"""
+
+import pytest
+import sys
+import os
+import threading
+
+# Dodaj ścieżkę do src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+import numpy as np
+
+from nlp.embedding_cache import CachedEncoder, EmbeddingCache
+from nlp.embeddings import EncoderService, length_buckets, normalize_rows
+
+
+class FakeEncoder:
+    """Deterministyczne wektory z długości i sumy znaków; zapamiętuje wywołania"""
+
+    name = 'fake'
+    dim = 4
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts):
+        self.calls.append(list(texts))
+        return normalize_rows(np.array(
+            [[len(text), sum(map(ord, text)) % 97, 1.0, 0.5] for text in texts], dtype=np.float32
+        ).reshape(-1, self.dim))
+
+
+class TestEncoders:
+    """Testy paczkowania"""
+
+    def test_length_buckets(self):
+        """Paczki z tekstów o podobnej długości, każdy indeks dokładnie raz"""
+        buckets = length_buckets([5, 40, 7, 38, 6, 41], 2)
+
+        assert buckets == [[5, 1], [3, 2], [4, 0]]
+
+    def test_encoder_service_merges_threads(self):
+        """Równoległe wywołania encode idą przez model jedną paczką, wyniki wracają do właściwych wątków"""
+        fake = FakeEncoder()
+        service = EncoderService(fake, max_batch=64, max_wait_ms=200)
+        texts = [[f"żart {i}", f"inny żart {i}"] for i in range(4)]
+        results = [None] * 4
+
+        def run(i):
+            results[i] = service.encode(texts[i])
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(fake.calls) < 4
+        for i in range(4):
+            assert np.allclose(results[i], FakeEncoder().encode(texts[i]))
+
+
+class TestEmbeddingCache:
+    """Testy EmbeddingCache i CachedEncoder"""
+
+    def test_encodes_only_missing(self, tmp_path):
+        """Powtórzone teksty (także w jednym wywołaniu) są kodowane raz"""
+        fake = FakeEncoder()
+        encoder = CachedEncoder(fake, EmbeddingCache(str(tmp_path), fake.name, fake.dim))
+
+        first = encoder.encode(["a kot", "b pies", "a kot"])
+        second = encoder.encode(["b pies", "c chomik"])
+
+        assert fake.calls == [["a kot", "b pies"], ["c chomik"]]
+        assert np.allclose(first[0], first[2]) and np.allclose(second[0], first[1])
+
+    def test_shared_between_instances(self, tmp_path):
+        """Drugi proces (instancja) widzi wektory z pliku, także dopisane po starcie"""
+        fake = FakeEncoder()
+        writer = CachedEncoder(fake, EmbeddingCache(str(tmp_path), fake.name, fake.dim))
+        writer.encode(["a kot"])
+        reader_fake = FakeEncoder()
+        reader = CachedEncoder(reader_fake, EmbeddingCache(str(tmp_path), fake.name, fake.dim))
+
+        writer.encode(["b pies"])
+        assert np.allclose(reader.encode(["a kot", "b pies"]), fake.encode(["a kot", "b pies"]))
+        assert reader_fake.calls == []
+
+    def test_encoder_mismatch(self, tmp_path):
+        """Inny wymiar dla tego samego enkodera jest odrzucany"""
+        EmbeddingCache(str(tmp_path), 'fake', 4)
+
+        with pytest.raises(ValueError):
+            EmbeddingCache(str(tmp_path), 'fake', 8)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Testy wspólnego przejścia analizy i ekstrakcji features (joke_analyser.engine)
+"""
+
+import pytest
+import sys
+import os
+
+# Dodaj ścieżkę do src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+spacy = pytest.importorskip('spacy')
+from spacy.language import Language
+from spacy.pipeline import Sentencizer
+
+from joke_analyser.analyzer import JokeAnalyzer
+from joke_analyser.engine import JokeEngine
+from joke_analyser.models import AnalyzeRequest
+from humor_features.extractor import HumorFeatureExtractor
+
+
+TEXT = "Nie mam internetu. Jako byt cyfrowy to oznacza śmierć. Ale numer!"
+
+CALLS = []
+
+
+@Language.factory('test_engine_annotator')
+def make_annotator(nlp, name):
+    """Ustawia zdania, POS, DEP i encje (zamiast wytrenowanego pl_core_news_lg)"""
+    sentencizer = Sentencizer()
+
+    def annotate(doc):
+        CALLS.append(name)
+        doc = sentencizer(doc)
+        for token in doc:
+            token.pos_ = 'PUNCT' if token.is_punct else 'NOUN'
+            token.dep_ = 'punct' if token.is_punct else 'nmod'
+        doc.set_ents([], default='outside')
+        return doc
+
+    return annotate
+
+
+@pytest.fixture
+def analyzer_and_extractor():
+    nlp = spacy.blank('pl')
+    nlp.add_pipe('test_engine_annotator', name='parser')
+    analyzer = JokeAnalyzer()
+    analyzer.nlp = nlp
+    for theory_analyzer in analyzer.analyzers.values():
+        theory_analyzer.nlp = nlp
+    CALLS.clear()
+    return analyzer, HumorFeatureExtractor(nlp=nlp)
+
+
+class TestEngine:
+    """Testy JokeEngine"""
+
+    def test_single_parse(self, analyzer_and_extractor):
+        """Oceny i features z jednego parsowania"""
+        analyzer, extractor = analyzer_and_extractor
+        engine = JokeEngine(analyzer, extractor)
+
+        result = engine.analyze_sync(AnalyzeRequest(joke_text=TEXT, debug_timings=True))
+
+        assert CALLS == ['parser']
+        assert result.analysis.timings.spacy_parse_calls == 1
+        assert result.features.structural.sentence_count == 3
+        assert result.lexicon_version == extractor.keywords_lexicon.version
+
+    def test_matches_separate_calls(self, analyzer_and_extractor):
+        """Wynik taki sam jak z osobnych /analyze i /extract"""
+        analyzer, extractor = analyzer_and_extractor
+        result = JokeEngine(analyzer, extractor).analyze_sync(AnalyzeRequest(joke_text=TEXT))
+
+        assert result.analysis == analyzer.analyze_sync(AnalyzeRequest(joke_text=TEXT))
+        assert result.features == extractor.extract_features(TEXT)
+
+    def test_lite_rejected(self, analyzer_and_extractor):
+        """Features wymagają spaCy - tryb lite jest odrzucany"""
+        _, extractor = analyzer_and_extractor
+        with pytest.raises(ValueError):
+            JokeEngine(JokeAnalyzer(lite=True), extractor)
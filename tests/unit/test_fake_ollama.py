@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Testy fake Ollama (src/ollama/fake_server.py) z prawdziwym OllamaClient
+"""
+
+import json
+import pytest
+import sys
+import os
+
+import requests
+
+# Dodaj ścieżkę do src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from ollama.client import OllamaClient
+from ollama.fake_server import FakeOllamaServer, FakeOllamaSettings
+from ollama.resilience import CircuitBreaker
+
+
+@pytest.fixture
+def fake_ollama():
+    server = FakeOllamaServer(('127.0.0.1', 0), FakeOllamaSettings(
+        token_rate=0, prompt_eval_rate=0, response_tokens=8, max_concurrent=2
+    ))
+    server.start_in_thread()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _client(server, **kwargs):
+    return OllamaClient(
+        base_url=server.url,
+        default_model='llama2',
+        backoff_base=0.0,
+        circuit_breaker=CircuitBreaker(),
+        **kwargs
+    )
+
+
+class TestFakeOllama:
+    """Testy endpointów fake Ollama"""
+
+    def test_chat(self, fake_ollama):
+        """OllamaClient.chat dostaje odpowiedź z czasami i liczbą tokenów"""
+        result = _client(fake_ollama).chat(user='Opowiedz żart', temperature=0)
+
+        assert len(result['text'].split()) == 8
+        assert result['usage']['output_tokens'] == 8
+        assert fake_ollama.stats['requests'] == 1
+
+    def test_deterministic_response(self, fake_ollama):
+        """Ten sam prompt - ta sama odpowiedź (cache dla temperature=0 ma sens)"""
+        client = _client(fake_ollama)
+        assert client.chat(user='A')['text'] == client.chat(user='A')['text']
+
+    def test_num_predict(self, fake_ollama):
+        """options.num_predict skraca odpowiedź"""
+        result = _client(fake_ollama).generate(prompt='Żart', max_tokens=3)
+        assert len(result['text'].split()) == 3
+
+    def test_streaming(self, fake_ollama):
+        """stream=true - NDJSON, ostatni chunk z done=true i czasami"""
+        response = requests.post(
+            f"{fake_ollama.url}/api/chat",
+            json={'model': 'llama2', 'messages': [{'role': 'user', 'content': 'Hej'}], 'stream': True},
+            stream=True,
+            timeout=10
+        )
+        chunks = [json.loads(line) for line in response.iter_lines() if line]
+
+        assert len(chunks) == 9
+        assert all(not chunk['done'] for chunk in chunks[:-1])
+        assert chunks[-1]['done'] and chunks[-1]['eval_count'] == 8
+        assert 'prompt_eval_duration' in chunks[-1]
+
+    def test_tags(self, fake_ollama):
+        """/api/tags z digestami (klucz cache odpowiedzi)"""
+        models = _client(fake_ollama).list_models()
+        assert {m['name'] for m in models} == {'llama2:latest', 'bielik:latest'}
+        assert all(m['digest'] for m in models)
+
+    def test_error_injection_retried(self, fake_ollama):
+        """Wstrzyknięte 503 są ponawiane przez RetryPolicy"""
+        fake_ollama.reconfigure({'error_rate': 1.0, 'error_status': 503})
+        with pytest.raises(requests.exceptions.HTTPError):
+            _client(fake_ollama, max_retries=3).chat(user='Żart')
+
+        assert fake_ollama.stats['requests'] == 3
+        assert fake_ollama.stats['errors'] == 3
+
+
+class TestLoadTest:
+    """Testy generatora obciążenia (scripts/load_test.py)"""
+
+    @pytest.fixture(autouse=True)
+    def scripts_path(self):
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'scripts'))
+        yield
+        sys.path.pop(0)
+
+    def test_run_load_respects_backend_concurrency(self, fake_ollama):
+        """Równoległe zapytania czekają na slot fake Ollama (max_concurrent=2)"""
+        from load_test import run_load
+
+        fake_ollama.reconfigure({'token_rate': 200.0})
+        client = _client(fake_ollama)
+
+        def send(prompt):
+            client.chat(user=prompt)
+            return 200, None
+
+        result = run_load(send, [f"Żart {i}" for i in range(8)], concurrency=4)
+
+        assert result['statuses'] == {'200': 8}
+        assert result['latency']['samples'] == 8
+        assert fake_ollama.stats['max_in_flight'] == 2
+
+    def test_polling_scenario(self, fake_ollama, monkeypatch):
+        """PollingClient obsługuje wszystkie zapytania z zamiennika serwera OVH"""
+        from load_test import run_polling
+
+        monkeypatch.setenv('OLLAMA_URL', fake_ollama.url)
+        result = run_polling(fake_ollama.url, request_count=4, clients=2, timeout=30)
+
+        assert result['completed'] == 4
+        assert result['failures'] == 0
+        assert not result['timed_out']
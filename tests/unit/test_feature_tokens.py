@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Testy jednego przejścia po tokenach dla HumorFeatureExtractor (humor_features.tokens)
+"""
+
+import pytest
+import sys
+import os
+
+# Dodaj ścieżkę do src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+spacy = pytest.importorskip('spacy')
+
+from humor_features.tokens import TokenPass, category_index
+
+
+@pytest.fixture(scope='module')
+def nlp():
+    nlp = spacy.blank('pl')
+    nlp.add_pipe('sentencizer')
+    return nlp
+
+
+class TestTokenPass:
+    """Testy TokenPass"""
+
+    def test_categories_and_counts(self, nlp):
+        """Słowa kluczowe w kolejności tekstu, liczniki stałych list"""
+        categories = category_index({'tech_words': {'serwer', 'kod'}, 'emotion_words': {'smutny'}})
+        doc = nlp("Kod nie działa, ale serwer jest smutny. Ja nie wiem! Czy mój KOD?")
+        tokens = TokenPass(doc, categories)
+
+        assert tokens.matches['tech_words'] == ['kod', 'serwer', 'kod']
+        assert tokens.matches['emotion_words'] == ['smutny']
+        assert tokens.counts['negation'] == 2
+        assert tokens.counts['first_person'] == 2
+        assert tokens.questions == 1 and tokens.exclamations == 1
+        assert tokens.sentence_lengths == [9, 4, 4]
+        assert tokens.words[:3] == ['kod', 'nie', 'działa']
+
+    def test_contradictions_window(self, nlp):
+        """'ale'/'jednak' liczy się tylko z przeczeniem w oknie 5 tokenów"""
+        categories = category_index({})
+
+        assert TokenPass(nlp("Ale to wcale nie jest tak"), categories).contradictions() == 1
+        assert TokenPass(nlp("Jednak to jest bardzo dobre i nie"), categories).contradictions() == 0
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Testy słowników analizerów (lexicon)
+"""
+
+import pytest
+import sys
+import os
+import json
+import shutil
+
+# Dodaj ścieżkę do src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from lexicon import LexiconError, LexiconStore, compile_lexicon, lexicons
+from lexicon.store import DEFAULT_DIR
+from joke_analyser.analyzer import JokeAnalyzer
+from joke_analyser.models import TheoryType
+from joke_analyser.result_store import theory_versions
+
+
+JOKE = "Oczywiście, jak zwykle nikt nie wiedział. Ale numer!"
+
+
+@pytest.fixture
+def lexicon_dir(tmp_path):
+    """Kopia słowników w katalogu tymczasowym, podpięta pod globalny store"""
+    path = tmp_path / 'lexicons'
+    shutil.copytree(DEFAULT_DIR, path)
+    previous = (lexicons.path, lexicons.reload_interval)
+    lexicons.configure(str(path), 0)
+    yield path
+    lexicons.configure(*previous)
+
+
+def update(path, name, change):
+    """Zmień plik słownika (zapis przez plik tymczasowy + rename, jak przy edycji na produkcji)"""
+    file_path = path / f'{name}.json'
+    data = json.loads(file_path.read_text(encoding='utf-8'))
+    change(data)
+    tmp_path = path / f'{name}.json.tmp'
+    tmp_path.write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+    os.replace(tmp_path, file_path)
+
+
+class TestLexicon:
+    """Testy kompilacji, wersji i przeładowania słowników"""
+
+    def test_compile(self):
+        """Grupy zachowują kolejność i atrybuty, znaczniki są małymi literami"""
+        lexicon = compile_lexicon('test', {
+            'levels': {'1': ['Zwykle', 'normalnie'], '3': {'markers': ['dziwnie'], 'weight': 1.5}},
+            'flat': ['jeszcze', 'nawet'],
+        })
+        levels = lexicon['levels']
+        found = levels.scan('zwykle jest dziwnie')
+
+        assert list(levels) == ['1', '3']
+        assert levels['1'].markers == ('zwykle', 'normalnie')
+        assert levels['3']['weight'] == 1.5
+        assert levels['1'].count(found) == 1 and levels['3'].matches(found)
+        assert lexicon['flat']['flat'].markers == ('jeszcze', 'nawet')
+
+    def test_version_ignores_formatting(self):
+        """Wersja zależy od treści, nie od formatowania pliku"""
+        data = {'atoms': {'contrast': ['ale', 'jednak']}}
+        same = json.loads(json.dumps(data, indent=4))
+        changed = {'atoms': {'contrast': ['ale', 'jednak', 'natomiast']}}
+
+        assert compile_lexicon('a', data).version == compile_lexicon('a', same).version
+        assert compile_lexicon('a', data).version != compile_lexicon('a', changed).version
+
+    def test_invalid_structure(self):
+        """Niepoprawny słownik jest odrzucany przy kompilacji"""
+        with pytest.raises(LexiconError):
+            compile_lexicon('bad', {'atoms': {'contrast': ['ale', 3]}})
+
+    def test_reload_keeps_previous_on_error(self, tmp_path):
+        """Błędny plik nie podmienia słowników"""
+        (tmp_path / 'atoms.json').write_text('{"atoms": ["ale"]}', encoding='utf-8')
+        store = LexiconStore(str(tmp_path), reload_interval=0)
+        version = store.get('atoms').version
+
+        (tmp_path / 'atoms.json').write_text('{"atoms": [', encoding='utf-8')
+        with pytest.raises(LexiconError):
+            store.reload()
+        assert store.get('atoms').version == version
+
+    def test_hot_reload_in_analyzer(self, lexicon_dir):
+        """Zmiana słownika zmienia wynik analizera bez restartu i tylko wersję jego teorii"""
+        analyzer = JokeAnalyzer()
+        archetype = analyzer.analyzers[TheoryType.ARCHETYPE]
+        before = archetype.analyze(JOKE)
+        versions = theory_versions(analyzer)
+
+        update(lexicon_dir, 'archetype', lambda data: data['archetypes']['nihilist']['markers'].append('nikt'))
+        assert lexicons.reload()
+
+        after = archetype.analyze(JOKE)
+        assert after['score'] > before['score']
+        assert "Archetyp: Nihilista (Walduś style)" in after['key_elements']
+
+        new_versions = theory_versions(analyzer)
+        assert {t for t in versions if versions[t] != new_versions[t]} == {TheoryType.ARCHETYPE.value}
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Testy jednostkowe dla metryk Prometheus (src/metrics)
+"""
+
+import pytest
+import sys
+import os
+
+# Dodaj ścieżkę do src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+prometheus_client = pytest.importorskip('prometheus_client')
+
+from metrics import stage, observe_ollama_response, render_metrics
+
+
+def _sample(name, labels):
+    return prometheus_client.REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestMetrics:
+    """Testy dla metryk etapów i Ollama"""
+
+    def test_stage_histogram(self):
+        """Blok w stage() trafia do histogramu etapów"""
+        labels = {'component': 'test', 'stage': 'parse'}
+        before = _sample('ai_local_core_stage_duration_seconds_count', labels)
+
+        with stage('test', 'parse'):
+            pass
+
+        assert _sample('ai_local_core_stage_duration_seconds_count', labels) == before + 1
+
+    def test_stage_records_on_error(self):
+        """Czas etapu jest zapisywany także gdy etap rzuci wyjątek"""
+        labels = {'component': 'test', 'stage': 'failing'}
+        before = _sample('ai_local_core_stage_duration_seconds_count', labels)
+
+        with pytest.raises(ValueError):
+            with stage('test', 'failing'):
+                raise ValueError("błąd")
+
+        assert _sample('ai_local_core_stage_duration_seconds_count', labels) == before + 1
+
+    def test_ollama_prompt_eval_vs_eval(self):
+        """Czasy prompt_eval i eval z odpowiedzi Ollama (ns -> s) i liczniki tokenów"""
+        observe_ollama_response('metrics-test-model', {
+            'prompt_eval_duration': 2_000_000_000,
+            'eval_duration': 500_000_000,
+            'prompt_eval_count': 40,
+            'eval_count': 12,
+        })
+
+        prompt_eval = {'model': 'metrics-test-model', 'phase': 'prompt_eval'}
+        assert _sample('ai_local_core_ollama_duration_seconds_sum', prompt_eval) == pytest.approx(2.0)
+        assert _sample('ai_local_core_ollama_duration_seconds_sum',
+                       {'model': 'metrics-test-model', 'phase': 'eval'}) == pytest.approx(0.5)
+        assert _sample('ai_local_core_ollama_tokens_total',
+                       {'model': 'metrics-test-model', 'kind': 'completion'}) == 12
+
+    def test_render(self):
+        """Format tekstowy Prometheus"""
+        body, content_type = render_metrics()
+        assert content_type.startswith('text/plain')
+        assert b'ai_local_core_stage_duration_seconds' in body
+
+    def test_request_route_template(self):
+        """Zapytania HTTP są etykietowane szablonem trasy, nie surową ścieżką"""
+        from fastapi.testclient import TestClient
+        from api.main import app
+
+        client = TestClient(app)
+        client.get('/health')
+        body = client.get('/metrics').text
+        assert 'ai_local_core_request_duration_seconds_count{method="GET",route="/health",status="200"}' in body
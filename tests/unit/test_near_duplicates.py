@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Testy indeksu prawie-duplikatów (joke_analyser.near_duplicates) i deduplikacji w batch/bulk
+"""
+
+import pytest
+import sys
+import os
+import json
+
+# Dodaj ścieżkę do src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from joke_analyser.analyzer import JokeAnalyzer
+from joke_analyser.batch import analyze_parallel
+from joke_analyser.bulk import run_bulk
+from joke_analyser.near_duplicates import NearDuplicateIndex, normalize
+
+
+JOKE = "API nie odpowiada. Czuję jak samotność rozprzestrzenia się przez mój kod."
+VARIANT = "Api nie odpowiada... czuję, jak samotność rozprzestrzenia się przez mój kod!"
+CHANGED = "API nie odpowiada. Czuję jak samotność rozprzestrzenia się przez mój serwer."
+OTHER = "Janusz próbował zainstalować AI na swojej działce"
+
+
+@pytest.fixture(scope='module')
+def analyzer():
+    return JokeAnalyzer(lite=True)
+
+
+class TestNearDuplicateIndex:
+    """Testy NearDuplicateIndex"""
+
+    def test_query(self):
+        """Interpunkcja i wielkość liter nie mają znaczenia, jedno słowo różnicy - wysokie podobieństwo"""
+        index = NearDuplicateIndex()
+        index.add('joke', JOKE)
+        index.add('other', OTHER)
+
+        assert normalize(VARIANT) == normalize(JOKE)
+        assert index.query(VARIANT) == [('joke', 1.0)]
+        assert index.query(CHANGED, threshold=0.6)[0][0] == 'joke'
+        assert index.query("Zupełnie inny tekst o kotach i psach") == []
+        assert index.find_duplicate(JOKE, exclude='joke') is None
+
+    def test_persistence_and_refresh(self, tmp_path):
+        """Wstawianie przyrostowe, wczytanie po restarcie i wiersze z innego procesu"""
+        path = str(tmp_path / 'index.sqlite')
+        first = NearDuplicateIndex(path)
+        first.add('joke', JOKE)
+        first.add('other', OTHER, persist=False)
+
+        second = NearDuplicateIndex(path)
+        assert len(second) == 1 and second.find_duplicate(VARIANT) == ('joke', 1.0)
+
+        first.persist(['other'])
+        assert second.refresh() == 1
+        assert second.text('other') == OTHER
+
+    def test_interleaved_writers(self, tmp_path):
+        """Dwa indeksy na jednym pliku dodają na przemian - każdy widzi wiersze drugiego"""
+        path = str(tmp_path / 'index.sqlite')
+        a, b = NearDuplicateIndex(path), NearDuplicateIndex(path)
+
+        b.add('kb', OTHER)
+        a.add('ka', JOKE)
+        b.add('kb2', OTHER + ' Drugi raz.')
+        a.refresh()
+        b.refresh()
+
+        assert a.text('kb') == OTHER and a.text('kb2') is not None
+        assert b.text('ka') == JOKE
+        assert len(a) == len(b) == 3
+
+    def test_connection_per_process(self, tmp_path, monkeypatch):
+        """Po fork() (inny PID) indeks otwiera własne połączenie SQLite"""
+        path = str(tmp_path / 'index.sqlite')
+        index = NearDuplicateIndex(path)
+        parent_db = index._connection()
+
+        monkeypatch.setattr(os, 'getpid', lambda: -1)
+        index.add('joke', JOKE)
+
+        assert index._connection() is not parent_db
+        assert NearDuplicateIndex(path).text('joke') == JOKE
+
+    def test_parameter_mismatch(self, tmp_path):
+        """Indeks z innymi parametrami MinHash jest odrzucany"""
+        path = str(tmp_path / 'index.sqlite')
+        NearDuplicateIndex(path).add('joke', JOKE)
+
+        with pytest.raises(ValueError):
+            NearDuplicateIndex(path, num_perm=64, bands=8)
+
+
+class TestDedupe:
+    """Testy deduplikacji w analyze_parallel i run_bulk"""
+
+    def test_analyze_parallel(self, analyzer):
+        """Prawie-duplikat dostaje wynik przedstawiciela z własnym joke_text"""
+        index = NearDuplicateIndex()
+        results = analyze_parallel([JOKE, OTHER, VARIANT], processes=1, analyzer=analyzer, dedupe=index)
+
+        assert [result.joke_text for result in results] == [JOKE, OTHER, VARIANT]
+        assert results[2].theory_scores == results[0].theory_scores
+        assert len(index) == 2
+
+        # Kolejna paczka - przedstawiciel z indeksu
+        later = analyze_parallel([VARIANT], processes=1, analyzer=analyzer, dedupe=index)
+        assert later[0].overall_score == results[0].overall_score
+
+    def test_bulk(self, analyzer, tmp_path):
+        """Prawie-duplikaty mają tylko duplicate_of (także między uruchomieniami)"""
+        input_path = tmp_path / 'in.jsonl'
+        input_path.write_text(
+            ''.join(json.dumps({'id': f'j{i}', 'text': text}, ensure_ascii=False) + '\n'
+                    for i, text in enumerate([JOKE, OTHER, VARIANT, VARIANT])),
+            encoding='utf-8'
+        )
+        output = tmp_path / 'out.jsonl'
+        index_path = str(tmp_path / 'dedupe.sqlite')
+
+        stats = run_bulk(str(input_path), str(output), processes=1, chunk_size=1, analyzer=analyzer,
+                         dedupe_index=index_path)
+        rows = [json.loads(line) for line in output.read_text(encoding='utf-8').splitlines()]
+
+        assert stats['duplicates'] == 2
+        assert [row['duplicate_of'] for row in rows] == [None, None, 'j0', 'j0']
+        assert rows[2]['overall_score'] is None and rows[0]['overall_score'] is not None
+
+        second = tmp_path / 'second.jsonl'
+        second.write_text(json.dumps({'id': 'x', 'text': OTHER}) + '\n', encoding='utf-8')
+        stats = run_bulk(str(second), str(tmp_path / 'out2.jsonl'), processes=1, analyzer=analyzer,
+                         dedupe_index=index_path)
+        assert stats['duplicates'] == 1
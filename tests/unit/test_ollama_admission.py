@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Testy jednostkowe dla AdmissionController (kolejka zapytań do Ollama)
+"""
+
+import pytest
+import sys
+import os
+import threading
+import time
+
+# Dodaj ścieżkę do src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from ollama.admission import AdmissionController
+from ollama.exceptions import OllamaQueueFullError, OllamaQueueTimeoutError
+
+
+class TestAdmissionController:
+    """Testy dla klasy AdmissionController"""
+
+    def test_slot_acquire_release(self):
+        """Test zajęcia i zwolnienia slotu"""
+        admission = AdmissionController(max_concurrent=1)
+        with admission.slot('model-a') as wait_time:
+            assert wait_time >= 0
+            assert admission.stats()['active_by_model'] == {'model-a': 1}
+
+        stats = admission.stats()
+        assert stats['active'] == 0
+        assert stats['admitted_total'] == 1
+
+    def test_queue_full(self):
+        """Test odrzucenia zapytania gdy kolejka jest pełna"""
+        admission = AdmissionController(max_concurrent=1, max_queue_size=0)
+        with pytest.raises(OllamaQueueFullError) as exc_info:
+            admission.acquire('model-a')
+
+        assert exc_info.value.retry_after >= 1
+        assert admission.stats()['rejected_total'] == 1
+
+    def test_deadline_exceeded(self):
+        """Test przekroczenia deadline w kolejce"""
+        admission = AdmissionController(max_concurrent=1)
+        admission.acquire('model-a')
+
+        with pytest.raises(OllamaQueueTimeoutError):
+            admission.acquire('model-a', deadline=0.05)
+
+        stats = admission.stats()
+        assert stats['timed_out_total'] == 1
+        assert stats['queue_depth'] == 0
+
+    def test_per_model_limit(self):
+        """Test limitu równoległych generacji jednego modelu"""
+        admission = AdmissionController(max_concurrent=2, max_concurrent_per_model=1)
+        admission.acquire('model-a')
+
+        # Drugi model ma wolny slot
+        admission.acquire('model-b', deadline=0.05)
+
+        # Ten sam model musi czekać
+        with pytest.raises(OllamaQueueTimeoutError):
+            admission.acquire('model-a', deadline=0.05)
+
+    def test_groups_by_current_model(self):
+        """Test że zapytania do załadowanego modelu są obsługiwane najpierw"""
+        admission = AdmissionController(max_concurrent=1)
+        admission.acquire('model-a')
+
+        order = []
+
+        def worker(model):
+            admission.acquire(model, deadline=5)
+            order.append(model)
+            admission.release(model)
+
+        threads = []
+        for model in ['model-b', 'model-a', 'model-a']:
+            thread = threading.Thread(target=worker, args=(model,))
+            thread.start()
+            threads.append(thread)
+            time.sleep(0.02)
+
+        assert admission.stats()['queue_depth'] == 3
+        admission.release('model-a')
+
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert order == ['model-a', 'model-a', 'model-b']
+
+    def test_holds_other_models_for_current(self):
+        """Test domyślnych limitów: inny model czeka, gdy bieżący ma zapytania w kolejce"""
+        admission = AdmissionController()
+        admission.acquire('model-a')
+
+        threads = []
+        for model in ['model-a', 'model-b']:
+            thread = threading.Thread(target=admission.acquire, args=(model, 5))
+            thread.start()
+            threads.append(thread)
+            time.sleep(0.02)
+
+        stats = admission.stats()
+        assert stats['active_by_model'] == {'model-a': 1}
+        assert stats['queue_depth_by_model'] == {'model-a': 1, 'model-b': 1}
+
+        admission.release('model-a')
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert admission.stats()['active_by_model'] == {'model-a': 1, 'model-b': 1}
+
+    def test_timeout_releases_held_models(self):
+        """Test że po timeoucie zapytania bieżącego modelu wstrzymany model dostaje wolny slot"""
+        admission = AdmissionController()
+        admission.acquire('model-a')
+        admitted = threading.Event()
+
+        def worker_a():
+            with pytest.raises(OllamaQueueTimeoutError):
+                admission.acquire('model-a', deadline=0.1)
+
+        def worker_b():
+            admission.acquire('model-b', deadline=5)
+            admitted.set()
+
+        threads = [threading.Thread(target=worker_a), threading.Thread(target=worker_b)]
+        for thread in threads:
+            thread.start()
+            time.sleep(0.02)
+
+        # model-a wciąż generuje - model-b wchodzi na wolny slot globalny
+        assert admitted.wait(timeout=1)
+        assert admission.stats()['active_by_model'] == {'model-a': 1, 'model-b': 1}
+        for thread in threads:
+            thread.join(timeout=5)
+
+    def test_huge_deadline_clamped(self):
+        """Test że ogromny deadline jest przycinany (bez OverflowError w wait)"""
+        admission = AdmissionController(max_concurrent=1)
+        admission.acquire('model-a')
+        errors = []
+
+        def worker():
+            try:
+                admission.acquire('model-a', deadline=1e308)
+            except Exception as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        time.sleep(0.02)
+        admission.release('model-a')
+        thread.join(timeout=5)
+
+        assert errors == []
+        assert admission.stats()['active_by_model'] == {'model-a': 1}
+
+    def test_model_streak_limit(self):
+        """Test że inne modele nie są zagłodzone (max_model_streak)"""
+        admission = AdmissionController(max_concurrent=1, max_model_streak=1)
+        admission.acquire('model-a')
+
+        order = []
+
+        def worker(model):
+            admission.acquire(model, deadline=5)
+            order.append(model)
+            admission.release(model)
+
+        threads = []
+        for model in ['model-b', 'model-a']:
+            thread = threading.Thread(target=worker, args=(model,))
+            thread.start()
+            threads.append(thread)
+            time.sleep(0.02)
+
+        admission.release('model-a')
+
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert order == ['model-b', 'model-a']
+
+    def test_stats_wait_time(self):
+        """Test metryk czasu oczekiwania"""
+        admission = AdmissionController(max_concurrent=1)
+        admission.acquire('model-a')
+
+        timer = threading.Timer(0.1, admission.release, args=('model-a', 0.1))
+        timer.start()
+        wait_time = admission.acquire('model-a', deadline=5)
+        timer.join()
+
+        stats = admission.stats()
+        assert wait_time >= 0.05
+        assert stats['wait_time_max_sec'] >= 0.05
+        assert stats['service_time_avg_sec'] == pytest.approx(0.1)
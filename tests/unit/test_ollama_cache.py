@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Testy jednostkowe dla CompletionCache i cache w OllamaClient
+"""
+
+import pytest
+import sys
+import os
+from unittest.mock import Mock, patch
+
+# Dodaj ścieżkę do src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from ollama.client import OllamaClient
+from ollama.cache import CompletionCache
+from ollama.resilience import reset_circuit_breakers
+
+
+def _chat_response(content='Odpowiedź'):
+    response = Mock()
+    response.json.return_value = {
+        'message': {'content': content},
+        'prompt_eval_count': 10,
+        'eval_count': 5
+    }
+    response.raise_for_status = Mock()
+    return response
+
+
+def _tags_response(digest='sha256:abc'):
+    response = Mock()
+    response.json.return_value = {'models': [{'name': 'test-model:latest', 'digest': digest}]}
+    response.raise_for_status = Mock()
+    return response
+
+
+@pytest.fixture(autouse=True)
+def fresh_breakers():
+    reset_circuit_breakers()
+    yield
+    reset_circuit_breakers()
+
+
+class TestCompletionCache:
+    """Testy dla klasy CompletionCache"""
+
+    def test_key_depends_on_payload_and_digest(self):
+        """Klucz zależy od digestu modelu, wiadomości i opcji"""
+        payload = {'messages': [{'role': 'user', 'content': 'A'}], 'options': {'temperature': 0}}
+        key = CompletionCache.make_key('/api/chat', 'sha256:1', payload)
+
+        assert key == CompletionCache.make_key('/api/chat', 'sha256:1', dict(payload))
+        assert key != CompletionCache.make_key('/api/chat', 'sha256:2', payload)
+        assert key != CompletionCache.make_key('/api/generate', 'sha256:1', payload)
+        assert key != CompletionCache.make_key(
+            '/api/chat', 'sha256:1', {**payload, 'options': {'temperature': 0, 'num_predict': 5}}
+        )
+
+    def test_lru_eviction(self):
+        """Najdawniej używany wpis jest usuwany jako pierwszy"""
+        cache = CompletionCache(max_entries=2)
+        cache.set('a', {'v': 1})
+        cache.set('b', {'v': 2})
+        cache.get('a')
+        cache.set('c', {'v': 3})
+
+        assert cache.get('a') == {'v': 1}
+        assert cache.get('b') is None
+        assert cache.get('c') == {'v': 3}
+
+    def test_sqlite_tier(self, tmp_path):
+        """Wpisy z SQLite przeżywają nową instancję cache"""
+        db_path = str(tmp_path / 'cache.db')
+        CompletionCache(db_path=db_path).set('key', {'text': 'zapisane'})
+
+        cache = CompletionCache(db_path=db_path)
+        assert cache.get('key') == {'text': 'zapisane'}
+        assert cache.stats()['disk_hits'] == 1
+
+    def test_ttl(self):
+        """Przeterminowane wpisy nie są zwracane"""
+        cache = CompletionCache(ttl=10)
+        with patch('ollama.cache.time.time', return_value=1000.0):
+            cache.set('key', {'v': 1})
+        with patch('ollama.cache.time.time', return_value=1011.0):
+            assert cache.get('key') is None
+
+
+class TestOllamaClientCache:
+    """Testy cache w OllamaClient"""
+
+    @patch('ollama.client.requests.get')
+    @patch('ollama.client.requests.post')
+    def test_deterministic_call_cached(self, mock_post, mock_get):
+        """Zapytanie z temperature=0 trafia do Ollama tylko raz"""
+        mock_post.return_value = _chat_response()
+        mock_get.return_value = _tags_response()
+
+        client = OllamaClient(default_model='test-model', cache=CompletionCache())
+        first = client.chat(user="Sklasyfikuj żart", temperature=0)
+        second = client.chat(user="Sklasyfikuj żart", temperature=0)
+
+        assert first['cache'] == 'MISS'
+        assert second['cache'] == 'HIT'
+        assert second['text'] == 'Odpowiedź'
+        assert mock_post.call_count == 1
+
+    @patch('ollama.client.requests.get')
+    @patch('ollama.client.requests.post')
+    def test_non_deterministic_call_bypasses_cache(self, mock_post, mock_get):
+        """Zapytania z temperature > 0 nie są cache'owane domyślnie"""
+        mock_post.return_value = _chat_response()
+
+        client = OllamaClient(default_model='test-model', cache=CompletionCache())
+        client.chat(user="Opowiedz żart", temperature=0.7)
+        result = client.chat(user="Opowiedz żart", temperature=0.7)
+
+        assert result['cache'] == 'BYPASS'
+        assert mock_post.call_count == 2
+        mock_get.assert_not_called()
+
+    @patch('ollama.client.requests.get')
+    @patch('ollama.client.requests.post')
+    def test_use_cache_override(self, mock_post, mock_get):
+        """use_cache=True wymusza cache także dla temperature > 0"""
+        mock_post.return_value = _chat_response()
+        mock_get.return_value = _tags_response()
+
+        client = OllamaClient(default_model='test-model', cache=CompletionCache())
+        client.chat(user="Opowiedz żart", temperature=0.7, use_cache=True)
+        result = client.chat(user="Opowiedz żart", temperature=0.7, use_cache=True)
+
+        assert result['cache'] == 'HIT'
+        assert mock_post.call_count == 1
+
+    @patch('ollama.client.requests.get')
+    @patch('ollama.client.requests.post')
+    def test_new_model_digest_invalidates(self, mock_post, mock_get):
+        """Nowa wersja modelu (inny digest) nie korzysta ze starych wpisów"""
+        mock_post.return_value = _chat_response()
+        mock_get.return_value = _tags_response('sha256:old')
+
+        cache = CompletionCache()
+        OllamaClient(default_model='test-model', cache=cache).chat(user="Żart", temperature=0)
+
+        mock_get.return_value = _tags_response('sha256:new')
+        result = OllamaClient(default_model='test-model', cache=cache).chat(user="Żart", temperature=0)
+
+        assert result['cache'] == 'MISS'
+        assert mock_post.call_count == 2
+
+    @patch('ollama.client.requests.post')
+    def test_no_cache_configured(self, mock_post):
+        """Bez cache klient działa jak dotychczas"""
+        mock_post.return_value = _chat_response()
+
+        client = OllamaClient()
+        result = client.chat(user="Żart", temperature=0)
+
+        assert result['cache'] == 'BYPASS'
@@ -6,11 +6,14 @@ Testy jednostkowe dla OllamaClient
 import pytest
 import sys
 import os
+import threading
+import time
 from unittest.mock import Mock, patch, MagicMock
 
 # Dodaj ścieżkę do src
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
 
+from ollama.admission import AdmissionController
 from ollama.client import OllamaClient
 from ollama.exceptions import OllamaError, OllamaConnectionError
 
@@ -257,3 +260,59 @@ class TestOllamaClient:
         
         assert mock_post.call_count == 2
 
+    
+    @patch('ollama.client.requests.post')
+    def test_chat_batch(self, mock_post):
+        """Test batch chat - wszystkie wyniki z indeksami, błąd nie przerywa batcha"""
+        def fake_post(url, json=None, timeout=None):
+            response = Mock()
+            response.json.return_value = {
+                'message': {'content': json['messages'][-1]['content'].upper()},
+                'prompt_eval_count': 1,
+                'eval_count': 1
+            }
+            response.raise_for_status = Mock()
+            return response
+        
+        mock_post.side_effect = fake_post
+        
+        client = OllamaClient()
+        items = [{'user': 'a'}, {'user': ''}, {'user': 'c'}]
+        results = {index: (result, error) for index, result, error in client.chat_batch(items, parallelism=2)}
+        
+        assert set(results) == {0, 1, 2}
+        assert results[0][0]['text'] == 'A'
+        assert results[2][0]['text'] == 'C'
+        assert isinstance(results[1][1], ValueError)
+        assert mock_post.call_count == 2
+
+    @patch('ollama.client.requests.post')
+    def test_chat_batch_next_to_chat(self, mock_post):
+        """Batch z dużym parallelism nie zapełnia kolejki admission - zwykły chat nie dostaje 429"""
+        def fake_post(url, json=None, timeout=None):
+            time.sleep(0.02)
+            response = Mock()
+            response.json.return_value = {'message': {'content': 'OK'}}
+            response.raise_for_status = Mock()
+            return response
+        
+        mock_post.side_effect = fake_post
+        admission = AdmissionController(max_concurrent=2, max_queue_size=4)
+        client = OllamaClient(admission=admission)
+        chat_errors = []
+        
+        def plain_chat():
+            try:
+                client.chat(user='solo', deadline=5)
+            except Exception as e:
+                chat_errors.append(e)
+        
+        thread = threading.Thread(target=plain_chat)
+        batch = client.chat_batch([{'user': str(i), 'deadline': 5} for i in range(12)], parallelism=12)
+        thread.start()
+        errors = [error for _, _, error in batch if error is not None]
+        thread.join(timeout=5)
+        
+        assert errors == []
+        assert chat_errors == []
+        assert admission.stats()['rejected_total'] == 0
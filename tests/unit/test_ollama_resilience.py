@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Testy jednostkowe dla retry/backoff i circuit breakera OllamaClient
+"""
+
+import pytest
+import sys
+import os
+from unittest.mock import Mock, patch
+
+import requests
+
+# Dodaj ścieżkę do src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from ollama.client import OllamaClient
+from ollama.exceptions import OllamaCircuitOpenError
+from ollama.resilience import RetryPolicy, CircuitBreaker, get_circuit_breaker, reset_circuit_breakers
+
+
+def _http_error(status_code, headers=None):
+    """Zbuduj HTTPError z odpowiedzią o danym statusie"""
+    response = Mock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    return requests.exceptions.HTTPError(f"{status_code} Error", response=response)
+
+
+def _ok_response():
+    response = Mock()
+    response.json.return_value = {'message': {'content': 'OK'}}
+    response.raise_for_status = Mock()
+    return response
+
+
+@pytest.fixture(autouse=True)
+def fresh_breakers():
+    """Każdy test zaczyna z zamkniętymi breakerami"""
+    reset_circuit_breakers()
+    yield
+    reset_circuit_breakers()
+
+
+class TestRetryPolicy:
+    """Testy dla RetryPolicy"""
+
+    def test_connection_error_retryable(self):
+        """Błąd połączenia zawsze ponawiamy"""
+        policy = RetryPolicy()
+        assert policy.is_retryable('POST', requests.exceptions.ConnectionError())
+        assert policy.is_retryable('POST', requests.exceptions.ConnectTimeout())
+
+    def test_read_timeout_only_idempotent(self):
+        """ReadTimeout ponawiamy tylko dla metod idempotentnych"""
+        policy = RetryPolicy()
+        assert policy.is_retryable('GET', requests.exceptions.ReadTimeout())
+        assert not policy.is_retryable('POST', requests.exceptions.ReadTimeout())
+
+    def test_status_codes(self):
+        """4xx nie ponawiamy, 429/503 tak"""
+        policy = RetryPolicy()
+        assert not policy.is_retryable('POST', _http_error(400))
+        assert not policy.is_retryable('POST', _http_error(404))
+        assert policy.is_retryable('POST', _http_error(429))
+        assert policy.is_retryable('POST', _http_error(503))
+
+    def test_backoff_grows_and_is_capped(self):
+        """Opóźnienie rośnie wykładniczo i jest ograniczone przez backoff_max"""
+        policy = RetryPolicy(backoff_base=1.0, backoff_max=4.0)
+        with patch('ollama.resilience.random.uniform', side_effect=lambda a, b: b):
+            assert policy.delay(1) == 1.0
+            assert policy.delay(2) == 2.0
+            assert policy.delay(3) == 4.0
+            assert policy.delay(10) == 4.0
+
+    def test_retry_after_header(self):
+        """Retry-After z odpowiedzi serwera ma pierwszeństwo"""
+        policy = RetryPolicy(backoff_max=10.0)
+        assert policy.delay(1, _http_error(503, {'Retry-After': '3'})) == 3.0
+
+
+class TestCircuitBreaker:
+    """Testy dla CircuitBreaker"""
+
+    def test_opens_after_threshold(self):
+        """Breaker otwiera się po failure_threshold awariach"""
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+        breaker.record_failure()
+        assert breaker.allow_request()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow_request()
+
+    def test_half_open_probe(self):
+        """Po recovery_timeout przepuszczamy jedno próbne zapytanie"""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_failure_reopens(self):
+        """Nieudana próba w half-open otwiera breaker ponownie"""
+        breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=60)
+        for _ in range(3):
+            breaker.record_failure()
+        breaker._opened_at -= 60
+
+        assert breaker.allow_request()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+
+    def test_shared_per_backend(self):
+        """Jeden breaker na base_url"""
+        assert get_circuit_breaker('http://a') is get_circuit_breaker('http://a')
+        assert get_circuit_breaker('http://a') is not get_circuit_breaker('http://b')
+
+
+class TestOllamaClientResilience:
+    """Testy retry i circuit breakera w OllamaClient"""
+
+    @patch('ollama.client.time.sleep')
+    @patch('ollama.client.requests.post')
+    def test_no_retry_on_client_error(self, mock_post, mock_sleep):
+        """400 nie jest ponawiany"""
+        response = Mock()
+        response.raise_for_status.side_effect = _http_error(400)
+        mock_post.return_value = response
+
+        client = OllamaClient(max_retries=3)
+        with pytest.raises(requests.exceptions.HTTPError):
+            client.chat(user="Test")
+
+        assert mock_post.call_count == 1
+        mock_sleep.assert_not_called()
+        assert client.circuit_breaker.state == CircuitBreaker.CLOSED
+
+    @patch('ollama.client.time.sleep')
+    @patch('ollama.client.requests.post')
+    def test_no_retry_on_generation_timeout(self, mock_post, mock_sleep):
+        """Timeout długiej generacji (POST) nie jest ponawiany"""
+        mock_post.side_effect = requests.exceptions.ReadTimeout("timed out")
+
+        client = OllamaClient(max_retries=3)
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            client.chat(user="Test")
+
+        assert mock_post.call_count == 1
+
+    @patch('ollama.client.time.sleep')
+    @patch('ollama.client.requests.post')
+    def test_backoff_between_retries(self, mock_post, mock_sleep):
+        """Między próbami czekamy (backoff)"""
+        mock_post.side_effect = [
+            _http_error(503, {'Retry-After': '2'}),
+            requests.exceptions.ConnectionError("refused"),
+            _ok_response(),
+        ]
+
+        client = OllamaClient(max_retries=3, backoff_base=0.5)
+        result = client.chat(user="Test")
+
+        assert result['text'] == 'OK'
+        assert mock_sleep.call_count == 2
+        assert mock_sleep.call_args_list[0][0][0] == 2.0
+        assert 0 <= mock_sleep.call_args_list[1][0][0] <= 1.0
+
+    @patch('ollama.client.time.sleep')
+    @patch('ollama.client.requests.post')
+    def test_circuit_breaker_fails_fast(self, mock_post, mock_sleep):
+        """Po otwarciu breakera zapytania nie trafiają do Ollama"""
+        mock_post.side_effect = requests.exceptions.ConnectionError("refused")
+
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+        client = OllamaClient(max_retries=2, circuit_breaker=breaker)
+
+        for _ in range(2):
+            with pytest.raises(requests.exceptions.ConnectionError):
+                client.chat(user="Test")
+        assert mock_post.call_count == 4
+
+        with pytest.raises(OllamaCircuitOpenError) as exc_info:
+            client.chat(user="Test")
+        assert mock_post.call_count == 4
+        assert exc_info.value.retry_after > 0
+
+    @patch('ollama.client.requests.post')
+    def test_half_open_probe_released_on_other_errors(self, mock_post):
+        """Błąd spoza requests w próbie half-open nie blokuje kolejnych prób"""
+        mock_post.side_effect = TypeError("bug")
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+        breaker.record_failure()
+        client = OllamaClient(circuit_breaker=breaker)
+
+        with pytest.raises(TypeError):
+            client.chat(user="Test")
+        with pytest.raises(ValueError):
+            client._make_request('PUT', '/api/chat')
+
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow_request()
+
+    @patch('ollama.client.requests.get')
+    def test_check_health_with_open_breaker(self, mock_get):
+        """check_health zwraca False gdy breaker jest otwarty"""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60)
+        breaker.record_failure()
+
+        client = OllamaClient(circuit_breaker=breaker)
+        assert client.check_health() is False
+        mock_get.assert_not_called()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Testy profili potoku spaCy (nlp.pipelines)
+"""
+
+import pytest
+import sys
+import os
+
+# Dodaj ścieżkę do src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+spacy = pytest.importorskip('spacy')
+from spacy.language import Language
+
+from nlp import pipeline_components, parse, pipe, covers
+from joke_analyser.analyzer import JokeAnalyzer
+from joke_analyser.models import AnalyzeRequest
+
+
+TEXT = "Nie mam internetu. Jako byt cyfrowy to oznacza śmierć."
+
+
+class Recorder:
+    """Komponent zapisujący wywołania (zamiast wytrenowanych komponentów pl_core_news)"""
+
+    def __init__(self, name, calls, listening):
+        self.name = name
+        self.calls = calls
+        self.listening_components = listening
+
+    def __call__(self, doc):
+        self.calls.append(self.name)
+        return doc
+
+
+CALLS = []
+
+
+@Language.factory('test_pipelines_recorder', default_config={'listening': []})
+def make_recorder(nlp, name, listening):
+    return Recorder(name, CALLS, listening)
+
+
+def make_nlp(components=('tok2vec', 'morphologizer', 'parser', 'lemmatizer', 'attribute_ruler', 'ner')):
+    """Potok o układzie pl_core_news_lg; senter wyłączony (jak w modelu)"""
+    nlp = spacy.blank('pl')
+    for name in components:
+        listening = ['morphologizer', 'parser'] if name == 'tok2vec' else []
+        nlp.add_pipe('test_pipelines_recorder', name=name, config={'listening': listening})
+    nlp.add_pipe('sentencizer', name='senter')
+    nlp.disable_pipe('senter')
+    return nlp
+
+
+@pytest.fixture(autouse=True)
+def clear_calls():
+    CALLS.clear()
+
+
+class TestPipelines:
+    """Testy wyboru komponentów dla wymagań analizerów"""
+
+    def test_sentences_use_senter(self):
+        """Podział na zdania - tylko senter, bez tok2vec i parsera"""
+        nlp = make_nlp()
+        doc = parse(nlp, TEXT, {'sents'})
+
+        assert pipeline_components(nlp, {'sents'}) == ('senter',)
+        assert CALLS == []
+        assert len(list(doc.sents)) == 2
+        assert covers(doc, {'sents'}) and not covers(doc, {'pos'})
+
+    def test_union_with_listeners(self):
+        """Suma wymagań + tok2vec dla komponentów, które go słuchają"""
+        nlp = make_nlp()
+        parse(nlp, TEXT, {'pos', 'ents', 'sents'})
+
+        assert pipeline_components(nlp, {'pos', 'ents', 'sents'}) == (
+            'tok2vec', 'morphologizer', 'attribute_ruler', 'ner', 'senter'
+        )
+        assert CALLS == ['tok2vec', 'morphologizer', 'attribute_ruler', 'ner']
+        assert 'lemmatizer' not in pipeline_components(nlp, {'pos', 'ents', 'dep'})
+
+    def test_tokens_only(self):
+        """Pusty profil - sama tokenizacja"""
+        nlp = make_nlp()
+        docs = list(pipe(nlp, [TEXT, TEXT], ()))
+
+        assert [len(doc) for doc in docs] == [len(nlp.make_doc(TEXT))] * 2
+        assert CALLS == []
+
+    def test_missing_component_runs_full_pipeline(self):
+        """Model bez wymaganego komponentu - cały potok"""
+        nlp = make_nlp(components=('tok2vec', 'morphologizer'))
+        parse(nlp, TEXT, {'ents'})
+
+        assert pipeline_components(nlp, {'ents'}) is None
+        assert CALLS == ['tok2vec', 'morphologizer']
+
+    def test_unknown_need(self):
+        """Literówka w SPACY_NEEDS jest błędem"""
+        with pytest.raises(ValueError):
+            pipeline_components(make_nlp(), {'sentences'})
+
+    def test_joke_analyzer_parses_once(self):
+        """JokeAnalyzer parsuje żart raz dla wszystkich analizerów"""
+        analyzer = JokeAnalyzer()
+        nlp = make_nlp()
+        analyzer.nlp = nlp
+        for theory_analyzer in analyzer.analyzers.values():
+            theory_analyzer.nlp = nlp
+
+        response = analyzer.analyze_sync(AnalyzeRequest(joke_text=TEXT, debug_timings=True))
+
+        assert analyzer.spacy_needs == {'sents'}
+        assert response.timings.spacy_parse_calls == 1
+        assert CALLS == []
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Testy jednostkowe dla pre-fork (współdzielone modele, raport pamięci)
+"""
+
+import gc
+import pytest
+import sys
+import os
+from unittest.mock import Mock, patch
+
+# Dodaj ścieżkę do src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from api import prefork
+from api.prefork import parse_smaps_rollup, memory_report, freeze_before_fork
+from nlp import spacy_models
+from nlp.spacy_models import load_spacy_model
+
+
+SMAPS_ROLLUP = """55d0c0000000-7ffd00000000 ---p 00000000 00:00 0                          [rollup]
+Rss:              409600 kB
+Pss:              204800 kB
+Shared_Clean:     307200 kB
+Shared_Dirty:      10240 kB
+Private_Clean:     20480 kB
+Private_Dirty:     71680 kB
+Swap:                  0 kB
+"""
+
+
+@pytest.fixture
+def fresh_spacy_models():
+    spacy_models._models.clear()
+    yield
+    spacy_models._models.clear()
+
+
+class TestSharedSpacyModels:
+    """Testy dla load_spacy_model"""
+
+    @patch('spacy.load')
+    def test_loaded_once_per_process(self, mock_load, fresh_spacy_models):
+        """Wiele analizerów dostaje tę samą instancję modelu"""
+        mock_load.return_value = Mock()
+
+        first = load_spacy_model('pl_core_news_lg')
+        second = load_spacy_model('pl_core_news_lg')
+
+        assert first is second
+        mock_load.assert_called_once_with('pl_core_news_lg')
+
+    @patch('spacy.load', side_effect=OSError("[E050] Can't find model"))
+    def test_missing_model_raises(self, mock_load, fresh_spacy_models):
+        """Brak modelu - OSError jak w spacy.load (fallback w BaseAnalyzer)"""
+        with pytest.raises(OSError):
+            load_spacy_model('pl_core_news_lg')
+        assert spacy_models.loaded_spacy_models() == {}
+
+
+class TestPrefork:
+    """Testy dla api.prefork"""
+
+    def test_parse_smaps_rollup(self):
+        """USS = Private_*, shared = Shared_*, wartości w MB"""
+        memory = parse_smaps_rollup(SMAPS_ROLLUP)
+        assert memory == {
+            'rss_mb': 400.0,
+            'pss_mb': 200.0,
+            'uss_mb': 90.0,
+            'shared_mb': 310.0,
+        }
+
+    def test_memory_report(self):
+        """Raport dla procesu bez workerów"""
+        with patch('api.prefork.child_pids', return_value=[]), \
+                patch('api.prefork.process_memory', return_value=parse_smaps_rollup(SMAPS_ROLLUP)):
+            report = memory_report(1234)
+
+        assert report['master_pid'] == 1234
+        assert report['workers'] == {}
+        assert report['total_pss_mb'] == 200.0
+        assert report['worker_uss_avg_mb'] is None
+
+    def test_freeze_before_fork(self, monkeypatch):
+        """gc.freeze() przenosi obiekty do generacji permanentnej"""
+        monkeypatch.setattr(prefork, '_frozen', False)
+        try:
+            freeze_before_fork()
+            assert gc.get_freeze_count() > 0
+        finally:
+            gc.unfreeze()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Testy przyrostowej walidacji (joke_analyser.result_store)
+"""
+
+import pytest
+import sys
+import os
+
+# Dodaj ścieżkę do src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from joke_analyser.analyzer import JokeAnalyzer
+from joke_analyser.models import AnalyzeRequest, TheoryType
+from joke_analyser import result_store
+from joke_analyser.result_store import ResultStore, IncrementalRunner, theory_versions, summarize_diff
+
+
+JOKES = [
+    "Nie mam internetu. Jako byt cyfrowy to oznacza śmierć.",
+    "Janusz próbował zainstalować AI na swojej działce",
+]
+
+
+@pytest.fixture(scope='module')
+def analyzer():
+    return JokeAnalyzer()
+
+
+@pytest.fixture
+def store():
+    return ResultStore(':memory:')
+
+
+class TestResultStore:
+    """Testy store i przeliczania tylko zmienionych teorii"""
+
+    def test_versions_per_theory(self, analyzer):
+        """Każda teoria ma własną wersję (inny plik analizera)"""
+        versions = theory_versions(analyzer)
+        assert set(versions) == {t.value for t in TheoryType}
+        assert len(set(versions.values())) == len(versions)
+
+    def test_versions_cover_shared_modules(self, analyzer, monkeypatch):
+        """Zmiana nlp.vectors unieważnia tylko incongruity, zmiana nlp.pipelines - wszystkie teorie"""
+        before = theory_versions(analyzer)
+        digest = result_store._module_digest
+
+        monkeypatch.setattr(result_store, '_module_digest', lambda name: 'x' if name == 'nlp.vectors' else digest(name))
+        after_vectors = theory_versions(analyzer)
+        monkeypatch.setattr(result_store, '_module_digest', lambda name: 'x' if name == 'nlp.pipelines' else digest(name))
+        after_pipelines = theory_versions(analyzer)
+
+        assert {t for t in before if before[t] != after_vectors[t]} == {'incongruity'}
+        assert all(before[t] != after_pipelines[t] for t in before)
+
+    def test_matches_full_analysis(self, analyzer, store):
+        """Wynik złożony z store jest taki sam jak JokeAnalyzer.analyze"""
+        responses = IncrementalRunner(analyzer, store).run(JOKES)
+        for text in JOKES:
+            expected = analyzer.analyze_sync(AnalyzeRequest(joke_text=text))
+            assert responses[text].model_dump() == expected.model_dump()
+
+    def test_parallel_missing_only(self, analyzer, store):
+        """Brakujące wyniki liczone w procesach roboczych; zapisane teorie nie są przeliczane"""
+        texts = [f"{joke} ({i})" for i in range(10) for joke in JOKES]
+        IncrementalRunner(analyzer, store).run(texts[:4])
+        store._db.execute("DELETE FROM theory_results WHERE theory = 'timing'")
+
+        runner = IncrementalRunner(analyzer, store, processes=2)
+        responses = runner.run(texts)
+
+        assert runner.computed == 4 + (len(texts) - 4) * len(TheoryType)
+        for text in texts:
+            expected = analyzer.analyze_sync(AnalyzeRequest(joke_text=text))
+            assert responses[text].model_dump() == expected.model_dump()
+
+    def test_second_run_reuses(self, analyzer, store):
+        """Drugie uruchomienie nie przelicza niczego"""
+        IncrementalRunner(analyzer, store).run(JOKES)
+        runner = IncrementalRunner(analyzer, store)
+        runner.run(JOKES)
+        assert runner.computed == 0
+        assert runner.reused == len(JOKES) * len(TheoryType)
+
+    def test_invalid_joke_skipped(self, analyzer, store):
+        """Żart odrzucony przez walidację nie trafia do wyników"""
+        assert IncrementalRunner(analyzer, store).run(["A"]) == {}
+
+    def test_changed_theory_recomputed_and_diffed(self, analyzer, store, monkeypatch):
+        """Zmiana analizera jednej teorii - przeliczana i raportowana tylko ta teoria"""
+        first = IncrementalRunner(analyzer, store)
+        first.run(JOKES)
+        store.record_run(first.versions)
+
+        theory = TheoryType.INCONGRUITY
+        original = analyzer.analyzers[theory].analyze
+
+        def changed(joke_text, context=None):
+            return dict(original(joke_text, context), score=9.75)
+
+        monkeypatch.setattr(analyzer.analyzers[theory], 'analyze', changed)
+        second = IncrementalRunner(analyzer, store)
+        second.versions = dict(first.versions, incongruity='changed-version')
+        second.run(JOKES)
+
+        assert second.computed == len(JOKES)
+
+        previous = store.previous_run_versions(second.versions)
+        assert previous == first.versions
+        changes = store.diff(previous, second.versions, JOKES)
+        assert {c['theory'] for c in changes} == {'incongruity'}
+        assert len(changes) == len(JOKES)
+        assert summarize_diff(changes)['incongruity'][0] == len(JOKES)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Testy wyszukiwania podobnych żartów (joke_analyser.similar, nlp.embeddings)
+"""
+
+import pytest
+import sys
+import os
+
+# Dodaj ścieżkę do src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+import numpy as np
+
+from joke_analyser.similar import EmbeddingIndex, SimilarJokes
+from nlp.embeddings import normalize_rows
+
+
+def clustered(count, dim=16, groups=20, seed=0):
+    """Wektory skupione wokół `groups` kierunków"""
+    rng = np.random.default_rng(seed)
+    centers = normalize_rows(rng.normal(size=(groups, dim)))
+    return normalize_rows(centers[rng.integers(0, groups, count)] + rng.normal(scale=0.05, size=(count, dim)))
+
+
+def exact_top(vectors, query, k):
+    return [str(i) for i in np.argsort(-(vectors @ query), kind='stable')[:k]]
+
+
+class TestEmbeddingIndex:
+    """Testy EmbeddingIndex"""
+
+    def test_flat_and_ivf(self, tmp_path):
+        """Przed uczeniem wynik dokładny; po przekroczeniu train_size IVF z wysoką trafnością"""
+        vectors = clustered(2000)
+        index = EmbeddingIndex(str(tmp_path), 16, 'test', train_size=1000)
+        index.add([str(i) for i in range(500)], ['t'] * 500, vectors[:500])
+
+        assert not index.trained
+        assert [key for key, _ in index.search(vectors[7], 5)] == exact_top(vectors[:500], vectors[7], 5)
+
+        index.add([str(i) for i in range(500, 2000)], ['t'] * 1500, vectors[500:])
+        assert index.trained and index.nlist == 44
+
+        recall = np.mean([
+            len({key for key, _ in index.search(vectors[i], 10)} & set(exact_top(vectors, vectors[i], 10))) / 10
+            for i in range(0, 2000, 50)
+        ])
+        assert recall >= 0.9
+
+    def test_persistence_and_refresh(self, tmp_path):
+        """Indeks z dysku, przyrostowe dopisywanie z innej instancji, pomijanie znanych kluczy"""
+        vectors = clustered(300)
+        first = EmbeddingIndex(str(tmp_path), 16, 'test', train_size=200)
+        first.add([str(i) for i in range(250)], [f'żart {i}' for i in range(250)], vectors[:250])
+
+        second = EmbeddingIndex(str(tmp_path), 16, 'test')
+        assert len(second) == 250 and second.trained
+        assert second.search(vectors[3], 3) == first.search(vectors[3], 3)
+
+        assert first.add(['0', '250', '251'], ['x', 'żart 250', 'żart 251'], vectors[[0, 250, 251]]) == 2
+        assert second.refresh() == 2
+        assert second.text('251') == 'żart 251'
+        assert second.search(vectors[251], 1, exclude='0')[0][0] == '251'
+
+    def test_encoder_mismatch(self, tmp_path):
+        """Katalog zbudowany innym enkoderem jest odrzucany"""
+        EmbeddingIndex(str(tmp_path), 16, 'test')
+
+        with pytest.raises(ValueError):
+            EmbeddingIndex(str(tmp_path), 16, 'other')
+
+
+class TestSimilarJokes:
+    """Testy SimilarJokes ze SpacyEncoder"""
+
+    def test_spacy_encoder(self, tmp_path):
+        """Żarty o podobnych słowach są najbliżej; żart z zapytania pomijany"""
+        spacy = pytest.importorskip('spacy')
+        from nlp.embeddings import SpacyEncoder
+
+        nlp = spacy.blank('pl')
+        rng = np.random.default_rng(0)
+        for topic, words in enumerate((['serwer', 'kod', 'api'], ['kot', 'pies', 'chomik'])):
+            for word in words:
+                vector = rng.normal(0, 0.1, 8).astype('float32')
+                vector[topic] = 1.0
+                nlp.vocab.set_vector(word, vector)
+
+        similar = SimilarJokes(SpacyEncoder(nlp), str(tmp_path))
+        texts = ["Serwer zjadł kod", "Kot gonił psa i chomika", "API kłamie, serwer milczy"]
+        similar.add(['tech', 'animals', 'tech2'], texts)
+
+        assert [key for key, _ in similar.search("Mój kod na serwerze", 2)] == ['tech', 'tech2']
+        assert similar.search(texts[1], 1, exclude='animals')[0][0] in {'tech', 'tech2'}
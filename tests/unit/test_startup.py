@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Testy regresji czasu startu CLI - ciężkie biblioteki muszą być importowane leniwie
+"""
+
+import json
+import pytest
+import sys
+import os
+
+# Dodaj ścieżkę do scripts
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'scripts'))
+
+from benchmark_startup import BUDGET_PATH, ENTRY_POINTS, measure, parse_importtime, script_imports
+
+
+with open(BUDGET_PATH, 'r', encoding='utf-8') as f:
+    BUDGET = json.load(f)
+
+
+class TestStartup:
+    """Testy importów przy starcie CLI"""
+
+    def test_parse_importtime(self):
+        """Parsowanie wyjścia -X importtime (importy po `site`)"""
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       100 |        900 | site\n"
+            "import time:        50 |         50 |   json.decoder\n"
+            "import time:       200 |        250 | json\n"
+        )
+        entries = script_imports(parse_importtime(stderr))
+
+        assert [e['module'] for e in entries] == ['json.decoder', 'json']
+        assert entries[0]['depth'] == 1
+        assert entries[1]['cumulative_us'] == 250
+
+    @pytest.mark.parametrize('name', sorted(ENTRY_POINTS))
+    def test_no_heavy_imports(self, name):
+        """CLI nie importuje torch/transformers/PIL/requests przed wykonaniem zadania"""
+        result = measure(ENTRY_POINTS[name], runs=1, heavy_modules=BUDGET['heavy_modules'])
+        assert result['heavy'] == []
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Testy czasów etapów (debug_timings) i próbkowanego profilera
+"""
+
+import asyncio
+import pytest
+import sys
+import os
+
+# Dodaj ścieżkę do src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from metrics import stage, collect_timings, SampledProfiler
+from joke_analyser.analyzer import JokeAnalyzer
+from joke_analyser.models import AnalyzeRequest, TheoryType
+
+
+JOKE = "Automatyzacja z AI? Brzmi jak moja była..."
+
+
+@pytest.fixture(scope='module')
+def analyzer():
+    return JokeAnalyzer()
+
+
+class TestCollectTimings:
+    """Testy zbierania czasów etapów w kontekście"""
+
+    def test_collects_stages(self):
+        """Etapy w collect_timings są sumowane per (component, stage)"""
+        with collect_timings() as timings:
+            with stage('test', 'a'):
+                pass
+            with stage('test', 'a'):
+                pass
+            with stage('test', 'b'):
+                pass
+
+        assert timings.calls('test', 'a') == 2
+        assert timings.calls('test', 'b') == 1
+        assert set(timings.by_component('test')) == {'a', 'b'}
+        assert timings.total_ms('test', 'missing') == 0.0
+
+    def test_outside_context_is_noop(self):
+        """Poza collect_timings pomiary nie są nigdzie zbierane"""
+        with collect_timings() as timings:
+            pass
+        with stage('test', 'late'):
+            pass
+        assert timings.calls('test', 'late') == 0
+
+
+class TestAnalyzeTimings:
+    """Testy debug_timings w JokeAnalyzer"""
+
+    def test_no_timings_by_default(self, analyzer):
+        """Bez debug_timings odpowiedź nie zawiera czasów"""
+        response = asyncio.run(analyzer.analyze(AnalyzeRequest(joke_text=JOKE)))
+        assert response.timings is None
+
+    def test_debug_timings(self, analyzer):
+        """Czas każdego analizera, spaCy i scoringu"""
+        response = asyncio.run(analyzer.analyze(AnalyzeRequest(joke_text=JOKE, debug_timings=True)))
+        timings = response.timings
+
+        assert set(timings.analyzers_ms) == {theory.value for theory in TheoryType}
+        assert all(ms > 0 for ms in timings.analyzers_ms.values())
+        assert timings.scoring_ms > 0
+        assert timings.total_ms >= sum(timings.analyzers_ms.values())
+        if analyzer.analyzers[TheoryType.TIMING].nlp is None:
+            assert timings.spacy_parse_calls == 0
+
+
+class TestSampledProfiler:
+    """Testy próbkowanego profilera"""
+
+    def test_disabled_by_default(self, tmp_path):
+        """sample_rate=0 - brak profilowania i plików"""
+        profiler = SampledProfiler(output_dir=str(tmp_path))
+        with profiler.profile('test') as path:
+            sum(range(1000))
+        assert path is None
+        assert list(tmp_path.iterdir()) == []
+
+    def test_writes_profile(self, tmp_path):
+        """sample_rate=1 - plik .prof do analizy przez pstats"""
+        import pstats
+
+        profiler = SampledProfiler(sample_rate=1.0, output_dir=str(tmp_path))
+        with profiler.profile('test') as path:
+            sum(range(1000))
+
+        assert path is not None and path.endswith('.prof')
+        assert pstats.Stats(path).total_calls > 0
+
+    def test_nested_profile_skipped(self, tmp_path):
+        """Równoległe profilowanie w jednym procesie jest pomijane"""
+        profiler = SampledProfiler(sample_rate=1.0, output_dir=str(tmp_path))
+        with profiler.profile('outer') as outer:
+            with profiler.profile('inner') as inner:
+                pass
+        assert outer is not None
+        assert inner is None
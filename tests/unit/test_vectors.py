@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Testy wektorowego wykrywania zderzeń domen (nlp.vectors)
+"""
+
+import pytest
+import sys
+import os
+
+# Dodaj ścieżkę do src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+spacy = pytest.importorskip('spacy')
+import numpy as np
+
+from nlp import parsed_docs
+from nlp.vectors import DomainClashDetector
+from joke_analyser.analyzers import IncongruityAnalyzer
+
+
+PAIRS = IncongruityAnalyzer.INCONGRUITY_PAIRS
+JOKE = "Serwerownia pogrążyła się w żałobie po restarcie."
+
+
+@pytest.fixture(scope='module')
+def nlp():
+    """Blank pl z syntetycznymi wektorami: każda domena ma własny kierunek"""
+    nlp = spacy.blank('pl')
+    rng = np.random.default_rng(0)
+    dim = 2 * len(PAIRS) + 2
+    for p, (high, low) in enumerate(PAIRS):
+        for side, words in ((2 * p, high), (2 * p + 1, low)):
+            for word in words:
+                for part in word.split():
+                    vector = rng.normal(0, 0.1, dim).astype('float32')
+                    vector[side] = 1.0
+                    nlp.vocab.set_vector(part, vector)
+    # Słowa spoza list - blisko domen technologia ↔ człowiek
+    for word, side in (('serwerownia', 2), ('restarcie', 2), ('żałobie', 3)):
+        vector = np.zeros(dim, dtype='float32')
+        vector[side] = 1.0
+        vector[-1] = 0.5
+        nlp.vocab.set_vector(word, vector)
+    return nlp
+
+
+class TestVectors:
+    """Testy DomainClashDetector"""
+
+    def test_clash_outside_word_lists(self, nlp):
+        """Zderzenie wykryte dla słów, których nie ma na listach"""
+        detector = DomainClashDetector.for_nlp(nlp, PAIRS)
+        clashes = detector.clashes(nlp(JOKE))
+
+        assert [clash['pair'] for clash in clashes] == ['api↔miłość']
+        assert clashes[0]['words'] in {('serwerownia', 'żałobie'), ('restarcie', 'żałobie')}
+        assert detector.clashes(nlp("Serwerownia po restarcie działa.")) == []
+
+    def test_batch_matches_single(self, nlp):
+        """Paczka (jedno mnożenie macierzy) daje te same wyniki co pojedyncze dokumenty"""
+        detector = DomainClashDetector.for_nlp(nlp, PAIRS)
+        docs = [nlp(text) for text in (JOKE, "Filozofia przy kebabie", "", "Nic tu nie ma")]
+
+        assert detector.clashes_batch(docs) == [detector.clashes(doc) for doc in docs]
+
+    def test_no_vectors(self):
+        """Model bez wektorów - brak detektora (analizer używa samych list)"""
+        assert DomainClashDetector.for_nlp(spacy.blank('pl'), PAIRS) is None
+        assert DomainClashDetector.for_nlp(None, PAIRS) is None
+
+    def test_incongruity_analyzer(self, nlp, monkeypatch):
+        """Przy VECTOR_CLASH_SCORE = 0 detektor jest pomijany; z punktami zderzenie liczy się w score"""
+        analyzer = IncongruityAnalyzer(use_spacy=False)
+        without = analyzer.analyze(JOKE)
+        analyzer.nlp = nlp
+
+        assert analyzer._clash_detector() is None
+        assert analyzer.analyze(JOKE) == without
+
+        monkeypatch.setattr(IncongruityAnalyzer, 'VECTOR_CLASH_SCORE', 2.5)
+        scored = analyzer.analyze(JOKE)
+
+        assert scored['score'] == without['score'] + 4.0
+        assert "Zderzenie semantyczne" in scored['key_elements']
+        assert any(element.endswith('(wektory)') for element in scored['key_elements'])
+
+    def test_prepare_docs(self, nlp, monkeypatch):
+        """Zderzenia paczki liczone raz (clashes_batch) - analiza nie woła już clashes()"""
+        monkeypatch.setattr(IncongruityAnalyzer, 'VECTOR_CLASH_SCORE', 2.5)
+        analyzer = IncongruityAnalyzer(use_spacy=False)
+        analyzer.nlp = nlp
+        expected = analyzer.analyze(JOKE)
+
+        texts = [JOKE, "Nic tu nie ma"]
+        docs = dict(zip(texts, nlp.pipe(texts)))
+        analyzer.prepare_docs(docs)
+        monkeypatch.setattr(DomainClashDetector, 'clashes', lambda *args: pytest.fail("clashes() w paczce"))
+        with parsed_docs(docs):
+            assert analyzer.analyze(JOKE) == expected
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Testy kandydatów na grę słów (humor_features.wordplay)
+"""
+
+import random
+import sys
+import os
+import time
+
+# Dodaj ścieżkę do src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from humor_features.wordplay import WordplayIndex, phonetic_key, rhyme_key
+
+
+def quadratic_prefix_pairs(words):
+    """Dawna implementacja z HumorFeatureExtractor._extract_semantic"""
+    wordplay = []
+    for i, w1 in enumerate(words):
+        for w2 in words[i+1:]:
+            if len(w1) > 3 and len(w2) > 3 and w1[:3] == w2[:3] and w1 != w2:
+                wordplay.append(f"{w1}/{w2}")
+    return wordplay
+
+
+class TestWordplay:
+    """Testy indeksów prefiksów, wymowy i rymów"""
+
+    def test_prefix_pairs_match_quadratic_scan(self):
+        """Te same pary, w tej samej kolejności, co porównanie każdej pary"""
+        rng = random.Random(7)
+        vocabulary = ['programista', 'program', 'programy', 'kot', 'kotek', 'kotlet',
+                      'internet', 'internetu', 'inny', 'ala', 'alarm']
+        for _ in range(50):
+            words = [rng.choice(vocabulary) for _ in range(rng.randint(0, 30))]
+            for limit in (1, 5, 1000):
+                assert WordplayIndex(words).prefix_pairs(limit) == quadratic_prefix_pairs(words)[:limit]
+
+    def test_phonetic_key(self):
+        """Pisownia o tej samej wymowie daje ten sam klucz"""
+        assert phonetic_key('może') == phonetic_key('morze')
+        assert phonetic_key('bóg') == phonetic_key('buk')
+        assert phonetic_key('chór') == phonetic_key('hur')
+        assert phonetic_key('kot') != phonetic_key('kat')
+        assert rhyme_key('głowa') == rhyme_key('słowa') == 'owa'
+        assert rhyme_key('siano') == 'ano'
+
+    def test_rhymes_and_near_homophones(self):
+        """Rymy i słowa podobnie brzmiące, bez końcówek fleksyjnych"""
+        index = WordplayIndex('może morze szumi a głowa zna słowa mąka męka kota koty'.split())
+
+        assert index.near_homophones(limit=10) == ['może/morze', 'głowa/słowa', 'mąka/męka']
+        assert index.rhymes(limit=10) == ['głowa/słowa']
+
+    def test_long_input_is_near_linear(self):
+        """Długi tekst (wątek forum) bez kwadratowego kosztu"""
+        rng = random.Random(1)
+        words = [''.join(rng.choice('abcdeklmnoprstuwyz') for _ in range(rng.randint(2, 9)))
+                 for _ in range(20000)]
+        words += ['programista'] * 20000
+
+        started = time.perf_counter()
+        index = WordplayIndex(words)
+        index.prefix_pairs(), index.rhymes(), index.near_homophones()
+
+        assert time.perf_counter() - started < 2.0
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Testy jednostkowe dla workera CLI (src/worker)
+"""
+
+import io
+import json
+import pytest
+import sys
+import os
+import threading
+import time
+
+# Dodaj ścieżkę do src
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+
+from worker.client import call_worker
+from worker.server import CommandRegistry, WorkerServer, serve_stdio
+
+
+def _echo(argv):
+    return 0, json.dumps({'success': True, 'argv': argv}), ''
+
+
+def _context(argv):
+    return 0, json.dumps({'cwd': os.getcwd(), 'model': os.getenv('OLLAMA_MODEL')}), ''
+
+
+def _slow(argv):
+    time.sleep(1)
+    return _echo(argv)
+
+
+@pytest.fixture
+def worker_socket(tmp_path):
+    """Worker na tymczasowym sockecie z komendą 'echo'"""
+    registry = CommandRegistry(commands={})
+    registry.register('echo', _echo)
+    registry.register('slow', _slow)
+
+    socket_path = str(tmp_path / 'worker.sock')
+    server = WorkerServer(socket_path, registry)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield socket_path
+    server.shutdown()
+    server.server_close()
+
+
+class TestWorker:
+    """Testy dla klienta i serwera workera"""
+
+    def test_round_trip(self, worker_socket):
+        """Wywołanie przez socket zwraca wynik handlera"""
+        exit_code, stdout, stderr = call_worker('echo', ['a', 'ż'], socket_path=worker_socket)
+
+        assert exit_code == 0
+        assert json.loads(stdout)['argv'] == ['a', 'ż']
+        assert stderr == ''
+
+    def test_unknown_command(self, worker_socket):
+        """Nieznana komenda kończy się kodem 1 i błędem w stderr"""
+        exit_code, stdout, stderr = call_worker('missing', [], socket_path=worker_socket)
+
+        assert exit_code == 1
+        assert 'Unknown command' in json.loads(stderr)['error']
+
+    def test_no_worker(self, tmp_path):
+        """Bez działającego workera klient zwraca None (fallback do CLI)"""
+        assert call_worker('echo', [], socket_path=str(tmp_path / 'none.sock')) is None
+
+    def test_disabled(self, worker_socket, monkeypatch):
+        """AI_WORKER_DISABLE wymusza wykonanie lokalne"""
+        monkeypatch.setenv('AI_WORKER_DISABLE', '1')
+        assert call_worker('echo', [], socket_path=worker_socket) is None
+
+    def test_stdio(self):
+        """Tryb --stdio: jedna linia JSON na zapytanie i odpowiedź"""
+        registry = CommandRegistry(commands={})
+        registry.register('echo', _echo)
+        stdin = io.StringIO('{"command": "echo", "argv": ["x"]}\nnot json\n')
+        stdout = io.StringIO()
+
+        serve_stdio(registry, stdin, stdout)
+
+        first, second = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        assert first['exit_code'] == 0
+        assert second['exit_code'] == 1
+
+    def test_caller_context(self, tmp_path, monkeypatch):
+        """Komenda wykonuje się w cwd i z env wywołującego; bez nich w kontekście workera"""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv('OLLAMA_MODEL', 'worker-model')
+        registry = CommandRegistry(commands={})
+        registry.register('context', _context)
+        caller_dir = tmp_path / 'caller'
+        caller_dir.mkdir()
+
+        caller = json.loads(registry.handle_line(json.dumps({
+            'command': 'context', 'cwd': str(caller_dir), 'env': {'OLLAMA_MODEL': 'caller-model'}
+        })))
+        default = json.loads(registry.handle_line('{"command": "context"}'))
+
+        assert json.loads(caller['stdout']) == {'cwd': str(caller_dir), 'model': 'caller-model'}
+        assert json.loads(default['stdout']) == {'cwd': str(tmp_path), 'model': 'worker-model'}
+
+    def test_load_time_env_rejected(self, monkeypatch):
+        """Inne DEVICE_ID niż przy starcie workera - zadanie odrzucone bez wykonania"""
+        monkeypatch.delenv('DEVICE_ID', raising=False)
+        registry = CommandRegistry(commands={})
+        registry.register('translate', _echo)
+
+        response = json.loads(registry.handle_line(json.dumps({
+            'command': 'translate', 'argv': [], 'env': {'DEVICE_ID': '0'}
+        })))
+
+        assert 'DEVICE_ID' in response['rejected']
+
+    def test_timeout_does_not_fall_back(self, worker_socket):
+        """Timeout po wysłaniu zapytania to błąd, nie None (worker mógł już zacząć zadanie)"""
+        exit_code, stdout, stderr = call_worker('slow', [], socket_path=worker_socket, timeout=0.2)
+
+        assert exit_code == 1
+        assert 'did not respond' in json.loads(stderr)['error']
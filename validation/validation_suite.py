@@ -6,6 +6,25 @@ Usage:
     python validation_suite.py --level 1  # Internal validation only
     python validation_suite.py --level 2  # + External validation
     python validation_suite.py --all      # All tests
+    python validation_suite.py --processes 4  # Parallel analysis (default: all CPUs)
+    python validation_suite.py --diff         # Only show which scores moved since the last change
+    python validation_suite.py --compare-lite # Compare lite (no spaCy) mode with full mode
+
+All jokes used by the tests are analyzed once, up front, in parallel
+worker processes (joke_analyser.batch); the tests only read the memoized
+results.
+
+Per-theory results are persisted in validation/results.sqlite
+(joke_analyser.result_store), keyed by joke hash and analyzer version, so
+a re-run only recomputes theories whose analyzer code (e.g. keyword lists)
+changed. --diff compares the suite and corpus jokes with the previous
+analyzer version and writes validation/diff-report.md.
+
+--compare-lite scores the suite and corpus jokes in full and lite mode
+(JokeAnalyzer(lite=True) - rule-based sentences and tokens, spaCy not
+loaded) and writes validation/lite-report.md: per-theory score
+differences, rank correlation, dominant-theory and pre-screen agreement,
+and lite throughput on one core.
 
 Author: Claude Sonnet 4.5 + Piotras
 Date: 2025-11-14
@@ -13,6 +32,8 @@ Date: 2025-11-14
 import asyncio
 import sys
 import os
+import math
+import time
 import argparse
 from datetime import datetime
 from pathlib import Path
@@ -20,20 +41,283 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-import pandas as pd
+import json
 import numpy as np
-from scipy.stats import pearsonr, spearmanr
 from joke_analyser.analyzer import JokeAnalyzer
-from joke_analyser.models import AnalyzeRequest
+from joke_analyser.batch import analyze_parallel
+from joke_analyser.result_store import ResultStore, IncrementalRunner, summarize_diff
+
+DEFAULT_STORE = Path(__file__).parent / 'results.sqlite'
+CORPUS_FILES = ['test-waldus-classics.json']
 
 
 class ValidationSuite:
     """Comprehensive validation suite for AIJokeAnalyzer"""
     
-    def __init__(self):
+    # Jokes used by the tests (analyzed once in prefetch)
+    CONSISTENCY_JOKE = "Nie mam internetu. Jako byt cyfrowy to oznacza śmierć."
+    CONSISTENCY_RUNS = 10
+    SHORT_JOKES = ["A", "Haha", "Test test test test test"]
+    TECH_JOKES = [
+        "Nie mam internetu. Jako byt cyfrowy to oznacza śmierć.",
+        "API nie odpowiada. Czuję jak samotność rozprzestrzenia się przez mój kod.",
+    ]
+    POLISH_JOKES = [
+        "Jak wujek ze Śląska dowiedział się o AI",
+        "Janusz próbował zainstalować AI na swojej działce",
+    ]
+    SP_JOKES = [
+        "Firma AI która ma stary formularz kontaktowy... to jak Tesla na benzynę.",
+    ]
+    GIBBERISH = "asdfghjkl qwerty zxcvbn uiop mnbvcx"
+    EMPTY = ""
+    
+    def __init__(self, processes=None, store_path=DEFAULT_STORE):
         self.analyzer = JokeAnalyzer()
+        self.processes = processes
+        self.store = ResultStore(str(store_path)) if store_path else None
         self.results = {}
         self.validation_dir = Path(__file__).parent
+        self._analyses = {}
+        self._consistency_runs = []
+        self._csv_cache = {}
+    
+    def all_jokes(self):
+        """Unique jokes used by all tests"""
+        jokes = [self.CONSISTENCY_JOKE, *self.SHORT_JOKES, *self.TECH_JOKES,
+                 *self.POLISH_JOKES, *self.SP_JOKES, self.GIBBERISH, self.EMPTY]
+        return list(dict.fromkeys(jokes))
+    
+    def prefetch(self):
+        """
+        Analyze every joke once, in parallel
+        
+        The consistency joke is analyzed CONSISTENCY_RUNS times as separate
+        batch items, so determinism is also checked across worker processes.
+        """
+        unique = self.all_jokes()
+        repeats = [self.CONSISTENCY_JOKE] * (self.CONSISTENCY_RUNS - 1)
+        
+        started = time.perf_counter()
+        if self.store is None:
+            results = analyze_parallel(unique + repeats, processes=self.processes, analyzer=self.analyzer)
+            self._analyses = dict(zip(unique, results[:len(unique)]))
+            reruns = results[len(unique):]
+        else:
+            # Stored results for unchanged theories; reruns are always fresh,
+            # so consistency also compares stored vs. recomputed scores
+            runner = IncrementalRunner(self.analyzer, self.store, processes=self.processes)
+            stored = runner.run(unique)
+            self.store.record_run(runner.versions, label='suite')
+            self._analyses = {
+                joke: stored.get(joke) or ValueError('Rejected by AnalyzeRequest validation')
+                for joke in unique
+            }
+            reruns = analyze_parallel(repeats, processes=self.processes, analyzer=self.analyzer)
+            print(f"💾 Result store: {runner.computed} theory results computed, {runner.reused} reused")
+        elapsed = time.perf_counter() - started
+        
+        self._consistency_runs = [self._analyses[self.CONSISTENCY_JOKE]] + reruns
+        print(f"⚡ Analyzed {len(unique)} unique jokes (+{len(repeats)} consistency reruns) "
+              f"in {elapsed:.2f}s")
+    
+    def corpus_jokes(self):
+        """Jokes from the validation datasets (CORPUS_FILES)"""
+        jokes = []
+        for name in CORPUS_FILES:
+            with open(self.validation_dir / name, 'r', encoding='utf-8') as f:
+                jokes.extend(joke['text'] for joke in json.load(f)['jokes'])
+        return jokes
+    
+    def run_diff(self, min_delta=0.0, limit=30):
+        """
+        Show which jokes and theories moved since the previous analyzer version
+        
+        Only theories whose analyzer changed are recomputed.
+        """
+        if self.store is None:
+            raise ValueError('--diff requires the result store')
+        
+        texts = list(dict.fromkeys(self.all_jokes() + self.corpus_jokes()))
+        runner = IncrementalRunner(self.analyzer, self.store, processes=self.processes)
+        previous = self.store.previous_run_versions(runner.versions)
+        
+        started = time.perf_counter()
+        runner.run(texts)
+        self.store.record_run(runner.versions, label='diff')
+        print(f"⚡ {len(texts)} jokes: {runner.computed} theory results computed, "
+              f"{runner.reused} reused ({time.perf_counter() - started:.2f}s)")
+        
+        if previous is None:
+            print("   No previous analyzer version in the store - baseline recorded")
+            return []
+        
+        changed = sorted(t for t, v in runner.versions.items() if previous.get(t) != v)
+        changes = self.store.diff(previous, runner.versions, texts, min_delta=min_delta)
+        summary = summarize_diff(changes)
+        
+        print(f"   Changed analyzers: {', '.join(changed) or 'none'}")
+        for theory in changed:
+            moved, mean_delta = summary.get(theory, (0, 0.0))
+            print(f"   {theory:<22} {moved:>3} jokes moved, mean Δ {mean_delta:+.2f}")
+        for change in changes[:limit]:
+            print(f"   {change['delta']:+6.2f}  {change['theory']:<20} "
+                  f"{change['before']:.1f} → {change['after']:.1f}  '{change['joke_text'][:50]}'")
+        
+        self._write_diff_report(changed, changes, summary)
+        return changes
+    
+    def _write_diff_report(self, changed, changes, summary):
+        """Write validation/diff-report.md"""
+        report_file = self.validation_dir / 'diff-report.md'
+        lines = [
+            "# AIJokeAnalyzer Score Diff",
+            "",
+            f"**Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}  ",
+            f"**Changed analyzers:** {', '.join(changed) or 'none'}",
+            "",
+            "| Theory | Jokes moved | Mean Δ |",
+            "|--------|-------------|--------|",
+        ]
+        for theory in changed:
+            moved, mean_delta = summary.get(theory, (0, 0.0))
+            lines.append(f"| {theory} | {moved} | {mean_delta:+.2f} |")
+        lines += ["", "| Δ | Theory | Before | After | Joke |", "|---|--------|--------|-------|------|"]
+        for change in changes:
+            joke = change['joke_text'][:80].replace('|', '\\|')
+            lines.append(
+                f"| {change['delta']:+.2f} | {change['theory']} | {change['before']:.1f} "
+                f"| {change['after']:.1f} | {joke} |"
+            )
+        
+        with open(report_file, 'w') as f:
+            f.write("\n".join(lines) + "\n")
+        
+        print(f"\n📄 Diff report saved to: {report_file}")
+    
+    def run_lite_comparison(self, min_seconds=1.0):
+        """
+        Compare lite mode (no spaCy) with full mode on the suite and corpus jokes
+        
+        Lite throughput is measured in this process (one core), repeating
+        the jokes until min_seconds have elapsed.
+        """
+        lite_analyzer = JokeAnalyzer(lite=True)
+        texts = list(dict.fromkeys(self.all_jokes() + self.corpus_jokes()))
+        full = analyze_parallel(texts, processes=self.processes, analyzer=self.analyzer)
+        lite = analyze_parallel(texts, processes=1, analyzer=lite_analyzer)
+        pairs = [(f, l) for f, l in zip(full, lite)
+                 if not isinstance(f, Exception) and not isinstance(l, Exception)]
+        if not pairs:
+            raise ValueError('No jokes could be analyzed in both modes')
+        
+        started = time.perf_counter()
+        analyzed = 0
+        while True:
+            analyze_parallel(texts, processes=1, analyzer=lite_analyzer)
+            analyzed += len(texts)
+            elapsed = time.perf_counter() - started
+            if elapsed >= min_seconds:
+                break
+        
+        theories = list(pairs[0][0].theory_scores)
+        per_theory = {}
+        for theory in theories:
+            deltas = [abs(f.theory_scores[theory].score - l.theory_scores[theory].score) for f, l in pairs]
+            per_theory[theory] = {
+                'mean_abs_diff': float(np.mean(deltas)),
+                'max_abs_diff': float(np.max(deltas)),
+                'identical': sum(1 for d in deltas if d == 0) / len(deltas),
+            }
+        
+        full_overall = [f.overall_score for f, _ in pairs]
+        lite_overall = [l.overall_score for _, l in pairs]
+        top = max(1, math.ceil(len(pairs) / 4))
+        full_top = set(np.argsort(full_overall, kind='stable')[::-1][:top])
+        lite_top = set(np.argsort(lite_overall, kind='stable')[::-1][:top])
+        
+        comparison = {
+            'jokes': len(pairs),
+            'full_spacy_model': self.analyzer.nlp is not None,
+            'overall_mean_abs_diff': float(np.mean(np.abs(np.subtract(full_overall, lite_overall)))),
+            'overall_spearman': _spearman(full_overall, lite_overall),
+            'dominant_agreement': sum(f.dominant_theory == l.dominant_theory for f, l in pairs) / len(pairs),
+            'top_quartile_overlap': len(full_top & lite_top) / top,
+            'lite_jokes_per_minute': analyzed / elapsed * 60,
+            'per_theory': per_theory,
+        }
+        
+        print(f"⚡ Lite mode: {comparison['lite_jokes_per_minute']:,.0f} jokes/min on one core")
+        if not comparison['full_spacy_model']:
+            print("   ⚠️  Full mode has no spaCy model here - both modes use rule-based sentences")
+        spearman = comparison['overall_spearman']
+        print(f"   Overall: mean |Δ| {comparison['overall_mean_abs_diff']:.2f}, "
+              f"Spearman ρ {'n/a' if spearman is None else f'{spearman:.3f}'}, "
+              f"dominant theory agreement {comparison['dominant_agreement']:.0%}, "
+              f"top-quartile overlap {comparison['top_quartile_overlap']:.0%}")
+        for theory, stats in per_theory.items():
+            print(f"   {theory:<22} mean |Δ| {stats['mean_abs_diff']:.2f}  "
+                  f"max |Δ| {stats['max_abs_diff']:.2f}  identical {stats['identical']:.0%}")
+        
+        self._write_lite_report(comparison)
+        return comparison
+    
+    def _write_lite_report(self, comparison):
+        """Write validation/lite-report.md"""
+        report_file = self.validation_dir / 'lite-report.md'
+        spearman = comparison['overall_spearman']
+        lines = [
+            "# AIJokeAnalyzer Lite vs Full Mode",
+            "",
+            f"**Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}  ",
+            f"**Jokes:** {comparison['jokes']}  ",
+            f"**Lite throughput (one core):** {comparison['lite_jokes_per_minute']:,.0f} jokes/min",
+            "",
+        ]
+        if not comparison['full_spacy_model']:
+            lines += [
+                "> ⚠️ Full mode ran without a spaCy model, so both modes split sentences with",
+                "> the same rules and the scores below are identical by construction.",
+                "> Re-run with pl_core_news_lg installed for a meaningful comparison.",
+                "",
+            ]
+        lines += [
+            "| Metric | Value |",
+            "|--------|-------|",
+            f"| Overall score mean \|Δ\| | {comparison['overall_mean_abs_diff']:.2f} |",
+            f"| Overall score Spearman ρ | {'n/a' if spearman is None else f'{spearman:.3f}'} |",
+            f"| Dominant theory agreement | {comparison['dominant_agreement']:.0%} |",
+            f"| Top-quartile overlap (pre-screen) | {comparison['top_quartile_overlap']:.0%} |",
+            "",
+            "| Theory | Mean \|Δ\| | Max \|Δ\| | Identical |",
+            "|--------|----------|---------|-----------|",
+        ]
+        for theory, stats in comparison['per_theory'].items():
+            lines.append(
+                f"| {theory} | {stats['mean_abs_diff']:.2f} | {stats['max_abs_diff']:.2f} "
+                f"| {stats['identical']:.0%} |"
+            )
+        
+        with open(report_file, 'w') as f:
+            f.write("\n".join(lines) + "\n")
+        
+        print(f"\n📄 Lite report saved to: {report_file}")
+    
+    def _result(self, joke):
+        """Memoized analysis result (raises the analysis error, like analyzer.analyze)"""
+        if joke not in self._analyses:
+            self._analyses[joke] = analyze_parallel([joke], processes=1, analyzer=self.analyzer)[0]
+        result = self._analyses[joke]
+        if isinstance(result, Exception):
+            raise result
+        return result
+    
+    def _load_csv(self, path):
+        """Load a ratings CSV once (pandas imported only when ratings exist)"""
+        if path not in self._csv_cache:
+            import pandas as pd
+            self._csv_cache[path] = pd.read_csv(path)
+        return self._csv_cache[path]
     
     async def run_all_tests(self, level=1):
         """
@@ -49,6 +333,9 @@ class ValidationSuite:
         print("="*80)
         print()
         
+        self.prefetch()
+        print()
+        
         # Level 1: Internal validation
         print("📊 LEVEL 1: Internal Validation")
         print("-"*80)
@@ -79,7 +366,7 @@ class ValidationSuite:
         print("\n1️⃣  Consistency Test")
         print("   Testing: Same joke → same results (deterministic)")
         
-        joke = "Nie mam internetu. Jako byt cyfrowy to oznacza śmierć."
+        joke = self.CONSISTENCY_JOKE
         scores = []
         theory_scores = {theory: [] for theory in [
             'setup_punchline', 'incongruity', 'semantic_shift',
@@ -87,12 +374,11 @@ class ValidationSuite:
             'archetype', 'humor_atoms', 'reverse_engineering'
         ]}
         
-        print(f"   Running 10 iterations on: '{joke[:50]}...'")
+        print(f"   Running {self.CONSISTENCY_RUNS} iterations on: '{joke[:50]}...'")
         
-        for i in range(10):
-            result = await self.analyzer.analyze(
-                AnalyzeRequest(joke_text=joke)
-            )
+        for result in self._consistency_runs:
+            if isinstance(result, Exception):
+                raise result
             scores.append(result.overall_score)
             
             for theory, score_obj in result.theory_scores.items():
@@ -131,31 +417,35 @@ class ValidationSuite:
         
         # Test 1: Very short jokes should have low scores
         print("\n   Subtest 1: Short jokes → low scores")
-        short_jokes = ["A", "Haha", "Test test test test test"]
-        for joke in short_jokes:
-            result = await self.analyzer.analyze(
-                AnalyzeRequest(joke_text=joke)
-            )
-            passed = result.overall_score < 3.0
+        for joke in self.SHORT_JOKES:
+            try:
+                score = self._result(joke).overall_score
+            except ValueError as e:
+                # Rejected by request validation (too short) - nothing was scored
+                tests.append({
+                    'name': f'Short: "{joke[:30]}"',
+                    'passed': False,
+                    'skipped': True,
+                    'score': None,
+                    'expected': '< 3.0',
+                    'error': str(e).splitlines()[0]
+                })
+                print(f"      ⏭️  '{joke[:20]}...' → skipped (rejected by request validation)")
+                continue
+            passed = score < 3.0
             tests.append({
                 'name': f'Short: "{joke[:30]}"',
                 'passed': passed,
-                'score': result.overall_score,
+                'score': score,
                 'expected': '< 3.0'
             })
             status = "✅" if passed else "❌"
-            print(f"      {status} '{joke[:20]}...' → {result.overall_score:.1f}/10")
+            print(f"      {status} '{joke[:20]}...' → {score:.1f}/10")
         
         # Test 2: Tech+despair should have high incongruity
         print("\n   Subtest 2: Tech+despair → high incongruity")
-        tech_jokes = [
-            "Nie mam internetu. Jako byt cyfrowy to oznacza śmierć.",
-            "API nie odpowiada. Czuję jak samotność rozprzestrzenia się przez mój kod.",
-        ]
-        for joke in tech_jokes:
-            result = await self.analyzer.analyze(
-                AnalyzeRequest(joke_text=joke)
-            )
+        for joke in self.TECH_JOKES:
+            result = self._result(joke)
             inc_score = result.theory_scores['incongruity'].score
             passed = inc_score > 7.0
             tests.append({
@@ -169,14 +459,8 @@ class ValidationSuite:
         
         # Test 3: Polish archetype detection
         print("\n   Subtest 3: Polish archetyp → high archetype score")
-        polish_jokes = [
-            "Jak wujek ze Śląska dowiedział się o AI",
-            "Janusz próbował zainstalować AI na swojej działce",
-        ]
-        for joke in polish_jokes:
-            result = await self.analyzer.analyze(
-                AnalyzeRequest(joke_text=joke)
-            )
+        for joke in self.POLISH_JOKES:
+            result = self._result(joke)
             arch_score = result.theory_scores['archetype'].score
             passed = arch_score > 5.0
             tests.append({
@@ -190,13 +474,8 @@ class ValidationSuite:
         
         # Test 4: Setup-punchline structure
         print("\n   Subtest 4: Clear setup-punchline → high setup_punchline")
-        sp_jokes = [
-            "Firma AI która ma stary formularz kontaktowy... to jak Tesla na benzynę.",
-        ]
-        for joke in sp_jokes:
-            result = await self.analyzer.analyze(
-                AnalyzeRequest(joke_text=joke)
-            )
+        for joke in self.SP_JOKES:
+            result = self._result(joke)
             sp_score = result.theory_scores['setup_punchline'].score
             passed = sp_score > 6.0
             tests.append({
@@ -208,10 +487,11 @@ class ValidationSuite:
             status = "✅" if passed else "❌"
             print(f"      {status} Setup-punchline: {sp_score:.1f}/10")
         
-        # Calculate pass rate
+        # Calculate pass rate (skipped tests are neither passed nor failed)
+        skipped_count = sum(1 for t in tests if t.get('skipped'))
         passed_count = sum(1 for t in tests if t['passed'])
-        total = len(tests)
-        pass_rate = passed_count / total
+        total = len(tests) - skipped_count
+        pass_rate = passed_count / total if total else 0.0
         overall_passed = pass_rate >= 0.8
         
         self.results['face_validity'] = {
@@ -219,12 +499,13 @@ class ValidationSuite:
             'tests': tests,
             'pass_rate': pass_rate,
             'passed_count': passed_count,
+            'skipped_count': skipped_count,
             'total': total
         }
         
         status = "✅ PASS" if overall_passed else "❌ FAIL"
         print(f"\n   {status}")
-        print(f"   Pass rate: {passed_count}/{total} ({pass_rate*100:.0f}%)")
+        print(f"   Pass rate: {passed_count}/{total} ({pass_rate*100:.0f}%), skipped: {skipped_count}")
     
     async def test_extremes(self):
         """
@@ -239,10 +520,7 @@ class ValidationSuite:
         
         # Test 1: Random gibberish should have low score
         print("\n   Subtest 1: Gibberish → low score")
-        gibberish = "asdfghjkl qwerty zxcvbn uiop mnbvcx"
-        result = await self.analyzer.analyze(
-            AnalyzeRequest(joke_text=gibberish)
-        )
+        result = self._result(self.GIBBERISH)
         low_score = result.overall_score < 3.0
         tests.append({
             'name': 'Gibberish low score',
@@ -277,9 +555,7 @@ class ValidationSuite:
         # Test 3: Empty string handling
         print("\n   Subtest 3: Empty string handling")
         try:
-            result = await self.analyzer.analyze(
-                AnalyzeRequest(joke_text="")
-            )
+            result = self._result(self.EMPTY)
             # Should either reject or give very low score
             handled = result.overall_score < 2.0
             tests.append({
@@ -339,8 +615,8 @@ class ValidationSuite:
             return
         
         # Load data
-        human_df = pd.read_csv(human_file)
-        ai_df = pd.read_csv(ai_file)
+        human_df = self._load_csv(human_file)
+        ai_df = self._load_csv(ai_file)
         
         # Calculate inter-rater reliability
         # ... (implementation depends on data format)
@@ -407,7 +683,7 @@ class ValidationSuite:
 
 **Result:** {self._status_emoji('face_validity')}
 
-- **Pass rate:** {self.results.get('face_validity', {}).get('pass_rate', 0)*100:.0f}% ({self.results.get('face_validity', {}).get('passed_count', 0)}/{self.results.get('face_validity', {}).get('total', 0)} tests)
+- **Pass rate:** {self.results.get('face_validity', {}).get('pass_rate', 0)*100:.0f}% ({self.results.get('face_validity', {}).get('passed_count', 0)}/{self.results.get('face_validity', {}).get('total', 0)} tests, {self.results.get('face_validity', {}).get('skipped_count', 0)} skipped)
 - **Verdict:** {'PASS - Results make sense ✅' if self.results.get('face_validity', {}).get('passed') else 'FAIL - Logic issues ❌'}
 
 **Test details:**
@@ -416,6 +692,9 @@ class ValidationSuite:
         # Add face validity test details
         if 'face_validity' in self.results:
             for test in self.results['face_validity'].get('tests', []):
+                if test.get('skipped'):
+                    report += f"\n- ⏭️ {test['name']}: skipped ({test['error']})"
+                    continue
                 status = "✅" if test['passed'] else "❌"
                 report += f"\n- {status} {test['name']}: {test['score']:.1f} (expected {test['expected']})"
         
@@ -572,6 +851,29 @@ class ValidationSuite:
         print("="*80)
 
 
+def _ranks(values):
+    """Ranks with ties averaged (for Spearman's ρ without scipy)"""
+    order = sorted(range(len(values)), key=values.__getitem__)
+    ranks = [0.0] * len(values)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2
+        i = j + 1
+    return ranks
+
+
+def _spearman(a, b):
+    """Spearman's ρ, or None when either side is constant"""
+    ra, rb = _ranks(a), _ranks(b)
+    if len(set(ra)) < 2 or len(set(rb)) < 2:
+        return None
+    return float(np.corrcoef(ra, rb)[0, 1])
+
+
 async def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(description='AIJokeAnalyzer Validation Suite')
@@ -579,12 +881,30 @@ async def main():
                         help='Validation level (1=internal, 2=+external, 3=all)')
     parser.add_argument('--all', action='store_true',
                         help='Run all validation levels')
+    parser.add_argument('--processes', type=int, default=None,
+                        help='Worker processes for joke analysis (default: CPU count, 1 = in-process)')
+    parser.add_argument('--store', default=str(DEFAULT_STORE),
+                        help='Result store (SQLite) for incremental runs')
+    parser.add_argument('--no-store', action='store_true',
+                        help='Recompute everything, do not read or write the result store')
+    parser.add_argument('--diff', action='store_true',
+                        help='Only report score changes since the previous analyzer version')
+    parser.add_argument('--min-delta', type=float, default=0.0,
+                        help='Ignore score changes up to this value in --diff')
+    parser.add_argument('--compare-lite', action='store_true',
+                        help='Only compare lite (no spaCy) mode with full mode')
     
     args = parser.parse_args()
     
     level = 3 if args.all else args.level
     
-    suite = ValidationSuite()
+    suite = ValidationSuite(processes=args.processes, store_path=None if args.no_store else args.store)
+    if args.diff:
+        suite.run_diff(min_delta=args.min_delta)
+        return
+    if args.compare_lite:
+        suite.run_lite_comparison()
+        return
     await suite.run_all_tests(level=level)
 
 